@@ -0,0 +1,203 @@
+"""Orchestration overhead: SafeBox's hot paths timed against a fake Docker client.
+
+Runs without a Docker daemon.  Containers come from
+:mod:`fake_docker`, which replays canned output through the real
+multiplexed log-stream format, so every number here is SafeBox's own
+cost: detection, container kwargs, demultiplexing and capture, the
+timeout kill, and a whole ``execute()`` call.
+
+Each benchmark reports the median of ``--rounds`` rounds.  ``--save``
+stores the results in ``benchmarks/baseline.json``.  Later runs show the
+change against it, and ``--check`` exits non-zero when any benchmark is
+more than ``--tolerance`` worse.  Baselines are machine-specific, so
+save one on the machine you compare on.
+
+    python benchmarks/bench_core.py [--rounds N] [--only NAME] [--save] [--check]
+"""
+
+from __future__ import annotations
+
+import argparse
+import atexit
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+# Keep the image cache and spilled output out of the real ~/.safebox.
+_HOME = tempfile.mkdtemp(prefix="safebox-bench-")
+atexit.register(shutil.rmtree, _HOME, ignore_errors=True)
+os.environ["HOME"] = _HOME
+
+from fake_docker import FakeDockerClient, FakeProgram, installed  # noqa: E402
+
+from safebox.core.container import ContainerConfig, build_container_kwargs  # noqa: E402
+from safebox.core.executor import execute  # noqa: E402
+from safebox.detection.detector import detect_language  # noqa: E402
+from safebox.output.plain import Reporter  # noqa: E402
+
+BASELINE = Path(__file__).with_name("baseline.json")
+FIXTURES = Path(__file__).resolve().parent.parent / "tests" / "fixtures" / "scripts"
+
+LINE = b"x" * 79 + b"\n"
+TIMEOUT = 0.2
+
+Benchmark = Callable[[], float]
+"""One round; returns the measured value."""
+
+
+def _per_call(fn: Callable[[], object], calls: int) -> float:
+    start = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def bench_detect() -> float:
+    scripts = [*sorted(FIXTURES.glob("hello.*")), _shebang_script()]
+    return _per_call(lambda: [detect_language(s) for s in scripts], 2000) / len(scripts)
+
+
+def bench_kwargs() -> float:
+    config = ContainerConfig(
+        image="python:3.12-slim",
+        image_ref="sha256:" + "0" * 64,
+        language="python",
+        script_path=FIXTURES / "hello.py",
+        environment={"MODE": "bench"},
+    )
+    return _per_call(lambda: build_container_kwargs(config), 20000)
+
+
+def _throughput(program: FakeProgram) -> float:
+    with installed(FakeDockerClient(program)):
+        start = time.perf_counter()
+        execute(_script(), reporter=Reporter(), deps=False, stats=False)
+        elapsed = time.perf_counter() - start
+    return len(program.output) / elapsed / 1e6
+
+
+def bench_stream_large() -> float:
+    return _throughput(FakeProgram(output=LINE * 400_000, frame_size=64 * 1024))
+
+
+def bench_stream_fragmented() -> float:
+    return _throughput(FakeProgram(output=LINE * 25_000, frame_size=len(LINE), chunk_size=7))
+
+
+def bench_timeout_kill() -> float:
+    with installed(FakeDockerClient(FakeProgram(output=LINE, hang=True))):
+        start = time.perf_counter()
+        result = execute(_script(), reporter=Reporter(), deps=False, timeout=TIMEOUT)
+        elapsed = time.perf_counter() - start
+    assert result.timed_out
+    return (elapsed - TIMEOUT) * 1000
+
+
+def bench_execute() -> float:
+    with installed(FakeDockerClient(FakeProgram(output=b"hello\n"))):
+        script = _script()
+        execute(script, reporter=Reporter())  # resolves and caches the image ID
+        runs = 50
+        start = time.perf_counter()
+        for _ in range(runs):
+            execute(script, reporter=Reporter())
+        return (time.perf_counter() - start) / runs * 1000
+
+
+# name → (round, unit, whether higher is better)
+BENCHMARKS: dict[str, tuple[Benchmark, str, bool]] = {
+    "detect_language": (bench_detect, "us", False),
+    "build_container_kwargs": (bench_kwargs, "us", False),
+    "stream_large": (bench_stream_large, "MB/s", True),
+    "stream_fragmented": (bench_stream_fragmented, "MB/s", True),
+    "timeout_kill": (bench_timeout_kill, "ms", False),
+    "execute": (bench_execute, "ms", False),
+}
+
+
+def _script() -> Path:
+    path = Path(_HOME) / "bench.py"
+    if not path.exists():
+        path.write_text('print("hello")\n')
+    return path
+
+
+def _shebang_script() -> Path:
+    path = Path(_HOME) / "bench-shebang"
+    if not path.exists():
+        path.write_text("#!/usr/bin/env bash\necho hello\n")
+    return path
+
+
+def _load_baseline() -> dict:
+    try:
+        return json.loads(BASELINE.read_text())["results"]
+    except (OSError, ValueError, KeyError):
+        return {}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--only", action="append", choices=BENCHMARKS, help="run just these")
+    parser.add_argument("--save", action="store_true", help="store results as the baseline")
+    parser.add_argument("--check", action="store_true", help="fail on a regression")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.3, help="allowed slowdown (default: 0.3)"
+    )
+    args = parser.parse_args()
+
+    baseline = _load_baseline()
+    results = {}
+    failures = []
+    print(f"{'benchmark':<24}{'median':>12}  {'unit':<6}{'baseline':>10}{'change':>9}")
+    for name in args.only or BENCHMARKS:
+        bench, unit, higher_is_better = BENCHMARKS[name]
+        value = statistics.median(bench() for _ in range(args.rounds))
+        results[name] = {
+            "value": round(value, 3),
+            "unit": unit,
+            "higher_is_better": higher_is_better,
+        }
+
+        reference = baseline.get(name, {}).get("value")
+        if reference:
+            change = value / reference - 1
+            worse = -change if higher_is_better else change
+            if worse > args.tolerance:
+                failures.append(f"{name} is {worse:.0%} worse than the baseline")
+            compared = f"{reference:>10.2f}{change:>+9.0%}"
+        else:
+            compared = f"{'-':>10}{'':>9}"
+        print(f"{name:<24}{value:>12.2f}  {unit:<6}{compared}")
+
+    if args.save:
+        saved = {**baseline, **results}
+        BASELINE.write_text(
+            json.dumps(
+                {
+                    "python": platform.python_version(),
+                    "machine": f"{platform.system()} {platform.machine()}",
+                    "results": saved,
+                },
+                indent=2,
+            )
+            + "\n"
+        )
+        print(f"baseline saved to {BASELINE}")
+
+    if args.check and failures:
+        for failure in failures:
+            print(f"FAIL: {failure}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,310 @@
+"""Load test: hundreds of concurrent runs through the real docker-py transport.
+
+Starts :mod:`fake_engine` in a subprocess on a Unix socket, points a
+real ``docker.DockerClient`` at it, and drives ``execute()`` (or
+``run_batch``) with ``--jobs`` runs at ``--concurrency``.  Unlike
+``bench_core.py`` this exercises HTTP, connection pooling and SafeBox's
+per-run threads as they behave in production.
+
+It reports:
+- jobs/sec and latency percentiles, taken from the ``execute`` spans
+- API requests per job, and connections the engine accepted
+- connections urllib3 discarded because its pool was full
+- threads, open sockets and RSS sampled every ``--interval`` seconds
+
+With ``--engines N`` the runs are dispatched over N engines (listening
+on TCP with ``--remote``, so scripts are uploaded rather than mounted),
+and ``--kill-engine-after S`` kills the first engine mid-test to show
+failover.  Jobs served per engine are reported.
+
+    python benchmarks/bench_load.py --jobs 500 --concurrency 200 --start-latency 0.05
+    python benchmarks/bench_load.py --engines 3 --remote --kill-engine-after 1
+"""
+
+from __future__ import annotations
+
+import argparse
+import atexit
+import logging
+import os
+import resource
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Keep the image cache and spilled output out of the real ~/.safebox.
+_HOME = tempfile.mkdtemp(prefix="safebox-load-")
+atexit.register(shutil.rmtree, _HOME, ignore_errors=True)
+os.environ["HOME"] = _HOME
+
+import docker  # noqa: E402
+from fake_docker import installed  # noqa: E402
+
+from safebox.config.constants import DEFAULT_CLIENT_POOL_SIZE  # noqa: E402
+
+from safebox.core.batch import BatchJob, run_batch  # noqa: E402
+from safebox.core.dispatch import Dispatcher  # noqa: E402
+from safebox.core.docker_client import _share_socket_pool  # noqa: E402
+from safebox.core.executor import execute  # noqa: E402
+from safebox.core.tracing import Tracer, tracing  # noqa: E402
+from safebox.output.plain import Reporter  # noqa: E402
+
+ENGINE = Path(__file__).with_name("fake_engine.py")
+API_VERSION = "1.44"
+
+
+class _PoolFullCounter(logging.Handler):
+    """Counts urllib3's "Connection pool is full, discarding connection" warnings."""
+
+    def __init__(self) -> None:
+        super().__init__(logging.WARNING)
+        self.count = 0
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if "pool is full" in record.getMessage():
+            self.count += 1
+
+
+class _Monitor(threading.Thread):
+    """Samples threads, sockets and RSS of this process every *interval* seconds."""
+
+    def __init__(self, interval: float, tracer: Tracer) -> None:
+        super().__init__(name="load-monitor", daemon=True)
+        self.interval = interval
+        self.tracer = tracer
+        self.samples: list[tuple[float, int, int, int | None, float]] = []
+        self._done = threading.Event()
+        self._start = time.monotonic()
+
+    def run(self) -> None:
+        while True:
+            self.sample()
+            if self._done.wait(self.interval):
+                return
+
+    def sample(self) -> None:
+        self.samples.append(
+            (
+                time.monotonic() - self._start,
+                sum(s.name == "execute" for s in list(self.tracer.spans)),
+                threading.active_count(),
+                _open_sockets(),
+                _rss_mb(),
+            )
+        )
+
+    def stop(self) -> None:
+        self._done.set()
+        self.join()
+        self.sample()
+
+
+def _open_sockets() -> int | None:
+    try:
+        fds = os.listdir("/proc/self/fd")
+    except OSError:
+        return None
+    count = 0
+    for fd in fds:
+        try:
+            count += os.readlink(f"/proc/self/fd/{fd}").startswith("socket:")
+        except OSError:
+            pass
+    return count
+
+
+def _rss_mb() -> float:
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1e6
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1e3
+
+
+def _start_engine(address: str | int, args: argparse.Namespace) -> subprocess.Popen:
+    """Start a fake engine on Unix socket path or TCP port *address*."""
+    listen = ["--port", str(address)] if isinstance(address, int) else ["--socket", address]
+    engine = subprocess.Popen(
+        [
+            sys.executable,
+            str(ENGINE),
+            *listen,
+            "--start-latency", str(args.start_latency),
+            "--output-bytes", str(args.output_bytes),
+            "--output-rate", str(args.output_rate),
+            "--exit-delay", str(args.exit_delay),
+        ]
+    )  # fmt: skip
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        try:
+            if isinstance(address, int):
+                socket.create_connection(("127.0.0.1", address)).close()
+            else:
+                with socket.socket(socket.AF_UNIX) as probe:
+                    probe.connect(address)
+            return engine
+        except OSError:
+            time.sleep(0.05)
+    engine.kill()
+    raise RuntimeError("fake engine did not start")
+
+
+def _free_port() -> int:
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+def _percentile(values: list[float], q: int) -> float:
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return statistics.quantiles(values, n=100, method="inclusive")[q - 1]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--mode", choices=("execute", "batch"), default="execute")
+    parser.add_argument(
+        "--pool-size", type=int, default=DEFAULT_CLIENT_POOL_SIZE, help="docker-py max_pool_size"
+    )
+    parser.add_argument(
+        "--per-url-pools", action="store_true", help="keep docker-py's own per-URL pools"
+    )
+    parser.add_argument("--stats", action="store_true", help="sample container stats per run")
+    parser.add_argument("--timeout", type=int, default=60)
+    parser.add_argument("--interval", type=float, default=1.0, help="monitor period (s)")
+    parser.add_argument("--engines", type=int, default=1, help="engines to dispatch over")
+    parser.add_argument("--remote", action="store_true", help="engines listen on TCP")
+    parser.add_argument(
+        "--kill-engine-after", type=float, default=None, help="kill engine 0 after S seconds"
+    )
+    engine_args = parser.add_argument_group("fake engine")
+    engine_args.add_argument("--start-latency", type=float, default=0.0)
+    engine_args.add_argument("--output-bytes", type=int, default=800)
+    engine_args.add_argument("--output-rate", type=float, default=0.0, help="bytes/s")
+    engine_args.add_argument("--exit-delay", type=float, default=0.0)
+    args = parser.parse_args()
+
+    urls = []
+    engines = []
+    for index in range(max(1, args.engines)):
+        if args.remote:
+            port = _free_port()
+            engines.append(_start_engine(port, args))
+            urls.append(f"tcp://127.0.0.1:{port}")
+        else:
+            path = os.path.join(_HOME, f"engine-{index}.sock")
+            engines.append(_start_engine(path, args))
+            urls.append(f"unix://{path}")
+        atexit.register(engines[-1].terminate)
+    dispatcher = Dispatcher.from_specs(urls).start() if len(urls) > 1 or args.remote else None
+
+    client = docker.DockerClient(
+        base_url=urls[0], version=API_VERSION, max_pool_size=args.pool_size
+    )
+    if not args.per_url_pools:
+        _share_socket_pool(client)  # what get_client() does
+    pool_full = _PoolFullCounter()
+    logging.getLogger("urllib3.connectionpool").addHandler(pool_full)
+
+    script = Path(_HOME) / "load.py"
+    script.write_text('print("hello")\n')
+
+    tracer = Tracer()
+    errors = 0
+    monitor = _Monitor(args.interval, tracer)
+
+    def one() -> bool:
+        result = execute(
+            script,
+            reporter=Reporter(),
+            timeout=args.timeout,
+            stats=args.stats,
+            dispatcher=dispatcher,
+        )
+        return result.exit_code == 0
+
+    with installed(client), tracing(tracer):
+        for _ in urls:  # warm the image cache of every engine
+            execute(script, reporter=Reporter(), stats=False, dispatcher=dispatcher)
+        tracer.spans.clear()
+        if args.kill_engine_after is not None:
+            threading.Timer(args.kill_engine_after, engines[0].kill).start()
+        monitor.start()
+        start = time.monotonic()
+        if args.mode == "batch":
+            items = run_batch(
+                [BatchJob(script_path=script, timeout=args.timeout)] * args.jobs,
+                concurrency=args.concurrency,
+                layout="quiet",
+                dispatcher=dispatcher,
+            )
+            errors = sum(not item.passed for item in items)
+        else:
+            with ThreadPoolExecutor(max_workers=args.concurrency) as workers:
+                futures = [workers.submit(one) for _ in range(args.jobs)]
+                for future in futures:
+                    try:
+                        errors += not future.result()
+                    except Exception:
+                        errors += 1
+        wall = time.monotonic() - start
+        monitor.stop()
+
+    per_engine = []
+    for url in urls:
+        api = docker.APIClient(base_url=url, version=API_VERSION)
+        try:
+            per_engine.append(api.get(f"{api.base_url}/_fake/stats").json())
+        except Exception:
+            per_engine.append(None)  # killed
+        finally:
+            api.close()
+    engine_stats = {
+        "connections": sum(s["connections"] for s in per_engine if s),
+        "requests": sum((Counter(s["requests"]) for s in per_engine if s), Counter()),
+    }
+    client.close()
+    if dispatcher is not None:
+        dispatcher.close()
+
+    latencies = sorted(s.duration * 1000 for s in tracer.spans if s.name == "execute")
+    requests = sum(engine_stats["requests"].values())
+    print(
+        f"{args.jobs} jobs, concurrency {args.concurrency}, mode {args.mode}, "
+        f"pool size {args.pool_size}{', per-URL pools' if args.per_url_pools else ''}"
+    )
+    print(f"  throughput   {args.jobs / wall:8.1f} jobs/s  ({wall:.2f}s wall, {errors} failed)")
+    percentiles = "  ".join(f"p{q} {_percentile(latencies, q):.1f}" for q in (50, 90, 99))
+    print(f"  latency ms   {percentiles}  max {max(latencies, default=0):.1f}")
+    print(
+        f"  engine       {requests / max(args.jobs, 1):.1f} requests/job, "
+        f"{engine_stats['connections']} connections accepted, "
+        f"{pool_full.count} discarded by a full pool"
+    )
+    print(f"  {'t (s)':>7}{'done':>7}{'threads':>9}{'sockets':>9}{'RSS MB':>9}")
+    for elapsed, done, threads, sockets, rss in monitor.samples:
+        sockets = "-" if sockets is None else sockets
+        print(f"  {elapsed:>7.1f}{done:>7}{threads:>9}{sockets:>9}{rss:>9.1f}")
+    endpoints = sorted(engine_stats["requests"].items())
+    print("  requests: " + ", ".join(f"{name} {count}" for name, count in endpoints))
+    if len(urls) > 1:
+        for url, stats in zip(urls, per_engine):
+            started = stats and stats["requests"].get("containers.start", 0)
+            served = "killed" if stats is None else f"{started} jobs"
+            print(f"  {url}: {served}")
+
+
+if __name__ == "__main__":
+    main()
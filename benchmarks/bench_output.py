@@ -0,0 +1,76 @@
+"""Throughput of the output paths: Rich console vs ``--output jsonl`` / ``raw``.
+
+Feeds the same stream of output chunks through each reporter with the
+destination redirected to ``/dev/null``, so only SafeBox's own
+formatting and write overhead is measured.
+
+    python benchmarks/bench_output.py [--chunks N] [--size BYTES]
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import os
+import time
+
+from rich.console import Console
+
+import safebox.output.reporter as reporter_module
+from safebox.output.events import JsonLinesReporter
+from safebox.output.reporter import ConsoleReporter, RawReporter, Reporter
+
+
+@contextlib.contextmanager
+def _stdout_to_devnull():
+    """Point file descriptors 1 and 2 (and the Rich console) at /dev/null."""
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    saved = os.dup(1), os.dup(2)
+    console = reporter_module.console
+    reporter_module.console = Console(file=open(os.devnull, "w"), force_terminal=True)
+    os.dup2(devnull, 1)
+    os.dup2(devnull, 2)
+    try:
+        yield
+    finally:
+        os.dup2(saved[0], 1)
+        os.dup2(saved[1], 2)
+        os.close(devnull)
+        reporter_module.console = console
+
+
+def _measure(reporter: Reporter, chunks: list[str]) -> float:
+    with _stdout_to_devnull():
+        start = time.perf_counter()
+        for chunk in chunks:
+            reporter.output(chunk)
+        return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--chunks", type=int, default=100_000)
+    parser.add_argument("--size", type=int, default=80, help="bytes per chunk")
+    args = parser.parse_args()
+
+    chunks = [("x" * (args.size - 1)) + "\n"] * args.chunks
+    megabytes = args.chunks * args.size / 1e6
+    rows = [
+        ("rich", ConsoleReporter()),
+        ("jsonl", JsonLinesReporter(1)),
+        ("raw", RawReporter()),
+    ]
+    baseline = None
+    print(f"{args.chunks} chunks × {args.size} B = {megabytes:.1f} MB")
+    print(f"{'path':<8}{'seconds':>10}{'MB/s':>10}{'chunks/s':>12}{'speedup':>10}")
+    for name, reporter in rows:
+        elapsed = _measure(reporter, chunks)
+        baseline = baseline or elapsed
+        print(
+            f"{name:<8}{elapsed:>10.3f}{megabytes / elapsed:>10.1f}"
+            f"{args.chunks / elapsed:>12.0f}{baseline / elapsed:>9.1f}×"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""CLI startup latency: wall time per entry point and the heavy modules it loads.
+
+Runs each command in a fresh interpreter several times and reports the
+median wall time, then re-runs it once under ``-X importtime`` to list
+which of the expensive dependencies (docker, requests, rich, yaml) were
+imported.  ``--check`` exits non-zero if ``--version`` or ``--help``
+pull any of them in — a regression guard for the lazy imports.
+
+    python benchmarks/bench_startup.py [--runs N] [--check]
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+HEAVY = ("docker", "requests", "rich", "yaml")
+
+COMMANDS = [
+    ("import", ["-c", "import safebox.cli.app"]),
+    ("--version", ["-m", "safebox", "--version"]),
+    ("--help", ["-m", "safebox", "--help"]),
+    ("run --help", ["-m", "safebox", "run", "--help"]),
+    ("images --help", ["-m", "safebox", "images", "--help"]),
+]
+
+# Entry points that must stay free of HEAVY imports.  ``--help`` renders
+# through Rich (Typer's rich markup mode), so only Docker and YAML count there.
+MUST_STAY_LIGHT = {
+    "import": HEAVY,
+    "--version": HEAVY,
+    "--help": ("docker", "requests", "yaml"),
+}
+
+
+def _wall_time(args: list[str], runs: int) -> float:
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, *args], capture_output=True, check=True)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def _heavy_imports(args: list[str]) -> list[str]:
+    """Top-level packages from :data:`HEAVY` that *args* imports."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", *args], capture_output=True, text=True, check=True
+    )
+    loaded = set()
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        module = line.rpartition("|")[2].strip()
+        loaded.add(module.split(".")[0])
+    return [name for name in HEAVY if name in loaded]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--check", action="store_true", help="fail if a light path is heavy")
+    args = parser.parse_args()
+
+    # Python itself, as the floor every command pays.
+    floor = _wall_time(["-c", "pass"], args.runs)
+    print(f"interpreter startup: {floor * 1000:.0f} ms (median of {args.runs})")
+    print(f"{'command':<16}{'ms':>8}{'+ms':>8}  heavy imports")
+
+    failures = []
+    for name, command in COMMANDS:
+        elapsed = _wall_time(command, args.runs)
+        heavy = _heavy_imports(command)
+        print(
+            f"{name:<16}{elapsed * 1000:>8.0f}{(elapsed - floor) * 1000:>8.0f}  "
+            f"{', '.join(heavy) or '-'}"
+        )
+        banned = [module for module in heavy if module in MUST_STAY_LIGHT.get(name, ())]
+        if banned:
+            failures.append(f"{name} imports {', '.join(banned)}")
+
+    if args.check and failures:
+        for failure in failures:
+            print(f"FAIL: {failure}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
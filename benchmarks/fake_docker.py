@@ -0,0 +1,265 @@
+"""In-process fake of the docker-py surface that ``execute()`` uses.
+
+Containers run nothing: each replays a :class:`FakeProgram` (output,
+how it is framed and fragmented on the wire, an exit code, or hanging
+until killed) through the same multiplexed ``/containers/{id}/logs``
+byte stream the Engine API returns.  SafeBox's demultiplexing, capture,
+run loop and cleanup all do their real work; only Docker is missing.
+
+    from fake_docker import FakeDockerClient, FakeProgram, installed
+
+    with installed(FakeDockerClient(FakeProgram(output=b"hi\\n"))) as client:
+        execute(Path("hello.py"), reporter=Reporter())
+    print(client.calls)   # API round trips by endpoint
+"""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import itertools
+import json
+import queue
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Iterator
+
+import safebox.core.docker_client as docker_client
+from safebox.config.constants import STDOUT
+
+_ids = itertools.count(1)
+
+
+@dataclass
+class FakeProgram:
+    """What a fake container "prints" and how it exits.
+
+    *output* is cut into multiplexed frames of *frame_size* payload
+    bytes, and the framed stream is delivered in HTTP chunks of
+    *chunk_size* bytes (``None``: one chunk per frame), so a small
+    *chunk_size* splits frame headers across reads.  With *hang* the
+    container keeps running after its output until it is killed.
+    """
+
+    output: bytes = b""
+    stream: int = STDOUT
+    frame_size: int = 64 * 1024
+    chunk_size: int | None = None
+    exit_code: int = 0
+    hang: bool = False
+
+    @cached_property
+    def wire(self) -> list[bytes]:
+        """The HTTP body chunks, built once and shared by every container."""
+        frames = [
+            bytes([self.stream, 0, 0, 0])
+            + len(payload).to_bytes(4, "big")
+            + payload
+            for payload in (
+                self.output[i : i + self.frame_size]
+                for i in range(0, len(self.output), self.frame_size)
+            )
+        ]
+        if self.chunk_size is None:
+            return frames
+        body = b"".join(frames)
+        return [body[i : i + self.chunk_size] for i in range(0, len(body), self.chunk_size)]
+
+
+class FakeContainer:
+    def __init__(self, client: FakeDockerClient, program: FakeProgram, kwargs: dict) -> None:
+        self.client = client
+        self.program = program
+        self.kwargs = kwargs
+        self.id = f"{next(_ids):064x}"
+        self.short_id = self.id[:12]
+        self.exit_code: int | None = None
+        self.finished = threading.Event()
+        self.attrs = {"State": {"Running": True, "ExitCode": 0, "OOMKilled": False}}
+
+    def logs_stream(self) -> Iterator[bytes]:
+        yield from self.program.wire
+        if self.program.hang:
+            self.finished.wait()
+        else:
+            self._exit(self.program.exit_code)
+
+    def kill(self, signal: str | None = None) -> None:
+        self.client.calls["containers.kill"] += 1
+        self._exit(143 if signal == "SIGTERM" else 137)
+
+    def reload(self) -> None:
+        self.client.calls["containers.inspect"] += 1
+        self.attrs = {
+            "State": {
+                "Running": not self.finished.is_set(),
+                "ExitCode": self.exit_code or 0,
+                "OOMKilled": False,
+            }
+        }
+
+    def wait(self, timeout: float | None = None) -> dict:
+        self.client.calls["containers.wait"] += 1
+        if not self.finished.wait(timeout):
+            raise TimeoutError("container still running")
+        return {"StatusCode": self.exit_code}
+
+    def remove(self, force: bool = False) -> None:
+        self.client.calls["containers.remove"] += 1
+        self._exit(137)
+
+    def _exit(self, code: int) -> None:
+        if not self.finished.is_set():
+            self.exit_code = code
+            self.finished.set()
+            self.client.emit("die", self, exitCode=str(code))
+
+
+class FakeContainers:
+    def __init__(self, client: FakeDockerClient) -> None:
+        self._client = client
+
+    def run(self, **kwargs) -> FakeContainer:
+        self._client.calls["containers.run"] += 1
+        return self._client.new_container(kwargs)
+
+    def prepare_model(self, attrs: dict) -> FakeContainer:
+        return self._client.containers_by_id[attrs["Id"]]
+
+
+class FakeImage:
+    def __init__(self, tag: str) -> None:
+        self.id = "sha256:" + hashlib.sha256(tag.encode()).hexdigest()
+        self.tags = [tag]
+        self.attrs = {"RepoDigests": [], "Size": 0}
+
+
+class FakeImages:
+    def __init__(self, client: FakeDockerClient) -> None:
+        self._client = client
+
+    def get(self, tag: str) -> FakeImage:
+        self._client.calls["images.get"] += 1
+        return FakeImage(tag)
+
+    def pull(self, tag: str) -> FakeImage:
+        self._client.calls["images.pull"] += 1
+        return FakeImage(tag)
+
+
+class _Raw:
+    closed = True  # makes CancellableStream.close() a no-op; kill() ends the stream
+
+
+class FakeResponse:
+    def __init__(self, body: Iterator[bytes]) -> None:
+        self._body = body
+        self.raw = _Raw()
+
+    def raise_for_status(self) -> None:
+        pass
+
+    def iter_content(self, chunk_size: int | None = None) -> Iterator[bytes]:
+        return self._body
+
+    def iter_lines(self) -> Iterator[bytes]:
+        return self._body
+
+    def close(self) -> None:
+        pass
+
+
+class FakeAPI:
+    """The low-level ``client.api`` calls SafeBox makes directly."""
+
+    base_url = "http+docker://localhost"
+    api_version = "1.44"
+
+    def __init__(self, client: FakeDockerClient) -> None:
+        self._client = client
+
+    def create_container_from_config(self, config: dict) -> dict:
+        self._client.calls["containers.create"] += 1
+        return {"Id": self._client.new_container(config).id, "Warnings": []}
+
+    def start(self, container_id: str) -> None:
+        self._client.calls["containers.start"] += 1
+
+    def remove_container(self, container_id: str, force: bool = False) -> None:
+        self._client.containers_by_id[container_id].remove(force=force)
+
+    def get(self, url: str, params=None, stream: bool = False, timeout=None) -> FakeResponse:
+        if url.endswith("/events"):
+            self._client.calls["events"] += 1
+            return FakeResponse(self._events())
+        container_id, endpoint = url.rsplit("/", 2)[-2:]
+        container = self._client.containers_by_id[container_id]
+        self._client.calls[f"containers.{endpoint}"] += 1
+        if endpoint == "logs":
+            return FakeResponse(container.logs_stream())
+        return FakeResponse(self._stats(container))
+
+    def _events(self) -> Iterator[bytes]:
+        while True:
+            yield json.dumps(self._client.events.get()).encode()
+
+    @staticmethod
+    def _stats(container: FakeContainer) -> Iterator[bytes]:
+        sample = {
+            "memory_stats": {"usage": 8 << 20, "limit": 256 << 20, "stats": {}},
+            "cpu_stats": {"cpu_usage": {"total_usage": 1_000_000}},
+            "pids_stats": {"current": 1},
+        }
+        yield json.dumps(sample).encode()
+        container.finished.wait()
+
+
+class FakeDockerClient:
+    """Stands in for :class:`docker.DockerClient`; new containers run *program*.
+
+    :attr:`calls` counts the API round trips made, by endpoint.
+    """
+
+    def __init__(self, program: FakeProgram | None = None) -> None:
+        self.program = program or FakeProgram()
+        self.calls: Counter[str] = Counter()
+        self.containers_by_id: dict[str, FakeContainer] = {}
+        self.events: queue.SimpleQueue[dict] = queue.SimpleQueue()
+        self.containers = FakeContainers(self)
+        self.images = FakeImages(self)
+        self.api = FakeAPI(self)
+
+    def ping(self) -> bool:
+        self.calls["ping"] += 1
+        return True
+
+    def emit(self, action: str, container: FakeContainer, **attributes: str) -> None:
+        """Publish a container event on the ``/events`` stream."""
+        self.events.put(
+            {
+                "Type": "container",
+                "Action": action,
+                "Actor": {"ID": container.id, "Attributes": attributes},
+                "time": int(time.time()),
+                "timeNano": time.time_ns(),
+            }
+        )
+
+    def new_container(self, config: dict) -> FakeContainer:
+        container = FakeContainer(self, self.program, config)
+        self.containers_by_id[container.id] = container
+        return container
+
+
+@contextlib.contextmanager
+def installed(client: FakeDockerClient) -> Iterator[FakeDockerClient]:
+    """Make :func:`safebox.core.docker_client.get_client` return *client*."""
+    previous = docker_client._client
+    docker_client._client = client
+    try:
+        yield client
+    finally:
+        docker_client._client = previous
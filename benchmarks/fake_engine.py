@@ -0,0 +1,476 @@
+"""A stand-in Docker Engine API served over a Unix socket or TCP, for load tests.
+
+Speaks enough of the Engine HTTP API for docker-py and SafeBox's own
+stream readers: ping, version, events, image list/inspect/pull, container
+create / archive upload / start / inspect / logs / stats / wait / kill /
+remove.  With *images* given, only those (and images pulled since) are
+present; otherwise every image is.
+
+Containers run nothing.  Each one waits *start_latency* in ``start``,
+then writes *output_bytes* of 80-byte lines to its multiplexed log
+stream at *output_rate* bytes per second (``0``: all at once), and exits
+*exit_delay* seconds after that.  ``kill`` ends it early with status 137
+(143 for ``SIGTERM``).  The ``die`` event is published once the exit is
+observed: by the end of its log stream, ``wait``, ``kill`` or ``remove``.
+
+``GET /_fake/stats`` returns the connections accepted and requests
+served by endpoint, so a harness can count API round trips.
+
+    python benchmarks/fake_engine.py --socket /tmp/engine.sock --start-latency 0.05
+    python benchmarks/fake_engine.py --port 2375 --image python:3.12-slim
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import io
+import itertools
+import json
+import os
+import queue
+import re
+import socket
+import socketserver
+import sys
+import tarfile
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler
+from urllib.parse import parse_qs, unquote, urlsplit
+
+LINE = b"x" * 79 + b"\n"
+FLUSH_BYTES = 64 * 1024
+
+_VERSION_PREFIX = re.compile(r"^/v[0-9.]+")
+_ids = itertools.count(1)
+_ID_PREFIX = f"{os.getpid():08x}"  # several engines must not hand out the same IDs
+
+
+@dataclass
+class EngineProfile:
+    """How fake containers behave; times in seconds, rate in bytes per second."""
+
+    start_latency: float = 0.0
+    output_bytes: int = 800
+    output_rate: float = 0.0
+    exit_delay: float = 0.0
+
+
+@dataclass
+class FakeContainer:
+    id: str
+    image: str
+    profile: EngineProfile
+    labels: dict[str, str] = field(default_factory=dict)
+    files: list[str] = field(default_factory=list)
+    started_at: float | None = None
+    killed: threading.Event = field(default_factory=threading.Event)
+    killed_at: float | None = None
+    kill_status: int = 137
+    died: bool = False
+
+    @property
+    def output_time(self) -> float:
+        rate = self.profile.output_rate
+        return self.profile.output_bytes / rate if rate else 0.0
+
+    @property
+    def exit_at(self) -> float:
+        if self.started_at is None:
+            return float("inf")
+        natural = self.started_at + self.output_time + self.profile.exit_delay
+        return min(natural, self.killed_at) if self.killed_at is not None else natural
+
+    @property
+    def running(self) -> bool:
+        return self.started_at is not None and time.monotonic() < self.exit_at
+
+    @property
+    def exit_code(self) -> int:
+        return self.kill_status if self.killed_at is not None else 0
+
+    def kill(self, status: int = 137) -> None:
+        if self.killed_at is None and self.running:
+            self.killed_at = time.monotonic()
+            self.kill_status = status
+        self.killed.set()
+
+    def wait_exit(self, timeout: float | None = None) -> bool:
+        """Block until the container has exited; ``False`` on *timeout*."""
+        if not self.running:
+            return True
+        remaining = self.exit_at - time.monotonic()
+        if timeout is not None:
+            remaining = min(remaining, timeout)
+        if remaining > 0:
+            self.killed.wait(remaining)
+        return not self.running
+
+    def inspect(self) -> dict:
+        running = self.running
+        return {
+            "Id": self.id,
+            "Image": self.image,
+            "State": {
+                "Status": "running" if running else "exited",
+                "Running": running,
+                "ExitCode": 0 if running else self.exit_code,
+                "OOMKilled": False,
+            },
+            "Config": {"Tty": False, "Labels": self.labels},
+            "HostConfig": {"LogConfig": {"Type": "json-file"}},
+        }
+
+
+class FakeEngine(socketserver.ThreadingTCPServer):
+    """The fake daemon; one thread per connection, like ``dockerd``'s own handling.
+
+    *address* is a Unix socket path or a ``(host, port)`` pair.
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+    request_queue_size = 1024
+
+    def __init__(
+        self,
+        address: str | tuple[str, int],
+        profile: EngineProfile | None = None,
+        images: list[str] | None = None,
+    ) -> None:
+        if isinstance(address, str):
+            self.address_family = socket.AF_UNIX
+            if os.path.exists(address):
+                os.unlink(address)
+        super().__init__(address, _Handler)
+        self.profile = profile or EngineProfile()
+        self.images = None if images is None else set(images)
+        self.containers: dict[str, FakeContainer] = {}
+        self.requests: Counter[str] = Counter()
+        self.connections = 0
+        self.lock = threading.Lock()
+        self.subscribers: list[queue.SimpleQueue] = []
+
+    def handle_error(self, request, client_address) -> None:
+        if not isinstance(sys.exc_info()[1], OSError):  # a client hung up mid-request
+            super().handle_error(request, client_address)
+
+    def died(self, container: FakeContainer) -> None:
+        """Publish *container*'s ``die`` event, once, after it has exited."""
+        with self.lock:
+            if container.died or container.running or container.started_at is None:
+                return
+            container.died = True
+            subscribers = list(self.subscribers)
+        now = time.time()
+        event = {
+            "Type": "container",
+            "Action": "die",
+            "Actor": {
+                "ID": container.id,
+                "Attributes": {**container.labels, "exitCode": str(container.exit_code)},
+            },
+            "time": int(now),
+            "timeNano": int(now * 1e9),
+        }
+        for subscriber in subscribers:
+            subscriber.put(event)
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {
+                "connections": self.connections,
+                "requests": dict(self.requests),
+                "containers": len(self.containers),
+            }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: FakeEngine
+
+    def setup(self) -> None:
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+    def address_string(self) -> str:
+        return "fake"
+
+    # ── Dispatch ─────────────────────────────────────────────
+
+    def do_GET(self) -> None:
+        self._serve("GET")
+
+    def do_POST(self) -> None:
+        self._serve("POST")
+
+    def do_PUT(self) -> None:
+        self._serve("PUT")
+
+    def do_DELETE(self) -> None:
+        self._serve("DELETE")
+
+    def _serve(self, method: str) -> None:
+        try:
+            self._dispatch(method)
+        except OSError:
+            self.close_connection = True  # the client hung up, e.g. a cancelled stream
+
+    def _dispatch(self, method: str) -> None:
+        url = urlsplit(self.path)
+        path = _VERSION_PREFIX.sub("", unquote(url.path))
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        body = json.loads(raw) if raw and method == "POST" else None
+
+        if path == "/_fake/stats":
+            return self._json(200, self.server.stats())
+        if path == "/_ping":
+            self._count("ping")
+            return self._text(200, "OK")
+        if path == "/version":
+            self._count("version")
+            return self._json(200, {"ApiVersion": "1.44", "Version": "fake"})
+        if path == "/images/json":
+            self._count("images.list")
+            images = sorted(self.server.images or [])
+            return self._json(200, [{"Id": _image_id(name), "RepoTags": [name]} for name in images])
+        if path.startswith("/images/"):
+            return self._image(method, path, query)
+        if path == "/events":
+            self._count("events")
+            return self._events(query)
+        if path == "/containers/create" and method == "POST":
+            return self._create(body or {})
+
+        match = re.fullmatch(r"/containers/([0-9a-f]+)(?:/(\w+))?", path)
+        container = self.server.containers.get(match.group(1)) if match else None
+        if container is None:
+            return self._json(404, {"message": f"No such container: {path}"})
+        action = match.group(2) or ("remove" if method == "DELETE" else "")
+        self._count("containers." + ("inspect" if action == "json" else action))
+        handler = getattr(self, f"_container_{action}", None)
+        if handler is None:
+            return self._json(404, {"message": f"page not found: {method} {path}"})
+        if action == "archive":
+            return self._container_archive(container, query, raw)
+        handler(container, query)
+
+    # ── Endpoints ────────────────────────────────────────────
+
+    def _image(self, method: str, path: str, query: dict) -> None:
+        images = self.server.images
+        if path == "/images/create":
+            self._count("images.pull")
+            if images is not None:
+                name = query.get("fromImage", "")
+                tag = query.get("tag")
+                with self.server.lock:
+                    images.add(f"{name}:{tag}" if tag and ":" not in name else name)
+            return self._json(200, {"status": "Downloaded newer image"})
+        name = path.removeprefix("/images/").removesuffix("/json")
+        self._count("images.inspect")
+        if images is not None and name not in images and name not in _image_ids(images):
+            return self._json(404, {"message": f"No such image: {name}"})
+        tag = name if images is None or name in images else _image_ids(images)[name]
+        self._json(
+            200, {"Id": _image_id(tag), "RepoTags": [tag], "RepoDigests": [], "Size": 0}
+        )
+
+    def _create(self, body: dict) -> None:
+        self._count("containers.create")
+        images = self.server.images
+        image = body.get("Image", "")
+        if images is not None and image not in images and image not in _image_ids(images):
+            return self._json(404, {"message": f"No such image: {image}"})
+        container = FakeContainer(
+            f"{_ID_PREFIX}{next(_ids):056x}",
+            body.get("Image", ""),
+            self.server.profile,
+            labels=body.get("Labels") or {},
+        )
+        with self.server.lock:
+            self.server.containers[container.id] = container
+        self._json(201, {"Id": container.id, "Warnings": []})
+
+    def _container_archive(self, container: FakeContainer, query: dict, data: bytes) -> None:
+        with tarfile.open(fileobj=io.BytesIO(data)) as tar:
+            root = query.get("path", "/").rstrip("/")
+            container.files.extend(f"{root}/{name}" for name in tar.getnames())
+        self._empty(200)
+
+    def _container_start(self, container: FakeContainer, query: dict) -> None:
+        time.sleep(container.profile.start_latency)
+        container.started_at = time.monotonic()
+        self._empty(204)
+
+    def _container_json(self, container: FakeContainer, query: dict) -> None:
+        self._json(200, container.inspect())
+
+    def _container_kill(self, container: FakeContainer, query: dict) -> None:
+        container.kill(143 if query.get("signal") == "SIGTERM" else 137)
+        self.server.died(container)
+        self._empty(204)
+
+    def _container_wait(self, container: FakeContainer, query: dict) -> None:
+        container.wait_exit()
+        self.server.died(container)
+        self._json(200, {"StatusCode": container.exit_code, "Error": None})
+
+    def _container_remove(self, container: FakeContainer, query: dict) -> None:
+        container.kill()
+        self.server.died(container)
+        with self.server.lock:
+            self.server.containers.pop(container.id, None)
+        self._empty(204)
+
+    def _container_logs(self, container: FakeContainer, query: dict) -> None:
+        self._start_stream("application/vnd.docker.multiplexed-stream")
+        profile = container.profile
+        frame = b"\x01\x00\x00\x00" + len(LINE).to_bytes(4, "big") + LINE
+        lines = profile.output_bytes // len(LINE)
+        per_flush = max(1, FLUSH_BYTES // len(frame))
+        if profile.output_rate:
+            per_flush = max(1, min(per_flush, int(profile.output_rate / len(LINE) / 100)))
+        sent = 0
+        while sent < lines and not container.killed.is_set():
+            count = min(per_flush, lines - sent)
+            if profile.output_rate:
+                due = container.started_at + (sent + count) * len(LINE) / profile.output_rate
+                if container.killed.wait(max(due - time.monotonic(), 0)):
+                    break
+            self._chunk(frame * count)
+            sent += count
+        container.wait_exit()
+        self.server.died(container)
+        self._chunk(b"")
+
+    def _container_stats(self, container: FakeContainer, query: dict) -> None:
+        self._start_stream("application/json")
+        while True:
+            sample = {
+                "read": time.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "memory_stats": {"usage": 8 << 20, "limit": 256 << 20, "stats": {}},
+                "cpu_stats": {"cpu_usage": {"total_usage": 1_000_000}},
+                "pids_stats": {"current": 1},
+            }
+            self._chunk(json.dumps(sample).encode() + b"\n")
+            if container.wait_exit(timeout=1.0):
+                break
+        self._chunk(b"")
+
+    def _events(self, query: dict) -> None:
+        filters = json.loads(query.get("filters") or "{}")
+        subscriber: queue.SimpleQueue = queue.SimpleQueue()
+        with self.server.lock:
+            self.server.subscribers.append(subscriber)
+        try:
+            self._start_stream("application/json")
+            while True:
+                try:
+                    event = subscriber.get(timeout=1.0)
+                except queue.Empty:
+                    self._chunk(b"\n")  # notices a client that has hung up
+                    continue
+                if _matches(event, filters):
+                    self._chunk(json.dumps(event).encode() + b"\n")
+        finally:
+            with self.server.lock:
+                self.server.subscribers.remove(subscriber)
+
+    # ── Responses ────────────────────────────────────────────
+
+    def _count(self, endpoint: str) -> None:
+        with self.server.lock:
+            self.server.requests[endpoint] += 1
+
+    def _json(self, status: int, payload: object) -> None:
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _text(self, status: int, text: str) -> None:
+        data = text.encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "text/plain")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _empty(self, status: int) -> None:
+        self.send_response(status)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def _start_stream(self, content_type: str) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+    def _chunk(self, data: bytes) -> None:
+        """Write one chunk; an empty *data* ends the chunked body."""
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+        self.wfile.flush()
+
+
+def _image_id(name: str) -> str:
+    return "sha256:" + hashlib.sha256(name.encode()).hexdigest()
+
+
+def _image_ids(images: set[str]) -> dict[str, str]:
+    """Image ID → tag, so images can be looked up by either."""
+    return {_image_id(name): name for name in images}
+
+
+def _matches(event: dict, filters: dict[str, list[str]]) -> bool:
+    attributes = event["Actor"]["Attributes"]
+    labels = [f"{key}={value}" for key, value in attributes.items()]
+    return (
+        event["Type"] in filters.get("type", [event["Type"]])
+        and event["Action"] in filters.get("event", [event["Action"]])
+        and all(label in labels or label in attributes for label in filters.get("label", []))
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    listen = parser.add_mutually_exclusive_group(required=True)
+    listen.add_argument("--socket", help="Unix socket path to listen on")
+    listen.add_argument("--port", type=int, help="TCP port to listen on, on 127.0.0.1")
+    parser.add_argument(
+        "--image", action="append", help="an image present at start (repeatable; default: all)"
+    )
+    parser.add_argument("--start-latency", type=float, default=0.0, help="seconds per start")
+    parser.add_argument("--output-bytes", type=int, default=800, help="log bytes per container")
+    parser.add_argument("--output-rate", type=float, default=0.0, help="bytes/s (0: unlimited)")
+    parser.add_argument("--exit-delay", type=float, default=0.0, help="seconds after output")
+    args = parser.parse_args()
+
+    profile = EngineProfile(
+        args.start_latency, args.output_bytes, args.output_rate, args.exit_delay
+    )
+    engine = FakeEngine(args.socket or ("127.0.0.1", args.port), profile, args.image)
+    try:
+        engine.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        engine.server_close()
+        if args.socket:
+            os.unlink(args.socket)
+
+
+if __name__ == "__main__":
+    main()
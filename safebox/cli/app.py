@@ -40,9 +40,17 @@ def main(
     setup_logging(verbose=verbose)
 
 
+from safebox.cli.cache import cache_app
+from safebox.cli.daemon import daemon_app
+from safebox.cli.images import images_app
 from safebox.cli.run import run
+from safebox.cli.run_many import run_many
 
 app.command()(run)
+app.command(name="run-many")(run_many)
+app.add_typer(daemon_app, name="daemon")
+app.add_typer(images_app, name="images")
+app.add_typer(cache_app, name="cache")
 
 
 if __name__ == "__main__":
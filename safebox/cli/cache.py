@@ -0,0 +1,78 @@
+"""``safebox cache`` commands — inspect and invalidate the result cache."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import List, Optional
+
+import typer
+
+cache_app = typer.Typer(
+    help="Inspect and clear cached run results and compile caches.", no_args_is_help=True
+)
+
+
+@cache_app.command()
+def stats() -> None:
+    """Show hit/miss counts and how full the result cache is."""
+    from safebox.core.result_cache import get_result_cache
+    from safebox.output.console import console
+
+    cache = get_result_cache()
+    info = cache.stats()
+    console.print(f"[bold]🗄  Result cache[/] [dim]{cache.directory}[/]")
+    console.print(
+        f"  entries  [white]{info.entries}[/]  "
+        f"size [white]{_format_size(info.size_bytes)}[/] / {_format_size(info.max_bytes)}"
+    )
+    console.print(
+        f"  hits     [green]{info.hits}[/]  misses [yellow]{info.misses}[/]  "
+        f"hit rate [white]{info.hit_rate:.0%}[/]"
+    )
+
+
+@cache_app.command()
+def clear(
+    scripts: Optional[List[str]] = typer.Argument(
+        None, help="Scripts whose cached results to drop (default: all)."
+    ),
+    reset_stats: bool = typer.Option(
+        False, "--reset-stats", help="Also zero the hit/miss counters."
+    ),
+    compile: bool = typer.Option(
+        False,
+        "--compile",
+        help="Also remove the compile cache volumes (Go binaries, bytecode caches).",
+    ),
+) -> None:
+    """Drop cached results, e.g. after changing a file the script reads."""
+    from safebox.core.result_cache import get_result_cache
+    from safebox.output.display import print_error, print_info
+
+    if compile:
+        from safebox.core.compile_cache import remove_compile_caches
+        from safebox.core.docker_client import DockerNotAvailableError, get_client
+
+        try:
+            volumes = remove_compile_caches(get_client())
+        except DockerNotAvailableError as exc:
+            print_error(str(exc))
+            raise typer.Exit(code=1) from exc
+        print_info(f"Removed {volumes} compile cache volume(s).")
+
+    cache = get_result_cache()
+    if scripts:
+        removed = sum(cache.invalidate(script=Path(script)) for script in scripts)
+    else:
+        removed = cache.invalidate()
+    if reset_stats:
+        cache.reset_stats()
+    print_info(f"Removed {removed} cached result(s).")
+
+
+def _format_size(size: int) -> str:
+    for unit in ("B", "KiB", "MiB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GiB"
@@ -0,0 +1,81 @@
+"""``safebox daemon`` commands — inspect and stop a running ``safeboxd``."""
+
+from __future__ import annotations
+
+import typer
+
+from safebox.daemon.client import DaemonUnavailableError, request, socket_path
+
+daemon_app = typer.Typer(help="Inspect or stop the safeboxd daemon.", no_args_is_help=True)
+
+
+@daemon_app.command()
+def status() -> None:
+    """Show whether safeboxd is running, its active jobs, admission queue and warm pool."""
+    from rich.markup import escape
+
+    from safebox.output.console import console
+    from safebox.output.display import print_info
+
+    try:
+        reply = request({"op": "status"})
+    except DaemonUnavailableError:
+        print_info(f"safeboxd is not running ([dim]{socket_path()}[/]).")
+        raise typer.Exit(code=1)
+
+    console.print(
+        f"[bold green]safeboxd {reply['version']}[/] (pid {reply['pid']}) — "
+        f"{reply['active_jobs']} active job(s)"
+    )
+    scheduler = reply.get("scheduler")
+    if scheduler:
+        budget, committed, wait = scheduler["budget"], scheduler["committed"], scheduler["wait"]
+        console.print(
+            f"  [cyan]admission[/]  running {scheduler['running']}  "
+            f"queued {scheduler['queued']} (max {scheduler['max_queued']})  "
+            f"wait p50 {wait['p50']:.2f}s p95 {wait['p95']:.2f}s"
+        )
+        console.print(
+            f"  [cyan]committed[/]  memory {committed['memory'] / 2**30:.1f}"
+            f"/{budget['memory'] / 2**30:.1f} GiB  "
+            f"cpus {committed['nano_cpus'] / 1e9:g}/{budget['nano_cpus'] / 1e9:g}  "
+            f"pids {committed['pids']}/{budget['pids']}"
+        )
+    placement = reply.get("placement")
+    if placement:
+        nodes = "  ".join(
+            f"node {node} {counts['free']}/{counts['cpus']} free"
+            for node, counts in placement["nodes"].items()
+        )
+        console.print(
+            f"  [cyan]cpus[/]  {nodes}  pinned {placement['pinned']}  "
+            f"unpinned {placement['unpinned']}"
+        )
+    for endpoint in reply.get("endpoints") or []:
+        if endpoint["healthy"]:
+            state = "[green]up[/]"
+        else:
+            state = f"[red]down[/] {escape(endpoint['error'])}"
+        console.print(
+            f"  [cyan]{endpoint['url']}[/]  weight {endpoint['weight']:g}  "
+            f"active {endpoint['active']}  runs {endpoint['runs']}  "
+            f"failures {endpoint['failures']}  {state}"
+        )
+    for image, counts in reply["pool"].items():
+        console.print(
+            f"  [magenta]{image}[/]  idle {counts['idle']}  busy {counts['busy']}  "
+            f"total {counts['total']}"
+        )
+
+
+@daemon_app.command()
+def stop() -> None:
+    """Ask safeboxd to shut down."""
+    from safebox.output.display import print_error, print_info
+
+    try:
+        request({"op": "shutdown"})
+    except DaemonUnavailableError as exc:
+        print_error(f"safeboxd is not running: {exc}")
+        raise typer.Exit(code=1) from exc
+    print_info("safeboxd is shutting down.")
@@ -0,0 +1,222 @@
+"""``safebox images`` commands — inspect and refresh the image cache."""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import TYPE_CHECKING, List, Optional
+
+import typer
+
+from safebox.config.constants import (
+    DEFAULT_DEPS_IMAGE_LIMIT,
+    DEFAULT_PREFETCH_CONCURRENCY,
+    LANGUAGE_IMAGE_MAP,
+)
+
+if TYPE_CHECKING:
+    from rich.progress import Progress, TaskID
+
+images_app = typer.Typer(help="Inspect and refresh cached image resolutions.", no_args_is_help=True)
+
+
+@images_app.command("list")
+def list_images() -> None:
+    """Show every cached tag → image ID resolution and its age."""
+    from rich.table import Table
+
+    from safebox.core.images import get_image_cache
+    from safebox.output.console import console
+    from safebox.output.display import print_info
+
+    cache = get_image_cache()
+    records = cache.records()
+    if not records:
+        print_info(f"No cached images ([dim]{cache.path}[/]).")
+        return
+
+    now = time.time()
+    table = Table(title="[bold]🐳 Image cache", title_justify="left", expand=False)
+    table.add_column("Tag", style="magenta")
+    table.add_column("Image ID", style="white")
+    table.add_column("Digest", style="dim")
+    table.add_column("Age", justify="right")
+    for record in records:
+        age = record.age(now)
+        style = "dim red" if age > cache.ttl else "green"
+        table.add_row(
+            record.tag,
+            record.image_id.removeprefix("sha256:")[:12],
+            record.digest.partition("@")[2][:19] or "-",
+            f"[{style}]{_format_age(age)}[/]",
+        )
+    console.print(table)
+
+
+@images_app.command()
+def refresh(
+    images: Optional[List[str]] = typer.Argument(
+        None, help="Image tags to re-resolve (default: every cached tag)."
+    ),
+    pull: bool = typer.Option(False, "--pull", help="Pull each tag before resolving it."),
+) -> None:
+    """Re-resolve cached tags now, e.g. after ``docker pull`` or a rebuild."""
+    from safebox.core.docker_client import DockerNotAvailableError, ImagePullError
+    from safebox.core.images import get_image_cache, resolve_image
+    from safebox.output.console import console
+    from safebox.output.display import print_error, print_info
+
+    targets = images or [record.tag for record in get_image_cache().records()]
+    if not targets:
+        print_info("Nothing to refresh.")
+        return
+
+    failed = False
+    for image in targets:
+        try:
+            image_id = resolve_image(image, refresh=True, pull=pull)
+        except (DockerNotAvailableError, ImagePullError) as exc:
+            print_error(str(exc))
+            failed = True
+            continue
+        console.print(f"  [magenta]{image}[/] → [white]{image_id.removeprefix('sha256:')[:12]}[/]")
+    if failed:
+        raise typer.Exit(code=1)
+
+
+@images_app.command()
+def clear(
+    images: Optional[List[str]] = typer.Argument(
+        None, help="Image tags to forget (default: all)."
+    ),
+) -> None:
+    """Drop cached resolutions; the next run looks the image up again."""
+    from safebox.core.images import get_image_cache
+    from safebox.output.display import print_info
+
+    cache = get_image_cache()
+    if images:
+        for image in images:
+            cache.invalidate(image)
+    else:
+        cache.invalidate()
+    print_info("Image cache cleared.")
+
+
+@images_app.command()
+def prefetch(
+    targets: Optional[List[str]] = typer.Argument(
+        None,
+        help="Languages or image tags to fetch (default: every configured image).",
+    ),
+    concurrency: int = typer.Option(
+        DEFAULT_PREFETCH_CONCURRENCY, "--concurrency", "-j", min=1, help="Parallel pulls."
+    ),
+    force: bool = typer.Option(False, "--force", help="Pull even if the image is present."),
+    check: bool = typer.Option(
+        True,
+        "--check/--no-check",
+        help="Ask the registry whether present images are still current.",
+    ),
+) -> None:
+    """Pull runtime images in parallel ahead of time, e.g. on fresh CI nodes."""
+    from rich.progress import BarColumn, DownloadColumn, Progress, TextColumn, TimeElapsedColumn
+
+    from safebox.core.docker_client import DockerNotAvailableError
+    from safebox.core.images import default_images, prefetch_images
+    from safebox.output.console import console
+    from safebox.output.display import print_error, print_prefetch_summary
+
+    images = [LANGUAGE_IMAGE_MAP.get(t, t) for t in targets] if targets else default_images()
+
+    start = time.monotonic()
+    with Progress(
+        TextColumn("[magenta]{task.fields[image]}[/]"),
+        BarColumn(),
+        DownloadColumn(),
+        TextColumn("[dim]{task.fields[layers]}[/]"),
+        TimeElapsedColumn(),
+        console=console,
+        transient=True,
+    ) as progress:
+        tracker = _LayerTracker(progress)
+        try:
+            results = prefetch_images(
+                images,
+                concurrency=concurrency,
+                force=force,
+                check_registry=check,
+                on_layer=tracker.update,
+            )
+        except DockerNotAvailableError as exc:
+            print_error(str(exc))
+            raise typer.Exit(code=1) from exc
+
+    print_prefetch_summary(results, time.monotonic() - start)
+    if any(r.status == "failed" for r in results):
+        raise typer.Exit(code=1)
+
+
+@images_app.command("prune-deps")
+def prune_deps(
+    keep: int = typer.Option(
+        DEFAULT_DEPS_IMAGE_LIMIT, "--keep", min=0, help="Most recently used images to keep."
+    ),
+) -> None:
+    """Remove least recently used dependency images (``safebox-deps/*``)."""
+    from safebox.core.deps import prune_dependency_images
+    from safebox.core.docker_client import DockerNotAvailableError
+    from safebox.output.console import console
+    from safebox.output.display import print_error, print_info
+
+    try:
+        removed = prune_dependency_images(keep)
+    except DockerNotAvailableError as exc:
+        print_error(str(exc))
+        raise typer.Exit(code=1) from exc
+    for tag in removed:
+        console.print(f"  [dim]removed[/] [magenta]{tag}[/]")
+    print_info(f"Removed {len(removed)} dependency image(s).")
+
+
+class _LayerTracker:
+    """Fold per-layer pull events into one progress bar per image."""
+
+    _DONE = ("Pull complete", "Already exists")
+
+    def __init__(self, progress: Progress) -> None:
+        self.progress = progress
+        self._lock = threading.Lock()
+        self._tasks: dict[str, TaskID] = {}
+        self._layers: dict[str, dict[str, list[int]]] = {}
+
+    def update(self, image: str, layer: str, status: str, current: int, total: int) -> None:
+        with self._lock:
+            if image not in self._tasks:
+                self._tasks[image] = self.progress.add_task("", total=None, image=image, layers="")
+                self._layers[image] = {}
+            layers = self._layers[image]
+            entry = layers.setdefault(layer, [0, 0, 0])  # current, total, done
+            if status == "Downloading" and total:
+                entry[0], entry[1] = current, total
+            elif status in self._DONE:
+                entry[0] = entry[1]
+                entry[2] = 1
+
+            done = sum(e[2] for e in layers.values())
+            self.progress.update(
+                self._tasks[image],
+                completed=sum(e[0] for e in layers.values()),
+                total=sum(e[1] for e in layers.values()) or None,
+                layers=f"{done}/{len(layers)} layers",
+            )
+
+
+def _format_age(seconds: float) -> str:
+    if seconds < 60:
+        return f"{seconds:.0f}s"
+    if seconds < 3600:
+        return f"{seconds / 60:.0f}m"
+    if seconds < 86400:
+        return f"{seconds / 3600:.1f}h"
+    return f"{seconds / 86400:.1f}d"
@@ -1,16 +1,37 @@
-"""``safebox run`` command — execute a script inside a sandboxed container."""
+"""``safebox run`` command — execute a script inside a sandboxed container.
+
+Only light modules are imported at the top: the executor (and with it
+the Docker SDK) and the Rich display layer are imported when a run
+actually needs them, so ``--help`` and daemon-served runs start fast.
+"""
 
 from __future__ import annotations
 
-from typing import Optional
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional
 
 import typer
 
-from safebox.config.constants import DEFAULT_CPUS, DEFAULT_MEMORY, DEFAULT_PIDS_LIMIT, DEFAULT_TIMEOUT
-from safebox.core.executor import ExecutionError, execute
-from safebox.output.display import print_error
+from safebox.config.constants import (
+    DEFAULT_CPUS,
+    DEFAULT_KILL_GRACE,
+    DEFAULT_MEMORY,
+    DEFAULT_PIDS_LIMIT,
+    DEFAULT_TIMEOUT,
+    OUTPUT_FORMATS,
+)
 from safebox.utils.files import resolve_script
-from safebox.utils.validators import validate_cpus, validate_memory, validate_timeout
+from safebox.utils.validators import (
+    validate_cpus,
+    validate_kill_grace,
+    validate_max_output,
+    validate_memory,
+    validate_timeout,
+)
+
+if TYPE_CHECKING:
+    from safebox.core.tracing import Tracer
+    from safebox.output.plain import Reporter
 
 
 def run(
@@ -41,60 +62,252 @@ def run(
         "-t",
         help="Kill execution after N seconds.",
     ),
+    kill_grace: float = typer.Option(
+        DEFAULT_KILL_GRACE,
+        "--kill-grace",
+        help="At the timeout send SIGTERM, then SIGKILL after this many seconds (default: 0).",
+    ),
     pids_limit: int = typer.Option(
         DEFAULT_PIDS_LIMIT,
         "--pids-limit",
         help="Max number of processes inside the container.",
     ),
+    priority: int = typer.Option(
+        0,
+        "--priority",
+        help="Admission priority on safeboxd; higher runs first when the host is full.",
+    ),
+    tenant: str = typer.Option(
+        "default",
+        "--tenant",
+        help="Fair-share group on safeboxd; busy groups yield to idle ones.",
+    ),
     rm: bool = typer.Option(
         True,
         "--rm/--keep",
         help="Remove container after execution (default: remove).",
     ),
+    max_output: Optional[str] = typer.Option(
+        None,
+        "--max-output",
+        help="Kill the run once it has written this much output (e.g. 10m, 1g).",
+    ),
+    pull: bool = typer.Option(
+        False,
+        "--pull",
+        help="Always pull the latest image (refreshes the image cache).",
+    ),
+    cache: bool = typer.Option(
+        False,
+        "--cache",
+        help="Replay the stored result of an identical earlier run (see `safebox cache`).",
+    ),
+    build_cache: bool = typer.Option(
+        True,
+        "--build-cache/--no-build-cache",
+        help="Reuse compiled Go binaries keyed by the source hash (default: yes).",
+    ),
+    compile_cache: bool = typer.Option(
+        False,
+        "--compile-cache",
+        help="Share a writable Python/Node bytecode cache between runs (trusted scripts only).",
+    ),
+    requirements: Optional[str] = typer.Option(
+        None,
+        "--requirements",
+        "-r",
+        help="Dependency manifest to install (requirements.txt or package.json).",
+    ),
+    deps: bool = typer.Option(
+        True,
+        "--deps/--no-deps",
+        help="Install the script's requirements.txt / PEP 723 / package.json (default: yes).",
+    ),
+    stats: bool = typer.Option(
+        False,
+        "--stats/--no-stats",
+        help="Sample memory, CPU, I/O and PIDs during the run (default: no).",
+    ),
+    timings: bool = typer.Option(
+        False,
+        "--timings",
+        help="Print how long each phase took and the sandbox overhead (runs locally).",
+    ),
+    trace: Optional[str] = typer.Option(
+        None,
+        "--trace",
+        help="Write the phase spans to this file as a Chrome trace (runs locally).",
+    ),
+    daemon: bool = typer.Option(
+        True,
+        "--daemon/--no-daemon",
+        help="Hand the run to a running safeboxd if there is one (default: yes).",
+    ),
+    output: str = typer.Option(
+        "rich",
+        "--output",
+        "-o",
+        help=f"Output format: {', '.join(OUTPUT_FORMATS)} (jsonl/raw bypass Rich).",
+    ),
+    output_fd: int = typer.Option(
+        1,
+        "--output-fd",
+        help="File descriptor for --output jsonl events (default: stdout).",
+    ),
 ) -> None:
     """Run a script inside a sandboxed Docker container.
 
     SafeBox auto-detects the language from the file extension or shebang,
     selects the appropriate Docker image, applies resource limits, and
-    streams the output in real time.
+    streams the output in real time.  When ``safeboxd`` is running the
+    job is forwarded to it; otherwise it runs in this process.
 
     \b
     Examples:
         safebox run hello.py
         safebox run --memory 512m --timeout 30 server.js
         safebox run -l bash script_no_extension
+        safebox run --cache report.py
+        safebox run --timings --trace run.json slow.py
+        safebox run -o jsonl build.sh | jq -c 'select(.event == "result")'
     """
+    if output not in OUTPUT_FORMATS:
+        from safebox.output.display import print_error
+
+        print_error(
+            f"Unknown output format '{output}'. Choose from: {', '.join(OUTPUT_FORMATS)}."
+        )
+        raise typer.Exit(code=1)
+    reporter = _make_reporter(output, output_fd)
+
     try:
         script_path = resolve_script(script)
     except FileNotFoundError as exc:
-        print_error(str(exc))
+        reporter.error(str(exc))
         raise typer.Exit(code=1) from exc
 
+    requirements_path = Path(requirements).resolve() if requirements else None
+    if requirements_path is not None and not requirements_path.is_file():
+        reporter.error(f"Requirements file not found: {requirements_path}")
+        raise typer.Exit(code=1)
+
     try:
         memory = validate_memory(memory)
         cpus = validate_cpus(cpus)
         timeout = validate_timeout(timeout)
+        kill_grace = validate_kill_grace(kill_grace)
+        max_output_bytes = validate_max_output(max_output) if max_output else None
     except ValueError as exc:
-        print_error(str(exc))
+        reporter.error(str(exc))
         raise typer.Exit(code=1) from exc
 
-    try:
-        result = execute(
-            script_path,
-            language=language,
-            memory=memory,
-            cpus=cpus,
-            timeout=timeout,
-            pids_limit=pids_limit,
-            remove=rm,
+    if daemon and not (timings or trace):
+        exit_code = _run_in_daemon(
+            {
+                "script": str(script_path),
+                "language": language,
+                "memory": memory,
+                "cpus": cpus,
+                "timeout": timeout,
+                "kill_grace": kill_grace,
+                "pids_limit": pids_limit,
+                "priority": priority,
+                "tenant": tenant,
+                "remove": rm,
+                "pull": pull,
+                "max_output": max_output_bytes,
+                "cache": cache,
+                "build_cache": build_cache,
+                "compile_cache": compile_cache,
+                "deps": deps,
+                "requirements": str(requirements_path) if requirements_path else None,
+                "stats": stats,
+            },
+            reporter,
         )
+        if exit_code is not None:
+            raise typer.Exit(code=exit_code)
+
+    from safebox.core.executor import ExecutionError, execute
+    from safebox.core.result_cache import get_result_cache
+    from safebox.core.tracing import Tracer, tracing
+
+    tracer = Tracer() if timings or trace else None
+    try:
+        with tracing(tracer):
+            result = execute(
+                script_path,
+                language=language,
+                memory=memory,
+                cpus=cpus,
+                timeout=timeout,
+                kill_grace=kill_grace,
+                pids_limit=pids_limit,
+                remove=rm,
+                pull=pull,
+                max_output=max_output_bytes,
+                reporter=reporter,
+                cache=get_result_cache() if cache else None,
+                build_cache=build_cache,
+                compile_cache=compile_cache,
+                deps=deps,
+                requirements=requirements_path,
+                stats=stats,
+            )
     except ExecutionError:
         raise typer.Exit(code=1)
     except KeyboardInterrupt:
-        print_error("Interrupted by user.")
+        reporter.error("Interrupted by user.")
         raise typer.Exit(code=130)
     except Exception as exc:
-        print_error(f"Unexpected error: {exc}")
+        reporter.error(f"Unexpected error: {exc}")
         raise typer.Exit(code=1) from exc
+    finally:
+        if tracer is not None:
+            _report_trace(tracer, timings, trace)
 
     raise typer.Exit(code=result.exit_code)
+
+
+def _make_reporter(output: str, fd: int) -> Reporter:
+    """Build the reporter for an ``--output`` format."""
+    if output == "jsonl":
+        from safebox.output.events import JsonLinesReporter
+
+        return JsonLinesReporter(fd)
+    if output == "raw":
+        from safebox.output.plain import RawReporter
+
+        return RawReporter()
+    from safebox.output.reporter import ConsoleReporter
+
+    return ConsoleReporter()
+
+
+def _report_trace(tracer: Tracer, timings: bool, trace: str | None) -> None:
+    """Write the ``--trace`` file and print the ``--timings`` table."""
+    from safebox.output.display import print_error, print_timings
+
+    if trace:
+        try:
+            tracer.write(Path(trace))
+        except OSError as exc:
+            print_error(f"Could not write trace file {trace}: {exc}")
+    if timings:
+        print_timings(tracer)
+
+
+def _run_in_daemon(job: dict, reporter: Reporter) -> int | None:
+    """Run *job* through ``safeboxd``; ``None`` means no daemon, run locally."""
+    from safebox.daemon.client import DaemonJobError, DaemonUnavailableError, run_via_daemon
+
+    try:
+        result = run_via_daemon(job, reporter)
+    except DaemonUnavailableError:
+        return None
+    except DaemonJobError:
+        return 1
+    except KeyboardInterrupt:
+        reporter.error("Interrupted by user.")
+        return 130
+    return result.exit_code
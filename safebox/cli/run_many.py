@@ -0,0 +1,255 @@
+"""``safebox run-many`` command — execute a batch of scripts concurrently."""
+
+from __future__ import annotations
+
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, List, Optional
+
+import typer
+
+from safebox.config.constants import (
+    BATCH_LAYOUTS,
+    BATCH_MAX_DEFAULT_CONCURRENCY,
+    DEFAULT_CPUS,
+    DEFAULT_MEMORY,
+    DEFAULT_PIDS_LIMIT,
+    DEFAULT_TIMEOUT,
+)
+from safebox.utils.validators import validate_cpus, validate_memory, validate_timeout
+
+if TYPE_CHECKING:
+    from safebox.core.tracing import Tracer
+
+
+def run_many(
+    scripts: Optional[List[str]] = typer.Argument(
+        None,
+        help="Script files or glob patterns (quote globs, e.g. 'jobs/**/*.py').",
+    ),
+    manifest: Optional[str] = typer.Option(
+        None,
+        "--manifest",
+        "-f",
+        help="YAML/JSON manifest listing scripts with per-job limits, args and env.",
+    ),
+    concurrency: Optional[int] = typer.Option(
+        None,
+        "--concurrency",
+        "-j",
+        help="Max scripts running at once (default: admit by host CPUs, memory and PIDs).",
+    ),
+    layout: str = typer.Option(
+        "interleaved",
+        "--layout",
+        help=f"Output layout: {', '.join(BATCH_LAYOUTS)}.",
+    ),
+    language: Optional[str] = typer.Option(
+        None,
+        "--language",
+        "-l",
+        help="Force language/runtime for every script.",
+    ),
+    memory: str = typer.Option(
+        DEFAULT_MEMORY,
+        "--memory",
+        "-m",
+        help="Memory limit per script (e.g. 256m, 1g).",
+    ),
+    cpus: float = typer.Option(
+        DEFAULT_CPUS,
+        "--cpus",
+        help="CPU limit per script (e.g. 0.5, 1.0, 2.0).",
+    ),
+    timeout: int = typer.Option(
+        DEFAULT_TIMEOUT,
+        "--timeout",
+        "-t",
+        help="Kill each script after N seconds.",
+    ),
+    pids_limit: int = typer.Option(
+        DEFAULT_PIDS_LIMIT,
+        "--pids-limit",
+        help="Max number of processes inside each container.",
+    ),
+    rm: bool = typer.Option(
+        True,
+        "--rm/--keep",
+        help="Remove containers after execution (default: remove).",
+    ),
+    cache: bool = typer.Option(
+        False,
+        "--cache",
+        help="Replay stored results of identical earlier runs (see `safebox cache`).",
+    ),
+    build_cache: bool = typer.Option(
+        True,
+        "--build-cache/--no-build-cache",
+        help="Reuse compiled Go binaries keyed by the source hash (default: yes).",
+    ),
+    compile_cache: bool = typer.Option(
+        False,
+        "--compile-cache",
+        help="Share a writable Python/Node bytecode cache between runs (trusted scripts only).",
+    ),
+    pin_cpus: bool = typer.Option(
+        False,
+        "--pin-cpus",
+        help="Pin each script to dedicated cores, within one NUMA node where possible.",
+    ),
+    endpoint: Optional[List[str]] = typer.Option(
+        None,
+        "--endpoint",
+        help="Docker endpoint to spread scripts over, as URL or URL=WEIGHT (repeatable).",
+    ),
+    deps: bool = typer.Option(
+        True,
+        "--deps/--no-deps",
+        help="Install each script's requirements.txt / PEP 723 / package.json (default: yes).",
+    ),
+    timings: bool = typer.Option(
+        False,
+        "--timings",
+        help="Print per-phase times summed over all scripts, and the sandbox overhead.",
+    ),
+    trace: Optional[str] = typer.Option(
+        None,
+        "--trace",
+        help="Write every script's phase spans to this file as a Chrome trace.",
+    ),
+) -> None:
+    """Run many scripts concurrently, each in its own sandbox.
+
+    Scripts come from arguments (paths or globs) and/or a manifest.
+    Command-line limits are the defaults; manifest entries override them.
+    Exits non-zero if any script fails.
+
+    \b
+    Examples:
+        safebox run-many a.py b.js c.sh
+        safebox run-many 'jobs/*.py' -j 8 --layout grouped
+        safebox run-many -f batch.yaml --timeout 30
+    """
+    from safebox.core.batch import (
+        BatchJob,
+        ManifestError,
+        expand_scripts,
+        load_manifest,
+        run_batch,
+    )
+    from safebox.core.dispatch import Dispatcher
+    from safebox.core.placement import get_allocator
+    from safebox.core.result_cache import get_result_cache
+    from safebox.core.scheduler import Scheduler, get_scheduler
+    from safebox.core.tracing import Tracer, tracing
+    from safebox.output.display import print_batch_summary, print_error
+
+    try:
+        memory = validate_memory(memory)
+        cpus = validate_cpus(cpus)
+        timeout = validate_timeout(timeout)
+    except ValueError as exc:
+        print_error(str(exc))
+        raise typer.Exit(code=1) from exc
+
+    if layout not in BATCH_LAYOUTS:
+        print_error(f"Unknown layout '{layout}'. Choose from: {', '.join(BATCH_LAYOUTS)}.")
+        raise typer.Exit(code=1)
+    if concurrency is not None and concurrency < 1:
+        print_error("--concurrency must be at least 1.")
+        raise typer.Exit(code=1)
+
+    defaults = dict(
+        language=language,
+        memory=memory,
+        cpus=cpus,
+        timeout=timeout,
+        pids_limit=pids_limit,
+        remove=rm,
+        build_cache=build_cache,
+        compile_cache=compile_cache,
+        deps=deps,
+    )
+    jobs = [BatchJob(script_path=path, **defaults) for path in expand_scripts(scripts or [])]
+    if manifest:
+        try:
+            jobs.extend(load_manifest(manifest, **defaults))
+        except ManifestError as exc:
+            print_error(str(exc))
+            raise typer.Exit(code=1) from exc
+
+    if not jobs:
+        print_error("No scripts to run. Pass script paths, globs or --manifest.")
+        raise typer.Exit(code=1)
+
+    dispatcher = None
+    if endpoint:
+        if pin_cpus:
+            print_error("--pin-cpus pins this host's cores; it cannot be used with --endpoint.")
+            raise typer.Exit(code=1)
+        try:
+            dispatcher = Dispatcher.from_specs(endpoint).start()
+        except ValueError as exc:
+            print_error(str(exc))
+            raise typer.Exit(code=1) from exc
+
+    scheduler = None
+    if concurrency is None:
+        scheduler = Scheduler(dispatcher.budget()) if dispatcher else get_scheduler()
+        concurrency = min(BATCH_MAX_DEFAULT_CONCURRENCY, len(jobs))
+
+    tracer = Tracer() if timings or trace else None
+    start = time.monotonic()
+    try:
+        with tracing(tracer):
+            items = run_batch(
+                jobs,
+                concurrency=concurrency,
+                layout=layout,
+                cache=get_result_cache() if cache else None,
+                scheduler=scheduler,
+                placement=get_allocator() if pin_cpus else None,
+                dispatcher=dispatcher,
+            )
+    except KeyboardInterrupt:
+        print_error("Interrupted by user.")
+        raise typer.Exit(code=130)
+    except Exception as exc:
+        print_error(f"Unexpected error: {exc}")
+        raise typer.Exit(code=1) from exc
+    finally:
+        if dispatcher is not None:
+            dispatcher.close()
+        if tracer is not None:
+            _report_trace(tracer, timings, trace)
+
+    wall_time = time.monotonic() - start
+    if layout == "jsonl":
+        from safebox.output.events import jsonl_writer
+
+        jsonl_writer()(
+            {
+                "event": "summary",
+                "passed": sum(item.passed for item in items),
+                "failed": sum(not item.passed for item in items),
+                "jobs": len(items),
+                "wall_time": wall_time,
+                "concurrency": concurrency,
+            }
+        )
+    else:
+        print_batch_summary(items, wall_time, concurrency)
+    raise typer.Exit(code=0 if all(item.passed for item in items) else 1)
+
+
+def _report_trace(tracer: Tracer, timings: bool, trace: str | None) -> None:
+    """Write the ``--trace`` file and print the ``--timings`` table."""
+    from safebox.output.display import print_error, print_timings
+
+    if trace:
+        try:
+            tracer.write(Path(trace))
+        except OSError as exc:
+            print_error(f"Could not write trace file {trace}: {exc}")
+    if timings:
+        print_timings(tracer)
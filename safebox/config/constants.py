@@ -57,6 +57,44 @@ DEFAULT_MEMORY = "256m"
 DEFAULT_CPUS = 1.0
 DEFAULT_TIMEOUT = 60
 DEFAULT_PIDS_LIMIT = 64
+DEFAULT_KILL_GRACE = 0.0
+
+DEFAULT_CLIENT_POOL_SIZE = 128
+DEFAULT_IMAGE_CACHE_TTL = 24 * 60 * 60
+DEFAULT_PREFETCH_CONCURRENCY = 4
+
+DEFAULT_CAPTURE_MEMORY = 1 << 20
+MAX_SPILL_FILES = 50
+SPILL_MIN_AGE = 60 * 60
+SPILL_COMPRESS_LEVEL = 1
+
+DEFAULT_RESULT_CACHE_SIZE = 256 << 20
+RESULT_CACHE_STATS_FLUSH = 30.0
+
+SCHEDULER_MEMORY_FRACTION = 0.9
+DEFAULT_SCHEDULER_PIDS = 4096
+SCHEDULER_WAIT_SAMPLES = 1024
+
+DISPATCH_HEALTH_INTERVAL = 5.0
+DISPATCH_HEALTH_TIMEOUT = 2.0
+DISPATCH_IMAGE_MISS_COST = 4
+
+COMPILE_CACHE_DIR = "/safebox-cache"
+GO_BINARY_DIR = "/safebox-bin"
+GO_BUILD_FLAGS = ["-trimpath"]
+COMPILE_CACHE_ENV: dict[str, str] = {
+    "python": "PYTHONPYCACHEPREFIX",
+    "node": "NODE_COMPILE_CACHE",
+}
+COMPILE_CACHE_LABEL = "safebox.cache"
+
+DEPS_IMAGE_REPO = "safebox-deps"
+DEPS_LABEL = "safebox.deps"
+DEPS_DIR = "/safebox-deps"
+DEFAULT_DEPS_IMAGE_LIMIT = 20
+
+STDOUT = 1
+STDERR = 2
 
 SANDBOX_DIR = "/sandbox"
 SANDBOX_SCRIPT_PATH = "/sandbox/script"
@@ -64,5 +102,18 @@ SANDBOX_SCRIPT_PATH = "/sandbox/script"
 SAFEBOX_LABEL = "safebox"
 SAFEBOX_LABEL_VALUE = "true"
 
+POOL_LABEL = "safebox.pool"
+POOL_KEEPALIVE_COMMAND = ["tail", "-f", "/dev/null"]
+DEFAULT_POOL_MIN_SIZE = 1
+DEFAULT_POOL_MAX_SIZE = 4
+DEFAULT_POOL_IDLE_TIMEOUT = 300
+
+SESSION_LABEL = "safebox.session"
+
+OUTPUT_FORMATS = ("rich", "jsonl", "raw")
+
+BATCH_LAYOUTS = ("interleaved", "grouped", "quiet", "jsonl")
+BATCH_MAX_DEFAULT_CONCURRENCY = 32
+
 SHEBANG_READ_SIZE = 512
 SUPPORTED_LANGUAGES = sorted(set(EXTENSION_MAP.values()))
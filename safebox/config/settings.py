@@ -7,6 +7,11 @@ from pathlib import Path
 SAFEBOX_HOME = Path.home() / ".safebox"
 PROFILES_DIR = SAFEBOX_HOME / "profiles"
 LOGS_DIR = SAFEBOX_HOME / "logs"
+DAEMON_SOCKET = SAFEBOX_HOME / "safeboxd.sock"
+IMAGE_CACHE_FILE = SAFEBOX_HOME / "images.json"
+RESULT_CACHE_DIR = SAFEBOX_HOME / "results"
+GO_BUILDS_FILE = SAFEBOX_HOME / "go-builds.json"
+DEPS_INDEX_FILE = SAFEBOX_HOME / "deps.json"
 
 
 def ensure_dirs() -> None:
@@ -0,0 +1,347 @@
+"""Minimal asyncio client for the Docker Engine API.
+
+Speaks HTTP/1.1 directly over the daemon's Unix socket (or plain TCP)
+with :mod:`asyncio` streams, so many containers can be driven from one
+event loop without a thread per request.  Only the handful of endpoints
+SafeBox needs are implemented.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+from typing import Any, AsyncIterator
+from urllib.parse import quote, urlencode, urlsplit
+
+from safebox import __version__
+from safebox.config.constants import STDERR, STDOUT  # noqa: F401 (re-exported)
+from safebox.core.docker_client import DockerNotAvailableError, ImagePullError
+
+DEFAULT_DOCKER_HOST = "unix:///var/run/docker.sock"
+MAX_IDLE_CONNECTIONS = 16
+
+
+class DockerAPIError(Exception):
+    """Raised when the Engine API answers with an error status."""
+
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(f"Docker API error {status}: {message}")
+        self.status = status
+        self.message = message
+
+
+class NotFoundError(DockerAPIError):
+    """Raised for 404 responses (missing image or container)."""
+
+
+class _Response:
+    """An HTTP response whose body is read lazily from the connection."""
+
+    def __init__(
+        self,
+        client: AsyncDockerClient,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        status: int,
+        headers: dict[str, str],
+    ) -> None:
+        self._client = client
+        self._reader = reader
+        self._writer = writer
+        self.status = status
+        self.headers = headers
+        self._done = False
+
+    async def iter_chunks(self) -> AsyncIterator[bytes]:
+        """Yield body bytes as they arrive, then recycle the connection."""
+        reader = self._reader
+        try:
+            if self.headers.get("transfer-encoding", "").lower() == "chunked":
+                while True:
+                    line = await reader.readline()
+                    if not line:
+                        raise ConnectionError("connection closed mid-body")
+                    size = int(line.split(b";", 1)[0].strip(), 16)
+                    if size == 0:
+                        while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                            pass
+                        break
+                    yield await reader.readexactly(size)
+                    await reader.readline()
+            elif "content-length" in self.headers:
+                remaining = int(self.headers["content-length"])
+                while remaining > 0:
+                    data = await reader.read(min(remaining, 65536))
+                    if not data:
+                        raise ConnectionError("connection closed mid-body")
+                    remaining -= len(data)
+                    yield data
+            else:
+                while data := await reader.read(65536):
+                    yield data
+                self.headers["connection"] = "close"
+            self._done = True
+        finally:
+            self.release()
+
+    async def read(self) -> bytes:
+        return b"".join([chunk async for chunk in self.iter_chunks()])
+
+    async def json(self) -> Any:
+        body = await self.read()
+        return json.loads(body) if body else None
+
+    def release(self) -> None:
+        """Return the connection to the pool if the body was fully read."""
+        writer, self._writer = self._writer, None
+        if writer is None:
+            return
+        reusable = self._done and self.headers.get("connection", "").lower() != "close"
+        self._client._recycle(self._reader, writer, reusable)
+
+
+class AsyncDockerClient:
+    """Asyncio Docker Engine API client.
+
+    *base_url* follows ``DOCKER_HOST`` conventions (``unix:///path`` or
+    ``tcp://host:port``); TLS and Windows named pipes are not supported.
+    Idle keep-alive connections are reused for plain requests, while
+    streaming responses (logs, pulls) hold a connection of their own.
+    """
+
+    def __init__(
+        self,
+        base_url: str | None = None,
+        *,
+        api_version: str | None = None,
+        timeout: float = 60.0,
+    ) -> None:
+        self.base_url = base_url or os.environ.get("DOCKER_HOST") or DEFAULT_DOCKER_HOST
+        self.api_version = api_version
+        self.timeout = timeout
+        self._idle: list[tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+        self._pulls: dict[str, asyncio.Future] = {}
+
+        url = urlsplit(self.base_url)
+        if url.scheme in ("unix", "http+unix"):
+            self._unix_path: str | None = url.path
+            self._tcp: tuple[str, int] | None = None
+        elif url.scheme in ("tcp", "http"):
+            if os.environ.get("DOCKER_TLS_VERIFY"):
+                raise DockerNotAvailableError(
+                    "TLS Docker hosts are not supported by the async client."
+                )
+            self._unix_path = None
+            self._tcp = (url.hostname or "localhost", url.port or 2375)
+        else:
+            raise DockerNotAvailableError(
+                f"Unsupported DOCKER_HOST for the async client: {self.base_url}"
+            )
+
+    # ── Connection handling ──────────────────────────────────
+
+    async def _connect(self) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        while self._idle:
+            reader, writer = self._idle.pop()
+            if not writer.is_closing() and not reader.at_eof():
+                return reader, writer
+            writer.close()
+        try:
+            if self._unix_path is not None:
+                return await asyncio.open_unix_connection(self._unix_path, limit=2**20)
+            host, port = self._tcp
+            return await asyncio.open_connection(host, port, limit=2**20)
+        except OSError as exc:
+            raise DockerNotAvailableError(
+                "Could not connect to the Docker daemon. "
+                "Make sure Docker Desktop is running.\n"
+                f"  ↳ {exc}"
+            ) from exc
+
+    def _recycle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, reusable: bool
+    ) -> None:
+        if reusable and len(self._idle) < MAX_IDLE_CONNECTIONS and not writer.is_closing():
+            self._idle.append((reader, writer))
+        else:
+            writer.close()
+
+    async def close(self) -> None:
+        """Close all idle connections."""
+        idle, self._idle = self._idle, []
+        for _, writer in idle:
+            writer.close()
+
+    async def __aenter__(self) -> AsyncDockerClient:
+        return self
+
+    async def __aexit__(self, *exc: object) -> None:
+        await self.close()
+
+    async def _version_prefix(self) -> str:
+        if self.api_version is None:
+            info = await self._request("GET", "/version", versioned=False)
+            self.api_version = (await info.json())["ApiVersion"]
+        return f"/v{self.api_version}"
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        *,
+        params: dict[str, Any] | None = None,
+        body: Any = None,
+        versioned: bool = True,
+    ) -> _Response:
+        if versioned:
+            path = await self._version_prefix() + path
+        if params:
+            path += "?" + urlencode({k: v for k, v in params.items() if v is not None})
+
+        payload = b"" if body is None else json.dumps(body).encode()
+        head = (
+            f"{method} {path} HTTP/1.1\r\n"
+            "Host: docker\r\n"
+            f"User-Agent: safebox/{__version__}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(payload)}\r\n\r\n"
+        ).encode()
+
+        reader, writer = await self._connect()
+        try:
+            writer.write(head + payload)
+            await writer.drain()
+            async with asyncio.timeout(self.timeout):
+                status_line = await reader.readline()
+                if not status_line:
+                    raise ConnectionError("Docker daemon closed the connection")
+                status = int(status_line.split(None, 2)[1])
+                headers: dict[str, str] = {}
+                while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    key, _, value = line.decode("latin-1").partition(":")
+                    headers[key.strip().lower()] = value.strip()
+        except BaseException:
+            writer.close()
+            raise
+
+        response = _Response(self, reader, writer, status, headers)
+        if status >= 400:
+            raw = await response.read()
+            try:
+                message = json.loads(raw).get("message", "")
+            except ValueError:
+                message = raw.decode("utf-8", errors="replace")
+            error = NotFoundError if status == 404 else DockerAPIError
+            raise error(status, message.strip())
+        return response
+
+    async def _call(self, method: str, path: str, **kwargs: Any) -> Any:
+        response = await self._request(method, path, **kwargs)
+        return await response.json()
+
+    # ── Endpoints ────────────────────────────────────────────
+
+    async def ping(self) -> None:
+        await (await self._request("GET", "/_ping", versioned=False)).read()
+
+    async def inspect_image(self, image: str) -> dict:
+        return await self._call("GET", f"/images/{quote(image, safe='')}/json")
+
+    async def pull(self, image: str) -> None:
+        """Pull *image*; concurrent pulls of the same image are coalesced."""
+        pending = self._pulls.get(image)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._pulls[image] = future
+        try:
+            await self._pull(image)
+        except BaseException as exc:
+            future.set_exception(exc)
+            future.exception()
+            raise
+        else:
+            future.set_result(None)
+        finally:
+            del self._pulls[image]
+
+    async def _pull(self, image: str) -> None:
+        name, _, tag = image.rpartition(":")
+        if "@" in image:
+            params = {"fromImage": image}
+        elif not name or "/" in tag:
+            params = {"fromImage": image, "tag": "latest"}
+        else:
+            params = {"fromImage": name, "tag": tag}
+        response = await self._request("POST", "/images/create", params=params)
+        buffer = b""
+        async for chunk in response.iter_chunks():
+            buffer += chunk
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                if line.strip() and "error" in (event := json.loads(line)):
+                    raise ImagePullError(f"Failed to pull image '{image}': {event['error']}")
+
+    async def ensure_image(self, image: str) -> dict:
+        """Inspect *image*, pulling it first when it is missing."""
+        try:
+            return await self.inspect_image(image)
+        except NotFoundError:
+            await self.pull(image)
+            return await self.inspect_image(image)
+
+    async def create_container(self, body: dict, *, name: str | None = None) -> str:
+        result = await self._call("POST", "/containers/create", params={"name": name}, body=body)
+        return result["Id"]
+
+    async def start(self, container_id: str) -> None:
+        await self._call("POST", f"/containers/{container_id}/start")
+
+    async def inspect_container(self, container_id: str) -> dict:
+        return await self._call("GET", f"/containers/{container_id}/json")
+
+    async def wait(self, container_id: str) -> dict:
+        response = await self._request("POST", f"/containers/{container_id}/wait")
+        return await response.json()
+
+    async def kill(self, container_id: str, signal: str = "SIGKILL") -> None:
+        await self._call("POST", f"/containers/{container_id}/kill", params={"signal": signal})
+
+    async def remove(self, container_id: str, *, force: bool = True) -> None:
+        await self._call(
+            "DELETE",
+            f"/containers/{container_id}",
+            params={"force": int(force), "v": 1},
+        )
+
+    async def logs(
+        self, container_id: str, *, follow: bool = True
+    ) -> AsyncIterator[tuple[int, bytes]]:
+        """Yield ``(stream, payload)`` frames (``STDOUT``/``STDERR``)."""
+        response = await self._request(
+            "GET",
+            f"/containers/{container_id}/logs",
+            params={"stdout": 1, "stderr": 1, "follow": int(follow)},
+        )
+        try:
+            async for frame in demux_frames(response.iter_chunks()):
+                yield frame
+        finally:
+            response.release()
+
+
+async def demux_frames(chunks: AsyncIterator[bytes]) -> AsyncIterator[tuple[int, bytes]]:
+    """Split Docker's multiplexed stream (8-byte frame headers) into frames."""
+    buf = bytearray()
+    async for chunk in chunks:
+        buf += chunk
+        while len(buf) >= 8:
+            size = int.from_bytes(buf[4:8], "big")
+            if len(buf) < 8 + size:
+                break
+            stream = buf[0]
+            payload = bytes(buf[8 : 8 + size])
+            del buf[: 8 + size]
+            yield stream, payload
@@ -0,0 +1,193 @@
+"""Asyncio execution pipeline — :func:`execute` for event-loop callers."""
+
+from __future__ import annotations
+
+import asyncio
+from contextlib import aclosing
+from pathlib import Path
+
+from safebox.config.constants import (
+    DEFAULT_CAPTURE_MEMORY,
+    DEFAULT_CPUS,
+    DEFAULT_MEMORY,
+    DEFAULT_PIDS_LIMIT,
+    DEFAULT_TIMEOUT,
+)
+from safebox.core.async_docker import AsyncDockerClient, NotFoundError
+from safebox.core.capture import RunCapture
+from safebox.core.container import (
+    ContainerConfig,
+    build_container_kwargs,
+    build_create_body,
+)
+from safebox.core.executor import ExecutionResult, resolve_runtime
+from safebox.core.images import get_image_cache, record_image
+from safebox.output.reporter import Reporter
+
+
+async def execute_async(
+    script_path: Path,
+    *,
+    language: str | None = None,
+    memory: str = DEFAULT_MEMORY,
+    cpus: float = DEFAULT_CPUS,
+    timeout: int = DEFAULT_TIMEOUT,
+    pids_limit: int = DEFAULT_PIDS_LIMIT,
+    remove: bool = True,
+    extra_args: str = "",
+    environment: dict[str, str] | None = None,
+    reporter: Reporter | None = None,
+    client: AsyncDockerClient | None = None,
+    max_output: int | None = None,
+    capture_memory: int = DEFAULT_CAPTURE_MEMORY,
+    raw: bool = False,
+) -> ExecutionResult:
+    """Awaitable counterpart of :func:`safebox.core.executor.execute`.
+
+    Uses the same detection and :class:`ContainerConfig` /
+    :func:`build_container_kwargs` pipeline, but every Docker call —
+    image check/pull, create, start, log streaming, kill and removal — is
+    a coroutine on *client*, and the deadline is an ``asyncio`` timeout
+    rather than a thread.  Pass one shared :class:`AsyncDockerClient` when
+    running many sandboxes concurrently so connections are reused.
+
+    *reporter* defaults to a silent :class:`Reporter`.  The image cache
+    is read and written in a worker thread, off the event loop.
+    """
+    reporter = reporter or Reporter()
+    owns_client = client is None
+    client = client or AsyncDockerClient()
+
+    try:
+        lang, image = resolve_runtime(script_path, language, reporter)
+        record = await asyncio.to_thread(get_image_cache().get, image)
+        if record is None:
+            info = await client.ensure_image(image)
+            record = await asyncio.to_thread(
+                record_image, image, info["Id"], info.get("RepoDigests")
+            )
+
+        config = ContainerConfig(
+            image=image,
+            image_ref=record.image_id,
+            language=lang,
+            script_path=script_path,
+            memory=memory,
+            cpus=cpus,
+            timeout=timeout,
+            pids_limit=pids_limit,
+            remove=remove,
+            extra_args=extra_args,
+            environment=environment or {},
+        )
+        reporter.config(config)
+
+        container_id = await _create(client, config)
+        capture = RunCapture(
+            max_memory=capture_memory, max_output=max_output, name=script_path.stem, binary=raw
+        )
+        try:
+            exit_code, timed_out, duration = await _run(
+                client, container_id, config, reporter, capture
+            )
+        finally:
+            capture.close()
+            if remove:
+                await _remove_quietly(client, container_id)
+    finally:
+        if owns_client:
+            await client.close()
+
+    result = ExecutionResult(
+        exit_code=exit_code,
+        duration=duration,
+        timed_out=timed_out,
+        output=capture.combined.value,
+        language=lang,
+        image=image,
+        image_id=config.image_ref,
+        output_bytes=capture.combined.total_bytes,
+        output_file=capture.combined.spill_path,
+        output_truncated=capture.truncated,
+        stdout=capture.stdout.value,
+        stderr=capture.stderr.value,
+    )
+    reporter.result(result)
+    return result
+
+
+async def _create(client: AsyncDockerClient, config: ContainerConfig) -> str:
+    """Create the container for *config*.
+
+    If the pinned image ID has disappeared (pruned or re-pulled under a
+    new ID), the tag is resolved again once and the create retried, as
+    in the synchronous pipeline.
+    """
+    try:
+        return await client.create_container(build_create_body(build_container_kwargs(config)))
+    except NotFoundError:
+        if config.image_ref == config.image:
+            raise
+    await asyncio.to_thread(get_image_cache().invalidate, config.image)
+    info = await client.ensure_image(config.image)
+    record = await asyncio.to_thread(
+        record_image, config.image, info["Id"], info.get("RepoDigests")
+    )
+    config.image_ref = record.image_id
+    return await client.create_container(build_create_body(build_container_kwargs(config)))
+
+
+async def _run(
+    client: AsyncDockerClient,
+    container_id: str,
+    config: ContainerConfig,
+    reporter: Reporter,
+    capture: RunCapture,
+) -> tuple[int, bool, float]:
+    loop = asyncio.get_running_loop()
+
+    await client.start(container_id)
+    start = loop.time()
+    deadline = start + config.timeout
+
+    async def _stream() -> int | None:
+        async with aclosing(client.logs(container_id, follow=True)) as frames:
+            async for stream, payload in frames:
+                kept = capture.feed(stream, payload)
+                if kept and not capture.binary:
+                    reporter.output(kept, stream)
+                if capture.truncated:
+                    reporter.output_limit(capture.combined.max_output)
+                    await client.kill(container_id)
+                    break
+        for stream, text in capture.finish():
+            reporter.output(text, stream)
+        state = (await client.inspect_container(container_id)).get("State", {})
+        if not state.get("Running"):
+            return state.get("ExitCode")
+        return (await client.wait(container_id)).get("StatusCode")
+
+    try:
+        async with asyncio.timeout_at(deadline):
+            exit_code = await _stream()
+        timed_out = False
+    except TimeoutError:
+        reporter.timeout(config.timeout)
+        timed_out = True
+        exit_code = 124
+        try:
+            await client.kill(container_id)
+        except Exception:
+            pass
+        if not config.remove:
+            await _remove_quietly(client, container_id)
+
+    duration = loop.time() - start
+    return (1 if exit_code is None else exit_code), timed_out, duration
+
+
+async def _remove_quietly(client: AsyncDockerClient, container_id: str) -> None:
+    try:
+        await client.remove(container_id, force=True)
+    except Exception:
+        pass
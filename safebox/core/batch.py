@@ -0,0 +1,330 @@
+"""Batch execution — run many scripts concurrently through :func:`execute`."""
+
+from __future__ import annotations
+
+import glob
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable
+
+import yaml
+
+from safebox.config.constants import (
+    BATCH_LAYOUTS,
+    BATCH_MAX_DEFAULT_CONCURRENCY,
+    DEFAULT_CPUS,
+    DEFAULT_MEMORY,
+    DEFAULT_PIDS_LIMIT,
+    DEFAULT_TIMEOUT,
+    LANGUAGE_IMAGE_MAP,
+)
+from safebox.core.executor import ExecutionError, ExecutionResult, execute
+from safebox.core.images import resolve_image
+from safebox.core.scheduler import host_memory_bytes
+from safebox.detection.detector import DetectionError, detect_language
+from safebox.output.events import JsonLinesReporter
+from safebox.output.reporter import GroupedReporter, PrefixedReporter, Reporter
+from safebox.utils.validators import (
+    parse_memory_bytes,
+    validate_cpus,
+    validate_memory,
+    validate_pids_limit,
+    validate_timeout,
+)
+
+if TYPE_CHECKING:
+    from safebox.core.dispatch import Dispatcher
+    from safebox.core.placement import CpuAllocator
+    from safebox.core.pool import ContainerPool
+    from safebox.core.result_cache import ResultCache
+    from safebox.core.scheduler import Scheduler
+
+_STYLES = ("cyan", "magenta", "yellow", "green", "blue", "bright_red", "bright_cyan")
+
+
+class ManifestError(Exception):
+    """Raised when a batch manifest cannot be parsed."""
+
+
+@dataclass
+class BatchJob:
+    """One script of a batch, with its own limits."""
+
+    script_path: Path
+    language: str | None = None
+    memory: str = DEFAULT_MEMORY
+    cpus: float = DEFAULT_CPUS
+    timeout: int = DEFAULT_TIMEOUT
+    pids_limit: int = DEFAULT_PIDS_LIMIT
+    remove: bool = True
+    extra_args: str = ""
+    environment: dict[str, str] = field(default_factory=dict)
+    build_cache: bool = True
+    compile_cache: bool = False
+    deps: bool = True
+    requirements: Path | None = None
+    priority: int = 0
+
+    @property
+    def name(self) -> str:
+        return self.script_path.name
+
+
+@dataclass
+class BatchItem:
+    """Outcome of one :class:`BatchJob`: a result, or the error that stopped it."""
+
+    job: BatchJob
+    result: ExecutionResult | None = None
+    error: str | None = None
+
+    @property
+    def passed(self) -> bool:
+        return self.result is not None and self.result.exit_code == 0
+
+
+def expand_scripts(patterns: Iterable[str]) -> list[Path]:
+    """Expand file paths and glob patterns into a sorted, de-duplicated list."""
+    seen: set[Path] = set()
+    paths: list[Path] = []
+    for pattern in patterns:
+        if glob.has_magic(pattern):
+            matches = sorted(glob.glob(pattern, recursive=True))
+        else:
+            matches = [pattern]
+        for match in matches:
+            path = Path(match).resolve()
+            if path.is_file() and path not in seen:
+                seen.add(path)
+                paths.append(path)
+    return paths
+
+
+def load_manifest(path: str | Path, **defaults: object) -> list[BatchJob]:
+    """Load jobs from a YAML (or JSON) manifest.
+
+    The manifest is either a list of entries or a mapping with an
+    optional ``defaults`` block and a ``jobs`` list.  Each entry is a
+    script path/glob or a mapping with ``script`` plus any of
+    ``language``, ``memory``, ``cpus``, ``timeout``, ``pids_limit``,
+    ``args``, ``env``, ``requirements``, ``deps``, ``build_cache``,
+    ``compile_cache`` and ``priority``.  Relative paths resolve against the manifest's
+    directory; *defaults* are overridden by the manifest's own.  Invalid
+    values raise :class:`ManifestError` naming the job.
+    """
+    manifest = Path(path)
+    try:
+        data = yaml.safe_load(manifest.read_text())
+    except (OSError, yaml.YAMLError) as exc:
+        raise ManifestError(f"Cannot read manifest {manifest}: {exc}") from exc
+
+    if isinstance(data, dict):
+        if not isinstance(data.get("defaults") or {}, dict):
+            raise ManifestError(f"Manifest {manifest}: 'defaults' must be a mapping.")
+        base = {**defaults, **(data.get("defaults") or {})}
+        entries = data.get("jobs") or []
+    else:
+        base = dict(defaults)
+        entries = data or []
+    if not isinstance(entries, list):
+        raise ManifestError(f"Manifest {manifest}: 'jobs' must be a list.")
+
+    jobs: list[BatchJob] = []
+    for entry in entries:
+        if not isinstance(entry, (str, dict)):
+            raise ManifestError(f"Manifest {manifest}: job must be a path or mapping: {entry!r}")
+        spec = {"script": entry} if isinstance(entry, str) else dict(entry)
+        script = spec.pop("script", None)
+        if not script:
+            raise ManifestError(f"Manifest {manifest}: job without 'script': {entry!r}")
+        spec = {**base, **spec}
+        pattern = str(manifest.parent / script)
+        scripts = expand_scripts([pattern])
+        if not scripts:
+            raise ManifestError(f"Manifest {manifest}: no script matches '{script}'.")
+        for script_path in scripts:
+            jobs.append(_job_from_spec(script_path, spec, manifest))
+    return jobs
+
+
+def _job_from_spec(script_path: Path, spec: dict, manifest: Path) -> BatchJob:
+    env = spec.get("env") or spec.get("environment") or {}
+    requirements = spec.get("requirements")
+    try:
+        if not isinstance(env, dict):
+            raise ValueError(f"'env' must be a mapping, not {type(env).__name__}.")
+        return BatchJob(
+            script_path=script_path,
+            language=spec.get("language"),
+            memory=validate_memory(str(spec.get("memory", DEFAULT_MEMORY))),
+            cpus=validate_cpus(float(spec.get("cpus", DEFAULT_CPUS))),
+            timeout=validate_timeout(int(spec.get("timeout", DEFAULT_TIMEOUT))),
+            pids_limit=validate_pids_limit(int(spec.get("pids_limit", DEFAULT_PIDS_LIMIT))),
+            remove=bool(spec.get("remove", True)),
+            extra_args=str(spec.get("args", spec.get("extra_args", ""))),
+            environment={str(k): str(v) for k, v in env.items()},
+            build_cache=bool(spec.get("build_cache", True)),
+            compile_cache=bool(spec.get("compile_cache", False)),
+            deps=bool(spec.get("deps", True)),
+            requirements=(manifest.parent / requirements).resolve() if requirements else None,
+            priority=int(spec.get("priority", 0)),
+        )
+    except (TypeError, ValueError) as exc:
+        raise ManifestError(f"Manifest {manifest}: job '{script_path.name}': {exc}") from exc
+
+
+def default_concurrency(jobs: Iterable[BatchJob]) -> int:
+    """How many jobs fit on this host at once given their ``--cpus``/``--memory``.
+
+    Uses the largest per-job request so a mixed batch never
+    oversubscribes, and caps the result at
+    :data:`BATCH_MAX_DEFAULT_CONCURRENCY`.
+    """
+    jobs = list(jobs)
+    if not jobs:
+        return 1
+    cpus = max(job.cpus for job in jobs)
+    memory = max(parse_memory_bytes(job.memory) for job in jobs)
+
+    limit = int((os.cpu_count() or 1) / cpus)
+    host_memory = host_memory_bytes()
+    if host_memory:
+        limit = min(limit, host_memory // memory)
+    return max(1, min(limit, BATCH_MAX_DEFAULT_CONCURRENCY, len(jobs)))
+
+
+def run_batch(
+    jobs: list[BatchJob],
+    *,
+    concurrency: int | None = None,
+    layout: str = "interleaved",
+    pool: ContainerPool | None = None,
+    cache: ResultCache | None = None,
+    scheduler: Scheduler | None = None,
+    placement: CpuAllocator | None = None,
+    dispatcher: Dispatcher | None = None,
+) -> list[BatchItem]:
+    """Run *jobs* with at most *concurrency* in flight.
+
+    Output is ``interleaved`` line by line with a per-script prefix,
+    ``grouped`` into one block per script as each finishes, written as
+    JSON-line events tagged with the script name (``jsonl``), or
+    suppressed entirely (``quiet``).  Images are resolved once up front so pulls
+    never race, and every job runs the image ID resolved at that point
+    even if a tag is re-pulled mid-batch.  With a *cache*, jobs identical
+    to earlier runs are replayed from it.  With a *scheduler*, each job
+    also waits for room in the host budget (highest ``priority`` first),
+    and *concurrency* defaults to :data:`BATCH_MAX_DEFAULT_CONCURRENCY`.
+    With a *placement* allocator, each job is pinned to cores of its own;
+    with a *dispatcher*, jobs are spread over its Docker endpoints.
+    Returns one :class:`BatchItem` per job, in input order.
+    """
+    if layout not in BATCH_LAYOUTS:
+        raise ValueError(
+            f"Unknown layout '{layout}'. Choose from: {', '.join(BATCH_LAYOUTS)}."
+        )
+    if concurrency is None and scheduler is not None:
+        concurrency = min(BATCH_MAX_DEFAULT_CONCURRENCY, len(jobs))
+    elif concurrency is None:
+        concurrency = default_concurrency(jobs)
+
+    # Endpoints resolve (and pull) images for themselves.
+    pinned = _prepare_images(jobs) if dispatcher is None else {}
+
+    items = [BatchItem(job=job) for job in jobs]
+    with ThreadPoolExecutor(
+        max_workers=max(1, concurrency), thread_name_prefix="safebox-batch"
+    ) as workers:
+        futures = [
+            workers.submit(
+                _run_one,
+                item,
+                _make_reporter(layout, item.job.name, index),
+                pool,
+                pinned,
+                cache,
+                scheduler,
+                placement,
+                dispatcher,
+            )
+            for index, item in enumerate(items)
+        ]
+        try:
+            for future in futures:
+                future.result()
+        except KeyboardInterrupt:
+            workers.shutdown(wait=False, cancel_futures=True)
+            raise
+    return items
+
+
+def _run_one(
+    item: BatchItem,
+    reporter: Reporter,
+    pool: ContainerPool | None,
+    pinned: dict[str, str],
+    cache: ResultCache | None = None,
+    scheduler: Scheduler | None = None,
+    placement: CpuAllocator | None = None,
+    dispatcher: Dispatcher | None = None,
+) -> None:
+    job = item.job
+    try:
+        item.result = execute(
+            job.script_path,
+            language=job.language,
+            memory=job.memory,
+            cpus=job.cpus,
+            timeout=job.timeout,
+            pids_limit=job.pids_limit,
+            remove=job.remove,
+            extra_args=job.extra_args,
+            environment=job.environment,
+            build_cache=job.build_cache,
+            compile_cache=job.compile_cache,
+            deps=job.deps,
+            requirements=job.requirements,
+            pool=pool,
+            reporter=reporter,
+            pinned_images=pinned,
+            cache=cache,
+            scheduler=scheduler,
+            priority=job.priority,
+            placement=placement,
+            dispatcher=dispatcher,
+        )
+    except ExecutionError as exc:
+        item.error = str(exc)
+    except Exception as exc:
+        item.error = f"Unexpected error: {exc}"
+        reporter.error(item.error)
+
+
+def _make_reporter(layout: str, name: str, index: int) -> Reporter:
+    style = _STYLES[index % len(_STYLES)]
+    if layout == "interleaved":
+        return PrefixedReporter(name, style)
+    if layout == "grouped":
+        return GroupedReporter(name, style)
+    if layout == "jsonl":
+        return JsonLinesReporter(job=name)
+    return Reporter()
+
+
+def _prepare_images(jobs: Iterable[BatchJob]) -> dict[str, str]:
+    """Resolve (and pull) each distinct image once, sequentially, before
+    fanning out; returns the tag → image ID pins for the batch.
+    """
+    images: list[str] = []
+    for job in jobs:
+        try:
+            lang = detect_language(job.script_path, language_override=job.language)
+        except DetectionError:
+            continue
+        image = LANGUAGE_IMAGE_MAP.get(lang)
+        if image and image not in images:
+            images.append(image)
+    return {image: resolve_image(image) for image in images}
+
@@ -0,0 +1,282 @@
+"""Bounded output capture — head/tail in memory, overflow spilled to disk."""
+
+from __future__ import annotations
+
+import codecs
+import gzip
+import threading
+import time
+import uuid
+from collections import deque
+from pathlib import Path
+
+from safebox.config.constants import (
+    DEFAULT_CAPTURE_MEMORY,
+    MAX_SPILL_FILES,
+    SPILL_COMPRESS_LEVEL,
+    SPILL_MIN_AGE,
+    STDERR,
+    STDOUT,
+)
+from safebox.config.settings import LOGS_DIR
+
+_open_spills: set[Path] = set()
+_open_spills_lock = threading.Lock()
+
+
+class OutputCapture:
+    """Keep a run's output without letting it grow the SafeBox process.
+
+    The first and last ``max_memory / 2`` characters stay in memory.  As
+    soon as anything would be dropped from the middle, the complete
+    output so far — and everything after it — goes to a gzip file under
+    *spill_dir* (``None`` disables spilling).  Once *max_output* bytes
+    have been written, further output is refused and :attr:`truncated`
+    is set.  With *binary* the capture holds ``bytes`` instead of text.
+    *max_memory* bounds this one capture, not the whole run.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_memory: int = DEFAULT_CAPTURE_MEMORY,
+        max_output: int | None = None,
+        spill_dir: Path | None = LOGS_DIR,
+        name: str = "output",
+        binary: bool = False,
+    ) -> None:
+        self.max_memory = max_memory
+        self.max_output = max_output
+        self.spill_dir = spill_dir
+        self.name = name
+        self.binary = binary
+        self.total_bytes = 0
+        self.truncated = False
+        self.spill_path: Path | None = None
+        self._empty = b"" if binary else ""
+        self._chars = 0
+        self._head: list = []
+        self._head_size = 0
+        self._tail: deque = deque()
+        self._tail_size = 0
+        self._dropped = False
+        self._spill: gzip.GzipFile | None = None
+
+    def write(self, data: str | bytes, size: int | None = None) -> str | bytes:
+        """Record *data* (*size* encoded bytes); return the part kept.
+
+        Returns an empty value once :attr:`max_output` has been reached.
+        """
+        if self.truncated:
+            return self._empty
+        if size is None:
+            size = len(data) if self.binary else len(data.encode("utf-8"))
+        if self.max_output is not None and self.total_bytes + size > self.max_output:
+            room = self.max_output - self.total_bytes
+            if self.binary:
+                data = data[:room]
+            else:
+                data = data.encode("utf-8")[:room].decode("utf-8", errors="ignore")
+            size = room
+            self.truncated = True
+
+        self.total_bytes += size
+        self._chars += len(data)
+        if self._spill is not None:
+            try:
+                self._spill.write(self._encode(data))
+            except OSError:
+                self._abandon_spill(self.spill_path)
+
+        rest = data
+        room = self.max_memory // 2 - self._head_size
+        if room > 0:
+            self._head.append(rest[:room])
+            self._head_size += len(self._head[-1])
+            rest = rest[room:]
+        if rest:
+            self._tail.append(rest)
+            self._tail_size += len(rest)
+            self._trim_tail()
+        return data
+
+    @property
+    def value(self) -> str | bytes:
+        """Everything kept in memory; a marker stands in for any dropped middle."""
+        head = self._empty.join(self._head)
+        tail = self._empty.join(self._tail)
+        if not self._dropped:
+            return head + tail
+        omitted = self._chars - self._head_size - self._tail_size
+        where = f"; full output in {self.spill_path}" if self.spill_path else ""
+        unit = "bytes" if self.binary else "characters"
+        marker = f"\n… [{omitted} {unit} omitted{where}] …\n"
+        return head + (marker.encode("utf-8") if self.binary else marker) + tail
+
+    @property
+    def complete(self) -> bool:
+        """Whether :attr:`value` still holds everything written, with nothing cut."""
+        return not self._dropped and not self.truncated
+
+    def close(self) -> None:
+        if self._spill is not None:
+            try:
+                self._spill.close()
+            except OSError:
+                pass
+            self._spill = None
+            with _open_spills_lock:
+                _open_spills.discard(self.spill_path)
+
+    def _encode(self, data: str | bytes) -> bytes:
+        return data if self.binary else data.encode("utf-8")
+
+    def _trim_tail(self) -> None:
+        excess = self._tail_size - (self.max_memory - self.max_memory // 2)
+        if excess <= 0:
+            return
+        if self._spill is None and not self._dropped:
+            self._open_spill()
+        self._dropped = True
+        while excess > 0:
+            first = self._tail[0]
+            if len(first) <= excess:
+                self._tail.popleft()
+                self._tail_size -= len(first)
+                excess -= len(first)
+            else:
+                self._tail[0] = first[excess:]
+                self._tail_size -= excess
+                excess = 0
+
+    def _open_spill(self) -> None:
+        """Start the spill file with everything seen so far (still all in memory)."""
+        if self.spill_dir is None:
+            return
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        path = self.spill_dir / f"{stamp}-{self.name}-{uuid.uuid4().hex[:8]}.log.gz"
+        try:
+            self.spill_dir.mkdir(parents=True, exist_ok=True)
+            _prune_spills(self.spill_dir)
+            with _open_spills_lock:
+                _open_spills.add(path)
+            self._spill = gzip.open(path, "wb", compresslevel=SPILL_COMPRESS_LEVEL)
+            for part in (*self._head, *self._tail):
+                self._spill.write(self._encode(part))
+        except OSError:
+            self._abandon_spill(path)
+            return
+        self.spill_path = path
+
+    def _abandon_spill(self, path: Path) -> None:
+        """Stop spilling after a write error (e.g. a full disk), without failing the run.
+
+        The partial file is closed and deleted.  :attr:`value` keeps its
+        head and tail, and the capture no longer counts as complete.
+        """
+        spill, self._spill = self._spill, None
+        if spill is not None:
+            try:
+                spill.close()
+            except OSError:
+                pass
+        try:
+            path.unlink(missing_ok=True)
+        except OSError:
+            pass
+        with _open_spills_lock:
+            _open_spills.discard(path)
+        self.spill_path = None
+        self._dropped = True
+
+
+class RunCapture:
+    """Capture one run's demultiplexed output.
+
+    :attr:`combined` is the interleaved :class:`OutputCapture` — it
+    enforces *max_output* and spills to disk — while :attr:`stdout` and
+    :attr:`stderr` keep bounded in-memory copies of each stream, so a run
+    holds up to three times *max_memory* characters in memory.  Raw
+    frames are decoded with one incremental UTF-8 decoder per stream, so
+    characters split across frames survive; with *binary* nothing is
+    decoded at all.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_memory: int = DEFAULT_CAPTURE_MEMORY,
+        max_output: int | None = None,
+        spill_dir: Path | None = LOGS_DIR,
+        name: str = "output",
+        binary: bool = False,
+    ) -> None:
+        self.binary = binary
+        self.combined = OutputCapture(
+            max_memory=max_memory,
+            max_output=max_output,
+            spill_dir=spill_dir,
+            name=name,
+            binary=binary,
+        )
+        self.stdout = OutputCapture(max_memory=max_memory, spill_dir=None, binary=binary)
+        self.stderr = OutputCapture(max_memory=max_memory, spill_dir=None, binary=binary)
+        self._decoders = {
+            STDOUT: codecs.getincrementaldecoder("utf-8")("replace"),
+            STDERR: codecs.getincrementaldecoder("utf-8")("replace"),
+        }
+
+    @property
+    def truncated(self) -> bool:
+        return self.combined.truncated
+
+    def feed(self, stream: int, chunk: bytes) -> str | bytes:
+        """Record one raw frame of *stream*; return the (decoded) part kept."""
+        stream = STDERR if stream == STDERR else STDOUT
+        data = chunk if self.binary else self._decoders[stream].decode(chunk)
+        return self.write(stream, data, len(chunk))
+
+    def write(self, stream: int, data: str | bytes, size: int | None = None) -> str | bytes:
+        """Record already-decoded *data* of *stream*; return the part kept."""
+        kept = self.combined.write(data, size)
+        if kept:
+            (self.stderr if stream == STDERR else self.stdout).write(kept)
+        return kept
+
+    def finish(self) -> list[tuple[int, str]]:
+        """Flush the decoders; returns any trailing text kept, per stream."""
+        if self.binary:
+            return []
+        tail = []
+        for stream, decoder in self._decoders.items():
+            text = decoder.decode(b"", final=True)
+            if text:
+                kept = self.write(stream, text)
+                if kept:
+                    tail.append((stream, kept))
+        return tail
+
+    def close(self) -> None:
+        self.combined.close()
+
+
+def _prune_spills(directory: Path, min_age: float = SPILL_MIN_AGE) -> None:
+    """Delete the oldest spill files beyond the newest :data:`MAX_SPILL_FILES` - 1.
+
+    Other runs, in this process or another, may still be writing or
+    returning theirs, so only files untouched for *min_age* seconds and
+    not open here are deleted; the directory may briefly exceed the limit.
+    """
+    spills = []
+    for path in directory.glob("*.log.gz"):
+        try:
+            spills.append((path.stat().st_mtime, path))
+        except OSError:
+            continue  # pruned by someone else meanwhile
+    spills.sort()
+    cutoff = time.time() - min_age
+    with _open_spills_lock:
+        open_here = set(_open_spills)
+    for mtime, old in spills[: max(len(spills) - MAX_SPILL_FILES + 1, 0)]:
+        if mtime < cutoff and old not in open_here:
+            old.unlink(missing_ok=True)
@@ -0,0 +1,204 @@
+"""Compile caches — named volumes for toolchain caches and prebuilt Go binaries."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shlex
+import threading
+import time
+from typing import TYPE_CHECKING
+
+from safebox.config.constants import (
+    COMPILE_CACHE_DIR,
+    COMPILE_CACHE_ENV,
+    COMPILE_CACHE_LABEL,
+    GO_BINARY_DIR,
+    GO_BUILD_FLAGS,
+    SAFEBOX_LABEL,
+    SAFEBOX_LABEL_VALUE,
+    SANDBOX_DIR,
+)
+from safebox.config.settings import GO_BUILDS_FILE
+
+if TYPE_CHECKING:
+    from docker import DockerClient
+
+    from safebox.core.container import ContainerConfig
+
+_lock = threading.Lock()
+_volumes: set[str] = set()
+
+
+def volume_name(kind: str, config: ContainerConfig) -> str:
+    """Name of the *kind* cache volume for *config*'s language and image.
+
+    Volumes are namespaced by image ID so different toolchain versions
+    never share compiled artifacts.
+    """
+    image = config.image_ref.removeprefix("sha256:")
+    if not all(c in "0123456789abcdef" for c in image):
+        image = hashlib.sha256(image.encode()).hexdigest()
+    return f"safebox-{kind}-{config.language}-{image[:12]}"
+
+
+def cache_mounts(config: ContainerConfig) -> dict[str, dict[str, str]]:
+    """Cache volumes to mount into *config*'s run container.
+
+    The Go binary volume is always read-only there; only the opt-in
+    bytecode caches of :data:`COMPILE_CACHE_ENV` languages are writable.
+    """
+    mounts = {}
+    if config.binary:
+        mounts[volume_name("bin", config)] = {"bind": GO_BINARY_DIR, "mode": "ro"}
+    if config.compile_cache and config.language in COMPILE_CACHE_ENV:
+        mounts[volume_name("cache", config)] = {
+            "bind": f"{COMPILE_CACHE_DIR}/{config.language}",
+            "mode": "rw",
+        }
+    return mounts
+
+
+def cache_environment(config: ContainerConfig) -> dict[str, str]:
+    """Environment pointing the runtime at its bytecode cache volume, if enabled."""
+    variable = COMPILE_CACHE_ENV.get(config.language)
+    if not config.compile_cache or variable is None:
+        return {}
+    return {variable: f"{COMPILE_CACHE_DIR}/{config.language}"}
+
+
+def ensure_cache_volumes(config: ContainerConfig, client: DockerClient) -> None:
+    """Create (labelled) the volumes :func:`cache_mounts` refers to, once per process."""
+    for name in cache_mounts(config):
+        _ensure_volume(client, name)
+
+
+def go_binary_key(config: ContainerConfig) -> str:
+    """Hash of the Go source, toolchain image and build flags."""
+    digest = hashlib.sha256()
+    digest.update(config.script_path.read_bytes())
+    digest.update(f"\0{config.image_ref}\0{' '.join(GO_BUILD_FLAGS)}".encode())
+    return digest.hexdigest()
+
+
+def binary_command(config: ContainerConfig, fallback: str) -> str:
+    """Shell command that runs the cached binary, or *fallback* if it vanished."""
+    binary = shlex.quote(config.binary)
+    script = f'[ -x {binary} ] && exec {binary} "$@"; exec {fallback} "$@"'
+    return f"sh -c {shlex.quote(script)} {shlex.quote(config.script_name)}"
+
+
+def prepare_go_binary(config: ContainerConfig, client: DockerClient) -> str:
+    """Return the in-container path of *config*'s compiled binary, building it if needed.
+
+    The build runs in its own network-less container with cgo disabled,
+    which is the only place the shared ``GOCACHE`` and binary volumes are
+    writable; untrusted code never runs there.  Returns ``""`` when the
+    build fails (e.g. a compile error) or times out, so the caller falls
+    back to ``go run`` and the user sees the compiler's own output.
+    """
+    key = go_binary_key(config)
+    path = f"{GO_BINARY_DIR}/{key}"
+    if _is_built(key):
+        return path
+
+    bin_volume = volume_name("bin", config)
+    go_cache = volume_name("gocache", config)
+    _ensure_volume(client, bin_volume)
+    _ensure_volume(client, go_cache)
+
+    source = f"{SANDBOX_DIR}/{config.script_name}"
+    build = (
+        f"go build {' '.join(GO_BUILD_FLAGS)} -o {path}.tmp.$$ {shlex.quote(source)} "
+        f"&& mv {path}.tmp.$$ {path}"
+    )
+    container = client.containers.run(
+        image=config.image_ref,
+        command=["sh", "-c", build],
+        detach=True,
+        mem_limit=config.memory,
+        nano_cpus=int(config.cpus * 1_000_000_000),
+        pids_limit=config.pids_limit,
+        network_disabled=True,
+        volumes={
+            str(config.script_path.resolve()): {"bind": source, "mode": "ro"},
+            bin_volume: {"bind": GO_BINARY_DIR, "mode": "rw"},
+            go_cache: {"bind": f"{COMPILE_CACHE_DIR}/go", "mode": "rw"},
+        },
+        environment={
+            "GOCACHE": f"{COMPILE_CACHE_DIR}/go",
+            "CGO_ENABLED": "0",
+            "GOTOOLCHAIN": "local",
+        },
+        working_dir=SANDBOX_DIR,
+        labels={SAFEBOX_LABEL: SAFEBOX_LABEL_VALUE, COMPILE_CACHE_LABEL: "build"},
+    )
+    try:
+        status = container.wait(timeout=config.timeout).get("StatusCode")
+    except Exception:
+        status = None
+    finally:
+        try:
+            container.remove(force=True)
+        except Exception:
+            pass
+
+    if status != 0:
+        return ""
+    _record_build(key, config.image_ref)
+    return path
+
+
+def remove_compile_caches(client: DockerClient) -> int:
+    """Delete every SafeBox cache volume and forget all built binaries.
+
+    Volumes still mounted by a running container are left alone.
+    Returns the number of volumes removed.
+    """
+    removed = 0
+    for volume in client.volumes.list(filters={"label": COMPILE_CACHE_LABEL}):
+        try:
+            volume.remove()
+            removed += 1
+        except Exception:
+            pass
+    with _lock:
+        _volumes.clear()
+        GO_BUILDS_FILE.unlink(missing_ok=True)
+    return removed
+
+
+def _ensure_volume(client: DockerClient, name: str) -> None:
+    if name in _volumes:
+        return
+    kind = name.split("-")[1]
+    client.volumes.create(
+        name=name, labels={SAFEBOX_LABEL: SAFEBOX_LABEL_VALUE, COMPILE_CACHE_LABEL: kind}
+    )
+    _volumes.add(name)
+
+
+def _load_builds() -> dict[str, dict]:
+    try:
+        return json.loads(GO_BUILDS_FILE.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def _is_built(key: str) -> bool:
+    with _lock:
+        return key in _load_builds()
+
+
+def _record_build(key: str, image_id: str) -> None:
+    with _lock:
+        builds = _load_builds()
+        builds[key] = {"image_id": image_id, "built_at": time.time()}
+        tmp = GO_BUILDS_FILE.with_name(f".{GO_BUILDS_FILE.name}.{os.getpid()}.tmp")
+        try:
+            GO_BUILDS_FILE.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_text(json.dumps(builds, indent=2))
+            os.replace(tmp, GO_BUILDS_FILE)
+        except OSError:
+            tmp.unlink(missing_ok=True)
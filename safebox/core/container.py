@@ -2,19 +2,33 @@
 
 from __future__ import annotations
 
+import io
+import shlex
+import tarfile
 from dataclasses import dataclass, field
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 from safebox.config.constants import (
     DEFAULT_CPUS,
+    DEFAULT_KILL_GRACE,
     DEFAULT_MEMORY,
     DEFAULT_PIDS_LIMIT,
     DEFAULT_TIMEOUT,
     ENTRYPOINT_MAP,
+    POOL_KEEPALIVE_COMMAND,
+    POOL_LABEL,
     SAFEBOX_LABEL,
     SAFEBOX_LABEL_VALUE,
     SANDBOX_DIR,
+    SESSION_LABEL,
 )
+from safebox.core.compile_cache import binary_command, cache_environment, cache_mounts
+from safebox.utils.validators import parse_memory_bytes
+
+if TYPE_CHECKING:
+    from docker import APIClient
+    from docker.models.containers import Container
 
 
 @dataclass
@@ -30,33 +44,69 @@ class ContainerConfig:
     cpus: float = DEFAULT_CPUS
     timeout: int = DEFAULT_TIMEOUT
     pids_limit: int = DEFAULT_PIDS_LIMIT
+    kill_grace: float = DEFAULT_KILL_GRACE
+    """Seconds between SIGTERM and SIGKILL at the deadline; ``0`` kills at once."""
+    cpuset_cpus: str = ""
+    """Cores the run is pinned to (``0-3``); empty lets it float."""
+    cpuset_mems: str = ""
+    """NUMA memory nodes the run allocates from; empty for any."""
 
     remove: bool = True
 
     environment: dict[str, str] = field(default_factory=dict)
     extra_args: str = ""
 
+    image_ref: str = ""
+    """Pinned reference actually run (image ID); defaults to ``image``."""
+
+    compile_cache: bool = False
+    """Mount the shared, writable bytecode cache volume (Python, Node)."""
+
+    binary: str = ""
+    """In-container path of a prebuilt executable to run instead (Go)."""
+
+    upload_script: bool = False
+    """Copy the script in with :func:`upload_script` instead of bind-mounting
+    it, for daemons that do not share this machine's filesystem."""
+
     def __post_init__(self) -> None:
         if not self.script_name:
             self.script_name = self.script_path.name
+        if not self.image_ref:
+            self.image_ref = self.image
+
+
+def build_command(config: ContainerConfig) -> str:
+    """Return the interpreter command line that runs the script.
+
+    With a prebuilt :attr:`~ContainerConfig.binary` the binary is run
+    directly, falling back to the interpreter if it has disappeared.
+    """
+    entrypoint = ENTRYPOINT_MAP.get(config.language, config.language)
+    command = f"{entrypoint} {SANDBOX_DIR}/{config.script_name}"
+    if config.binary:
+        command = binary_command(config, command)
+    if config.extra_args:
+        command += f" {config.extra_args}"
+    return command
 
 
 def build_container_kwargs(config: ContainerConfig) -> dict:
     """Translate a :class:`ContainerConfig` into kwargs for
     ``client.containers.run()``.
     """
-    entrypoint = ENTRYPOINT_MAP.get(config.language, config.language)
     script_dest = f"{SANDBOX_DIR}/{config.script_name}"
-    command = f"{entrypoint} {script_dest}"
-    if config.extra_args:
-        command += f" {config.extra_args}"
+    command = build_command(config)
 
     nano_cpus = int(config.cpus * 1_000_000_000)
 
-    host_script = str(config.script_path.resolve())
+    volumes = cache_mounts(config)
+    if not config.upload_script:
+        host_script = str(config.script_path.resolve())
+        volumes = {host_script: {"bind": script_dest, "mode": "ro"}, **volumes}
 
     kwargs: dict = {
-        "image": config.image,
+        "image": config.image_ref,
         "command": command,
         "detach": True,
         "stdout": True,
@@ -64,21 +114,152 @@ def build_container_kwargs(config: ContainerConfig) -> dict:
         "mem_limit": config.memory,
         "nano_cpus": nano_cpus,
         "pids_limit": config.pids_limit,
-        "volumes": {
-            host_script: {
-                "bind": script_dest,
-                "mode": "ro",
-            },
-        },
+        "volumes": volumes,
         "working_dir": SANDBOX_DIR,
         "labels": {
             SAFEBOX_LABEL: SAFEBOX_LABEL_VALUE,
             "safebox.language": config.language,
             "safebox.script": config.script_name,
+            "safebox.image": config.image,
         },
     }
 
-    if config.environment:
-        kwargs["environment"] = config.environment
+    environment = container_environment(config)
+    if environment:
+        kwargs["environment"] = environment
+    if config.kill_grace:
+        kwargs["init"] = True  # the script is not PID 1, so SIGTERM's default action applies
+    if config.cpuset_cpus:
+        kwargs["cpuset_cpus"] = config.cpuset_cpus
+    if config.cpuset_mems:
+        kwargs["cpuset_mems"] = config.cpuset_mems
+
+    return kwargs
+
 
+def container_environment(config: ContainerConfig) -> dict[str, str]:
+    """The run's environment: compile-cache variables, then the user's own."""
+    return {**cache_environment(config), **config.environment}
+
+
+def build_pool_container_kwargs(config: ContainerConfig, pool_key: str) -> dict:
+    """Kwargs for an idle, pre-started pool container.
+
+    Same image, limits, labels and cache volumes as
+    :func:`build_container_kwargs`, but no script is mounted and the
+    command just keeps the container alive so scripts can be injected
+    and ``exec``-ed into it later.
+    """
+    kwargs = build_container_kwargs(config)
+    kwargs["volumes"] = cache_mounts(config)
+    if not kwargs["volumes"]:
+        del kwargs["volumes"]
+    kwargs.pop("environment", None)
+    kwargs.pop("cpuset_cpus", None)  # each run is pinned when it takes the container
+    kwargs.pop("cpuset_mems", None)
+    kwargs["command"] = list(POOL_KEEPALIVE_COMMAND)
+    kwargs["init"] = True
+    kwargs["labels"] = {
+        SAFEBOX_LABEL: SAFEBOX_LABEL_VALUE,
+        POOL_LABEL: pool_key,
+    }
     return kwargs
+
+
+def build_session_container_kwargs(config: ContainerConfig) -> dict:
+    """Kwargs for a :class:`~safebox.core.session.Sandbox` container.
+
+    Kept alive like a pool container, but labelled as a session of
+    *config*'s language and image rather than as a pool member.
+    """
+    kwargs = build_pool_container_kwargs(config, "")
+    kwargs["labels"] = {
+        SAFEBOX_LABEL: SAFEBOX_LABEL_VALUE,
+        SESSION_LABEL: "true",
+        "safebox.language": config.language,
+        "safebox.image": config.image,
+    }
+    return kwargs
+
+
+def build_create_body(kwargs: dict) -> dict:
+    """Translate :func:`build_container_kwargs` output into an Engine API
+    ``POST /containers/create`` body, for clients that bypass docker-py.
+    """
+    known = {
+        "image", "command", "detach", "stdout", "stderr", "mem_limit", "nano_cpus",
+        "pids_limit", "volumes", "working_dir", "labels", "environment", "init",
+        "cpuset_cpus", "cpuset_mems",
+    }
+    unknown = set(kwargs) - known
+    if unknown:
+        raise ValueError(f"Cannot translate container kwargs: {', '.join(sorted(unknown))}")
+
+    command = kwargs["command"]
+    host_config: dict = {
+        "Memory": parse_memory_bytes(kwargs["mem_limit"]),
+        "NanoCpus": kwargs["nano_cpus"],
+        "PidsLimit": kwargs["pids_limit"],
+        "Binds": [
+            f"{host}:{spec['bind']}:{spec['mode']}"
+            for host, spec in kwargs.get("volumes", {}).items()
+        ],
+    }
+    if kwargs.get("init"):
+        host_config["Init"] = True
+    if kwargs.get("cpuset_cpus"):
+        host_config["CpusetCpus"] = kwargs["cpuset_cpus"]
+    if kwargs.get("cpuset_mems"):
+        host_config["CpusetMems"] = kwargs["cpuset_mems"]
+
+    return {
+        "Image": kwargs["image"],
+        "Cmd": shlex.split(command) if isinstance(command, str) else list(command),
+        "WorkingDir": kwargs["working_dir"],
+        "Labels": kwargs["labels"],
+        "Env": [f"{key}={value}" for key, value in kwargs.get("environment", {}).items()],
+        "AttachStdout": True,
+        "AttachStderr": True,
+        "HostConfig": host_config,
+    }
+
+
+def inject_script(
+    container: Container, config: ContainerConfig, source: bytes | None = None
+) -> None:
+    """Copy the script into *container* at ``SANDBOX_DIR`` (read-only file).
+
+    With *source*, that is written under the script's name instead of
+    the contents of :attr:`~ContainerConfig.script_path`.
+    """
+    container.put_archive(SANDBOX_DIR, _script_archive(config, source=source))
+
+
+def upload_script(api: APIClient, container_id: str, config: ContainerConfig) -> None:
+    """Copy the script into a created, not yet started container.
+
+    Unlike :func:`inject_script` this does not need ``SANDBOX_DIR`` to
+    exist in the image: the archive creates it.
+    """
+    sandbox = SANDBOX_DIR.strip("/")
+    api.put_archive(container_id, "/", _script_archive(config, prefix=f"{sandbox}/"))
+
+
+def _script_archive(
+    config: ContainerConfig, prefix: str = "", source: bytes | None = None
+) -> bytes:
+    """A tar of the script (read-only), under *prefix* if given."""
+    data = config.script_path.read_bytes() if source is None else source
+    info = tarfile.TarInfo(name=prefix + config.script_name)
+    info.size = len(data)
+    info.mode = 0o444
+
+    buf = io.BytesIO()
+    with tarfile.open(fileobj=buf, mode="w") as tar:
+        if prefix:
+            directory = tarfile.TarInfo(name=prefix.rstrip("/"))
+            directory.type = tarfile.DIRTYPE
+            directory.mode = 0o755
+            tar.addfile(directory)
+        tar.addfile(info, io.BytesIO(data))
+    return buf.getvalue()
@@ -0,0 +1,295 @@
+"""Dependency layers — derived images with a script's third-party packages installed."""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import os
+import re
+import tarfile
+import threading
+import time
+import tomllib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from docker.errors import BuildError, DockerException, ImageNotFound
+
+from safebox.config.constants import (
+    DEFAULT_DEPS_IMAGE_LIMIT,
+    DEPS_DIR,
+    DEPS_IMAGE_REPO,
+    DEPS_LABEL,
+    SAFEBOX_LABEL,
+    SAFEBOX_LABEL_VALUE,
+)
+from safebox.config.settings import DEPS_INDEX_FILE
+from safebox.core.docker_client import get_client
+from safebox.output.console import err_console
+
+if TYPE_CHECKING:
+    from docker import DockerClient
+
+_PEP723 = re.compile(
+    r"(?m)^# /// (?P<type>[a-zA-Z0-9-]+)$\s(?P<content>(^#(| .*)$\s)+)^# ///$"
+)
+
+_lock = threading.Lock()
+_builds: dict[str, threading.Lock] = {}
+
+
+class DependencyError(Exception):
+    """Raised when a dependency manifest is invalid or its image fails to build."""
+
+
+@dataclass
+class DependencySpec:
+    """A script's third-party dependencies, as files to install from.
+
+    *files* maps file names in the build context (``requirements.txt``,
+    ``package.json``, ``package-lock.json``) to their contents; *source*
+    is where they were found, for messages.
+    """
+
+    language: str
+    files: dict[str, bytes] = field(default_factory=dict)
+    source: str = ""
+
+    @property
+    def digest(self) -> str:
+        """Hash of the dependency set — equal specs share one image."""
+        h = hashlib.sha256(self.language.encode())
+        for name in sorted(self.files):
+            h.update(f"\0{name}\0".encode())
+            h.update(self.files[name])
+        return h.hexdigest()
+
+
+def find_dependencies(
+    script_path: Path, language: str, requirements: Path | None = None
+) -> DependencySpec | None:
+    """Locate *script_path*'s dependency manifest, if it has one.
+
+    An explicit *requirements* file wins.  Otherwise Python scripts are
+    checked for inline PEP 723 ``# /// script`` metadata, then for a
+    ``requirements.txt`` next to them; Node scripts for a
+    ``package.json`` (plus ``package-lock.json``) next to them.
+    """
+    if requirements is not None:
+        if language == "node" or requirements.name == "package.json":
+            return _node_spec(requirements)
+        return DependencySpec(
+            language, {"requirements.txt": _read(requirements)}, str(requirements)
+        )
+
+    directory = script_path.parent
+    if language == "python":
+        inline = _pep723_dependencies(script_path)
+        if inline is not None:
+            if not inline:
+                return None
+            text = "\n".join(inline) + "\n"
+            return DependencySpec(
+                language, {"requirements.txt": text.encode()}, f"{script_path.name} (PEP 723)"
+            )
+        candidate = directory / "requirements.txt"
+        if candidate.is_file():
+            return DependencySpec(language, {"requirements.txt": _read(candidate)}, str(candidate))
+    elif language == "node":
+        candidate = directory / "package.json"
+        if candidate.is_file():
+            return _node_spec(candidate)
+    return None
+
+
+def dependency_tag(spec: DependencySpec, base_ref: str) -> str:
+    """Image tag for *spec* installed on top of *base_ref*."""
+    digest = hashlib.sha256(f"{base_ref}\0{spec.digest}".encode()).hexdigest()
+    return f"{DEPS_IMAGE_REPO}/{spec.language}:{digest[:16]}"
+
+
+def ensure_dependency_image(
+    spec: DependencySpec, base_ref: str, *, client: DockerClient | None = None
+) -> str:
+    """Return the ID of the image with *spec* installed on *base_ref*.
+
+    The image is built once per dependency set and base image and reused
+    afterwards; concurrent callers wait for a single build.  Building
+    prunes the least recently used derived images beyond
+    :data:`DEFAULT_DEPS_IMAGE_LIMIT`.
+    """
+    client = client or get_client()
+    tag = dependency_tag(spec, base_ref)
+    with _lock:
+        build_lock = _builds.setdefault(tag, threading.Lock())
+
+    with build_lock:
+        try:
+            image = client.images.get(tag)
+        except ImageNotFound:
+            image = _build(client, spec, base_ref, tag)
+            _touch(tag, image.id, image.attrs.get("Size", 0))
+            prune_dependency_images(client=client)
+        else:
+            _touch(tag, image.id, image.attrs.get("Size", 0))
+    return image.id
+
+
+def prune_dependency_images(
+    keep: int = DEFAULT_DEPS_IMAGE_LIMIT, *, client: DockerClient | None = None
+) -> list[str]:
+    """Remove all but the *keep* most recently used dependency images.
+
+    Images still in use by a container are skipped.  Returns the tags
+    removed.
+    """
+    client = client or get_client()
+    index = _load_index()
+    images = client.images.list(filters={"label": DEPS_LABEL})
+    tags = [t for image in images for t in image.tags if t.startswith(f"{DEPS_IMAGE_REPO}/")]
+    tags.sort(key=lambda t: index.get(t, {}).get("last_used", 0), reverse=True)
+
+    removed = []
+    for tag in tags[keep:]:
+        try:
+            client.images.remove(tag, noprune=False)
+        except DockerException:
+            continue
+        removed.append(tag)
+    if removed:
+        with _lock:
+            index = _load_index()
+            for tag in removed:
+                index.pop(tag, None)
+            _save_index(index)
+    return removed
+
+
+def _build(client: DockerClient, spec: DependencySpec, base_ref: str, tag: str):
+    context = _build_context(spec, base_ref)
+    with err_console.status(f"[bold cyan]Installing dependencies from [yellow]{spec.source}[/]…"):
+        try:
+            image, _ = client.images.build(
+                fileobj=context,
+                custom_context=True,
+                tag=tag,
+                labels={
+                    SAFEBOX_LABEL: SAFEBOX_LABEL_VALUE,
+                    DEPS_LABEL: spec.digest,
+                },
+                rm=True,
+                forcerm=True,
+                pull=False,
+            )
+        except BuildError as exc:
+            log = "".join(
+                chunk.get("stream", "") for chunk in exc.build_log if isinstance(chunk, dict)
+            )
+            tail = "\n".join(log.strip().splitlines()[-15:])
+            raise DependencyError(
+                f"Installing dependencies from {spec.source} failed: {exc.msg}\n{tail}"
+            ) from exc
+        except DockerException as exc:
+            raise DependencyError(
+                f"Installing dependencies from {spec.source} failed: {exc}"
+            ) from exc
+    err_console.print(f"  [green]✓[/] Dependencies installed → [yellow]{tag}[/]")
+    return image
+
+
+def _build_context(spec: DependencySpec, base_ref: str) -> io.BytesIO:
+    """A tar build context: the manifest files plus a generated Dockerfile."""
+    if spec.language == "node":
+        lock = "package-lock.json" in spec.files
+        install = "npm ci" if lock else "npm install"
+        dockerfile = (
+            f"FROM {base_ref}\n"
+            f"WORKDIR {DEPS_DIR}\n"
+            f"COPY {' '.join(sorted(spec.files))} ./\n"
+            f"RUN {install} --omit=dev --no-audit --no-fund && npm cache clean --force "
+            f"&& ln -s {DEPS_DIR}/node_modules /node_modules\n"
+        )
+    else:
+        dockerfile = (
+            f"FROM {base_ref}\n"
+            f"COPY requirements.txt {DEPS_DIR}/requirements.txt\n"
+            "RUN pip install --no-cache-dir --disable-pip-version-check "
+            f"-r {DEPS_DIR}/requirements.txt\n"
+        )
+
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w") as tar:
+        for name, data in {**spec.files, "Dockerfile": dockerfile.encode()}.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            info.mode = 0o644
+            tar.addfile(info, io.BytesIO(data))
+    buffer.seek(0)
+    return buffer
+
+
+def _pep723_dependencies(script_path: Path) -> list[str] | None:
+    """``dependencies`` of the script's PEP 723 block; ``None`` without one."""
+    try:
+        text = script_path.read_text(encoding="utf-8", errors="replace")
+    except OSError:
+        return None
+    blocks = [m for m in _PEP723.finditer(text) if m.group("type") == "script"]
+    if not blocks:
+        return None
+    if len(blocks) > 1:
+        raise DependencyError(f"{script_path.name}: multiple '# /// script' blocks.")
+    content = "".join(
+        line[2:] if line.startswith("# ") else line[1:]
+        for line in blocks[0].group("content").splitlines(keepends=True)
+    )
+    try:
+        metadata = tomllib.loads(content)
+    except tomllib.TOMLDecodeError as exc:
+        raise DependencyError(f"{script_path.name}: invalid PEP 723 metadata: {exc}") from exc
+    dependencies = metadata.get("dependencies", [])
+    if not isinstance(dependencies, list) or not all(isinstance(d, str) for d in dependencies):
+        raise DependencyError(f"{script_path.name}: 'dependencies' must be a list of strings.")
+    return dependencies
+
+
+def _node_spec(package_json: Path) -> DependencySpec:
+    files = {"package.json": _read(package_json)}
+    lock = package_json.with_name("package-lock.json")
+    if lock.is_file():
+        files["package-lock.json"] = _read(lock)
+    return DependencySpec("node", files, str(package_json))
+
+
+def _read(path: Path) -> bytes:
+    try:
+        return path.read_bytes()
+    except OSError as exc:
+        raise DependencyError(f"Cannot read dependency manifest {path}: {exc}") from exc
+
+
+def _load_index() -> dict[str, dict]:
+    try:
+        return json.loads(DEPS_INDEX_FILE.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_index(index: dict[str, dict]) -> None:
+    tmp = DEPS_INDEX_FILE.with_name(f".{DEPS_INDEX_FILE.name}.{os.getpid()}.tmp")
+    try:
+        DEPS_INDEX_FILE.parent.mkdir(parents=True, exist_ok=True)
+        tmp.write_text(json.dumps(index, indent=2))
+        os.replace(tmp, DEPS_INDEX_FILE)
+    except OSError:
+        tmp.unlink(missing_ok=True)
+
+
+def _touch(tag: str, image_id: str, size: int) -> None:
+    """Record a use of *tag* for LRU pruning."""
+    with _lock:
+        index = _load_index()
+        index[tag] = {"image_id": image_id, "size": size, "last_used": time.time()}
+        _save_index(index)
@@ -0,0 +1,330 @@
+"""Multi-daemon dispatch — spread runs over several Docker endpoints."""
+
+from __future__ import annotations
+
+import contextlib
+import threading
+import time
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Iterable, Iterator
+
+from requests.exceptions import ConnectionError as RequestsConnectionError
+
+from safebox.config.constants import (
+    DISPATCH_HEALTH_INTERVAL,
+    DISPATCH_HEALTH_TIMEOUT,
+    DISPATCH_IMAGE_MISS_COST,
+)
+from safebox.core.docker_client import DockerNotAvailableError, connect, use_client
+from safebox.core.events import EventStream, use_events
+from safebox.core.images import endpoint_image_cache, use_image_cache
+from safebox.core.scheduler import Resources, host_budget
+from safebox.core.tracing import record
+
+if TYPE_CHECKING:
+    from docker import DockerClient
+
+UNREACHABLE = (RequestsConnectionError, DockerNotAvailableError)
+"""Errors that mean the endpoint itself is down, not that the run failed."""
+
+LOCAL_SCHEMES = ("unix://", "npipe://")
+"""Endpoints on this machine, which can bind-mount its files."""
+
+
+class EndpointsUnavailableError(DockerNotAvailableError):
+    """Raised when no Docker endpoint is healthy."""
+
+
+def parse_endpoint(spec: str) -> tuple[str, float]:
+    """Split ``URL`` or ``URL=WEIGHT`` into the URL and its capacity weight."""
+    url, sep, weight = spec.rpartition("=")
+    if not sep:
+        return spec, 1.0
+    try:
+        value = float(weight)
+    except ValueError:
+        return spec, 1.0
+    if value <= 0:
+        raise ValueError(f"Endpoint weight must be positive: {spec}")
+    return url, value
+
+
+class Endpoint:
+    """One Docker daemon: its connection, health and load.
+
+    *weight* is its capacity relative to the other endpoints; a weight
+    of ``2`` takes twice the runs of a weight of ``1``.  *images* holds
+    the tags known to be present there, and :attr:`image_cache` its own
+    tag → image ID resolutions.
+    """
+
+    def __init__(self, url: str, weight: float = 1.0) -> None:
+        self.url = url
+        self.weight = weight
+        self.healthy = False
+        self.error = ""
+        self.active = 0
+        self.runs = 0
+        self.failures = 0
+        self.images: set[str] = set()
+        self.image_cache = endpoint_image_cache(url)
+        self._client: DockerClient | None = None
+        self._events: EventStream | None = None
+
+    @property
+    def remote(self) -> bool:
+        """Whether the daemon runs elsewhere, so scripts must be copied in."""
+        return not self.url.startswith(LOCAL_SCHEMES)
+
+    @property
+    def client(self) -> DockerClient:
+        if self._client is None:
+            raise DockerNotAvailableError(f"Not connected to {self.url}: {self.error}")
+        return self._client
+
+    @property
+    def events(self) -> EventStream:
+        """This daemon's own events stream, opened on first use."""
+        if self._events is None or self._events.client is not self.client:
+            self._events = EventStream(self.client)
+        return self._events
+
+    def check(self) -> bool:
+        """Ping the daemon and record the result; returns whether it answered."""
+        error = self.ping()
+        if error is None:
+            self.mark_up()
+        else:
+            self.mark_down(error)
+        return error is None
+
+    def ping(self) -> Exception | None:
+        """Ping the daemon, connecting first if needed; returns the error, if any.
+
+        Leaves :attr:`healthy` alone, so a dispatcher can apply the
+        result under its lock.  A new connection also lists the
+        daemon's images, for locality.
+        """
+        try:
+            if self._client is None:
+                client = connect(self.url)
+                self.images = {
+                    tag for image in client.api.images() for tag in image.get("RepoTags") or []
+                }
+                self._client = client
+            else:
+                api = self._client.api
+                api.get(api._url("/_ping"), timeout=DISPATCH_HEALTH_TIMEOUT).raise_for_status()
+        except Exception as exc:
+            return exc
+        return None
+
+    def mark_up(self) -> None:
+        self.healthy, self.error = True, ""
+
+    def mark_down(self, exc: BaseException) -> None:
+        if self.healthy:
+            self.failures += 1
+        self.healthy, self.error = False, str(exc) or type(exc).__name__
+
+    def close(self) -> None:
+        if self._events is not None:
+            self._events.close()
+        if self._client is not None:
+            try:
+                self._client.close()
+            except Exception:
+                pass
+
+    def to_dict(self) -> dict:
+        return {
+            "url": self.url,
+            "weight": self.weight,
+            "healthy": self.healthy,
+            "active": self.active,
+            "runs": self.runs,
+            "failures": self.failures,
+            "images": len(self.images),
+            "error": self.error,
+        }
+
+
+class Lease:
+    """A run's claim on an endpoint; binds the endpoint's client and image cache while held."""
+
+    def __init__(self, dispatcher: Dispatcher, image: str, endpoint: Endpoint) -> None:
+        self.image = image
+        self.endpoint = endpoint
+        self._dispatcher = dispatcher
+        self._tried = {id(endpoint)}
+        self._binding = contextlib.ExitStack()
+
+    def failover(self, exc: BaseException) -> Endpoint:
+        """Mark this endpoint down after *exc* and move to another healthy one.
+
+        Only safe before the run's container has started.  Raises
+        :class:`EndpointsUnavailableError` when there is none left to try.
+        """
+        self._dispatcher._down(self.endpoint, exc)
+        endpoint = self._dispatcher._acquire(self.image, exclude=self._tried)
+        self._dispatcher._release(self.endpoint)
+        self._tried.add(id(endpoint))
+        self.endpoint = endpoint
+        self._bind()
+        return endpoint
+
+    def _bind(self) -> None:
+        self._binding.close()
+        self._binding = contextlib.ExitStack()
+        self._binding.enter_context(use_client(self.endpoint.client))
+        self._binding.enter_context(use_events(self.endpoint.events))
+        self._binding.enter_context(use_image_cache(self.endpoint.image_cache))
+
+
+_current_lease: ContextVar[Lease | None] = ContextVar("safebox_lease", default=None)
+
+
+def current_lease() -> Lease | None:
+    """The :class:`Lease` of the run in progress in this context, if dispatched."""
+    return _current_lease.get()
+
+
+class Dispatcher:
+    """Load-balance runs across several Docker endpoints.
+
+    Each run goes to the healthy endpoint with the lowest load for its
+    weight, counting an endpoint that lacks the run's image as
+    :data:`DISPATCH_IMAGE_MISS_COST` runs busier (it would have to pull
+    first).  Endpoints are pinged every *health_interval* seconds; one
+    that fails a ping or drops a connection mid-run is skipped until it
+    answers again, and a run whose container could not be started there
+    moves to another endpoint.  There is no failover once a container
+    has started: a run in flight on an endpoint that dies fails with the
+    connection error, and the caller decides whether to run it again.
+    """
+
+    def __init__(
+        self, endpoints: Iterable[Endpoint], health_interval: float = DISPATCH_HEALTH_INTERVAL
+    ) -> None:
+        self.endpoints = list(endpoints)
+        if not self.endpoints:
+            raise ValueError("A dispatcher needs at least one endpoint.")
+        self.health_interval = health_interval
+        self._lock = threading.Lock()
+        self._check_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @classmethod
+    def from_specs(cls, specs: Iterable[str], **kwargs) -> Dispatcher:
+        """Build from ``URL`` / ``URL=WEIGHT`` strings (see :func:`parse_endpoint`)."""
+        return cls([Endpoint(*parse_endpoint(spec)) for spec in specs], **kwargs)
+
+    def start(self) -> Dispatcher:
+        """Check every endpoint now, then keep checking in the background."""
+        self.check()
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._health_loop, name="safebox-dispatch", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def close(self) -> None:
+        self._stop.set()
+        for endpoint in self.endpoints:
+            endpoint.close()
+
+    def __enter__(self) -> Dispatcher:
+        return self.start()
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def check(self) -> None:
+        """Ping every endpoint once.
+
+        The pings run outside :attr:`_lock`, so a slow endpoint never
+        holds up :meth:`lease`; each result is applied under it.
+        """
+        with self._check_lock:
+            for endpoint in self.endpoints:
+                error = endpoint.ping()
+                with self._lock:
+                    if error is None:
+                        endpoint.mark_up()
+                    else:
+                        endpoint.mark_down(error)
+
+    @contextlib.contextmanager
+    def lease(self, image: str = "") -> Iterator[Lease]:
+        """Run the block on the best endpoint for *image*.
+
+        :func:`~safebox.core.docker_client.get_client` and
+        :func:`~safebox.core.events.get_events` return that endpoint's
+        client and stream inside the block, and
+        :func:`~safebox.core.images.get_image_cache` its image cache.  Raises
+        :class:`EndpointsUnavailableError` when no endpoint is healthy.
+        """
+        start = time.monotonic()
+        lease = Lease(self, image, self._acquire(image))
+        record("dispatch", start, time.monotonic(), endpoint=lease.endpoint.url)
+        token = _current_lease.set(lease)
+        try:
+            lease._bind()
+            yield lease
+        except UNREACHABLE as exc:
+            self._down(lease.endpoint, exc)
+            raise
+        else:
+            if image:
+                with self._lock:
+                    lease.endpoint.images.add(image)
+        finally:
+            lease._binding.close()
+            _current_lease.reset(token)
+            self._release(lease.endpoint)
+
+    def budget(self) -> Resources:
+        """The combined :func:`~safebox.core.scheduler.host_budget` of the healthy endpoints."""
+        with self._lock:
+            healthy = [e for e in self.endpoints if e.healthy]
+        return sum((host_budget(e.client) for e in healthy), Resources())
+
+    def stats(self) -> list[dict]:
+        """One entry per endpoint: health, load, runs served and failures."""
+        with self._lock:
+            return [endpoint.to_dict() for endpoint in self.endpoints]
+
+    def _acquire(self, image: str, exclude: set[int] | None = None) -> Endpoint:
+        for attempt in range(2):
+            with self._lock:
+                candidates = [
+                    e for e in self.endpoints if e.healthy and id(e) not in (exclude or ())
+                ]
+                if candidates:
+                    endpoint = min(candidates, key=lambda e: self._load(e, image))
+                    endpoint.active += 1
+                    endpoint.runs += 1
+                    return endpoint
+            if attempt == 0:
+                self.check()  # all down; one may have come back since the last check
+        with self._lock:
+            reasons = "; ".join(f"{e.url}: {e.error or 'down'}" for e in self.endpoints)
+        raise EndpointsUnavailableError(f"No healthy Docker endpoint ({reasons}).")
+
+    def _load(self, endpoint: Endpoint, image: str) -> tuple[float, int]:
+        miss = DISPATCH_IMAGE_MISS_COST if image and image not in endpoint.images else 0
+        return (endpoint.active + 1 + miss) / endpoint.weight, self.endpoints.index(endpoint)
+
+    def _release(self, endpoint: Endpoint) -> None:
+        with self._lock:
+            endpoint.active -= 1
+
+    def _down(self, endpoint: Endpoint, exc: BaseException) -> None:
+        with self._lock:
+            endpoint.mark_down(exc)
+
+    def _health_loop(self) -> None:
+        while not self._stop.wait(self.health_interval):
+            self.check()
@@ -2,12 +2,18 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+import contextlib
+import threading
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Iterator
 
 import docker
 from docker.errors import DockerException, ImageNotFound
+from docker.transport import UnixHTTPAdapter
 
-from safebox.output.console import console
+from safebox.config.constants import DEFAULT_CLIENT_POOL_SIZE
+from safebox.core.tracing import span
+from safebox.output.console import err_console
 
 if TYPE_CHECKING:
     from docker import DockerClient
@@ -19,37 +25,110 @@ class DockerNotAvailableError(Exception):
 
 
 _client: DockerClient | None = None
+_client_lock = threading.Lock()
+_bound_client: ContextVar[DockerClient | None] = ContextVar("safebox_client", default=None)
+
+
+class _SharedPoolAdapter(UnixHTTPAdapter):
+    """docker-py's Unix-socket adapter with a single keep-alive pool.
+
+    Upstream keys connection pools by the full request URL, so every
+    container-specific endpoint opened a new socket and the pools of
+    earlier containers were evicted unused.  All URLs share one daemon
+    socket, so they can share one pool.
+    """
+
+    def get_connection(self, url, proxies=None):
+        return super().get_connection("http+docker://localhost", proxies)
 
 
 def get_client() -> DockerClient:
-    """Return a cached :class:`docker.DockerClient`.
+    """Return the process-wide :class:`docker.DockerClient`.
+
+    Creates the client on first call; concurrent first calls wait for a
+    single connection.  The client keeps up to
+    :data:`DEFAULT_CLIENT_POOL_SIZE` idle keep-alive connections, shared
+    by every thread.  Raises :class:`DockerNotAvailableError` with a
+    user-friendly message if Docker is unreachable.
 
-    Creates the client on first call.  Raises
-    :class:`DockerNotAvailableError` with a user-friendly message if
-    Docker is unreachable.
+    Inside :func:`use_client` the bound client is returned instead.
     """
     global _client
+    bound = _bound_client.get()
+    if bound is not None:
+        return bound
     if _client is not None:
         return _client
 
-    try:
-        _client = docker.from_env()
-        _client.ping()
-    except DockerException as exc:
-        raise DockerNotAvailableError(
-            "Could not connect to the Docker daemon. "
-            "Make sure Docker Desktop is running.\n"
-            f"  ↳ {exc}"
-        ) from exc
+    with _client_lock:
+        if _client is not None:
+            return _client
+        try:
+            with span("docker.connect"):
+                client = docker.from_env(max_pool_size=DEFAULT_CLIENT_POOL_SIZE)
+                _share_socket_pool(client)
+                client.ping()
+        except DockerException as exc:
+            raise DockerNotAvailableError(
+                "Could not connect to the Docker daemon. "
+                "Make sure Docker Desktop is running.\n"
+                f"  ↳ {exc}"
+            ) from exc
+        _client = client
 
     return _client
 
 
+def connect(base_url: str) -> DockerClient:
+    """Open a client for the daemon at *base_url* (``unix://``, ``tcp://``, ``ssh://``).
+
+    Pooled like :func:`get_client`'s.  Raises
+    :class:`DockerNotAvailableError` if the daemon does not answer.
+    """
+    try:
+        with span("docker.connect", endpoint=base_url):
+            client = docker.DockerClient(
+                base_url=base_url, max_pool_size=DEFAULT_CLIENT_POOL_SIZE
+            )
+            _share_socket_pool(client)
+            client.ping()
+    except Exception as exc:
+        raise DockerNotAvailableError(f"Could not connect to {base_url}: {exc}") from exc
+    return client
+
+
+@contextlib.contextmanager
+def use_client(client: DockerClient) -> Iterator[DockerClient]:
+    """Make :func:`get_client` return *client* in this thread (and context) until exit."""
+    token = _bound_client.set(client)
+    try:
+        yield client
+    finally:
+        _bound_client.reset(token)
+
+
+def _share_socket_pool(client: DockerClient) -> None:
+    """Swap a Unix-socket client's adapter for :class:`_SharedPoolAdapter`."""
+    api = client.api
+    adapter = getattr(api, "_custom_adapter", None)
+    if type(adapter) is not UnixHTTPAdapter:
+        return  # TCP/TLS hosts already pool per host; SSH and named pipes are left alone
+    shared = _SharedPoolAdapter(
+        f"http+unix://{adapter.socket_path}",
+        timeout=adapter.timeout,
+        max_pool_size=adapter.max_pool_size,
+    )
+    api.mount("http+docker://", shared)
+    api._custom_adapter = shared
+    adapter.close()
+
+
 def ensure_image(image: str, *, pull: bool = False) -> Image:
     """Make sure *image* is available locally.
 
     Pulls the image with a Rich status spinner when it is missing
-    (or when *pull* is ``True``).
+    (or when *pull* is ``True``).  Progress goes to stderr so that
+    ``--output jsonl``/``raw`` keep stdout machine-readable.
     """
     import warnings
 
@@ -59,20 +138,22 @@ def ensure_image(image: str, *, pull: bool = False) -> Image:
 
     if not pull:
         try:
-            return client.images.get(image)
+            with span("docker.images.get", image=image):
+                return client.images.get(image)
         except ImageNotFound:
             pass
 
-    with console.status(f"[bold cyan]Pulling image [yellow]{image}[/]…"):
+    with err_console.status(f"[bold cyan]Pulling image [yellow]{image}[/]…"):
         try:
-            img = client.images.pull(image)
+            with span("docker.images.pull", image=image):
+                img = client.images.pull(image)
         except DockerException as exc:
             raise ImagePullError(
                 f"Failed to pull image '{image}': {exc}\n"
                 "  Tip: Check your internet connection and Docker login."
             ) from exc
 
-    console.print(f"  [green]✓[/] Image [yellow]{image}[/] ready")
+    err_console.print(f"  [green]✓[/] Image [yellow]{image}[/] ready")
     return img
 
 
@@ -0,0 +1,260 @@
+"""Docker events — one ``/events`` subscription shared by every run in the process."""
+
+from __future__ import annotations
+
+import contextlib
+import threading
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Callable, Iterator
+
+from safebox.config.constants import SAFEBOX_LABEL, SAFEBOX_LABEL_VALUE
+from safebox.core.docker_client import get_client
+from safebox.core.streams import follow_events
+
+if TYPE_CHECKING:
+    from docker import DockerClient
+
+CONTAINER_ACTIONS = ("die", "oom", "exec_die")
+"""Container events SafeBox listens for."""
+
+RECONNECT_DELAY = 1.0
+"""Seconds to wait before reopening a dropped event stream."""
+
+EXIT_EVENT_TIMEOUT = 1.0
+"""Seconds a finished run waits for its exit event before asking the daemon."""
+
+RECENT_EXITS = 4096
+"""Exits remembered for runs that ask after the event has arrived."""
+
+
+@dataclass
+class ContainerEvent:
+    """One event about a SafeBox container."""
+
+    action: str
+    container_id: str
+    time: float
+    attributes: dict[str, str] = field(default_factory=dict)
+
+    @property
+    def exit_code(self) -> int | None:
+        """The exit status carried by ``die`` and ``exec_die`` events."""
+        code = self.attributes.get("exitCode")
+        return int(code) if code is not None else None
+
+    @property
+    def exit_key(self) -> str:
+        """What :meth:`EventStream.wait_exit` knows this exit by: the exec or container ID."""
+        if self.action == "exec_die":
+            return self.attributes.get("execID", "")
+        return self.container_id
+
+    @classmethod
+    def from_message(cls, message: dict) -> ContainerEvent:
+        """Parse an Engine API event message."""
+        actor = message.get("Actor") or {}
+        nanos = message.get("timeNano")
+        return cls(
+            action=message.get("Action") or message.get("status", ""),
+            container_id=actor.get("ID") or message.get("id", ""),
+            time=nanos / 1e9 if nanos else float(message.get("time", 0)),
+            attributes=actor.get("Attributes") or {},
+        )
+
+
+@dataclass
+class ExitStatus:
+    """How a container or exec process ended, as its events told it."""
+
+    exit_code: int | None = None
+    oom_killed: bool = False
+
+
+Listener = Callable[[ContainerEvent], None]
+
+
+class EventStream:
+    """Fan the daemon's SafeBox container events out to in-process listeners.
+
+    A single reader thread holds one ``/events`` connection, filtered to
+    :data:`CONTAINER_ACTIONS` on containers labelled ``SAFEBOX_LABEL``.
+    It is started by the first :meth:`subscribe` or :meth:`wait_exit`.
+    If the daemon drops the stream it is reopened after
+    :data:`RECONNECT_DELAY`, replaying from the last event seen, so
+    listeners may see an event twice.  Listeners run on the reader
+    thread and must not block.
+
+    Exits are also kept for :meth:`wait_exit`, so a run learns its exit
+    code (and whether the OOM killer struck) without asking the daemon.
+    """
+
+    def __init__(self, client: DockerClient) -> None:
+        self.client = client
+        self._lock = threading.Lock()
+        self._listeners: list[Listener] = []
+        self._stream = None
+        self._thread: threading.Thread | None = None
+        self._closed = False
+        self._since = int(time.time())
+        self._exits: OrderedDict[str, ExitStatus] = OrderedDict()
+        self._waiters: dict[str, threading.Event] = {}
+        self.connected = threading.Event()
+
+    def subscribe(self, listener: Listener) -> Callable[[], None]:
+        """Call *listener* for every event; returns a function that unsubscribes."""
+        with self._lock:
+            self._listeners = [*self._listeners, listener]
+            self._start_locked()
+
+        def unsubscribe() -> None:
+            with self._lock:
+                self._listeners = [fn for fn in self._listeners if fn is not listener]
+
+        return unsubscribe
+
+    def wait_exit(self, key: str, timeout: float) -> ExitStatus | None:
+        """Wait up to *timeout* seconds for container or exec *key* to exit.
+
+        Returns ``None`` when the stream is not connected or no exit was
+        seen in time; the caller then asks the daemon instead.
+        """
+        with self._lock:
+            self._start_locked()
+            status = self._exits.get(key)
+            if status is not None and status.exit_code is not None:
+                return status
+            if not self.connected.is_set():
+                return None
+            waiter = self._waiters.setdefault(key, threading.Event())
+        waiter.wait(timeout)
+        with self._lock:
+            self._waiters.pop(key, None)
+            status = self._exits.get(key)
+        return status if status is not None and status.exit_code is not None else None
+
+    def exit_status(self, key: str) -> ExitStatus | None:
+        """What the stream has seen of *key*'s exit so far, without waiting."""
+        with self._lock:
+            return self._exits.get(key)
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def _start_locked(self) -> None:
+        if self._thread is None and not self._closed:
+            self._thread = threading.Thread(target=self._run, name="safebox-events", daemon=True)
+            self._thread.start()
+
+    def close(self) -> None:
+        """Stop the reader thread and drop the connection."""
+        with self._lock:
+            self._closed = True
+            stream = self._stream
+        if stream is not None:
+            try:
+                stream.close()
+            except Exception:
+                pass
+
+    def _run(self) -> None:
+        filters = {
+            "type": ["container"],
+            "event": list(CONTAINER_ACTIONS),
+            "label": [f"{SAFEBOX_LABEL}={SAFEBOX_LABEL_VALUE}"],
+        }
+        while True:
+            try:
+                stream = follow_events(self.client.api, filters, since=self._since)
+            except Exception:
+                stream = None
+            with self._lock:
+                if self._closed:
+                    break
+                self._stream = stream
+            if stream is not None:
+                self.connected.set()
+                try:
+                    for message in stream:
+                        self._dispatch(ContainerEvent.from_message(message))
+                except Exception:
+                    pass
+            with self._lock:
+                self._stream = None
+                self.connected.clear()
+                for waiter in self._waiters.values():
+                    waiter.set()  # nothing more will arrive for now; fall back
+                if self._closed:
+                    break
+            time.sleep(RECONNECT_DELAY)
+        if stream is not None:
+            try:
+                stream.close()
+            except Exception:
+                pass
+
+    def _dispatch(self, event: ContainerEvent) -> None:
+        self._since = max(self._since, int(event.time))
+        self._record_exit(event)
+        for listener in self._listeners:
+            try:
+                listener(event)
+            except Exception:
+                pass
+
+    def _record_exit(self, event: ContainerEvent) -> None:
+        key = event.exit_key
+        with self._lock:
+            status = self._exits.get(key)
+            if status is None:
+                status = self._exits[key] = ExitStatus()
+                if len(self._exits) > RECENT_EXITS:
+                    self._exits.popitem(last=False)
+            if event.action == "oom":
+                status.oom_killed = True
+                return
+            status.exit_code = event.exit_code
+            waiter = self._waiters.get(key)
+        if waiter is not None:
+            waiter.set()
+
+
+_default_events: EventStream | None = None
+_events_lock = threading.Lock()
+_bound_events: ContextVar[EventStream | None] = ContextVar("safebox_events", default=None)
+
+
+def get_events() -> EventStream:
+    """Return the process-wide :class:`EventStream` for :func:`get_client`'s client.
+
+    A new stream replaces the old one if the client has changed.  Inside
+    :func:`use_events` the bound stream is returned instead.
+    """
+    global _default_events
+    bound = _bound_events.get()
+    if bound is not None:
+        return bound
+    client = get_client()
+    with _events_lock:
+        if _default_events is None or _default_events.client is not client:
+            if _default_events is not None:
+                _default_events.close()
+            _default_events = EventStream(client)
+        return _default_events
+
+
+@contextlib.contextmanager
+def use_events(events: EventStream) -> Iterator[EventStream]:
+    """Make :func:`get_events` return *events* in this thread (and context) until exit.
+
+    Pairs with :func:`~safebox.core.docker_client.use_client` for runs on
+    another daemon, whose events come over their own stream.
+    """
+    token = _bound_events.set(events)
+    try:
+        yield events
+    finally:
+        _bound_events.reset(token)
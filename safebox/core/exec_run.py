@@ -0,0 +1,160 @@
+"""Exec runs — drive one command ``exec``-ed into a running container to completion.
+
+Shared by the warm pool path of :func:`~safebox.core.executor.execute`
+and by :class:`~safebox.core.session.Sandbox`.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING, Callable
+
+from safebox.config.constants import SANDBOX_DIR
+from safebox.core.container import ContainerConfig, container_environment, inject_script
+from safebox.core.events import EXIT_EVENT_TIMEOUT, EventStream, get_events
+from safebox.core.runloop import RunOutcome, run_loop
+from safebox.core.streams import exec_frames
+from safebox.core.timeout import ExecutionTimeoutError
+from safebox.core.tracing import span
+from safebox.core.watchdog import get_watchdog
+
+if TYPE_CHECKING:
+    from docker import APIClient
+    from docker.models.containers import Container
+
+    from safebox.core.capture import RunCapture
+    from safebox.output.plain import Reporter
+
+
+class OutputEcho:
+    """Capture ``(stream, payload)`` frames and forward the text to the reporter.
+
+    When the capture refuses output (``max_output`` reached) the reporter
+    is told once and *on_limit* kills the process.  Raw captures are not
+    forwarded.  The kept frames are also appended to *frames*, when
+    given, for as long as the capture holds the complete output.
+    """
+
+    def __init__(
+        self,
+        reporter: Reporter,
+        capture: RunCapture,
+        on_limit: Callable[[], None],
+        frames: list | None = None,
+    ) -> None:
+        self._reporter = reporter
+        self._capture = capture
+        self._on_limit = on_limit
+        self._frames = frames
+        self._limited = False
+        self.first_output: float | None = None
+
+    def __call__(self, frame: tuple[int, bytes]) -> None:
+        if self.first_output is None:
+            self.first_output = time.monotonic()
+        if self._limited:
+            return
+        stream, chunk = frame
+        kept = self._capture.feed(stream, chunk)
+        if kept:
+            self._record(stream, kept)
+            if not self._capture.binary:
+                self._reporter.output(kept, stream)
+        if self._capture.truncated:
+            self._limited = True
+            self._reporter.output_limit(self._capture.combined.max_output)
+            try:
+                self._on_limit()
+            except Exception:
+                pass
+
+    def finish(self) -> None:
+        """Flush characters still held by the incremental decoders."""
+        for stream, text in self._capture.finish():
+            self._record(stream, text)
+            self._reporter.output(text, stream)
+
+    def _record(self, stream: int, data: str | bytes) -> None:
+        if self._frames is None:
+            return
+        if self._capture.combined.complete:
+            self._frames.append((stream, data))
+        else:
+            self._frames.clear()
+            self._frames = None
+
+
+def run_exec(
+    api: APIClient,
+    container: Container,
+    config: ContainerConfig,
+    command: str | list[str],
+    echo: OutputEcho,
+    reporter: Reporter,
+    *,
+    inject: bool = False,
+    source: bytes | None = None,
+    start_time: float | None = None,
+) -> RunOutcome:
+    """Exec *command* in the running *container* and wait for it to finish.
+
+    With *inject* the script of *config* — or *source* in its place,
+    which implies *inject* — is copied in first.  The command runs in
+    ``SANDBOX_DIR`` with *config*'s environment, output goes to *echo*,
+    and *config*'s timeout counts from *start_time* (default: now).
+    Docker cannot signal an exec on its own, so at the deadline the
+    :class:`~safebox.core.watchdog.Watchdog` stops the whole container.
+    """
+    events = get_events()
+    start_time = time.monotonic() if start_time is None else start_time
+    deadline = get_watchdog().watch(
+        container, config.timeout, grace=config.kill_grace, start=start_time
+    )
+    try:
+        if inject or source is not None:
+            with span("inject_script"):
+                inject_script(container, config, source)
+        with span("exec_create"):
+            exec_id = api.exec_create(
+                container.id,
+                command,
+                workdir=SANDBOX_DIR,
+                environment=container_environment(config) or None,
+            )["Id"]
+        with span("run"):
+            outcome = run_loop(
+                exec_frames(api, exec_id),
+                timeout=config.timeout,
+                on_chunk=echo,
+                kill=deadline.expire,
+                exit_status=lambda remaining: exec_exit_code(api, events, exec_id, remaining),
+                on_timeout=lambda: reporter.timeout(config.timeout),
+                start_time=start_time,
+                grace=config.kill_grace,
+                expired=lambda: deadline.expired,
+            )
+            echo.finish()
+    finally:
+        deadline.cancel()
+    return outcome
+
+
+def exec_exit_code(api, events: EventStream, exec_id: str, remaining: float) -> int | None:
+    """Exit code of a finished exec, from its ``exec_die`` event.
+
+    Without the event, ``exec_inspect`` is polled briefly while Docker
+    catches up.
+    """
+    deadline = time.monotonic() + remaining
+    with span("wait", source="events"):
+        status = events.wait_exit(exec_id, min(remaining, EXIT_EVENT_TIMEOUT))
+    if status is not None:
+        return status.exit_code
+    with span("wait"):
+        while True:
+            info = api.exec_inspect(exec_id)
+            if not info.get("Running"):
+                return info.get("ExitCode")
+            if time.monotonic() >= deadline:
+                raise ExecutionTimeoutError("Exec did not finish before the deadline.")
+            time.sleep(0.01)
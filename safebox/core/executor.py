@@ -3,39 +3,56 @@
 from __future__ import annotations
 
 import time
-from dataclasses import dataclass
+from contextlib import ExitStack, nullcontext
 from pathlib import Path
+from typing import TYPE_CHECKING
+
+from docker.errors import APIError, ImageNotFound
 
 from safebox.config.constants import (
+    DEFAULT_CAPTURE_MEMORY,
     DEFAULT_CPUS,
+    DEFAULT_KILL_GRACE,
     DEFAULT_MEMORY,
     DEFAULT_PIDS_LIMIT,
     DEFAULT_TIMEOUT,
     LANGUAGE_IMAGE_MAP,
 )
-from safebox.core.container import ContainerConfig, build_container_kwargs
-from safebox.core.docker_client import ensure_image, get_client
-from safebox.core.timeout import ExecutionTimeoutError, wait_with_timeout
-from safebox.detection.detector import DetectionError, detect_language
-from safebox.output.console import console
-from safebox.output.display import (
-    print_detection_info,
-    print_error,
-    print_execution_header,
-    print_result,
+from safebox.core.capture import RunCapture
+from safebox.core.compile_cache import ensure_cache_volumes, prepare_go_binary
+from safebox.core.container import (
+    ContainerConfig,
+    build_command,
+    build_container_kwargs,
+    build_create_body,
+    upload_script,
 )
+from safebox.core.deps import (
+    DependencyError,
+    dependency_tag,
+    ensure_dependency_image,
+    find_dependencies,
+)
+from safebox.core.dispatch import UNREACHABLE, Dispatcher, current_lease
+from safebox.core.docker_client import get_client
+from safebox.core.events import EXIT_EVENT_TIMEOUT, EventStream, get_events
+from safebox.core.exec_run import OutputEcho, run_exec
+from safebox.core.images import get_image_cache, resolve_image
+from safebox.core.placement import CpuAllocator
+from safebox.core.result import ExecutionResult
+from safebox.core.result_cache import CachedRun, ResultCache, cache_key
+from safebox.core.runloop import run_loop
+from safebox.core.scheduler import Resources, Scheduler
+from safebox.core.streams import follow_logs, follow_stats
+from safebox.core.telemetry import OOM_SUSPECT_RATIO, ResourceUsage, StatsSampler
+from safebox.core.timeout import ExecutionTimeoutError
+from safebox.core.tracing import record, span
+from safebox.core.watchdog import get_watchdog
+from safebox.detection.detector import DetectionError, detect_language
+from safebox.output.reporter import ConsoleReporter, Reporter
 
-
-@dataclass
-class ExecutionResult:
-    """Outcome of a sandboxed script run."""
-
-    exit_code: int
-    duration: float
-    timed_out: bool = False
-    output: str = ""
-    language: str = ""
-    image: str = ""
+if TYPE_CHECKING:
+    from safebox.core.pool import ContainerPool
 
 
 class ExecutionError(Exception):
@@ -50,26 +67,285 @@ def execute(
     cpus: float = DEFAULT_CPUS,
     timeout: int = DEFAULT_TIMEOUT,
     pids_limit: int = DEFAULT_PIDS_LIMIT,
+    kill_grace: float = DEFAULT_KILL_GRACE,
     remove: bool = True,
     extra_args: str = "",
     environment: dict[str, str] | None = None,
+    pool: ContainerPool | None = None,
+    reporter: Reporter | None = None,
+    pull: bool = False,
+    pinned_images: dict[str, str] | None = None,
+    max_output: int | None = None,
+    capture_memory: int = DEFAULT_CAPTURE_MEMORY,
+    raw: bool = False,
+    cache: ResultCache | None = None,
+    build_cache: bool = True,
+    compile_cache: bool = False,
+    deps: bool = True,
+    requirements: Path | None = None,
+    stats: bool = False,
+    scheduler: Scheduler | None = None,
+    priority: int = 0,
+    tenant: str = "default",
+    placement: CpuAllocator | None = None,
+    dispatcher: Dispatcher | None = None,
 ) -> ExecutionResult:
     """Full execution pipeline for a single script.
 
     1. Detect language
-    2. Resolve Docker image
-    3. Pull image if necessary
-    4. Build container configuration
-    5. Create & start container
-    6. Stream output
-    7. Wait (with timeout)
+    2. Resolve Docker image to a pinned ID (cached on disk)
+    3. Pull image if necessary (or always, with *pull*)
+    4. Install dependencies into a derived image, if the script has any
+    5. Build container configuration
+    6. Create & start container (or take a warm one from *pool*)
+    7. Stream output until exit; the :class:`~safebox.core.watchdog.Watchdog`
+       stops the container at the deadline
     8. Collect result & clean up
+
+    Progress is reported through *reporter* (Rich panels and live
+    output on the console by default).  *pinned_images* maps image tags
+    to IDs resolved earlier, e.g. once for a whole batch.  Output is
+    captured by a :class:`RunCapture` holding at most *capture_memory*
+    characters per stream (the rest is spilled to ``LOGS_DIR``); past
+    *max_output* bytes the container is killed and the result marked
+    truncated.  With *raw*, output is kept as undecoded bytes and not
+    passed to the reporter.
+
+    With a *cache*, a run identical to an earlier one (same script
+    contents, image ID, limits, args and environment) is replayed from
+    it without starting a container; otherwise a clean run — not timed
+    out, cut off, spilled or killed by a signal — is stored there.
+
+    With *build_cache*, Go sources are compiled once in a separate build
+    container and the cached binary is run on later calls.
+    *compile_cache* mounts a shared, writable bytecode cache for Python
+    and Node — only for trusted scripts, as one run can poison it for the
+    next.
+
+    With *deps*, a dependency manifest (*requirements*, inline PEP 723
+    metadata, or a ``requirements.txt``/``package.json`` next to the
+    script) is installed once into a derived image that later runs reuse.
+
+    At the deadline the container gets ``SIGTERM`` and, *kill_grace*
+    seconds later, ``SIGKILL`` (at once when *kill_grace* is ``0``).
+
+    With *stats*, container stats are sampled in the background and
+    attached to the result as :attr:`ExecutionResult.usage`.  Sampling
+    holds a stats stream and a thread for the whole run, so it is off
+    unless asked for.
+
+    With a *scheduler*, the container only starts once the host budget
+    has room for its memory, CPU and PIDs limits; *priority* and
+    *tenant* place it in the queue (see
+    :class:`~safebox.core.scheduler.Scheduler`).  With a *placement*
+    allocator, the run is pinned to ``ceil(cpus)`` cores of its own
+    (``cpuset_cpus``, plus ``cpuset_mems`` on NUMA hosts), returned when
+    it finishes.
+
+    With a *dispatcher*, the run goes to one of several Docker endpoints
+    (see :class:`~safebox.core.dispatch.Dispatcher`) instead of
+    :func:`get_client`'s daemon, without the warm *pool*.  Scripts are
+    copied into containers on remote endpoints, where Go binaries are
+    not cached.
+
+    Each phase runs in a :func:`~safebox.core.tracing.span`, recorded
+    when a tracer is installed with :func:`~safebox.core.tracing.tracing`.
+    """
+    if reporter is None:
+        reporter = ConsoleReporter()
+
+    with span("execute", script=script_path.name), ExitStack() as stack:
+        lang, image = resolve_runtime(script_path, language, reporter)
+
+        lease = None
+        if dispatcher is not None:
+            lease = stack.enter_context(dispatcher.lease(image))
+            pool = None
+            if lease.endpoint.remote:
+                build_cache = False  # the Go build bind-mounts the source
+
+        image_ref = (pinned_images or {}).get(image)
+        if not image_ref:
+            with span("resolve_image", image=image):
+                image_ref = resolve_image(image, pull=pull)
+
+        if deps:
+            with span("dependencies"):
+                image, image_ref = _with_dependencies(
+                    script_path, lang, image, image_ref, requirements, reporter
+                )
+
+        config = ContainerConfig(
+            image=image,
+            image_ref=image_ref,
+            language=lang,
+            script_path=script_path,
+            memory=memory,
+            cpus=cpus,
+            timeout=timeout,
+            pids_limit=pids_limit,
+            kill_grace=kill_grace,
+            remove=remove,
+            extra_args=extra_args,
+            environment=environment or {},
+            compile_cache=compile_cache,
+            upload_script=lease is not None and lease.endpoint.remote,
+        )
+
+        reporter.config(config)
+
+        key = None
+        if cache is not None:
+            with span("cache_lookup"):
+                key = cache_key(config, max_output=max_output, raw=raw)
+                cached = cache.get(key)
+            if cached is not None:
+                with span("replay"):
+                    result = _replay_cached(cached, reporter, capture_memory)
+                with span("report"):
+                    reporter.result(result)
+                return result
+
+        _prepare_compile_caches(config, build_cache=build_cache)
+
+        capture = RunCapture(
+            max_memory=capture_memory, max_output=max_output, name=script_path.stem, binary=raw
+        )
+        frames: list | None = [] if cache is not None else None
+        if scheduler is None:
+            admission = nullcontext()
+        else:
+            admission = scheduler.admit(
+                Resources.from_config(config), priority=priority, tenant=tenant
+            )
+        cores = nullcontext() if placement is None else placement.place(config.cpus)
+        try:
+            with admission, cores as placed:
+                if placed is not None:
+                    config.cpuset_cpus = placed.cpuset_cpus
+                    config.cpuset_mems = placed.cpuset_mems
+                if pool is not None and remove:
+                    exit_code, timed_out, duration, usage = _run_pooled(
+                        pool, config, reporter, capture, frames, stats
+                    )
+                else:
+                    exit_code, timed_out, duration, usage = _run_fresh(
+                        config, reporter, capture, frames, stats
+                    )
+        finally:
+            capture.close()
+
+        result = ExecutionResult(
+            exit_code=exit_code,
+            duration=duration,
+            timed_out=timed_out,
+            output=capture.combined.value,
+            language=lang,
+            image=image,
+            image_id=config.image_ref,
+            output_bytes=capture.combined.total_bytes,
+            output_file=capture.combined.spill_path,
+            output_truncated=capture.truncated,
+            stdout=capture.stdout.value,
+            stderr=capture.stderr.value,
+            usage=usage,
+        )
+
+        if cache is not None and not timed_out and capture.combined.complete and exit_code < 128:
+            with span("cache_store"):
+                cache.put(
+                    CachedRun(
+                        key=key,
+                        script=str(script_path.resolve()),
+                        exit_code=exit_code,
+                        duration=duration,
+                        language=lang,
+                        image=image,
+                        image_id=config.image_ref,
+                        output_bytes=capture.combined.total_bytes,
+                        binary=raw,
+                        frames=frames,
+                        created_at=time.time(),
+                    )
+                )
+
+        with span("report"):
+            reporter.result(result)
+        return result
+
+
+def _replay_cached(
+    cached: CachedRun, reporter: Reporter, capture_memory: int
+) -> ExecutionResult:
+    """Feed a cached run's output to *reporter* and rebuild its result."""
+    start = time.monotonic()
+    capture = RunCapture(max_memory=capture_memory, spill_dir=None, binary=cached.binary)
+    for stream, data in cached.frames:
+        capture.write(stream, data)
+        if not cached.binary:
+            reporter.output(data, stream)
+    return ExecutionResult(
+        exit_code=cached.exit_code,
+        duration=time.monotonic() - start,
+        output=capture.combined.value,
+        language=cached.language,
+        image=cached.image,
+        image_id=cached.image_id,
+        output_bytes=cached.output_bytes,
+        stdout=capture.stdout.value,
+        stderr=capture.stderr.value,
+        cached=True,
+    )
+
+
+def _with_dependencies(
+    script_path: Path,
+    language: str,
+    image: str,
+    image_ref: str,
+    requirements: Path | None,
+    reporter: Reporter,
+) -> tuple[str, str]:
+    """Swap in the derived dependency image for *script_path*, if it has a manifest.
+
+    Returns ``(image, image_ref)`` — unchanged when there is nothing to
+    install; raises :class:`ExecutionError` (after reporting it) when the
+    manifest is invalid or the install fails.
     """
+    try:
+        spec = find_dependencies(script_path, language, requirements)
+        if spec is None:
+            return image, image_ref
+        return dependency_tag(spec, image_ref), ensure_dependency_image(spec, image_ref)
+    except DependencyError as exc:
+        reporter.error(str(exc))
+        raise ExecutionError(str(exc)) from exc
 
+
+def _prepare_compile_caches(config: ContainerConfig, *, build_cache: bool) -> None:
+    """Build the Go binary for *config* and create its cache volumes, as enabled."""
+    if not (config.compile_cache or (build_cache and config.language == "go")):
+        return
+    with span("compile_cache", language=config.language):
+        client = get_client()
+        if build_cache and config.language == "go":
+            config.binary = prepare_go_binary(config, client)
+        ensure_cache_volumes(config, client)
+
+
+def resolve_runtime(
+    script_path: Path, language: str | None, reporter: Reporter
+) -> tuple[str, str]:
+    """Detect the language of *script_path* and pick its image.
+
+    Reports the detection and returns ``(language, image)``; raises
+    :class:`ExecutionError` (after reporting it) when either step fails.
+    """
     try:
-        lang = detect_language(script_path, language_override=language)
+        with span("detect"):
+            lang = detect_language(script_path, language_override=language)
     except DetectionError as exc:
-        print_error(str(exc))
+        reporter.error(str(exc))
         raise ExecutionError(str(exc)) from exc
 
     image = LANGUAGE_IMAGE_MAP.get(lang)
@@ -78,69 +354,241 @@ def execute(
             f"No default image for language '{lang}'. "
             "Use --image to specify one explicitly."
         )
-        print_error(msg)
+        reporter.error(msg)
         raise ExecutionError(msg)
 
-    print_detection_info(lang, image, script_path.name)
-
-    ensure_image(image)
-
-    config = ContainerConfig(
-        image=image,
-        language=lang,
-        script_path=script_path,
-        memory=memory,
-        cpus=cpus,
-        timeout=timeout,
-        pids_limit=pids_limit,
-        remove=remove,
-        extra_args=extra_args,
-        environment=environment or {},
-    )
+    reporter.detection(lang, image, script_path.name)
+    return lang, image
 
-    print_execution_header(config)
 
-    client = get_client()
-    kwargs = build_container_kwargs(config)
-
-    container = client.containers.run(**kwargs)
+def _run_fresh(
+    config: ContainerConfig,
+    reporter: Reporter,
+    capture: RunCapture,
+    frames: list | None = None,
+    stats: bool = False,
+) -> tuple[int, bool, float, ResourceUsage | None]:
+    """Run *config* in a newly created container."""
+    container = _start_container(config)
     start_time = time.monotonic()
+    api = get_client().api
+    events = get_events()
+    sampler = _start_sampler(api, container.id) if stats else None
+    deadline = get_watchdog().watch(
+        container, config.timeout, grace=config.kill_grace, start=start_time
+    )
 
-    output_chunks: list[str] = []
+    echo = OutputEcho(reporter, capture, container.kill, frames)
+    outcome = None
+    usage = None
     try:
-        for chunk in container.logs(stream=True, follow=True):
-            text = chunk.decode("utf-8", errors="replace")
-            console.print(text, end="", highlight=False)
-            output_chunks.append(text)
-    except Exception:
-        pass
+        with span("run"):
+            logs = follow_logs(api, container.id)
+            outcome = run_loop(
+                logs,
+                timeout=config.timeout,
+                on_chunk=echo,
+                kill=deadline.expire,
+                exit_status=lambda remaining: _container_exit_code(
+                    container, events, remaining
+                ),
+                cancel=logs.close,
+                on_timeout=lambda: reporter.timeout(config.timeout),
+                start_time=start_time,
+                grace=config.kill_grace,
+                expired=lambda: deadline.expired,
+            )
+            echo.finish()
+    finally:
+        deadline.cancel()
+        if sampler is not None:
+            usage = sampler.stop(time.monotonic() - start_time)
+        if config.remove or (outcome is not None and outcome.timed_out):
+            with span("remove"):
+                try:
+                    container.remove(force=True)
+                except Exception:
+                    pass
+
+    _record_first_output(echo, start_time)
+
+    if usage is not None:
+        status = events.exit_status(container.id)
+        if status is not None:
+            oom_killed = status.oom_killed
+        else:
+            oom_killed = container.attrs.get("State", {}).get("OOMKilled", False)
+        _annotate_usage(usage, echo, start_time, outcome.exit_code, oom_killed)
+    return outcome.exit_code, outcome.timed_out, outcome.duration, usage
+
+
+def _record_first_output(echo: OutputEcho, start_time: float) -> None:
+    if echo.first_output is not None:
+        record("first_output", start_time, echo.first_output)
+
+
+def _start_sampler(api, container_id: str) -> StatsSampler:
+    return StatsSampler(lambda: follow_stats(api, container_id)).start()
+
+
+def _annotate_usage(
+    usage: ResourceUsage,
+    echo: OutputEcho,
+    start_time: float,
+    exit_code: int,
+    oom_killed: bool | None = None,
+) -> None:
+    """Add time-to-first-byte and the OOM verdict to sampled *usage*.
+
+    Without Docker's own ``OOMKilled`` flag (exec runs), a SIGKILL exit
+    with peak memory at the limit is taken as an OOM kill.
+    """
+    if echo.first_output is not None:
+        usage.first_output = echo.first_output - start_time
+    if oom_killed is None:
+        oom_killed = exit_code == 137 and usage.memory_ratio >= OOM_SUSPECT_RATIO
+    usage.oom_killed = bool(oom_killed)
+
+
+def _start_container(config: ContainerConfig):
+    """Create and start the container for *config*.
+
+    Uses the low-level create and start calls rather than
+    ``containers.run``, which inspects the new container in between; the
+    run loop only needs its ID.  If the pinned image ID has disappeared
+    (pruned or re-pulled under a new ID), the tag is resolved again once
+    and the start retried.  A dispatched run whose endpoint cannot be
+    reached moves to another endpoint and tries again.
+    """
+    while True:
+        try:
+            return _start_on(get_client(), config)
+        except UNREACHABLE as exc:
+            lease = current_lease()
+            if lease is None:
+                raise
+            with span("failover", endpoint=lease.endpoint.url):
+                config.upload_script = lease.failover(exc).remote
 
-    timed_out = False
-    exit_code = 1
 
+def _start_on(client, config: ContainerConfig):
     try:
-        wait_result = wait_with_timeout(container, timeout)
-        exit_code = wait_result.get("StatusCode", 1)
-    except ExecutionTimeoutError:
-        timed_out = True
-        exit_code = 124
+        return _create_and_start(client, config)
+    except APIError:
+        if config.image_ref == config.image:
+            raise
+        try:
+            client.images.get(config.image_ref)
+        except ImageNotFound:
+            pass
+        else:
+            raise
+    get_image_cache().invalidate(config.image)
+    with span("resolve_image", image=config.image):
+        config.image_ref = resolve_image(config.image, refresh=True)
+    return _create_and_start(client, config)
 
-    duration = time.monotonic() - start_time
 
-    if remove and not timed_out:
+def _create_and_start(client, config: ContainerConfig):
+    body = build_create_body(build_container_kwargs(config))
+    with span("containers.create", image=config.image_ref):
+        container_id = client.api.create_container_from_config(body)["Id"]
+    try:
+        if config.upload_script:
+            with span("upload_script"):
+                upload_script(client.api, container_id, config)
+        with span("containers.start"):
+            client.api.start(container_id)
+    except Exception:
         try:
-            container.remove(force=True)
+            client.api.remove_container(container_id, force=True)
         except Exception:
             pass
+        raise
+    return client.containers.prepare_model({"Id": container_id})
 
-    result = ExecutionResult(
-        exit_code=exit_code,
-        duration=duration,
-        timed_out=timed_out,
-        output="".join(output_chunks),
-        language=lang,
-        image=image,
-    )
 
-    print_result(result)
-    return result
+def _run_pooled(
+    pool: ContainerPool,
+    config: ContainerConfig,
+    reporter: Reporter,
+    capture: RunCapture,
+    frames: list | None = None,
+    stats: bool = False,
+) -> tuple[int, bool, float, ResourceUsage | None]:
+    """Run *config* via ``exec`` inside a warm container from *pool*."""
+    with span("pool.acquire"):
+        container = pool.acquire(config)
+    api = pool.client.api
+    start_time = time.monotonic()
+    sampler = _start_sampler(api, container.id) if stats else None
+
+    echo = OutputEcho(reporter, capture, container.kill, frames)
+    try:
+        if config.cpuset_cpus:
+            with span("pin", cpus=config.cpuset_cpus):
+                api.update_container(
+                    container.id,
+                    cpuset_cpus=config.cpuset_cpus,
+                    cpuset_mems=config.cpuset_mems or None,
+                )
+        outcome = run_exec(
+            api,
+            container,
+            config,
+            build_command(config),
+            echo,
+            reporter,
+            inject=True,
+            start_time=start_time,
+        )
+    except Exception:
+        if sampler is not None:
+            sampler.stop(0)
+        pool.release(container, reusable=False)
+        raise
+
+    usage = None
+    if sampler is not None:
+        usage = sampler.stop(time.monotonic() - start_time)
+        _annotate_usage(usage, echo, start_time, outcome.exit_code)
+    _record_first_output(echo, start_time)
+
+    with span("pool.release"):
+        pool.release(
+            container,
+            reusable=(
+                outcome.exit_code == 0
+                and not outcome.timed_out
+                and not capture.truncated
+                and not config.cpuset_cpus  # still pinned to cores another run may now own
+            ),
+        )
+    return outcome.exit_code, outcome.timed_out, outcome.duration, usage
+
+
+def _container_exit_code(container, events: EventStream, remaining: float) -> int | None:
+    """Exit code of a container whose log stream has ended.
+
+    The ``die`` event on the shared *events* stream carries it, so
+    usually no request is needed.  Without the event a single inspect is
+    enough, as the stream ending normally means the container has
+    stopped; a blocking ``wait`` bounded by the remaining time is only
+    the fallback for a stream that broke early.
+    """
+    with span("wait", source="events"):
+        status = events.wait_exit(container.id, min(remaining, EXIT_EVENT_TIMEOUT))
+    if status is not None:
+        return status.exit_code
+    with span("wait"):
+        container.reload()
+    state = container.attrs.get("State", {})
+    if not state.get("Running"):
+        return state.get("ExitCode")
+    try:
+        with span("wait", blocking=True):
+            return container.wait(timeout=max(remaining, 0.001)).get("StatusCode")
+    except Exception as exc:
+        raise ExecutionTimeoutError(
+            f"Container {container.short_id} was still running at the deadline."
+        ) from exc
@@ -0,0 +1,306 @@
+"""Image resolution cache — tag → immutable image ID, persisted on disk."""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator
+
+from docker.errors import DockerException, ImageNotFound
+
+from safebox.config.constants import (
+    DEFAULT_IMAGE_CACHE_TTL,
+    DEFAULT_PREFETCH_CONCURRENCY,
+    LANGUAGE_IMAGE_MAP,
+)
+from safebox.config.settings import IMAGE_CACHE_FILE
+from safebox.core.docker_client import ensure_image, get_client
+
+if TYPE_CHECKING:
+    from docker import DockerClient
+    from docker.models.images import Image
+
+LayerCallback = Callable[[str, str, str, int, int], None]
+"""``(image, layer_id, status, current_bytes, total_bytes)`` pull progress hook."""
+
+
+@dataclass
+class ImageRecord:
+    """What a tag resolved to, and when."""
+
+    tag: str
+    image_id: str
+    repo_digests: list[str] = field(default_factory=list)
+    resolved_at: float = 0.0
+
+    @property
+    def digest(self) -> str:
+        """The ``repo@sha256:…`` digest, or ``""`` for local-only images."""
+        return self.repo_digests[0] if self.repo_digests else ""
+
+    def age(self, now: float | None = None) -> float:
+        return (now or time.time()) - self.resolved_at
+
+
+class ImageCache:
+    """Tag → :class:`ImageRecord` map stored as JSON under ``~/.safebox``.
+
+    Entries older than *ttl* seconds are treated as missing.  Writes are
+    atomic (temp file + rename) and failures to persist are ignored, so a
+    read-only home directory only costs the cache, never the run.
+    """
+
+    def __init__(
+        self, path: Path = IMAGE_CACHE_FILE, ttl: float = DEFAULT_IMAGE_CACHE_TTL
+    ) -> None:
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._records: dict[str, ImageRecord] | None = None
+        self._mtime: float | None = None
+
+    def get(self, tag: str) -> ImageRecord | None:
+        """Return the fresh record for *tag*, or ``None``."""
+        with self._lock:
+            record = self._load().get(tag)
+        if record is None or record.age() > self.ttl:
+            return None
+        return record
+
+    def records(self) -> list[ImageRecord]:
+        """All records, fresh or stale, sorted by tag."""
+        with self._lock:
+            return sorted(self._load().values(), key=lambda r: r.tag)
+
+    def put(self, record: ImageRecord) -> None:
+        with self._lock:
+            self._load()[record.tag] = record
+            self._save()
+
+    def invalidate(self, tag: str | None = None) -> None:
+        """Forget *tag*, or every entry when *tag* is ``None``."""
+        with self._lock:
+            records = self._load()
+            if tag is None:
+                records.clear()
+            else:
+                records.pop(tag, None)
+            self._save()
+
+    def _load(self) -> dict[str, ImageRecord]:
+        try:
+            mtime = self.path.stat().st_mtime
+        except OSError:
+            mtime = None
+        if self._records is not None and mtime == self._mtime:
+            return self._records
+
+        records: dict[str, ImageRecord] = {}
+        if mtime is not None:
+            try:
+                raw = json.loads(self.path.read_text())
+                for entry in raw.values():
+                    record = ImageRecord(**entry)
+                    records[record.tag] = record
+            except (OSError, ValueError, TypeError):
+                records = {}
+        self._records = records
+        self._mtime = mtime
+        return records
+
+    def _save(self) -> None:
+        data = {tag: asdict(record) for tag, record in (self._records or {}).items()}
+        tmp = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_text(json.dumps(data, indent=2))
+            os.replace(tmp, self.path)
+            self._mtime = self.path.stat().st_mtime
+        except OSError:
+            tmp.unlink(missing_ok=True)
+
+
+_default_cache: ImageCache | None = None
+_bound_cache: ContextVar[ImageCache | None] = ContextVar("safebox_image_cache", default=None)
+
+
+def get_image_cache() -> ImageCache:
+    """Return the process-wide :class:`ImageCache`.
+
+    Inside :func:`use_image_cache` the bound cache is returned instead.
+    """
+    global _default_cache
+    bound = _bound_cache.get()
+    if bound is not None:
+        return bound
+    if _default_cache is None:
+        _default_cache = ImageCache()
+    return _default_cache
+
+
+@contextlib.contextmanager
+def use_image_cache(cache: ImageCache) -> Iterator[ImageCache]:
+    """Make :func:`get_image_cache` return *cache* in this thread (and context) until exit."""
+    token = _bound_cache.set(cache)
+    try:
+        yield cache
+    finally:
+        _bound_cache.reset(token)
+
+
+def endpoint_image_cache(url: str) -> ImageCache:
+    """A separate :class:`ImageCache` for the Docker daemon at *url*.
+
+    Image IDs are per daemon: the same tag can resolve to different IDs
+    on two endpoints, so each keeps its own ``images-<hash>.json``.
+    """
+    digest = hashlib.sha256(url.encode()).hexdigest()[:12]
+    return ImageCache(IMAGE_CACHE_FILE.with_name(f"images-{digest}.json"))
+
+
+def record_image(tag: str, image_id: str, repo_digests: list[str] | None = None) -> ImageRecord:
+    """Store a fresh resolution of *tag* in the default cache."""
+    record = ImageRecord(
+        tag=tag,
+        image_id=image_id,
+        repo_digests=list(repo_digests or []),
+        resolved_at=time.time(),
+    )
+    get_image_cache().put(record)
+    return record
+
+
+def resolve_image(image: str, *, refresh: bool = False, pull: bool = False) -> str:
+    """Return the immutable image ID to run for tag *image*.
+
+    A fresh cache entry is returned without touching the Docker API.
+    Otherwise (or with *refresh*) the image is looked up — and pulled
+    when missing or when *pull* is set — and the cache is updated.
+    Running by ID means a concurrent re-pull of the tag cannot change
+    the image underneath runs that already resolved it.
+    """
+    if not (refresh or pull):
+        record = get_image_cache().get(image)
+        if record is not None:
+            return record.image_id
+
+    img = ensure_image(image, pull=pull)
+    return record_image(image, img.id, img.attrs.get("RepoDigests")).image_id
+
+
+@dataclass
+class PrefetchResult:
+    """Outcome of prefetching one image."""
+
+    image: str
+    status: str  # "present" | "pulled" | "failed"
+    image_id: str = ""
+    duration: float = 0.0
+    error: str = ""
+
+
+def default_images() -> list[str]:
+    """Every distinct runtime image in ``LANGUAGE_IMAGE_MAP``, sorted."""
+    return sorted(set(LANGUAGE_IMAGE_MAP.values()))
+
+
+def prefetch_images(
+    images: Iterable[str] | None = None,
+    *,
+    concurrency: int = DEFAULT_PREFETCH_CONCURRENCY,
+    force: bool = False,
+    check_registry: bool = True,
+    on_layer: LayerCallback | None = None,
+) -> list[PrefetchResult]:
+    """Pull *images* (default: :func:`default_images`) concurrently.
+
+    An image that is present locally is skipped unless *force* is set
+    or, with *check_registry*, the registry now serves a different
+    digest for its tag.  Per-layer pull progress is passed to
+    *on_layer* from worker threads.  Every image — skipped or pulled —
+    is recorded in the image cache, so later runs need no lookup.
+    Returns one :class:`PrefetchResult` per image, in input order;
+    failures are reported there rather than raised.  The workers use the
+    caller's client, including one bound with
+    :func:`~safebox.core.docker_client.use_client`.
+    """
+    targets = list(dict.fromkeys(images or default_images()))
+    client = get_client()
+
+    with ThreadPoolExecutor(
+        max_workers=max(1, min(concurrency, len(targets) or 1)),
+        thread_name_prefix="safebox-prefetch",
+    ) as workers:
+        return list(
+            workers.map(
+                lambda image: _prefetch_one(client, image, force, check_registry, on_layer),
+                targets,
+            )
+        )
+
+
+def _prefetch_one(
+    client: DockerClient,
+    image: str,
+    force: bool,
+    check_registry: bool,
+    on_layer: LayerCallback | None,
+) -> PrefetchResult:
+    start = time.monotonic()
+    try:
+        if not force:
+            local = _local_image(client, image)
+            if local is not None and not (check_registry and _is_stale(client, image, local)):
+                record_image(image, local.id, local.attrs.get("RepoDigests"))
+                return PrefetchResult(image, "present", local.id, time.monotonic() - start)
+
+        for event in client.api.pull(image, stream=True, decode=True):
+            if "error" in event:
+                raise DockerException(event["error"])
+            if on_layer is not None and event.get("id"):
+                detail = event.get("progressDetail") or {}
+                on_layer(
+                    image,
+                    event["id"],
+                    event.get("status", ""),
+                    detail.get("current", 0),
+                    detail.get("total", 0),
+                )
+
+        img = client.images.get(image)
+    except DockerException as exc:
+        return PrefetchResult(image, "failed", duration=time.monotonic() - start, error=str(exc))
+
+    record_image(image, img.id, img.attrs.get("RepoDigests"))
+    return PrefetchResult(image, "pulled", img.id, time.monotonic() - start)
+
+
+def _local_image(client: DockerClient, image: str) -> Image | None:
+    try:
+        return client.images.get(image)
+    except ImageNotFound:
+        return None
+
+
+def _is_stale(client: DockerClient, image: str, local: Image) -> bool:
+    """``True`` if the registry serves a digest *local* was not pulled as.
+
+    Images built locally (no repo digests) and registries that cannot be
+    reached are treated as current: prefetch must not fail offline.
+    """
+    local_digests = {d.partition("@")[2] for d in local.attrs.get("RepoDigests") or []}
+    if not local_digests:
+        return False
+    try:
+        remote = client.images.get_registry_data(image).id
+    except DockerException:
+        return False
+    return remote not in local_digests
@@ -0,0 +1,196 @@
+"""CPU placement — pin each run to dedicated cores, kept within one NUMA node."""
+
+from __future__ import annotations
+
+import contextlib
+import math
+import os
+import re
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, Iterator
+
+from safebox.core.docker_client import get_client
+
+if TYPE_CHECKING:
+    from docker import DockerClient
+
+NODE_DIR = Path("/sys/devices/system/node")
+"""Where Linux lists NUMA nodes and their CPUs."""
+
+
+def parse_cpulist(text: str) -> list[int]:
+    """Expand a kernel CPU list (``0-3,8,10-11``) into CPU numbers."""
+    cpus: list[int] = []
+    for part in text.strip().split(","):
+        if not part:
+            continue
+        first, _, last = part.partition("-")
+        cpus.extend(range(int(first), int(last or first) + 1))
+    return cpus
+
+
+def format_cpulist(cpus: Iterable[int]) -> str:
+    """Compress CPU numbers into the ``0-3,8`` form Docker's ``cpuset`` takes."""
+    ranges: list[list[int]] = []
+    for cpu in sorted(cpus):
+        if ranges and cpu == ranges[-1][1] + 1:
+            ranges[-1][1] = cpu
+        else:
+            ranges.append([cpu, cpu])
+    return ",".join(str(a) if a == b else f"{a}-{b}" for a, b in ranges)
+
+
+@dataclass(frozen=True)
+class Topology:
+    """The host's usable CPUs, grouped by NUMA node."""
+
+    nodes: dict[int, tuple[int, ...]]
+
+    @property
+    def cpus(self) -> list[int]:
+        return sorted(cpu for cpus in self.nodes.values() for cpu in cpus)
+
+    @classmethod
+    def flat(cls, count: int) -> Topology:
+        """*count* CPUs on a single node."""
+        return cls({0: tuple(range(count))})
+
+    @classmethod
+    def detect(cls, client: DockerClient | None = None) -> Topology:
+        """Read this machine's nodes from sysfs, limited to the CPUs we may use.
+
+        When *client*'s daemon reports a different CPU count it runs
+        elsewhere (a remote host, Docker Desktop's VM), and a single
+        node of that many CPUs is assumed instead.
+        """
+        try:
+            usable = os.sched_getaffinity(0)
+        except AttributeError:
+            usable = set(range(os.cpu_count() or 1))
+        nodes: dict[int, tuple[int, ...]] = {}
+        for path in NODE_DIR.glob("node[0-9]*"):
+            match = re.fullmatch(r"node(\d+)", path.name)
+            try:
+                cpus = parse_cpulist((path / "cpulist").read_text())
+            except (OSError, ValueError):
+                continue
+            cpus = [cpu for cpu in cpus if cpu in usable]
+            if match and cpus:
+                nodes[int(match.group(1))] = tuple(cpus)
+        if not nodes:
+            nodes = {0: tuple(sorted(usable))}
+        topology = cls(nodes)
+
+        if client is not None:
+            try:
+                ncpu = client.info().get("NCPU")
+            except Exception:
+                ncpu = None
+            if ncpu and ncpu != len(topology.cpus):
+                return cls.flat(ncpu)
+        return topology
+
+
+@dataclass(frozen=True)
+class Placement:
+    """The cores (and memory nodes) one run is pinned to."""
+
+    cpus: tuple[int, ...]
+    nodes: tuple[int, ...] = ()
+
+    @property
+    def cpuset_cpus(self) -> str:
+        return format_cpulist(self.cpus)
+
+    @property
+    def cpuset_mems(self) -> str:
+        """Memory nodes, or ``""`` where the host has only one."""
+        return format_cpulist(self.nodes)
+
+
+class CpuAllocator:
+    """Hand out dedicated cores from a :class:`Topology` and take them back.
+
+    A run limited to ``cpus`` gets ``ceil(cpus)`` cores of its own.  The
+    cores come from a single NUMA node when one has enough free: the
+    fullest such node, so that large runs still find whole nodes later.
+    Otherwise the run spans the nodes with the most free cores.  On
+    multi-node hosts the run's memory is bound to the nodes it runs on.
+    When too few cores are free the run is not pinned and floats as
+    before, so pair the allocator with a
+    :class:`~safebox.core.scheduler.Scheduler` whose CPU budget matches
+    the topology to keep every run pinned.
+    """
+
+    def __init__(self, topology: Topology) -> None:
+        self.topology = topology
+        self._lock = threading.Lock()
+        self._free = {node: set(cpus) for node, cpus in topology.nodes.items()}
+        self._pinned = 0
+        self._unpinned = 0
+
+    @contextlib.contextmanager
+    def place(self, cpus: float) -> Iterator[Placement | None]:
+        """Reserve cores for a run limited to *cpus*; yields ``None`` if none are free."""
+        placement = self.allocate(max(1, math.ceil(cpus)))
+        try:
+            yield placement
+        finally:
+            if placement is not None:
+                self.release(placement)
+
+    def allocate(self, count: int) -> Placement | None:
+        """Take *count* free cores, or return ``None`` if there aren't that many."""
+        with self._lock:
+            if count > sum(len(free) for free in self._free.values()):
+                self._unpinned += 1
+                return None
+            fits = [node for node, free in self._free.items() if len(free) >= count]
+            if fits:
+                node = min(fits, key=lambda n: (len(self._free[n]), n))
+                taken = {node: sorted(self._free[node])[:count]}
+            else:
+                taken = {}
+                for node in sorted(self._free, key=lambda n: (-len(self._free[n]), n)):
+                    want = count - sum(len(cpus) for cpus in taken.values())
+                    if want <= 0:
+                        break
+                    taken[node] = sorted(self._free[node])[:want]
+            for node, cpus in taken.items():
+                self._free[node].difference_update(cpus)
+            self._pinned += 1
+        nodes = tuple(sorted(taken)) if len(self._free) > 1 else ()
+        return Placement(tuple(sorted(cpu for cpus in taken.values() for cpu in cpus)), nodes)
+
+    def release(self, placement: Placement) -> None:
+        """Return *placement*'s cores to the free pool."""
+        with self._lock:
+            for node, cpus in self.topology.nodes.items():
+                self._free[node].update(cpu for cpu in placement.cpus if cpu in cpus)
+
+    def stats(self) -> dict:
+        """Free cores per node and how many runs were pinned or left floating."""
+        with self._lock:
+            return {
+                "nodes": {
+                    str(node): {"cpus": len(cpus), "free": len(self._free[node])}
+                    for node, cpus in self.topology.nodes.items()
+                },
+                "pinned": self._pinned,
+                "unpinned": self._unpinned,
+            }
+
+
+_default_allocator: CpuAllocator | None = None
+_allocator_lock = threading.Lock()
+
+
+def get_allocator() -> CpuAllocator:
+    """Return the process-wide :class:`CpuAllocator` for the Docker host's topology."""
+    global _default_allocator
+    with _allocator_lock:
+        if _default_allocator is None:
+            _default_allocator = CpuAllocator(Topology.detect(get_client()))
+        return _default_allocator
@@ -0,0 +1,380 @@
+"""Warm container pool — pre-started sandboxes that scripts are exec'd into."""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from safebox.config.constants import (
+    DEFAULT_POOL_IDLE_TIMEOUT,
+    DEFAULT_POOL_MAX_SIZE,
+    DEFAULT_POOL_MIN_SIZE,
+    SANDBOX_DIR,
+)
+from safebox.core.compile_cache import cache_mounts
+from safebox.core.container import ContainerConfig, build_pool_container_kwargs
+from safebox.core.docker_client import get_client
+
+if TYPE_CHECKING:
+    from docker import DockerClient
+    from docker.models.containers import Container
+
+
+class PoolExhaustedError(Exception):
+    """Raised when no pooled container becomes available in time."""
+
+
+@dataclass(frozen=True)
+class PoolKey:
+    """Identity of interchangeable pool containers: image, limits and cache volumes."""
+
+    image: str
+    memory: str
+    cpus: float
+    pids_limit: int
+    volumes: tuple[str, ...] = ()
+
+    @classmethod
+    def from_config(cls, config: ContainerConfig) -> PoolKey:
+        return cls(
+            config.image_ref,
+            config.memory,
+            config.cpus,
+            config.pids_limit,
+            tuple(sorted(cache_mounts(config))),
+        )
+
+    @property
+    def label(self) -> str:
+        """Short stable hash used as the ``safebox.pool`` label value."""
+        raw = f"{self.image}|{self.memory}|{self.cpus}|{self.pids_limit}"
+        if self.volumes:
+            raw += "|" + ",".join(self.volumes)
+        return hashlib.sha256(raw.encode()).hexdigest()[:16]
+
+
+@dataclass
+class PoolSettings:
+    """Sizing and lifecycle knobs for a :class:`ContainerPool`.
+
+    ``min_size``/``max_size`` apply per :class:`PoolKey`.  A key that
+    was not explicitly warmed is retired, containers and all, once it
+    has gone ``idle_timeout`` seconds without a checkout.  ``recycle``
+    returns containers to the pool after a clean run instead of
+    destroying them — only enable it for trusted workloads, since
+    anything a script leaves behind outside ``SANDBOX_DIR`` and ``/tmp``
+    is visible to the next script.
+    """
+
+    min_size: int = DEFAULT_POOL_MIN_SIZE
+    max_size: int = DEFAULT_POOL_MAX_SIZE
+    idle_timeout: float = DEFAULT_POOL_IDLE_TIMEOUT
+    recycle: bool = False
+    acquire_timeout: float = 30.0
+    maintenance_interval: float = 10.0
+
+
+@dataclass
+class _Slot:
+    container: Container
+    key: PoolKey
+    idle_since: float = field(default_factory=time.monotonic)
+
+
+class ContainerPool:
+    """Per-image pool of pre-started, resource-limited idle containers.
+
+    :meth:`acquire` hands out a running container matching a
+    :class:`ContainerConfig`; :meth:`release` recycles or destroys it and
+    the pool is topped back up to ``min_size`` in the background, so the
+    next run only pays for an ``exec``.
+    """
+
+    def __init__(
+        self,
+        settings: PoolSettings | None = None,
+        *,
+        client: DockerClient | None = None,
+    ) -> None:
+        self.settings = settings or PoolSettings()
+        self._client = client
+        self._cond = threading.Condition()
+        self._idle: dict[PoolKey, list[_Slot]] = {}
+        self._busy: dict[str, _Slot] = {}
+        self._counts: dict[PoolKey, int] = {}
+        self._templates: dict[PoolKey, ContainerConfig] = {}
+        self._last_used: dict[PoolKey, float] = {}
+        self._warmed: set[PoolKey] = set()
+        self._background = ThreadPoolExecutor(
+            max_workers=2, thread_name_prefix="safebox-pool"
+        )
+        self._stop = threading.Event()
+        self._maintainer: threading.Thread | None = None
+        self._closed = False
+
+    @property
+    def client(self) -> DockerClient:
+        if self._client is None:
+            self._client = get_client()
+        return self._client
+
+    # ── Public API ───────────────────────────────────────────
+
+    def warm(self, config: ContainerConfig) -> None:
+        """Synchronously start containers for *config* up to ``min_size``.
+
+        Warmed keys stay topped up for the life of the pool.
+        """
+        key = PoolKey.from_config(config)
+        with self._cond:
+            self._templates.setdefault(key, config)
+            self._warmed.add(key)
+        self._top_up(key)
+
+    def acquire(self, config: ContainerConfig) -> Container:
+        """Return a healthy running container matching *config*.
+
+        Reuses an idle container when one exists, otherwise starts a new
+        one as long as the key is below ``max_size``; at the cap, blocks
+        up to ``acquire_timeout`` for a release.
+        """
+        key = PoolKey.from_config(config)
+        deadline = time.monotonic() + self.settings.acquire_timeout
+
+        while True:
+            slot = self._reserve(key, config, deadline)
+            if slot is None:
+                try:
+                    slot = _Slot(self._start(key), key)
+                except Exception:
+                    self._forget(key)
+                    raise
+            elif not _is_healthy(slot.container):
+                self._destroy(slot)
+                continue
+
+            with self._cond:
+                self._busy[slot.container.id] = slot
+            self._background.submit(self._top_up, key)
+            return slot.container
+
+    def release(self, container: Container, *, reusable: bool = True) -> None:
+        """Give *container* back after a run.
+
+        It is scrubbed and returned to the idle list when recycling is
+        enabled and *reusable* is true; otherwise it is destroyed off the
+        caller's critical path and replaced.
+        """
+        with self._cond:
+            slot = self._busy.pop(container.id, None)
+        if slot is None:
+            return
+
+        if reusable and self.settings.recycle and not self._closed and _scrub(container):
+            slot.idle_since = time.monotonic()
+            with self._cond:
+                self._idle.setdefault(slot.key, []).append(slot)
+                self._cond.notify_all()
+            return
+
+        self._background.submit(self._destroy, slot)
+        self._background.submit(self._top_up, slot.key)
+
+    def maintain(self) -> None:
+        """Evict idle containers past ``idle_timeout``, retire keys unused
+        for that long, health-check the rest, and top every remaining key
+        back up to ``min_size``.
+        """
+        now = time.monotonic()
+        stale: list[_Slot] = []
+        with self._cond:
+            busy = {slot.key for slot in self._busy.values()}
+            for key in list(self._templates):
+                unused = now - self._last_used.get(key, now)
+                if key in self._warmed or key in busy or unused <= self.settings.idle_timeout:
+                    continue
+                stale.extend(self._idle.pop(key, []))
+                del self._templates[key]
+                self._last_used.pop(key, None)
+            for key, idle in self._idle.items():
+                excess = self._counts.get(key, 0) - self.settings.min_size
+                keep: list[_Slot] = []
+                for slot in idle:
+                    if excess > 0 and now - slot.idle_since > self.settings.idle_timeout:
+                        stale.append(slot)
+                        excess -= 1
+                    else:
+                        keep.append(slot)
+                self._idle[key] = keep
+            checks = [slot for idle in self._idle.values() for slot in idle]
+            keys = list(self._templates)
+
+        for slot in stale:
+            self._destroy(slot)
+
+        for slot in checks:
+            if _is_healthy(slot.container):
+                continue
+            with self._cond:
+                idle = self._idle.get(slot.key, [])
+                if slot not in idle:
+                    continue
+                idle.remove(slot)
+            self._destroy(slot)
+
+        for key in keys:
+            self._top_up(key)
+
+    def start(self) -> ContainerPool:
+        """Run :meth:`maintain` periodically on a background thread."""
+        if self._maintainer is None:
+            self._maintainer = threading.Thread(
+                target=self._maintenance_loop, name="safebox-pool-maintainer", daemon=True
+            )
+            self._maintainer.start()
+        return self
+
+    def close(self) -> None:
+        """Stop maintenance and destroy every container owned by the pool."""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            slots = [slot for idle in self._idle.values() for slot in idle]
+            slots.extend(self._busy.values())
+            self._idle.clear()
+            self._busy.clear()
+            self._cond.notify_all()
+
+        self._stop.set()
+        self._background.shutdown(wait=True)
+        for slot in slots:
+            _remove(slot.container)
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        """Return ``{image: {"idle": n, "busy": n, "total": n}}``."""
+        out: dict[str, dict[str, int]] = {}
+        with self._cond:
+            for key, total in self._counts.items():
+                entry = out.setdefault(self._name(key), {"idle": 0, "busy": 0, "total": 0})
+                entry["idle"] += len(self._idle.get(key, []))
+                entry["total"] += total
+            for slot in self._busy.values():
+                entry = out.setdefault(self._name(slot.key), {"idle": 0, "busy": 0, "total": 0})
+                entry["busy"] += 1
+        return out
+
+    def __enter__(self) -> ContainerPool:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    # ── Internals ────────────────────────────────────────────
+
+    def _name(self, key: PoolKey) -> str:
+        template = self._templates.get(key)
+        return template.image if template is not None else key.image
+
+    def _reserve(
+        self, key: PoolKey, config: ContainerConfig, deadline: float
+    ) -> _Slot | None:
+        """Pop an idle slot, or reserve capacity for a new one (``None``)."""
+        with self._cond:
+            self._templates.setdefault(key, config)
+            self._last_used[key] = time.monotonic()
+            while True:
+                if self._closed:
+                    raise PoolExhaustedError("Container pool is closed.")
+                idle = self._idle.get(key)
+                if idle:
+                    return idle.pop()
+                if self._counts.get(key, 0) < self.settings.max_size:
+                    self._counts[key] = self._counts.get(key, 0) + 1
+                    return None
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise PoolExhaustedError(
+                        f"No pooled container for '{self._name(key)}' became available "
+                        f"within {self.settings.acquire_timeout:.0f}s "
+                        f"(max_size={self.settings.max_size})."
+                    )
+                self._cond.wait(remaining)
+
+    def _start(self, key: PoolKey) -> Container:
+        kwargs = build_pool_container_kwargs(self._templates[key], key.label)
+        return self.client.containers.run(**kwargs)
+
+    def _top_up(self, key: PoolKey) -> None:
+        while True:
+            with self._cond:
+                if self._closed or key not in self._templates:
+                    return
+                idle = len(self._idle.get(key, []))
+                total = self._counts.get(key, 0)
+                if idle >= self.settings.min_size or total >= self.settings.max_size:
+                    return
+                self._counts[key] = total + 1
+            try:
+                container = self._start(key)
+            except Exception:
+                self._forget(key)
+                return
+            with self._cond:
+                retired = self._closed or key not in self._templates
+                if not retired:
+                    self._idle.setdefault(key, []).append(_Slot(container, key))
+                    self._cond.notify_all()
+            if retired:
+                self._destroy(_Slot(container, key))
+                return
+
+    def _destroy(self, slot: _Slot) -> None:
+        _remove(slot.container)
+        self._forget(slot.key)
+
+    def _forget(self, key: PoolKey) -> None:
+        with self._cond:
+            count = self._counts.get(key, 0) - 1
+            if count > 0 or key in self._templates:
+                self._counts[key] = max(0, count)
+            else:
+                self._counts.pop(key, None)  # retired and empty
+            self._cond.notify_all()
+
+    def _maintenance_loop(self) -> None:
+        while not self._stop.wait(self.settings.maintenance_interval):
+            try:
+                self.maintain()
+            except Exception:
+                pass
+
+
+def _is_healthy(container: Container) -> bool:
+    try:
+        container.reload()
+    except Exception:
+        return False
+    return container.status == "running"
+
+
+def _scrub(container: Container) -> bool:
+    """Wipe the injected script and scratch files; ``False`` on failure."""
+    try:
+        result = container.exec_run(
+            ["sh", "-c", f"rm -rf {SANDBOX_DIR}/* {SANDBOX_DIR}/.[!.]* /tmp/* /tmp/.[!.]*"],
+        )
+    except Exception:
+        return False
+    return result.exit_code == 0
+
+
+def _remove(container: Container) -> None:
+    try:
+        container.remove(force=True)
+    except Exception:
+        pass
@@ -0,0 +1,58 @@
+"""Execution result — kept free of Docker imports so clients load it cheaply."""
+
+from __future__ import annotations
+
+import gzip
+import io
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Iterator
+
+if TYPE_CHECKING:
+    from safebox.core.telemetry import ResourceUsage
+
+
+@dataclass
+class ExecutionResult:
+    """Outcome of a sandboxed script run.
+
+    :attr:`output` is stdout and stderr interleaved as they arrived;
+    :attr:`stdout` and :attr:`stderr` hold each stream on its own.  All
+    three are ``bytes`` for runs executed with ``raw=True``.  :attr:`cached`
+    results were replayed from an identical earlier run.
+    """
+
+    exit_code: int
+    duration: float
+    timed_out: bool = False
+    output: str | bytes = ""
+    language: str = ""
+    image: str = ""
+    image_id: str = ""
+    output_bytes: int = 0
+    output_file: Path | None = None
+    output_truncated: bool = False
+    stdout: str | bytes = ""
+    stderr: str | bytes = ""
+    cached: bool = False
+    """Replayed from the result cache instead of run in a container."""
+    usage: ResourceUsage | None = None
+    """Sampled resource usage, when stats were collected."""
+
+    def open_output(self) -> IO:
+        """Open the complete output for reading (binary for raw runs).
+
+        :attr:`output` only holds the head and tail of a large run; the
+        full text is streamed from :attr:`output_file` when it was spilled.
+        """
+        raw = isinstance(self.output, bytes)
+        if self.output_file is not None:
+            if raw:
+                return gzip.open(self.output_file, "rb")
+            return gzip.open(self.output_file, "rt", encoding="utf-8", errors="replace")
+        return io.BytesIO(self.output) if raw else io.StringIO(self.output)
+
+    def iter_output(self) -> Iterator[str | bytes]:
+        """Yield the complete output line by line without loading it at once."""
+        with self.open_output() as handle:
+            yield from handle
@@ -0,0 +1,285 @@
+"""Content-addressed result cache — replay identical runs without a container."""
+
+from __future__ import annotations
+
+import atexit
+import base64
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from safebox.config.constants import DEFAULT_RESULT_CACHE_SIZE, RESULT_CACHE_STATS_FLUSH
+from safebox.config.settings import RESULT_CACHE_DIR
+
+if TYPE_CHECKING:
+    from safebox.core.container import ContainerConfig
+
+CACHE_FORMAT = 1
+"""Bumped whenever the key derivation or entry layout changes."""
+
+_SUFFIX = ".json.gz"
+
+
+@dataclass
+class CachedRun:
+    """A finished run as stored in the cache: its outcome and output frames."""
+
+    key: str
+    script: str
+    exit_code: int
+    duration: float
+    language: str
+    image: str
+    image_id: str
+    output_bytes: int = 0
+    binary: bool = False
+    frames: list[tuple[int, str | bytes]] = field(default_factory=list)
+    created_at: float = 0.0
+
+
+@dataclass
+class CacheStats:
+    """Hit/miss counters and current size of a :class:`ResultCache`."""
+
+    hits: int
+    misses: int
+    entries: int
+    size_bytes: int
+    max_bytes: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+def cache_key(
+    config: ContainerConfig, *, max_output: int | None = None, raw: bool = False
+) -> str:
+    """Hash everything that determines a run's outcome.
+
+    Covers the script's contents (not its path), the pinned image ID,
+    language, resource limits, arguments, environment and the capture
+    settings that shape the stored output.
+    """
+    material = {
+        "format": CACHE_FORMAT,
+        "script": hashlib.sha256(config.script_path.read_bytes()).hexdigest(),
+        "script_name": config.script_name,
+        "image": config.image_ref,
+        "language": config.language,
+        "memory": config.memory,
+        "cpus": config.cpus,
+        "timeout": config.timeout,
+        "pids_limit": config.pids_limit,
+        "args": config.extra_args,
+        "env": sorted(config.environment.items()),
+        "max_output": max_output,
+        "raw": raw,
+    }
+    encoded = json.dumps(material, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """Finished runs stored as gzip JSON files under ``~/.safebox/results``.
+
+    Each entry is one file named by its key.  Hits bump the file's mtime,
+    and once the directory grows past *max_bytes* the least recently used
+    entries are deleted.  Hit and miss counts persist across processes
+    in ``stats.json``, which is only written on :meth:`put`, at most
+    every :data:`RESULT_CACHE_STATS_FLUSH` seconds of lookups, and at
+    exit; counts in between stay in memory.  Like the image cache,
+    failing to read or write the directory only costs the cache, never
+    the run.
+    """
+
+    def __init__(
+        self, directory: Path = RESULT_CACHE_DIR, max_bytes: int = DEFAULT_RESULT_CACHE_SIZE
+    ) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._pending: dict[str, int] = {}
+        self._flushed_at = time.monotonic()
+        self._atexit = False
+
+    def get(self, key: str) -> CachedRun | None:
+        """Return the stored run for *key* (counting a hit), or ``None`` (a miss)."""
+        path = self._path(key)
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as handle:
+                run = _decode(json.load(handle))
+            os.utime(path)
+        except (OSError, ValueError, TypeError, KeyError):
+            self._count("misses")
+            return None
+        self._count("hits")
+        return run
+
+    def put(self, run: CachedRun) -> None:
+        """Store *run*, then evict old entries beyond :attr:`max_bytes`."""
+        path = self._path(run.key)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with gzip.open(tmp, "wt", encoding="utf-8", compresslevel=1) as handle:
+                json.dump(_encode(run), handle, ensure_ascii=False)
+            os.replace(tmp, path)
+        except OSError:
+            tmp.unlink(missing_ok=True)
+            return
+        self._evict()
+        self.flush_stats()
+
+    def invalidate(self, key: str | None = None, *, script: Path | None = None) -> int:
+        """Drop the entry for *key*, every entry recorded for *script*, or all.
+
+        Returns the number of entries removed.
+        """
+        if key is not None:
+            paths = [self._path(key)]
+        else:
+            paths = [path for path, _ in self._entries()]
+        if script is not None:
+            wanted = str(script.resolve())
+            paths = [path for path in paths if _script_of(path) == wanted]
+
+        removed = 0
+        for path in paths:
+            try:
+                path.unlink()
+                removed += 1
+            except OSError:
+                pass
+        return removed
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            counts = self._read_counts()
+            for name, count in self._pending.items():
+                counts[name] = counts.get(name, 0) + count
+        entries = self._entries()
+        return CacheStats(
+            hits=counts.get("hits", 0),
+            misses=counts.get("misses", 0),
+            entries=len(entries),
+            size_bytes=sum(stat.st_size for _, stat in entries),
+            max_bytes=self.max_bytes,
+        )
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._pending.clear()
+            self._write_counts({})
+
+    def flush_stats(self) -> None:
+        """Add the counts gathered in memory to ``stats.json``."""
+        with self._lock:
+            self._flush_locked()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}{_SUFFIX}"
+
+    def _entries(self) -> list[tuple[Path, os.stat_result]]:
+        entries = []
+        try:
+            paths = list(self.directory.glob(f"*{_SUFFIX}"))
+        except OSError:
+            return entries
+        for path in paths:
+            try:
+                entries.append((path, path.stat()))
+            except OSError:
+                pass
+        return entries
+
+    def _evict(self) -> None:
+        """Delete least recently used entries until the cache fits :attr:`max_bytes`."""
+        entries = sorted(self._entries(), key=lambda entry: entry[1].st_mtime)
+        total = sum(stat.st_size for _, stat in entries)
+        for path, stat in entries:
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= stat.st_size
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._pending[name] = self._pending.get(name, 0) + 1
+            if not self._atexit:
+                atexit.register(self.flush_stats)
+                self._atexit = True
+            if time.monotonic() - self._flushed_at >= RESULT_CACHE_STATS_FLUSH:
+                self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        self._flushed_at = time.monotonic()
+        if not self._pending:
+            return
+        counts = self._read_counts()
+        for name, count in self._pending.items():
+            counts[name] = counts.get(name, 0) + count
+        self._pending.clear()
+        self._write_counts(counts)
+
+    def _read_counts(self) -> dict[str, int]:
+        try:
+            return json.loads((self.directory / "stats.json").read_text())
+        except (OSError, ValueError):
+            return {}
+
+    def _write_counts(self, counts: dict[str, int]) -> None:
+        path = self.directory / "stats.json"
+        tmp = path.with_name(f".stats.json.{os.getpid()}.tmp")
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            tmp.write_text(json.dumps(counts))
+            os.replace(tmp, path)
+        except OSError:
+            tmp.unlink(missing_ok=True)
+
+
+_default_cache: ResultCache | None = None
+
+
+def get_result_cache() -> ResultCache:
+    """Return the process-wide :class:`ResultCache`."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ResultCache()
+    return _default_cache
+
+
+def _encode(run: CachedRun) -> dict:
+    frames = [
+        [stream, base64.b64encode(data).decode("ascii") if run.binary else data]
+        for stream, data in run.frames
+    ]
+    return {**asdict(run), "format": CACHE_FORMAT, "frames": frames}
+
+
+def _decode(data: dict) -> CachedRun:
+    if data.pop("format", None) != CACHE_FORMAT:
+        raise ValueError("unsupported cache entry format")
+    binary = data.get("binary", False)
+    data["frames"] = [
+        (stream, base64.b64decode(payload) if binary else payload)
+        for stream, payload in data["frames"]
+    ]
+    return CachedRun(**data)
+
+
+def _script_of(path: Path) -> str | None:
+    """The script path recorded in the entry at *path*."""
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as handle:
+            return json.load(handle).get("script")
+    except (OSError, ValueError):
+        return None
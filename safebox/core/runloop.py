@@ -0,0 +1,142 @@
+"""Deadline-aware run loop — streams output, enforces the timeout and
+detects exit in one place.
+"""
+
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Iterable
+
+from safebox.core.timeout import ExecutionTimeoutError
+
+KILL_DRAIN_TIMEOUT = 2.0
+"""Seconds to keep draining output after a kill before abandoning the stream."""
+
+_END = object()
+
+
+@dataclass
+class RunOutcome:
+    """What the run loop observed about a finished process."""
+
+    exit_code: int
+    timed_out: bool
+    duration: float
+
+
+def run_loop(
+    chunks: Iterable[tuple[int, bytes]],
+    *,
+    timeout: float,
+    on_chunk: Callable[[tuple[int, bytes]], None],
+    kill: Callable[[], None],
+    exit_status: Callable[[float], int | None],
+    cancel: Callable[[], None] | None = None,
+    on_timeout: Callable[[], None] | None = None,
+    start_time: float | None = None,
+    grace: float = 0.0,
+    expired: Callable[[], bool] | None = None,
+) -> RunOutcome:
+    """Drive one sandboxed process to completion.
+
+    A reader thread pumps *chunks* into a queue while this thread waits
+    on that queue with the remaining time as its timeout, so output,
+    the deadline and end-of-stream are handled by a single loop:
+
+    * each ``(stream, payload)`` chunk is handed to *on_chunk* as it
+      arrives;
+    * when the deadline passes, *on_timeout* and *kill* are called and
+      the stream is drained for at most *grace* plus
+      :data:`KILL_DRAIN_TIMEOUT` seconds before it is abandoned (and
+      *cancel*-led, when given);
+    * end-of-stream means the process exited.  If *expired* reports
+      that the deadline was enforced elsewhere first (a watchdog killed
+      it), the run counts as timed out; otherwise *exit_status* — given
+      the seconds left before the deadline — reports its exit code
+      (``None`` when unknown).  It may raise
+      :class:`ExecutionTimeoutError` if the process turns out to still be
+      running when the deadline passes.
+
+    If *on_chunk* raises or the loop is interrupted (e.g. ``Ctrl-C``), the
+    process is killed before the exception propagates.
+    """
+    start = time.monotonic() if start_time is None else start_time
+    deadline = start + timeout
+    events: queue.SimpleQueue = queue.SimpleQueue()
+
+    def _pump() -> None:
+        try:
+            for chunk in chunks:
+                events.put(chunk)
+        except Exception:
+            pass
+        events.put(_END)
+
+    threading.Thread(target=_pump, name="safebox-stream", daemon=True).start()
+
+    timed_out = False
+    try:
+        while True:
+            remaining = deadline - time.monotonic()
+            if timed_out:
+                remaining += grace + KILL_DRAIN_TIMEOUT
+            try:
+                item = events.get(timeout=max(remaining, 0))
+            except queue.Empty:
+                if timed_out:
+                    if cancel is not None:
+                        try:
+                            cancel()
+                        except Exception:
+                            pass
+                    break
+                timed_out = True
+                if on_timeout is not None:
+                    on_timeout()
+                try:
+                    kill()
+                except Exception:
+                    pass
+                continue
+
+            if item is _END:
+                if not timed_out and expired is not None and expired():
+                    timed_out = True
+                    if on_timeout is not None:
+                        on_timeout()
+                break
+            on_chunk(item)
+    except BaseException:
+        # The consumer failed or we were interrupted: never leave the
+        # process running behind our back.
+        try:
+            kill()
+        except Exception:
+            pass
+        raise
+
+    if not timed_out:
+        try:
+            exit_code = exit_status(max(deadline - time.monotonic(), 0))
+        except ExecutionTimeoutError:
+            timed_out = True
+            try:
+                kill()
+            except Exception:
+                pass
+        except Exception:
+            exit_code = None
+
+    duration = time.monotonic() - start
+
+    if timed_out:
+        return RunOutcome(exit_code=124, timed_out=True, duration=duration)
+
+    return RunOutcome(
+        exit_code=1 if exit_code is None else exit_code,
+        timed_out=False,
+        duration=duration,
+    )
@@ -0,0 +1,275 @@
+"""Admission control — hold runs back until the host has room for their limits."""
+
+from __future__ import annotations
+
+import contextlib
+import itertools
+import os
+import statistics
+import threading
+import time
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Iterator
+
+from safebox.config.constants import (
+    DEFAULT_SCHEDULER_PIDS,
+    SCHEDULER_MEMORY_FRACTION,
+    SCHEDULER_WAIT_SAMPLES,
+)
+from safebox.core.docker_client import get_client
+from safebox.core.tracing import span
+from safebox.utils.validators import parse_memory_bytes
+
+if TYPE_CHECKING:
+    from docker import DockerClient
+
+    from safebox.core.container import ContainerConfig
+
+
+class AdmissionTimeoutError(Exception):
+    """Raised when a run is still queued when its admission timeout expires."""
+
+
+@dataclass(frozen=True)
+class Resources:
+    """Memory (bytes), CPU (``nano_cpus``) and PIDs, as Docker limits them."""
+
+    memory: int = 0
+    nano_cpus: int = 0
+    pids: int = 0
+
+    @classmethod
+    def from_config(cls, config: ContainerConfig) -> Resources:
+        return cls(
+            parse_memory_bytes(config.memory),
+            int(config.cpus * 1_000_000_000),
+            config.pids_limit,
+        )
+
+    def __add__(self, other: Resources) -> Resources:
+        return Resources(
+            self.memory + other.memory, self.nano_cpus + other.nano_cpus, self.pids + other.pids
+        )
+
+    def __sub__(self, other: Resources) -> Resources:
+        return Resources(
+            self.memory - other.memory, self.nano_cpus - other.nano_cpus, self.pids - other.pids
+        )
+
+    def fits(self, budget: Resources) -> bool:
+        """Whether every dimension is within *budget*."""
+        return (
+            self.memory <= budget.memory
+            and self.nano_cpus <= budget.nano_cpus
+            and self.pids <= budget.pids
+        )
+
+    def to_dict(self) -> dict[str, int]:
+        return {"memory": self.memory, "nano_cpus": self.nano_cpus, "pids": self.pids}
+
+
+def host_memory_bytes() -> int | None:
+    """Physical memory of this host, or ``None`` where it can't be read."""
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def host_budget(client: DockerClient | None = None) -> Resources:
+    """What sandboxes may commit in total on the Docker host.
+
+    :data:`SCHEDULER_MEMORY_FRACTION` of the daemon's memory, all of its
+    CPUs and :data:`DEFAULT_SCHEDULER_PIDS` processes.  The daemon's own
+    figures are used when *client* can report them (Docker Desktop runs
+    in a VM smaller than the machine), otherwise this machine's.
+    """
+    memory, cpus = host_memory_bytes(), os.cpu_count() or 1
+    if client is not None:
+        try:
+            info = client.info()
+            memory, cpus = info.get("MemTotal") or memory, info.get("NCPU") or cpus
+        except Exception:
+            pass
+    return Resources(
+        int((memory or 0) * SCHEDULER_MEMORY_FRACTION),
+        cpus * 1_000_000_000,
+        DEFAULT_SCHEDULER_PIDS,
+    )
+
+
+@dataclass(eq=False)
+class _Ticket:
+    resources: Resources
+    priority: int
+    tenant: str
+    seq: int
+    queued_at: float = field(default_factory=time.monotonic)
+    granted: bool = False
+
+
+class Scheduler:
+    """Admit runs while their combined limits fit within a host *budget*.
+
+    :meth:`admit` blocks a run until the memory, ``nano_cpus`` and PIDs
+    committed by admitted runs leave room for its own.  Waiting runs are
+    admitted highest *priority* first; among equal priorities the tenant
+    with the fewest running runs goes next, ties going to the tenant
+    served longest ago (fair share), then the earliest.  The next run in
+    that order is never overtaken, so a large run cannot be starved by a
+    stream of small ones.  A run larger than the whole budget is admitted
+    alone.
+    """
+
+    def __init__(self, budget: Resources) -> None:
+        self.budget = budget
+        self._cond = threading.Condition()
+        self._committed = Resources()
+        self._running: Counter[str] = Counter()
+        self._served: dict[str, int] = {}
+        self._queue: list[_Ticket] = []
+        self._seq = itertools.count()
+        self._waits: deque[float] = deque(maxlen=SCHEDULER_WAIT_SAMPLES)
+        self._admitted = 0
+        self._max_queued = 0
+
+    @contextlib.contextmanager
+    def admit(
+        self,
+        resources: Resources,
+        *,
+        priority: int = 0,
+        tenant: str = "default",
+        timeout: float | None = None,
+    ) -> Iterator[float]:
+        """Hold the caller until *resources* fit; yields the seconds spent queued.
+
+        The resources are committed until the ``with`` block exits.
+        Raises :class:`AdmissionTimeoutError` after *timeout* seconds in
+        the queue.
+        """
+        ticket = _Ticket(resources, priority, tenant, next(self._seq))
+        with span("admission", tenant=tenant, priority=priority):
+            waited = self._wait(ticket, timeout)
+        try:
+            yield waited
+        finally:
+            self._release(ticket)
+
+    def stats(self) -> dict:
+        """Budget, commitments, queue depth and queue-wait percentiles."""
+        with self._cond:
+            waits = sorted(self._waits)
+            queued = Counter(ticket.tenant for ticket in self._queue)
+            return {
+                "budget": self.budget.to_dict(),
+                "committed": self._committed.to_dict(),
+                "running": sum(self._running.values()),
+                "queued": len(self._queue),
+                "max_queued": self._max_queued,
+                "admitted": self._admitted,
+                "tenants": {
+                    tenant: {"running": self._running[tenant], "queued": queued[tenant]}
+                    for tenant in sorted(set(self._running) | set(queued))
+                },
+                "wait": {
+                    "p50": _quantile(waits, 50),
+                    "p95": _quantile(waits, 95),
+                    "max": waits[-1] if waits else 0.0,
+                },
+            }
+
+    def _wait(self, ticket: _Ticket, timeout: float | None) -> float:
+        deadline = None if timeout is None else ticket.queued_at + timeout
+        with self._cond:
+            self._queue.append(ticket)
+            self._max_queued = max(self._max_queued, len(self._queue))
+            self._dispatch()
+            try:
+                while not ticket.granted:
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        raise AdmissionTimeoutError(
+                            f"Not admitted within {timeout:g}s: "
+                            f"{len(self._queue) - 1} other run(s) queued."
+                        )
+                    self._cond.wait(remaining)
+            except BaseException:
+                if ticket.granted:
+                    self._release_locked(ticket)
+                else:
+                    self._queue.remove(ticket)
+                    self._forget(ticket.tenant)
+                    self._dispatch()  # the next run may have been waiting behind this one
+                raise
+            waited = time.monotonic() - ticket.queued_at
+            self._waits.append(waited)
+            return waited
+
+    def _release(self, ticket: _Ticket) -> None:
+        with self._cond:
+            self._release_locked(ticket)
+
+    def _release_locked(self, ticket: _Ticket) -> None:
+        ticket.granted = False
+        self._committed -= ticket.resources
+        self._running[ticket.tenant] -= 1
+        if not self._running[ticket.tenant]:
+            del self._running[ticket.tenant]
+            self._forget(ticket.tenant)
+        self._dispatch()
+
+    def _forget(self, tenant: str) -> None:
+        """Drop *tenant*'s fair-share history once it has nothing running or queued.
+
+        A tenant that comes back later sorts as never served, ahead of
+        the tenants that stayed busy meanwhile.
+        """
+        if tenant not in self._running and all(t.tenant != tenant for t in self._queue):
+            self._served.pop(tenant, None)
+
+    def _dispatch(self) -> None:
+        """Grant queued tickets in order while they fit.  Called with the lock held."""
+        granted = False
+        while self._queue:
+            ticket = min(
+                self._queue,
+                key=lambda t: (
+                    -t.priority,
+                    self._running[t.tenant],
+                    self._served.get(t.tenant, -1),
+                    t.seq,
+                ),
+            )
+            idle = not self._running
+            if not (idle or (self._committed + ticket.resources).fits(self.budget)):
+                break
+            self._queue.remove(ticket)
+            ticket.granted = True
+            self._committed += ticket.resources
+            self._running[ticket.tenant] += 1
+            self._served[ticket.tenant] = self._admitted
+            self._admitted += 1
+            granted = True
+        if granted:
+            self._cond.notify_all()
+
+
+def _quantile(values: list[float], q: int) -> float:
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return statistics.quantiles(values, n=100, method="inclusive")[q - 1]
+
+
+_default_scheduler: Scheduler | None = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> Scheduler:
+    """Return the process-wide :class:`Scheduler`, budgeted by :func:`host_budget`."""
+    global _default_scheduler
+    with _scheduler_lock:
+        if _default_scheduler is None:
+            _default_scheduler = Scheduler(host_budget(get_client()))
+        return _default_scheduler
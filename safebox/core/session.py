@@ -0,0 +1,319 @@
+"""Sandbox sessions — one container that many scripts and commands are exec'd into."""
+
+from __future__ import annotations
+
+import itertools
+import threading
+from dataclasses import replace
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from docker.errors import APIError
+
+from safebox.config.constants import (
+    DEFAULT_CAPTURE_MEMORY,
+    DEFAULT_CPUS,
+    DEFAULT_KILL_GRACE,
+    DEFAULT_MEMORY,
+    DEFAULT_PIDS_LIMIT,
+    DEFAULT_TIMEOUT,
+    EXTENSION_MAP,
+    LANGUAGE_IMAGE_MAP,
+    SANDBOX_DIR,
+)
+from safebox.core.capture import RunCapture
+from safebox.core.compile_cache import ensure_cache_volumes
+from safebox.core.container import (
+    ContainerConfig,
+    build_command,
+    build_session_container_kwargs,
+)
+from safebox.core.docker_client import get_client
+from safebox.core.events import get_events
+from safebox.core.exec_run import OutputEcho, run_exec
+from safebox.core.executor import ExecutionError
+from safebox.core.images import resolve_image
+from safebox.core.result import ExecutionResult
+from safebox.core.tracing import span
+from safebox.output.reporter import Reporter
+
+if TYPE_CHECKING:
+    from docker import DockerClient
+    from docker.models.containers import Container
+
+    from safebox.core.runloop import RunOutcome
+
+_SUFFIXES = {language: suffix for suffix, language in reversed(EXTENSION_MAP.items())}
+"""First file extension of each language, for :meth:`Sandbox.run_code` snippets."""
+
+
+class SessionClosedError(Exception):
+    """Raised when a :class:`Sandbox` is used after :meth:`~Sandbox.close`."""
+
+
+class Sandbox:
+    """One resource-limited container that many scripts and commands run in.
+
+    The container starts on entry (or :meth:`start`) with the limits
+    given here and stays up until :meth:`close`.  :meth:`run`,
+    :meth:`run_code` and :meth:`run_command` each ``exec`` into it, so a
+    call costs an exec rather than a container start, and returns an
+    :class:`ExecutionResult`.  Calls are serialised; files one writes
+    under ``SANDBOX_DIR`` or ``/tmp`` are visible to the next.
+
+    Every call has its own *timeout*.  A call that reaches it, or
+    *max_output*, is stopped by killing the container — the only way to
+    be sure everything it started is gone — and the next call starts a
+    fresh one, without the files of earlier calls.  A container that
+    died some other way is noticed before the next call, from the events
+    stream or because Docker refuses the exec, and replaced the same way.
+
+    ::
+
+        with Sandbox("python", memory="128m", timeout=5) as box:
+            box.run_code("open('/tmp/x', 'w').write('hi')")
+            print(box.run_command("cat /tmp/x").stdout)
+    """
+
+    def __init__(
+        self,
+        language: str = "python",
+        *,
+        image: str | None = None,
+        memory: str = DEFAULT_MEMORY,
+        cpus: float = DEFAULT_CPUS,
+        pids_limit: int = DEFAULT_PIDS_LIMIT,
+        timeout: int = DEFAULT_TIMEOUT,
+        kill_grace: float = DEFAULT_KILL_GRACE,
+        environment: dict[str, str] | None = None,
+        compile_cache: bool = False,
+        pull: bool = False,
+        max_output: int | None = None,
+        capture_memory: int = DEFAULT_CAPTURE_MEMORY,
+        raw: bool = False,
+    ) -> None:
+        image = image or LANGUAGE_IMAGE_MAP.get(language)
+        if image is None:
+            raise ExecutionError(
+                f"No default image for language '{language}'. Pass image= explicitly."
+            )
+        self.config = ContainerConfig(
+            image=image,
+            language=language,
+            script_path=Path(SANDBOX_DIR),  # each call brings its own script
+            memory=memory,
+            cpus=cpus,
+            timeout=timeout,
+            pids_limit=pids_limit,
+            kill_grace=kill_grace,
+            environment=environment or {},
+            compile_cache=compile_cache,
+        )
+        self.pull = pull
+        self.max_output = max_output
+        self.capture_memory = capture_memory
+        self.raw = raw
+        self.runs = 0
+        """Calls made so far."""
+        self.starts = 0
+        """Containers started so far; more than one after a timeout or crash."""
+        self._lock = threading.Lock()
+        self._snippets = itertools.count(1)
+        self._client: DockerClient | None = None
+        self._container: Container | None = None
+        self._resolved = False
+        self._closed = False
+
+    # ── Public API ───────────────────────────────────────────
+
+    def start(self) -> Sandbox:
+        """Start the container now rather than on the first call."""
+        with self._lock:
+            self._ensure_container()
+        return self
+
+    def run(
+        self,
+        script_path: str | Path,
+        *,
+        extra_args: str = "",
+        timeout: float | None = None,
+        environment: dict[str, str] | None = None,
+        reporter: Reporter | None = None,
+    ) -> ExecutionResult:
+        """Copy the local script *script_path* in and run it with the session's language."""
+        script_path = Path(script_path)
+        return self._run_script(
+            script_path.name, script_path.read_bytes(), extra_args, timeout, environment, reporter
+        )
+
+    def run_code(
+        self,
+        code: str,
+        *,
+        name: str | None = None,
+        extra_args: str = "",
+        timeout: float | None = None,
+        environment: dict[str, str] | None = None,
+        reporter: Reporter | None = None,
+    ) -> ExecutionResult:
+        """Run the source *code* as a script, saved as *name* (``snippet-N.py`` etc.)."""
+        if name is None:
+            name = f"snippet-{next(self._snippets)}{_SUFFIXES.get(self.config.language, '')}"
+        return self._run_script(
+            name, code.encode("utf-8"), extra_args, timeout, environment, reporter
+        )
+
+    def run_command(
+        self,
+        command: str | list[str],
+        *,
+        timeout: float | None = None,
+        environment: dict[str, str] | None = None,
+        reporter: Reporter | None = None,
+    ) -> ExecutionResult:
+        """Run *command* in ``SANDBOX_DIR``: a string through ``sh -c``, a list as is."""
+        argv = ["sh", "-c", command] if isinstance(command, str) else list(command)
+        return self._exec(self._call_config(timeout, environment), argv, None, reporter)
+
+    def close(self) -> None:
+        """Remove the container; further calls raise :class:`SessionClosedError`."""
+        with self._lock:
+            self._closed = True
+            self._discard()
+
+    def __enter__(self) -> Sandbox:
+        return self.start()
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    # ── Internals ────────────────────────────────────────────
+
+    def _run_script(
+        self,
+        name: str,
+        source: bytes,
+        extra_args: str,
+        timeout: float | None,
+        environment: dict[str, str] | None,
+        reporter: Reporter | None,
+    ) -> ExecutionResult:
+        config = replace(
+            self._call_config(timeout, environment),
+            script_path=Path(name),
+            script_name=name,
+            extra_args=extra_args,
+        )
+        return self._exec(config, build_command(config), source, reporter)
+
+    def _call_config(
+        self, timeout: float | None, environment: dict[str, str] | None
+    ) -> ContainerConfig:
+        return replace(
+            self.config,
+            timeout=self.config.timeout if timeout is None else timeout,
+            environment={**self.config.environment, **(environment or {})},
+        )
+
+    def _exec(
+        self,
+        config: ContainerConfig,
+        command: str | list[str],
+        source: bytes | None,
+        reporter: Reporter | None,
+    ) -> ExecutionResult:
+        """Run *command* (after writing *source* as *config*'s script) in the container."""
+        if reporter is None:
+            reporter = Reporter()
+        capture = RunCapture(
+            max_memory=self.capture_memory,
+            max_output=self.max_output,
+            name=Path(config.script_name).stem,
+            binary=self.raw,
+        )
+        with self._lock, span("session.exec"):
+            self.runs += 1
+            try:
+                outcome = self._exec_locked(config, command, source, reporter, capture)
+            finally:
+                capture.close()
+            if outcome.timed_out or capture.truncated:
+                self._discard()
+
+        result = ExecutionResult(
+            exit_code=outcome.exit_code,
+            duration=outcome.duration,
+            timed_out=outcome.timed_out,
+            output=capture.combined.value,
+            language=config.language,
+            image=config.image,
+            image_id=config.image_ref,
+            output_bytes=capture.combined.total_bytes,
+            output_file=capture.combined.spill_path,
+            output_truncated=capture.truncated,
+            stdout=capture.stdout.value,
+            stderr=capture.stderr.value,
+        )
+        reporter.result(result)
+        return result
+
+    def _exec_locked(
+        self,
+        config: ContainerConfig,
+        command: str | list[str],
+        source: bytes | None,
+        reporter: Reporter,
+        capture: RunCapture,
+    ) -> RunOutcome:
+        while True:
+            starts = self.starts
+            container = self._ensure_container()
+            config.image_ref = self.config.image_ref
+            echo = OutputEcho(reporter, capture, container.kill)
+            try:
+                return run_exec(
+                    self._client.api, container, config, command, echo, reporter, source=source
+                )
+            except APIError:
+                self._discard()
+                # Refused before anything ran.  Unless the container was new,
+                # it died unseen since the last call: try once in a fresh one.
+                if self.starts != starts:
+                    raise
+            except Exception:
+                self._discard()  # the container may be gone; start afresh next call
+                raise
+
+    def _ensure_container(self) -> Container:
+        """The running container, started first if there is none; needs the lock."""
+        if self._closed:
+            raise SessionClosedError("Sandbox session is closed.")
+        if self._container is not None:
+            status = get_events().exit_status(self._container.id)
+            if status is None or status.exit_code is None:
+                return self._container
+            self._discard()  # it died since the last call
+        client = self._client = get_client()
+        if not self._resolved:
+            with span("resolve_image", image=self.config.image):
+                self.config.image_ref = resolve_image(self.config.image, pull=self.pull)
+            if self.config.compile_cache:
+                ensure_cache_volumes(self.config, client)
+            self._resolved = True
+        with span("session.start", image=self.config.image_ref):
+            self._container = client.containers.run(
+                **build_session_container_kwargs(self.config)
+            )
+        self.starts += 1
+        return self._container
+
+    def _discard(self) -> None:
+        container, self._container = self._container, None
+        if container is None:
+            return
+        with span("remove"):
+            try:
+                container.remove(force=True)
+            except Exception:
+                pass
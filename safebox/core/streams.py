@@ -0,0 +1,113 @@
+"""Docker streams for the synchronous executor — output frames, stats and events.
+
+The output helpers yield ``(stream, payload)`` frames, where *stream* is
+``STDOUT`` or ``STDERR`` — the same shape as
+:meth:`safebox.core.async_docker.AsyncDockerClient.logs`.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING, Iterable, Iterator
+
+import requests
+from docker.errors import create_api_error_from_http_exception
+from docker.types import CancellableStream
+
+from safebox.config.constants import STDERR, STDOUT
+
+if TYPE_CHECKING:
+    from docker import APIClient
+
+
+def demux_frames(chunks: Iterable[bytes]) -> Iterator[tuple[int, bytes]]:
+    """Split Docker's multiplexed stream (8-byte frame headers) into frames."""
+    buf = bytearray()
+    for chunk in chunks:
+        buf += chunk
+        while len(buf) >= 8:
+            size = int.from_bytes(buf[4:8], "big")
+            if len(buf) < 8 + size:
+                break
+            stream = buf[0]
+            payload = bytes(buf[8 : 8 + size])
+            del buf[: 8 + size]
+            yield stream, payload
+
+
+def follow_logs(api: APIClient, container_id: str) -> CancellableStream:
+    """Follow a container's output frame by frame.
+
+    Reads ``/containers/{id}/logs`` directly: docker-py's ``logs()``
+    merges the two streams, and both it and ``attach()`` inspect the
+    container first to check for a TTY, which SafeBox containers never
+    have.  ``close()`` on the result aborts a blocked read.
+    """
+    response = api.get(
+        f"{api.base_url}/v{api.api_version}/containers/{container_id}/logs",
+        params={"stdout": 1, "stderr": 1, "follow": 1},
+        stream=True,
+        timeout=None,
+    )
+    try:
+        response.raise_for_status()
+    except requests.HTTPError as exc:
+        response.close()
+        create_api_error_from_http_exception(exc)  # raises APIError / NotFound
+    return CancellableStream(demux_frames(response.iter_content(chunk_size=None)), response)
+
+
+def follow_stats(api: APIClient, container_id: str) -> CancellableStream:
+    """Follow a container's stats stream, one decoded sample at a time.
+
+    ``close()`` on the result aborts a blocked read.
+    """
+    response = api.get(
+        f"{api.base_url}/v{api.api_version}/containers/{container_id}/stats",
+        params={"stream": 1},
+        stream=True,
+        timeout=None,
+    )
+    try:
+        response.raise_for_status()
+    except requests.HTTPError as exc:
+        response.close()
+        create_api_error_from_http_exception(exc)  # raises APIError / NotFound
+    samples = (json.loads(line) for line in response.iter_lines() if line)
+    return CancellableStream(samples, response)
+
+
+def follow_events(
+    api: APIClient, filters: dict[str, list[str]], since: int | None = None
+) -> CancellableStream:
+    """Follow the daemon's event stream, one decoded event at a time.
+
+    *filters* is sent as-is (e.g. ``{"type": ["container"]}``); *since*
+    replays events from that Unix time onwards.  ``close()`` on the
+    result aborts a blocked read.
+    """
+    params: dict = {"filters": json.dumps(filters)}
+    if since is not None:
+        params["since"] = since
+    response = api.get(
+        f"{api.base_url}/v{api.api_version}/events",
+        params=params,
+        stream=True,
+        timeout=None,
+    )
+    try:
+        response.raise_for_status()
+    except requests.HTTPError as exc:
+        response.close()
+        create_api_error_from_http_exception(exc)  # raises APIError
+    events = (json.loads(line) for line in response.iter_lines() if line)
+    return CancellableStream(events, response)
+
+
+def exec_frames(api: APIClient, exec_id: str) -> Iterator[tuple[int, bytes]]:
+    """Start exec *exec_id* and yield its output frame by frame."""
+    for out, err in api.exec_start(exec_id, stream=True, demux=True):
+        if out:
+            yield STDOUT, out
+        if err:
+            yield STDERR, err
@@ -0,0 +1,137 @@
+"""Resource telemetry — container stats sampled while a script runs."""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from typing import Callable, Iterator
+
+OOM_SUSPECT_RATIO = 0.95
+"""Peak memory / limit above which an exit 137 is attributed to the OOM killer."""
+
+
+@dataclass
+class ResourceUsage:
+    """What a run consumed, from Docker's stats stream (about one sample a second).
+
+    Memory is the working set (usage minus reclaimable page cache), in
+    bytes.  CPU, throttling, block and network I/O are cumulative
+    counters as of the last sample, so a run shorter than the sampling
+    interval may report zeros there.  *first_output* is the time from
+    start to the first byte of output, in seconds.
+    """
+
+    samples: int = 0
+    memory_peak: int = 0
+    memory_avg: int = 0
+    memory_limit: int = 0
+    cpu_time: float = 0.0
+    cpu_avg: float = 0.0
+    throttled_periods: int = 0
+    throttled_time: float = 0.0
+    block_read: int = 0
+    block_write: int = 0
+    net_rx: int = 0
+    net_tx: int = 0
+    pids_peak: int = 0
+    oom_killed: bool = False
+    first_output: float | None = None
+
+    @property
+    def memory_ratio(self) -> float:
+        """Peak memory as a fraction of the limit (``0.0`` when unknown)."""
+        return self.memory_peak / self.memory_limit if self.memory_limit else 0.0
+
+
+class StatsSampler:
+    """Fold a container's stats stream into a :class:`ResourceUsage`.
+
+    *open_stream* is called on the sampler's own thread, so connecting
+    to the stats endpoint never delays the run; it must return an
+    iterator of decoded stats samples with a ``close()`` method.
+    :meth:`stop` never waits for that thread either: samples are only
+    folded in under the lock, and not at all once stopped.
+    """
+
+    def __init__(self, open_stream: Callable[[], Iterator[dict]]) -> None:
+        self._open_stream = open_stream
+        self._stream = None
+        self._lock = threading.Lock()
+        self._stopped = False
+        self._usage = ResourceUsage()
+        self._memory_total = 0
+
+    def start(self) -> StatsSampler:
+        threading.Thread(target=self._run, name="safebox-stats", daemon=True).start()
+        return self
+
+    def stop(self, duration: float) -> ResourceUsage:
+        """Stop sampling; return the usage, with CPU averaged over *duration*."""
+        with self._lock:
+            self._stopped = True
+            stream = self._stream
+        if stream is not None:
+            try:
+                stream.close()
+            except Exception:
+                pass
+
+        with self._lock:
+            usage = self._usage
+            if usage.samples:
+                usage.memory_avg = self._memory_total // usage.samples
+            if duration > 0:
+                usage.cpu_avg = usage.cpu_time / duration
+            return usage
+
+    def _run(self) -> None:
+        try:
+            stream = self._open_stream()
+        except Exception:
+            return
+        with self._lock:
+            if self._stopped:
+                stream.close()
+                return
+            self._stream = stream
+        try:
+            for sample in stream:
+                with self._lock:
+                    if self._stopped:
+                        return
+                    self._add(sample)
+        except Exception:
+            pass
+
+    def _add(self, sample: dict) -> None:
+        memory = sample.get("memory_stats") or {}
+        if "usage" not in memory:
+            return  # the container has already stopped
+        usage = self._usage
+        detail = memory.get("stats") or {}
+        cache = detail.get("inactive_file", detail.get("total_inactive_file", 0))
+        working_set = max(memory["usage"] - cache, 0)
+        usage.samples += 1
+        usage.memory_peak = max(usage.memory_peak, working_set)
+        usage.memory_limit = memory.get("limit", usage.memory_limit)
+        self._memory_total += working_set
+
+        cpu = sample.get("cpu_stats") or {}
+        usage.cpu_time = (cpu.get("cpu_usage") or {}).get("total_usage", 0) / 1e9
+        throttling = cpu.get("throttling_data") or {}
+        usage.throttled_periods = throttling.get("throttled_periods", 0)
+        usage.throttled_time = throttling.get("throttled_time", 0) / 1e9
+
+        usage.block_read = usage.block_write = 0
+        io_bytes = (sample.get("blkio_stats") or {}).get("io_service_bytes_recursive") or []
+        for entry in io_bytes:
+            op = entry.get("op", "").lower()
+            if op == "read":
+                usage.block_read += entry.get("value", 0)
+            elif op == "write":
+                usage.block_write += entry.get("value", 0)
+
+        networks = (sample.get("networks") or {}).values()
+        usage.net_rx = sum(n.get("rx_bytes", 0) for n in networks)
+        usage.net_tx = sum(n.get("tx_bytes", 0) for n in networks)
+        usage.pids_peak = max(usage.pids_peak, (sample.get("pids_stats") or {}).get("current", 0))
@@ -0,0 +1,153 @@
+"""Phase tracing — timed spans around the steps of a run.
+
+Code marks a phase with ``with span("name"):``.  Spans are only recorded
+while a :class:`Tracer` is installed with :func:`tracing`; otherwise
+:func:`span` hands back one shared no-op context manager, so the
+instrumentation costs a global lookup per phase.  A tracer exports its
+spans as a Chrome trace (``chrome://tracing``, Perfetto) or summarises
+them per phase for ``--timings``.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import ContextManager, Iterator
+
+_NULL_SPAN = nullcontext()
+
+_tracer: Tracer | None = None
+
+
+@dataclass
+class Span:
+    """One timed phase; times are :func:`time.monotonic` seconds."""
+
+    name: str
+    start: float
+    end: float
+    thread: int
+    attrs: dict = field(default_factory=dict)
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+
+@dataclass
+class PhaseTiming:
+    """All spans of one name, summed; *depth* is how deeply the first one nests."""
+
+    name: str
+    calls: int
+    total: float
+    depth: int
+
+
+class Tracer:
+    """Collects :class:`Span` records from every thread of the process."""
+
+    def __init__(self) -> None:
+        self.spans: list[Span] = []
+        self.origin = time.monotonic()
+
+    def add(self, name: str, start: float, end: float, **attrs) -> None:
+        """Record a span measured by the caller."""
+        self.spans.append(Span(name, start, end, threading.get_ident(), attrs))
+
+    def total(self, name: str) -> float:
+        """Summed duration of every span called *name*."""
+        return sum(s.duration for s in self.spans if s.name == name)
+
+    def phases(self) -> list[PhaseTiming]:
+        """Per-name totals, in the order the phases first started."""
+        spans = sorted(self.spans, key=lambda s: (s.start, -s.end))
+        phases: dict[str, PhaseTiming] = {}
+        open_spans: dict[int, list[Span]] = {}
+        for s in spans:
+            stack = open_spans.setdefault(s.thread, [])
+            while stack and stack[-1].end < s.end:
+                stack.pop()
+            phase = phases.get(s.name)
+            if phase is None:
+                phase = phases[s.name] = PhaseTiming(s.name, 0, 0.0, len(stack))
+            phase.calls += 1
+            phase.total += s.duration
+            stack.append(s)
+        return list(phases.values())
+
+    def chrome_trace(self) -> dict:
+        """The spans in Chrome's Trace Event Format (complete ``X`` events)."""
+        pid = os.getpid()
+        names = {t.ident: t.name for t in threading.enumerate()}
+        events = [
+            {
+                "name": s.name,
+                "cat": "safebox",
+                "ph": "X",
+                "ts": round((s.start - self.origin) * 1e6, 3),
+                "dur": round(s.duration * 1e6, 3),
+                "pid": pid,
+                "tid": s.thread,
+                "args": s.attrs,
+            }
+            for s in self.spans
+        ]
+        for tid in {s.thread for s in self.spans}:
+            events.append(
+                {
+                    "name": "thread_name",
+                    "ph": "M",
+                    "pid": pid,
+                    "tid": tid,
+                    "args": {"name": names.get(tid, f"thread-{tid}")},
+                }
+            )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write(self, path: Path) -> None:
+        """Write :meth:`chrome_trace` to *path* as JSON."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.chrome_trace(), default=str))
+
+
+def span(name: str, **attrs) -> ContextManager[None]:
+    """Time the enclosed block as phase *name* when tracing is on."""
+    tracer = _tracer
+    if tracer is None:
+        return _NULL_SPAN
+    return _timed(tracer, name, attrs)
+
+
+def record(name: str, start: float, end: float, **attrs) -> None:
+    """Record a phase timed by the caller (monotonic seconds) when tracing is on."""
+    tracer = _tracer
+    if tracer is not None:
+        tracer.add(name, start, end, **attrs)
+
+
+@contextmanager
+def tracing(tracer: Tracer | None = None) -> Iterator[Tracer | None]:
+    """Install *tracer* for the duration of the block; ``None`` leaves tracing off."""
+    global _tracer
+    previous = _tracer
+    if tracer is not None:
+        _tracer = tracer
+    try:
+        yield tracer
+    finally:
+        _tracer = previous
+
+
+@contextmanager
+def _timed(tracer: Tracer, name: str, attrs: dict) -> Iterator[None]:
+    start = time.monotonic()
+    try:
+        yield
+    finally:
+        tracer.add(name, start, time.monotonic(), **attrs)
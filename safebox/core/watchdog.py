@@ -0,0 +1,199 @@
+"""Deadline watchdog — one thread enforces the timeout of every run."""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import threading
+import time
+from typing import TYPE_CHECKING, Callable
+
+from safebox.core.events import ContainerEvent, get_events
+
+if TYPE_CHECKING:
+    from docker.models.containers import Container
+
+    from safebox.core.events import EventStream
+
+
+class Deadline:
+    """A container's deadline, as registered with :meth:`Watchdog.watch`.
+
+    *terminated* and *killed* record which signals the watchdog sent.
+    """
+
+    def __init__(self, watchdog: Watchdog, container: Container, at: float, grace: float):
+        self.container = container
+        self.at = at
+        self.grace = grace
+        self.terminated = False
+        self.killed = False
+        self.done = False
+        self._watchdog = watchdog
+
+    @property
+    def expired(self) -> bool:
+        """Whether the watchdog has started stopping the container."""
+        return self.terminated or self.killed
+
+    def expire(self) -> None:
+        """Treat the deadline as reached now (no-op once expired or done)."""
+        self._watchdog._expire(self)
+
+    def cancel(self) -> None:
+        """Stop watching; the run is over.  Safe to call more than once."""
+        self._watchdog._retire(self)
+
+
+class Watchdog:
+    """Stop containers that outlive their deadline, all from one thread.
+
+    Deadlines sit in a heap ordered by time and the thread sleeps until
+    the earliest one.  When it passes, the container gets ``SIGTERM``
+    and, *grace* seconds later, ``SIGKILL`` — or ``SIGKILL`` straight
+    away when *grace* is ``0``.  A deadline is retired when its owner
+    cancels it or the Docker events stream reports that the container
+    died.  Signals are sent one at a time, in deadline order.  With runs
+    on several daemons, the stream of each one is followed.
+    """
+
+    def __init__(self, events: Callable[[], EventStream] = get_events) -> None:
+        self._get_events = events
+        self._followed: dict[int, tuple[EventStream, Callable[[], None]]] = {}
+        self._cond = threading.Condition()
+        self._heap: list[tuple[float, int, Deadline]] = []
+        self._seq = itertools.count()
+        self._by_container: dict[str, Deadline] = {}
+        self._thread: threading.Thread | None = None
+
+    def watch(
+        self,
+        container: Container,
+        timeout: float,
+        *,
+        grace: float = 0.0,
+        start: float | None = None,
+    ) -> Deadline:
+        """Stop *container* *timeout* seconds after *start* (default: now)."""
+        self._follow_events()
+        start = time.monotonic() if start is None else start
+        deadline = Deadline(self, container, start + timeout, grace)
+        with self._cond:
+            self._by_container[container.id] = deadline
+            self._push(deadline)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="safebox-watchdog", daemon=True
+                )
+                self._thread.start()
+            elif self._heap[0][2] is deadline:
+                self._cond.notify()  # the thread sleeps until a later deadline
+        return deadline
+
+    def exited(self, container_id: str) -> None:
+        """Retire the deadline of a container that has stopped on its own."""
+        with self._cond:
+            deadline = self._by_container.get(container_id)
+            if deadline is not None:
+                self._retire_locked(deadline)
+
+    @property
+    def pending(self) -> int:
+        """Deadlines still being watched."""
+        with self._cond:
+            return len(self._by_container)
+
+    def _follow_events(self) -> None:
+        try:
+            events = self._get_events()
+        except Exception:
+            return
+        with self._cond:
+            followed = self._followed.get(id(events))
+            if followed is not None and followed[0] is events:
+                return
+            for key, (stream, unsubscribe) in list(self._followed.items()):
+                if stream.closed:
+                    unsubscribe()
+                    del self._followed[key]
+            self._followed[id(events)] = (events, events.subscribe(self._on_event))
+
+    def _on_event(self, event: ContainerEvent) -> None:
+        if event.action == "die":
+            self.exited(event.container_id)
+
+    def _push(self, deadline: Deadline) -> None:
+        heapq.heappush(self._heap, (deadline.at, next(self._seq), deadline))
+
+    def _expire(self, deadline: Deadline) -> None:
+        with self._cond:
+            if deadline.done or deadline.expired:
+                return
+            deadline.at = time.monotonic()
+            self._push(deadline)
+            self._cond.notify()
+
+    def _retire(self, deadline: Deadline) -> None:
+        with self._cond:
+            self._retire_locked(deadline)
+
+    def _retire_locked(self, deadline: Deadline) -> None:
+        deadline.done = True
+        if self._by_container.get(deadline.container.id) is deadline:
+            del self._by_container[deadline.container.id]
+
+    def _next_due(self) -> tuple[Deadline, str]:
+        """Wait for the next deadline to pass; return it and the signal to send.
+
+        Heap entries are never removed in place: an entry is stale once
+        its deadline is done or has been moved.  Called with the lock held.
+        """
+        while True:
+            while self._heap and _stale(self._heap[0]):
+                heapq.heappop(self._heap)
+            if not self._heap:
+                self._cond.wait()
+                continue
+            delay = self._heap[0][0] - time.monotonic()
+            if delay > 0:
+                self._cond.wait(delay)
+                continue
+            _, _, deadline = heapq.heappop(self._heap)
+            if deadline.grace > 0 and not deadline.terminated:
+                deadline.terminated = True
+                deadline.at = time.monotonic() + deadline.grace
+                self._push(deadline)
+                return deadline, "SIGTERM"
+            deadline.killed = True
+            self._retire_locked(deadline)
+            return deadline, "SIGKILL"
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                deadline, signal = self._next_due()
+            try:
+                if signal == "SIGKILL":
+                    deadline.container.kill()
+                else:
+                    deadline.container.kill(signal=signal)
+            except Exception:
+                pass
+
+
+def _stale(entry: tuple[float, int, Deadline]) -> bool:
+    at, _, deadline = entry
+    return deadline.done or at != deadline.at
+
+
+_default_watchdog: Watchdog | None = None
+_watchdog_lock = threading.Lock()
+
+
+def get_watchdog() -> Watchdog:
+    """Return the process-wide :class:`Watchdog`."""
+    global _default_watchdog
+    with _watchdog_lock:
+        if _default_watchdog is None:
+            _default_watchdog = Watchdog()
+        return _default_watchdog
@@ -0,0 +1,96 @@
+"""Thin client for ``safeboxd`` — forwards a run and replays its events."""
+
+from __future__ import annotations
+
+import json
+import os
+import socket
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from safebox import __version__
+from safebox.config.settings import DAEMON_SOCKET
+
+if TYPE_CHECKING:
+    from safebox.core.result import ExecutionResult
+    from safebox.output.reporter import Reporter
+
+MAX_REQUEST_SIZE = 1 << 20
+CONNECT_TIMEOUT = 0.5
+
+
+class DaemonUnavailableError(Exception):
+    """Raised when no compatible daemon is reachable (run in-process instead)."""
+
+
+class DaemonJobError(Exception):
+    """Raised when the daemon reports that a job could not run."""
+
+
+def socket_path() -> Path:
+    """Daemon socket location: ``$SAFEBOX_SOCKET`` or ``~/.safebox/safeboxd.sock``."""
+    override = os.environ.get("SAFEBOX_SOCKET")
+    return Path(override) if override else DAEMON_SOCKET
+
+
+def connect(path: Path | None = None) -> socket.socket:
+    """Open a connection to the daemon or raise :class:`DaemonUnavailableError`."""
+    path = path or socket_path()
+    if not hasattr(socket, "AF_UNIX") or not path.exists():
+        raise DaemonUnavailableError(f"No daemon socket at {path}")
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(CONNECT_TIMEOUT)
+    try:
+        sock.connect(str(path))
+    except OSError as exc:
+        sock.close()
+        raise DaemonUnavailableError(f"Cannot connect to {path}: {exc}") from exc
+    sock.settimeout(None)
+    return sock
+
+
+def request(payload: dict, path: Path | None = None) -> dict:
+    """Send a one-shot request (``ping``, ``status``, ``shutdown``) and return the reply."""
+    with connect(path) as sock:
+        sock.sendall(json.dumps(payload).encode() + b"\n")
+        line = sock.makefile("rb").readline()
+    if not line:
+        raise DaemonUnavailableError("Daemon closed the connection.")
+    return json.loads(line)
+
+
+def run_via_daemon(
+    job: dict,
+    reporter: Reporter,
+    path: Path | None = None,
+) -> ExecutionResult:
+    """Submit *job* (the keyword arguments of ``execute()`` plus ``script``)
+    and replay the streamed events into *reporter*.
+
+    Raises :class:`DaemonUnavailableError` before anything was reported if
+    no compatible daemon answers, so the caller can run in-process.
+    """
+    from safebox.core.capture import RunCapture
+    from safebox.output.events import replay
+
+    sock = connect(path)
+    output = RunCapture(spill_dir=None)
+    started = False
+    try:
+        sock.sendall(json.dumps({"op": "run", "version": __version__, **job}).encode() + b"\n")
+        for line in sock.makefile("rb"):
+            event = json.loads(line)
+            if not started and event.get("code") == "version_mismatch":
+                raise DaemonUnavailableError(event["message"])
+            started = True
+            result = replay(event, reporter, output)
+            if result is not None:
+                return result
+            if event.get("event") == "error":
+                raise DaemonJobError(event["message"])
+    finally:
+        sock.close()
+
+    if not started:
+        raise DaemonUnavailableError("Daemon closed the connection without answering.")
+    raise DaemonJobError("Daemon closed the connection before the run finished.")
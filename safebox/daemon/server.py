@@ -0,0 +1,354 @@
+"""``safeboxd`` — long-running SafeBox daemon on a Unix socket.
+
+Keeps the Docker client, resolved images and a warm container pool
+alive between runs.  Clients send one JSON request line per connection
+and receive the run's events back as JSON lines (see
+:mod:`safebox.output.events`).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import socket
+import socketserver
+import threading
+from pathlib import Path
+from typing import List, Optional
+
+import typer
+
+from safebox import __version__
+from safebox.config.constants import (
+    DEFAULT_KILL_GRACE,
+    DEFAULT_POOL_IDLE_TIMEOUT,
+    DEFAULT_POOL_MAX_SIZE,
+    DEFAULT_POOL_MIN_SIZE,
+    LANGUAGE_IMAGE_MAP,
+)
+from safebox.config.settings import ensure_dirs
+from safebox.core.container import ContainerConfig
+from safebox.core.dispatch import Dispatcher
+from safebox.core.docker_client import DockerNotAvailableError, get_client
+from safebox.core.executor import ExecutionError, execute
+from safebox.core.images import resolve_image
+from safebox.core.placement import CpuAllocator, Topology
+from safebox.core.pool import ContainerPool, PoolSettings
+from safebox.core.result_cache import get_result_cache
+from safebox.core.scheduler import Resources, Scheduler, host_budget
+from safebox.daemon.client import MAX_REQUEST_SIZE, socket_path
+from safebox.output.console import console
+from safebox.output.events import EventReporter
+from safebox.output.logger import setup_logging
+from safebox.utils.validators import (
+    parse_memory_bytes,
+    validate_cpus,
+    validate_kill_grace,
+    validate_memory,
+    validate_timeout,
+)
+
+
+class _ClientGone(Exception):
+    """The client hung up while its job was still running."""
+
+
+class SafeboxDaemon(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Threaded Unix-socket server; one thread per client connection."""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        path: Path,
+        pool: ContainerPool,
+        scheduler: Scheduler,
+        placement: CpuAllocator | None = None,
+        dispatcher: Dispatcher | None = None,
+    ) -> None:
+        self.pool = pool
+        self.scheduler = scheduler
+        self.placement = placement
+        self.dispatcher = dispatcher
+        self.active_jobs = 0
+        self._jobs_lock = threading.Lock()
+        super().__init__(str(path), _Handler)
+
+    def server_bind(self) -> None:
+        """Bind under a ``0o177`` umask, so the socket is ``0600`` from the start.
+
+        A ``chmod`` after binding would leave a window in which any
+        local user could connect and submit runs.
+        """
+        umask = os.umask(0o177)
+        try:
+            super().server_bind()
+        finally:
+            os.umask(umask)
+
+    def job_started(self) -> None:
+        with self._jobs_lock:
+            self.active_jobs += 1
+
+    def job_finished(self) -> None:
+        with self._jobs_lock:
+            self.active_jobs -= 1
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    server: SafeboxDaemon
+
+    def handle(self) -> None:
+        line = self.rfile.readline(MAX_REQUEST_SIZE)
+        try:
+            request = json.loads(line)
+        except ValueError:
+            self._send({"event": "error", "message": "Malformed request."})
+            return
+
+        op = request.get("op")
+        if op == "ping":
+            self._send({"event": "pong", "version": __version__, "pid": os.getpid()})
+        elif op == "status":
+            self._send(
+                {
+                    "event": "status",
+                    "version": __version__,
+                    "pid": os.getpid(),
+                    "active_jobs": self.server.active_jobs,
+                    "pool": self.server.pool.stats(),
+                    "scheduler": self.server.scheduler.stats(),
+                    "placement": self.server.placement.stats() if self.server.placement else None,
+                    "endpoints": self.server.dispatcher.stats() if self.server.dispatcher else None,
+                }
+            )
+        elif op == "shutdown":
+            self._send({"event": "bye"})
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+        elif op == "run":
+            self._run(request)
+        else:
+            self._send({"event": "error", "message": f"Unknown op: {op!r}"})
+
+    def _send(self, event: dict) -> None:
+        try:
+            self.wfile.write(json.dumps(event, separators=(",", ":")).encode() + b"\n")
+            self.wfile.flush()
+        except OSError as exc:
+            raise _ClientGone() from exc
+
+    def _run(self, request: dict) -> None:
+        if request.get("version") != __version__:
+            self._send(
+                {
+                    "event": "error",
+                    "code": "version_mismatch",
+                    "message": f"safeboxd is {__version__}, client is {request.get('version')}.",
+                }
+            )
+            return
+
+        try:
+            script_path = Path(request["script"])
+            if not script_path.is_absolute() or not script_path.is_file():
+                raise ValueError(f"Script not found: {script_path}")
+            memory = validate_memory(request["memory"])
+            cpus = validate_cpus(float(request["cpus"]))
+            timeout = validate_timeout(int(request["timeout"]))
+            kill_grace = validate_kill_grace(float(request.get("kill_grace", DEFAULT_KILL_GRACE)))
+            pids_limit = int(request["pids_limit"])
+            requirements = request.get("requirements")
+            if requirements is not None:
+                requirements = Path(requirements)
+                if not requirements.is_absolute() or not requirements.is_file():
+                    raise ValueError(f"Requirements file not found: {requirements}")
+            max_output = request.get("max_output")
+            if max_output is not None:
+                max_output = int(max_output)
+            priority = int(request.get("priority", 0))
+            tenant = str(request.get("tenant") or "default")
+        except (KeyError, TypeError, ValueError) as exc:
+            self._send({"event": "error", "message": f"Invalid request: {exc}"})
+            return
+
+        remove = bool(request.get("remove", True))
+        self.server.job_started()
+        try:
+            execute(
+                script_path,
+                language=request.get("language"),
+                memory=memory,
+                cpus=cpus,
+                timeout=timeout,
+                kill_grace=kill_grace,
+                pids_limit=pids_limit,
+                remove=remove,
+                extra_args=request.get("extra_args", ""),
+                environment=request.get("environment") or None,
+                pool=self.server.pool,
+                reporter=EventReporter(self._send),
+                pull=bool(request.get("pull", False)),
+                max_output=max_output,
+                cache=get_result_cache() if request.get("cache") else None,
+                build_cache=bool(request.get("build_cache", True)),
+                compile_cache=bool(request.get("compile_cache", False)),
+                deps=bool(request.get("deps", True)),
+                requirements=requirements,
+                stats=bool(request.get("stats", False)),
+                scheduler=self.server.scheduler,
+                priority=priority,
+                tenant=tenant,
+                placement=self.server.placement,
+                dispatcher=self.server.dispatcher,
+            )
+        except (_ClientGone, ExecutionError):
+            pass
+        except Exception as exc:
+            try:
+                self._send({"event": "error", "message": f"Unexpected error: {exc}"})
+            except _ClientGone:
+                pass
+        finally:
+            self.server.job_finished()
+
+
+def _claim_socket(path: Path) -> None:
+    """Remove a stale socket file, refusing if a live daemon owns it."""
+    if not path.exists():
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(str(path))
+    except OSError:
+        path.unlink()
+    else:
+        raise RuntimeError(f"safeboxd is already running on {path}")
+    finally:
+        probe.close()
+
+
+def _budget(
+    host: Resources, memory: str | None, cpus: float | None, pids: int | None
+) -> Resources:
+    """*host*, with any dimension given on the command line replaced."""
+    if (cpus is not None and cpus <= 0) or (pids is not None and pids <= 0):
+        raise ValueError("Budget CPUs and PIDs must be positive.")
+    return Resources(
+        parse_memory_bytes(memory) if memory else host.memory,
+        int(cpus * 1_000_000_000) if cpus else host.nano_cpus,
+        pids or host.pids,
+    )
+
+
+def serve(
+    socket_file: Optional[str] = typer.Option(
+        None,
+        "--socket",
+        help="Unix socket path (default: $SAFEBOX_SOCKET or ~/.safebox/safeboxd.sock).",
+    ),
+    pool_min: int = typer.Option(
+        DEFAULT_POOL_MIN_SIZE, "--pool-min", help="Idle warm containers kept per image/limits."
+    ),
+    pool_max: int = typer.Option(
+        DEFAULT_POOL_MAX_SIZE, "--pool-max", help="Max containers per image/limits."
+    ),
+    pool_idle: int = typer.Option(
+        DEFAULT_POOL_IDLE_TIMEOUT,
+        "--pool-idle",
+        help="Seconds before surplus idle containers are evicted.",
+    ),
+    warm: Optional[List[str]] = typer.Option(
+        None,
+        "--warm",
+        help="Pre-pull and pre-start containers for a language (repeatable).",
+    ),
+    budget_memory: Optional[str] = typer.Option(
+        None,
+        "--budget-memory",
+        help="Memory all running jobs may commit (default: 90% of the Docker host's).",
+    ),
+    budget_cpus: Optional[float] = typer.Option(
+        None, "--budget-cpus", help="CPUs all running jobs may commit (default: the host's)."
+    ),
+    budget_pids: Optional[int] = typer.Option(
+        None, "--budget-pids", help="Processes all running jobs may commit (default: 4096)."
+    ),
+    pin_cpus: bool = typer.Option(
+        False,
+        "--pin-cpus",
+        help="Pin each job to dedicated cores, within one NUMA node where possible.",
+    ),
+    endpoint: Optional[List[str]] = typer.Option(
+        None,
+        "--endpoint",
+        help="Docker endpoint to spread jobs over, as URL or URL=WEIGHT (repeatable).",
+    ),
+    verbose: bool = typer.Option(False, "--verbose", "-v", help="Enable debug logging."),
+) -> None:
+    """Run the SafeBox daemon in the foreground.
+
+    ``safebox run`` forwards jobs here when the socket is reachable and
+    falls back to in-process execution otherwise.
+    """
+    setup_logging(verbose=verbose)
+    ensure_dirs()
+    path = Path(socket_file) if socket_file else socket_path()
+
+    dispatcher = placement = None
+    try:
+        if endpoint:
+            if pin_cpus:
+                raise ValueError("--pin-cpus pins this host's cores; not usable with --endpoint.")
+            dispatcher = Dispatcher.from_specs(endpoint).start()
+            host = dispatcher.budget()
+        else:
+            client = get_client()
+            host = host_budget(client)
+            placement = CpuAllocator(Topology.detect(client)) if pin_cpus else None
+        budget = _budget(host, budget_memory, budget_cpus, budget_pids)
+        _claim_socket(path)
+    except (DockerNotAvailableError, RuntimeError, ValueError) as exc:
+        console.print(f"[bold red]{exc}[/]")
+        raise typer.Exit(code=1) from exc
+
+    if dispatcher is not None and warm:
+        console.print("[yellow]--warm is ignored with --endpoint: runs use fresh containers[/]")
+        warm = None
+
+    settings = PoolSettings(min_size=pool_min, max_size=pool_max, idle_timeout=pool_idle)
+    with ContainerPool(settings).start() as pool:
+        for lang in warm or []:
+            image = LANGUAGE_IMAGE_MAP.get(lang)
+            if image is None:
+                console.print(f"[yellow]Skipping unknown language '{lang}'[/]")
+                continue
+            pool.warm(
+                ContainerConfig(
+                    image=image,
+                    image_ref=resolve_image(image),
+                    language=lang,
+                    script_path=Path("warm"),
+                )
+            )
+
+        server = SafeboxDaemon(path, pool, Scheduler(budget), placement, dispatcher)
+        console.print(f"[bold green]safeboxd {__version__}[/] listening on [cyan]{path}[/]")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            if dispatcher is not None:
+                dispatcher.close()
+            path.unlink(missing_ok=True)
+            console.print("[dim]safeboxd stopped[/]")
+
+
+def main() -> None:
+    """Console-script entry point for ``safeboxd``."""
+    typer.run(serve)
+
+
+if __name__ == "__main__":
+    main()
@@ -7,11 +7,15 @@ from typing import TYPE_CHECKING
 from rich.panel import Panel
 from rich.table import Table
 
-from safebox.output.console import console
+from safebox.output.console import console, err_console
 
 if TYPE_CHECKING:
+    from safebox.core.batch import BatchItem
     from safebox.core.container import ContainerConfig
-    from safebox.core.executor import ExecutionResult
+    from safebox.core.images import PrefetchResult
+    from safebox.core.result import ExecutionResult
+    from safebox.core.telemetry import ResourceUsage
+    from safebox.core.tracing import Tracer
 
 
 def print_detection_info(language: str, image: str, script_name: str) -> None:
@@ -56,9 +60,15 @@ def print_result(result: ExecutionResult) -> None:
                 expand=False,
             )
         )
+        _print_output_note(result)
+        _print_usage(result.usage)
         return
 
-    if result.exit_code == 0:
+    if result.usage is not None and result.usage.oom_killed:
+        status = f"[bold red]OOM-KILLED[/] (exit code {result.exit_code}, memory limit reached)"
+        border = "red"
+        icon = "💥"
+    elif result.exit_code == 0:
         status = "[bold green]PASSED[/]"
         border = "green"
         icon = "✅"
@@ -68,6 +78,8 @@ def print_result(result: ExecutionResult) -> None:
         icon = "❌"
 
     duration_str = f"[dim]{result.duration:.2f}s[/]"
+    if result.cached:
+        duration_str += "  [cyan](cached)[/]"
 
     console.print(
         Panel(
@@ -77,6 +89,172 @@ def print_result(result: ExecutionResult) -> None:
             expand=False,
         )
     )
+    _print_output_note(result)
+    _print_usage(result.usage)
+
+
+def _print_usage(usage: ResourceUsage | None) -> None:
+    """Print the sampled resource usage below the result banner."""
+    if usage is None:
+        return
+    table = Table(show_header=False, box=None, padding=(0, 2))
+    table.add_column(style="bold cyan")
+    table.add_column()
+
+    if usage.samples:
+        ratio = usage.memory_ratio
+        style = "red" if ratio >= 0.9 else "yellow" if ratio >= 0.7 else "white"
+        limit = ""
+        if usage.memory_limit:
+            limit = f" / {_format_bytes(usage.memory_limit)} ({ratio:.0%})"
+        table.add_row(
+            "Memory",
+            f"[{style}]{_format_bytes(usage.memory_peak)}[/] peak{limit}, "
+            f"{_format_bytes(usage.memory_avg)} avg",
+        )
+        cpu = f"[white]{usage.cpu_time:.2f}s[/] ({usage.cpu_avg:.2f} cores avg)"
+        if usage.throttled_periods:
+            cpu += (
+                f", [yellow]throttled {usage.throttled_periods}×[/] "
+                f"for {usage.throttled_time:.2f}s"
+            )
+        table.add_row("CPU", cpu)
+        table.add_row(
+            "I/O",
+            f"disk {_format_bytes(usage.block_read)} read, "
+            f"{_format_bytes(usage.block_write)} written; "
+            f"net {_format_bytes(usage.net_rx)} in, {_format_bytes(usage.net_tx)} out",
+        )
+        table.add_row("PIDs", f"[white]{usage.pids_peak}[/] peak")
+    if usage.first_output is not None:
+        table.add_row("First output", f"[white]{usage.first_output * 1000:.0f} ms[/]")
+    if table.row_count:
+        console.print(table)
+
+
+def _format_bytes(size: float) -> str:
+    for unit in ("B", "KiB", "MiB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GiB"
+
+
+def _print_output_note(result: ExecutionResult) -> None:
+    """Mention a truncated or spilled output below the result banner."""
+    if result.output_truncated:
+        console.print(f"  [red]✂[/]  Output cut off at {result.output_bytes} bytes")
+    if result.output_file is not None:
+        console.print(f"  [dim]Full output ({result.output_bytes} bytes): {result.output_file}[/]")
+
+
+def print_batch_summary(items: list[BatchItem], wall_time: float, concurrency: int) -> None:
+    """Print the aggregate table at the end of ``safebox run-many``."""
+    table = Table(title="[bold]📦 Batch summary", title_justify="left", expand=False)
+    table.add_column("Script", style="white")
+    table.add_column("Language", style="yellow")
+    table.add_column("Status")
+    table.add_column("Exit", justify="right")
+    table.add_column("Duration", justify="right", style="dim")
+
+    passed = failed = 0
+    for item in items:
+        result = item.result
+        if result is None:
+            failed += 1
+            table.add_row(item.job.name, "-", "[bold red]ERROR[/]", "-", "-")
+            continue
+        if result.timed_out:
+            status = "[bold red]TIMED OUT[/]"
+        elif result.exit_code == 0:
+            status = "[bold green]PASSED[/]"
+        else:
+            status = "[bold red]FAILED[/]"
+        if result.exit_code == 0 and not result.timed_out:
+            passed += 1
+        else:
+            failed += 1
+        table.add_row(
+            item.job.name,
+            result.language,
+            status,
+            str(result.exit_code),
+            f"{result.duration:.2f}s",
+        )
+
+    console.print()
+    console.print(table)
+    border = "green" if failed == 0 else "red"
+    console.print(
+        Panel(
+            f"[bold green]{passed} passed[/]  [bold red]{failed} failed[/]  "
+            f"[dim]{len(items)} jobs · {wall_time:.2f}s wall · concurrency {concurrency}[/]",
+            border_style=border,
+            expand=False,
+        )
+    )
+
+
+def print_prefetch_summary(results: list[PrefetchResult], wall_time: float) -> None:
+    """Print the per-image outcome of ``safebox images prefetch``."""
+    table = Table(title="[bold]🐳 Prefetch summary", title_justify="left", expand=False)
+    table.add_column("Image", style="magenta")
+    table.add_column("Status")
+    table.add_column("Image ID", style="white")
+    table.add_column("Duration", justify="right", style="dim")
+
+    styles = {"present": "[dim green]UP TO DATE[/]", "pulled": "[bold green]PULLED[/]"}
+    for result in results:
+        status = styles.get(result.status, "[bold red]FAILED[/]")
+        table.add_row(
+            result.image,
+            status,
+            result.image_id.removeprefix("sha256:")[:12] or "-",
+            f"{result.duration:.2f}s",
+        )
+
+    console.print(table)
+    for result in results:
+        if result.error:
+            console.print(f"  [red]✗[/] [magenta]{result.image}[/]: {result.error}")
+
+    failed = sum(r.status == "failed" for r in results)
+    pulled = sum(r.status == "pulled" for r in results)
+    console.print(
+        Panel(
+            f"[bold green]{pulled} pulled[/]  [dim]{len(results) - pulled - failed} up to date[/]  "
+            f"[bold red]{failed} failed[/]  [dim]{wall_time:.2f}s wall[/]",
+            border_style="green" if failed == 0 else "red",
+            expand=False,
+        )
+    )
+
+
+def print_timings(tracer: Tracer) -> None:
+    """Print per-phase times and the sandbox overhead (to stderr, for ``--timings``)."""
+    total = tracer.total("execute")
+    table = Table(title="[bold]⏱  Timings", title_justify="left", expand=False)
+    table.add_column("Phase", style="white")
+    table.add_column("Calls", justify="right", style="dim")
+    table.add_column("Time", justify="right")
+    table.add_column("Share", justify="right", style="dim")
+    for phase in tracer.phases():
+        share = f"{phase.total / total:.0%}" if total else "-"
+        table.add_row(
+            "  " * phase.depth + phase.name,
+            str(phase.calls),
+            f"{phase.total * 1000:.1f} ms",
+            share,
+        )
+    err_console.print(table)
+    if total:
+        script = tracer.total("run")
+        overhead = total - script
+        err_console.print(
+            f"  script [white]{script * 1000:.1f} ms[/]  "
+            f"sandbox overhead [yellow]{overhead * 1000:.1f} ms[/] "
+            f"[dim]({overhead / total:.0%} of {total * 1000:.1f} ms)[/]"
+        )
 
 
 def print_error(message: str) -> None:
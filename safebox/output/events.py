@@ -0,0 +1,185 @@
+"""Execution events as plain JSON-serialisable dicts.
+
+:class:`EventReporter` turns the :class:`Reporter` callbacks of a run
+into event dicts; :func:`replay` feeds such events back into any other
+reporter, so a run can be observed from another process.
+:class:`JsonLinesReporter` writes them as JSON lines straight to a file
+descriptor (``--output jsonl``).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from dataclasses import asdict
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable
+
+from safebox.config.constants import STDOUT
+from safebox.output.plain import Reporter
+
+if TYPE_CHECKING:
+    from safebox.core.capture import RunCapture
+    from safebox.core.container import ContainerConfig
+    from safebox.core.result import ExecutionResult
+
+
+class EventReporter(Reporter):
+    """Report a run by handing one event dict per callback to *emit*."""
+
+    def __init__(self, emit: Callable[[dict], None]) -> None:
+        self.emit = emit
+
+    def detection(self, language: str, image: str, script_name: str) -> None:
+        self.emit(
+            {"event": "detection", "language": language, "image": image, "script": script_name}
+        )
+
+    def config(self, config: ContainerConfig) -> None:
+        self.emit(
+            {
+                "event": "config",
+                "image": config.image,
+                "language": config.language,
+                "script": str(config.script_path),
+                "memory": config.memory,
+                "cpus": config.cpus,
+                "timeout": config.timeout,
+                "pids_limit": config.pids_limit,
+                "remove": config.remove,
+            }
+        )
+
+    def output(self, text: str, stream: int = STDOUT) -> None:
+        self.emit({"event": "output", "data": text, "stream": stream, "ts": time.time()})
+
+    def timeout(self, seconds: float) -> None:
+        self.emit({"event": "timeout", "seconds": seconds})
+
+    def output_limit(self, max_bytes: int) -> None:
+        self.emit({"event": "output_limit", "max_bytes": max_bytes})
+
+    def result(self, result: ExecutionResult) -> None:
+        self.emit(
+            {
+                "event": "result",
+                "exit_code": result.exit_code,
+                "duration": result.duration,
+                "timed_out": result.timed_out,
+                "language": result.language,
+                "image": result.image,
+                "image_id": result.image_id,
+                "output_bytes": result.output_bytes,
+                "output_file": str(result.output_file) if result.output_file else None,
+                "output_truncated": result.output_truncated,
+                "cached": result.cached,
+                "usage": asdict(result.usage) if result.usage is not None else None,
+            }
+        )
+
+    def error(self, message: str) -> None:
+        self.emit({"event": "error", "message": message})
+
+
+class JsonLinesWriter:
+    """Write event dicts as JSON lines directly to file descriptor *fd*.
+
+    Bypasses Rich and Python's buffered streams: every event is a single
+    unbuffered ``os.write`` under a lock, so lines from concurrent runs
+    never interleave.
+    """
+
+    def __init__(self, fd: int = 1) -> None:
+        self.fd = fd
+        self._lock = threading.Lock()
+        self._encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"), default=str)
+
+    def __call__(self, event: dict) -> None:
+        data = (self._encoder.encode(event) + "\n").encode("utf-8")
+        with self._lock:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(self.fd, view) :]
+
+
+_writers: dict[int, JsonLinesWriter] = {}
+_writers_lock = threading.Lock()
+
+
+def jsonl_writer(fd: int = 1) -> JsonLinesWriter:
+    """Return the shared :class:`JsonLinesWriter` for *fd*."""
+    with _writers_lock:
+        if fd not in _writers:
+            _writers[fd] = JsonLinesWriter(fd)
+        return _writers[fd]
+
+
+class JsonLinesReporter(EventReporter):
+    """Report a run as JSON lines on *fd*; *fields* are added to every event."""
+
+    def __init__(self, fd: int = 1, **fields: Any) -> None:
+        writer = jsonl_writer(fd)
+        super().__init__((lambda event: writer({**fields, **event})) if fields else writer)
+
+
+def replay(
+    event: dict, reporter: Reporter, output: RunCapture | None = None
+) -> ExecutionResult | None:
+    """Dispatch one *event* to *reporter*.
+
+    Output text is also written to *output* when given.  Returns the
+    :class:`ExecutionResult` for a ``result`` event, ``None`` otherwise.
+    """
+    from safebox.core.container import ContainerConfig
+    from safebox.core.result import ExecutionResult
+    from safebox.core.telemetry import ResourceUsage
+
+    kind = event.get("event")
+    if kind == "detection":
+        reporter.detection(event["language"], event["image"], event["script"])
+    elif kind == "config":
+        reporter.config(
+            ContainerConfig(
+                image=event["image"],
+                language=event["language"],
+                script_path=Path(event["script"]),
+                memory=event["memory"],
+                cpus=event["cpus"],
+                timeout=event["timeout"],
+                pids_limit=event["pids_limit"],
+                remove=event["remove"],
+            )
+        )
+    elif kind == "output":
+        stream = event.get("stream", STDOUT)
+        reporter.output(event["data"], stream)
+        if output is not None:
+            output.write(stream, event["data"])
+    elif kind == "timeout":
+        reporter.timeout(event["seconds"])
+    elif kind == "output_limit":
+        reporter.output_limit(event["max_bytes"])
+    elif kind == "error":
+        reporter.error(event["message"])
+    elif kind == "result":
+        result = ExecutionResult(
+            exit_code=event["exit_code"],
+            duration=event["duration"],
+            timed_out=event["timed_out"],
+            output=output.combined.value if output is not None else "",
+            language=event["language"],
+            image=event["image"],
+            image_id=event.get("image_id", ""),
+            output_bytes=event.get("output_bytes", 0),
+            output_file=Path(event["output_file"]) if event.get("output_file") else None,
+            output_truncated=event.get("output_truncated", False),
+            stdout=output.stdout.value if output is not None else "",
+            stderr=output.stderr.value if output is not None else "",
+            cached=event.get("cached", False),
+            usage=ResourceUsage(**event["usage"]) if event.get("usage") else None,
+        )
+        reporter.result(result)
+        return result
+    return None
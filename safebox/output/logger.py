@@ -4,9 +4,23 @@ from __future__ import annotations
 
 import logging
 
-from rich.logging import RichHandler
 
-from safebox.output.console import console
+class _LazyRichHandler(logging.Handler):
+    """Defers importing Rich until the first record is actually logged."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._handler: logging.Handler | None = None
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if self._handler is None:
+            from rich.logging import RichHandler
+
+            from safebox.output.console import console
+
+            self._handler = RichHandler(console=console, rich_tracebacks=True)
+            self._handler.setFormatter(self.formatter)
+        self._handler.handle(record)
 
 
 def setup_logging(*, verbose: bool = False) -> None:
@@ -16,5 +30,5 @@ def setup_logging(*, verbose: bool = False) -> None:
         level=level,
         format="%(message)s",
         datefmt="[%X]",
-        handlers=[RichHandler(console=console, rich_tracebacks=True)],
+        handlers=[_LazyRichHandler()],
     )
@@ -0,0 +1,71 @@
+"""Rich-free reporters — the :class:`Reporter` interface and raw passthrough.
+
+Kept apart from :mod:`safebox.output.reporter` so machine-readable and
+raw output never pay for importing Rich.
+"""
+
+from __future__ import annotations
+
+import os
+from typing import TYPE_CHECKING
+
+from safebox.config.constants import STDERR, STDOUT
+
+if TYPE_CHECKING:
+    from safebox.core.container import ContainerConfig
+    from safebox.core.result import ExecutionResult
+
+
+class Reporter:
+    """Receives every event of a single execution.
+
+    The base class ignores everything; subclasses override what they
+    want to show.
+    """
+
+    def detection(self, language: str, image: str, script_name: str) -> None:
+        """Language and image were resolved."""
+
+    def config(self, config: ContainerConfig) -> None:
+        """The container configuration is final and the run is starting."""
+
+    def output(self, text: str, stream: int = STDOUT) -> None:
+        """A decoded chunk of script output arrived on *stream*."""
+
+    def timeout(self, seconds: float) -> None:
+        """The deadline passed and the container is being killed."""
+
+    def output_limit(self, max_bytes: int) -> None:
+        """The output cap was reached and the container is being killed."""
+
+    def result(self, result: ExecutionResult) -> None:
+        """The run finished."""
+
+    def error(self, message: str) -> None:
+        """The run could not be started or completed."""
+
+
+class RawReporter(Reporter):
+    """Pass the script's stdout and stderr straight through (``--output raw``).
+
+    Nothing else is shown except one-line notices on stderr; output
+    bypasses Rich and is written unbuffered to file descriptors 1 and 2.
+    """
+
+    def output(self, text: str, stream: int = STDOUT) -> None:
+        _write_fd(2 if stream == STDERR else 1, text)
+
+    def timeout(self, seconds: float) -> None:
+        _write_fd(2, f"safebox: timed out after {seconds}s\n")
+
+    def output_limit(self, max_bytes: int) -> None:
+        _write_fd(2, f"safebox: output exceeded {max_bytes} bytes\n")
+
+    def error(self, message: str) -> None:
+        _write_fd(2, f"safebox: {message}\n")
+
+
+def _write_fd(fd: int, text: str) -> None:
+    view = memoryview(text.encode("utf-8"))
+    while view:
+        view = view[os.write(fd, view) :]
@@ -0,0 +1,131 @@
+"""Execution reporters — how the events of one run reach the user."""
+
+from __future__ import annotations
+
+import threading
+from typing import TYPE_CHECKING
+
+from rich.console import Group
+from rich.markup import escape
+from rich.rule import Rule
+from rich.text import Text
+
+from safebox.config.constants import STDERR, STDOUT
+from safebox.core.capture import OutputCapture
+from safebox.output.console import console
+from safebox.output.display import (
+    print_detection_info,
+    print_error,
+    print_execution_header,
+    print_result,
+)
+from safebox.output.plain import RawReporter, Reporter  # noqa: F401 (re-exported)
+
+if TYPE_CHECKING:
+    from safebox.core.container import ContainerConfig
+    from safebox.core.result import ExecutionResult
+
+
+class ConsoleReporter(Reporter):
+    """The interactive ``safebox run`` view: Rich panels plus live output."""
+
+    def detection(self, language: str, image: str, script_name: str) -> None:
+        print_detection_info(language, image, script_name)
+
+    def config(self, config: ContainerConfig) -> None:
+        print_execution_header(config)
+
+    def output(self, text: str, stream: int = STDOUT) -> None:
+        console.print(text, end="", highlight=False, style="red" if stream == STDERR else None)
+
+    def timeout(self, seconds: float) -> None:
+        console.print(
+            f"\n[bold red]⏱  Timeout![/] Container exceeded {seconds}s limit — killing…"
+        )
+
+    def output_limit(self, max_bytes: int) -> None:
+        console.print(
+            f"\n[bold red]✂  Output limit![/] Script wrote more than {max_bytes} bytes — killing…"
+        )
+
+    def result(self, result: ExecutionResult) -> None:
+        print_result(result)
+
+    def error(self, message: str) -> None:
+        print_error(message)
+
+
+class PrefixedReporter(Reporter):
+    """Interleave output of concurrent runs, one prefixed line at a time.
+
+    Partial lines are held back until their newline (or the end of the
+    run) so lines from different scripts never mix.
+    """
+
+    def __init__(self, name: str, style: str = "cyan") -> None:
+        self.prefix = f"[{style}]{escape(name)}[/] │ "
+        self._pending = {STDOUT: "", STDERR: ""}
+        self._lock = threading.Lock()
+
+    def output(self, text: str, stream: int = STDOUT) -> None:
+        with self._lock:
+            lines = (self._pending[stream] + text).split("\n")
+            self._pending[stream] = lines.pop()
+        for line in lines:
+            self._emit(line, stderr=stream == STDERR)
+
+    def timeout(self, seconds: float) -> None:
+        self._emit(f"[bold red]⏱  timed out after {seconds}s — killing[/]", markup=True)
+
+    def output_limit(self, max_bytes: int) -> None:
+        self._emit(f"[bold red]✂  output exceeded {max_bytes} bytes — killing[/]", markup=True)
+
+    def result(self, result: ExecutionResult) -> None:
+        with self._lock:
+            pending, self._pending = self._pending, {STDOUT: "", STDERR: ""}
+        for stream, line in pending.items():
+            if line:
+                self._emit(line, stderr=stream == STDERR)
+
+    def error(self, message: str) -> None:
+        self._emit(f"[bold red]{message}[/]", markup=True)
+
+    def _emit(self, line: str, *, markup: bool = False, stderr: bool = False) -> None:
+        body = Text.from_markup(line) if markup else Text(line, style="red" if stderr else "")
+        console.print(Text.from_markup(self.prefix) + body, highlight=False)
+
+
+class GroupedReporter(Reporter):
+    """Buffer a run's output and print it as one block when it finishes."""
+
+    def __init__(self, name: str, style: str = "cyan") -> None:
+        self.name = name
+        self.style = style
+        self._output = OutputCapture(spill_dir=None)
+        self._notes: list[str] = []
+
+    def output(self, text: str, stream: int = STDOUT) -> None:
+        self._output.write(text)
+
+    def timeout(self, seconds: float) -> None:
+        self._notes.append(f"[bold red]⏱  timed out after {seconds}s[/]")
+
+    def output_limit(self, max_bytes: int) -> None:
+        self._notes.append(f"[bold red]✂  output exceeded {max_bytes} bytes[/]")
+
+    def result(self, result: ExecutionResult) -> None:
+        self._flush()
+
+    def error(self, message: str) -> None:
+        self._notes.append(f"[bold red]{message}[/]")
+        self._flush()
+
+    def _flush(self) -> None:
+        parts: list = [Rule(f"[{self.style}]{escape(self.name)}[/]", align="left")]
+        text = self._output.value
+        if text:
+            parts.append(Text(text.removesuffix("\n")))
+        parts.extend(Text.from_markup(note) for note in self._notes)
+        console.print(Group(*parts), highlight=False)
+        self._output = OutputCapture(spill_dir=None)
+        self._notes.clear()
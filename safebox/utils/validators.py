@@ -32,6 +32,24 @@ def validate_memory(value: str) -> str:
     return f"{amount}{unit}"
 
 
+def parse_memory_bytes(value: str) -> int:
+    """Convert a memory string (``512m``, ``1g``) into a byte count."""
+    match = _MEMORY_RE.match(value.strip())
+    if not match:
+        raise ValueError(f"Invalid memory format: '{value}'.")
+    return int(float(match.group(1)) * _MEMORY_UNITS[match.group(2).lower()])
+
+
+def validate_max_output(value: str) -> int:
+    """Parse an output cap (``512k``, ``10m``, ``1g``) into a byte count."""
+    match = _MEMORY_RE.match(value.strip())
+    if not match:
+        raise ValueError(
+            f"Invalid output limit: '{value}'. Expected format like 512k, 10m, 1g."
+        )
+    return int(float(match.group(1)) * _MEMORY_UNITS[match.group(2).lower()])
+
+
 def validate_cpus(value: float) -> float:
     """Validate CPU limit (0.1 – 16.0)."""
     if not 0.1 <= value <= 16.0:
@@ -50,6 +68,22 @@ def validate_timeout(value: int) -> int:
     return value
 
 
+def validate_pids_limit(value: int) -> int:
+    """Validate the per-container process limit (at least 1)."""
+    if value < 1:
+        raise ValueError(f"Invalid PIDs limit: {value}. Must be at least 1.")
+    return value
+
+
+def validate_kill_grace(value: float) -> float:
+    """Validate the SIGTERM → SIGKILL grace period in seconds (0 – 300)."""
+    if not 0 <= value <= 300:
+        raise ValueError(
+            f"Invalid kill grace: {value}. Must be between 0 and 300 seconds."
+        )
+    return value
+
+
 def validate_script_path(value: str) -> Path:
     """Ensure the script file exists and is readable."""
     path = Path(value).resolve()
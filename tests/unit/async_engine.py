@@ -0,0 +1,148 @@
+"""A scripted Docker Engine API on a Unix socket, for the asyncio client tests.
+
+Runs on the test's own event loop, since asyncio streams cannot cross
+loops.  Only the endpoints :class:`~safebox.core.async_docker.AsyncDockerClient`
+calls are answered, and every container is ``c1``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import re
+import shutil
+import tempfile
+from pathlib import Path
+from urllib.parse import parse_qs, unquote, urlsplit
+
+_VERSION_PREFIX = re.compile(r"^/v[0-9.]+")
+
+
+def frame(stream: int, payload: bytes) -> bytes:
+    """One frame of Docker's multiplexed log stream."""
+    return bytes([stream, 0, 0, 0]) + len(payload).to_bytes(4, "big") + payload
+
+
+class AsyncEngine:
+    """Serve the Engine API at :attr:`url` inside ``async with``.
+
+    *images* maps tags to IDs; a pull adds ``sha256:pulled-<tag>``.  The
+    counters (:attr:`connections`, :attr:`pulls`, :attr:`created`, …)
+    record what the client asked for.
+    """
+
+    def __init__(self, images: dict[str, str] | None = None) -> None:
+        self.images = dict(images or {})
+        self.connections = 0
+        self.pulls: list[str] = []
+        self.pull_delay = 0.05
+        self.pull_error = ""
+        self.created: list[dict] = []
+        self.killed: list[str] = []
+        self.removed: list[str] = []
+        self.log_chunks: list[bytes] = []
+        self.hang_logs = False
+        self.exit_code = 0
+        self.close_next = False
+        self._kill = asyncio.Event()
+        self._writers: set[asyncio.StreamWriter] = set()
+        self._dir = Path(tempfile.mkdtemp(prefix="sbx"))  # short: socket paths are limited
+        self.path = self._dir / "e.sock"
+        self.url = f"unix://{self.path}"
+
+    async def __aenter__(self) -> AsyncEngine:
+        self._server = await asyncio.start_unix_server(self._handle, path=str(self.path))
+        return self
+
+    async def __aexit__(self, *exc: object) -> None:
+        self._server.close()
+        for writer in list(self._writers):
+            writer.close()
+        await self._server.wait_closed()
+        shutil.rmtree(self._dir, ignore_errors=True)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        self._writers.add(writer)
+        try:
+            while line := await reader.readline():
+                method, target, _ = line.decode().split(" ", 2)
+                headers = {}
+                while (header := await reader.readline()) not in (b"\r\n", b""):
+                    key, _, value = header.decode().partition(":")
+                    headers[key.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+                url = urlsplit(target)
+                path = unquote(_VERSION_PREFIX.sub("", url.path))
+                query = {k: v[0] for k, v in parse_qs(url.query).items()}
+                await self._route(writer, method, path, query, json.loads(body) if body else None)
+                await writer.drain()
+                if self.close_next:
+                    self.close_next = False
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+    async def _route(self, writer, method: str, path: str, query: dict, body) -> None:
+        if path == "/version":
+            return self._json(writer, 200, {"ApiVersion": "1.44"})
+        if path.startswith("/images/") and path.endswith("/json"):
+            name = path[len("/images/") : -len("/json")]
+            image_id = self.images.get(name) or (name if name in self.images.values() else "")
+            if not image_id:
+                return self._json(writer, 404, {"message": f"No such image: {name}"})
+            return self._json(writer, 200, {"Id": image_id, "RepoDigests": []})
+        if path == "/images/create":
+            return await self._pull(writer, f"{query['fromImage']}:{query['tag']}")
+        if path == "/containers/create":
+            self.created.append(body)
+            if body["Image"] not in self.images and body["Image"] not in self.images.values():
+                return self._json(writer, 404, {"message": f"No such image: {body['Image']}"})
+            return self._json(writer, 201, {"Id": "c1"})
+        if path == "/containers/c1/start":
+            return self._json(writer, 204, None)
+        if path == "/containers/c1/logs":
+            return await self._stream(writer, self.log_chunks, hang=self.hang_logs)
+        if path == "/containers/c1/kill":
+            self.killed.append(query["signal"])
+            self._kill.set()
+            return self._json(writer, 204, None)
+        if path == "/containers/c1/json":
+            state = {"Running": False, "ExitCode": self.exit_code}
+            return self._json(writer, 200, {"State": state})
+        if path == "/containers/c1/wait":
+            return self._json(writer, 200, {"StatusCode": self.exit_code})
+        if path == "/containers/c1" and method == "DELETE":
+            self.removed.append("c1")
+            return self._json(writer, 204, None)
+        return self._json(writer, 404, {"message": f"page not found: {method} {path}"})
+
+    async def _pull(self, writer, image: str) -> None:
+        self.pulls.append(image)
+        await asyncio.sleep(self.pull_delay)
+        if self.pull_error:
+            lines = [{"status": "Pulling"}, {"error": self.pull_error}]
+        else:
+            self.images[image] = f"sha256:pulled-{image}"
+            lines = [{"status": "Pulling"}, {"status": "Downloaded newer image"}]
+        data = b"".join(json.dumps(line).encode() + b"\n" for line in lines)
+        await self._stream(writer, [data[i : i + 7] for i in range(0, len(data), 7)])
+
+    async def _stream(self, writer, chunks: list[bytes], hang: bool = False) -> None:
+        writer.write(b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n")
+        for chunk in chunks:
+            writer.write(b"%x;ext=1\r\n%s\r\n" % (len(chunk), chunk))
+            await writer.drain()
+        if hang:
+            await self._kill.wait()
+        writer.write(b"0\r\n\r\n")
+
+    def _json(self, writer, status: int, payload) -> None:
+        body = b"" if payload is None else json.dumps(payload).encode()
+        head = f"HTTP/1.1 {status} X\r\nContent-Type: application/json\r\n"
+        if self.close_next:
+            head += "Connection: close\r\n"
+        writer.write(f"{head}Content-Length: {len(body)}\r\n\r\n".encode() + body)
@@ -0,0 +1,118 @@
+"""Tests for the asyncio Engine API client against a scripted Unix-socket server."""
+
+from __future__ import annotations
+
+import asyncio
+import socket
+
+import pytest
+
+from safebox.config.constants import STDERR, STDOUT
+from safebox.core import async_docker
+from safebox.core.async_docker import AsyncDockerClient, NotFoundError
+from safebox.core.docker_client import ImagePullError
+from tests.unit.async_engine import AsyncEngine, frame
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="needs Unix sockets")
+
+
+def _run(test, engine: AsyncEngine | None = None):
+    """Run ``test(engine, client)`` on a fresh loop with the engine serving."""
+
+    async def main():
+        async with engine or AsyncEngine() as served:
+            async with AsyncDockerClient(served.url, api_version="1.44") as client:
+                return await test(served, client)
+
+    return asyncio.run(main())
+
+
+@pytest.mark.parametrize("size", [1, 3, 8, 1000])
+def test_logs_are_dechunked_and_demultiplexed(size):
+    engine = AsyncEngine()
+    data = frame(STDOUT, b"out\n") + frame(STDERR, b"err\n" * 50) + frame(STDOUT, b"")
+    engine.log_chunks = [data[i : i + size] for i in range(0, len(data), size)]
+
+    async def test(engine, client):
+        frames = [f async for f in client.logs("c1")]
+        return frames, len(client._idle)
+
+    frames, idle = _run(test, engine)
+    assert frames == [(STDOUT, b"out\n"), (STDERR, b"err\n" * 50), (STDOUT, b"")]
+    assert idle == 1  # the fully read stream went back to the pool
+
+
+def test_keep_alive_connection_is_reused():
+    async def test(engine, client):
+        for _ in range(3):
+            await client.inspect_image("a:1")
+        await client.start("c1")
+        return engine.connections
+
+    assert _run(test, AsyncEngine({"a:1": "sha256:a"})) == 1
+
+
+def test_connection_close_and_unread_bodies_are_not_reused():
+    engine = AsyncEngine({"a:1": "sha256:a"})
+    engine.log_chunks = [frame(STDOUT, b"x")] * 5
+
+    async def test(engine, client):
+        engine.close_next = True
+        await client.inspect_image("a:1")
+        await client.inspect_image("a:1")
+        assert engine.connections == 2
+        async for _ in client.logs("c1"):
+            break  # abandoned mid-body: the connection cannot carry another request
+        assert client._idle == []
+        await client.inspect_image("a:1")
+        return engine.connections
+
+    assert _run(test, engine) == 3
+
+
+def test_idle_pool_is_capped(monkeypatch):
+    monkeypatch.setattr(async_docker, "MAX_IDLE_CONNECTIONS", 2)
+
+    async def test(engine, client):
+        await asyncio.gather(*(client.inspect_image("a:1") for _ in range(4)))
+        return engine.connections, len(client._idle)
+
+    assert _run(test, AsyncEngine({"a:1": "sha256:a"})) == (4, 2)
+
+
+def test_errors_carry_the_daemon_message():
+    async def test(engine, client):
+        with pytest.raises(NotFoundError, match="No such image: gone:1"):
+            await client.inspect_image("gone:1")
+        await client.inspect_image("a:1")  # the connection is still usable
+        return engine.connections
+
+    assert _run(test, AsyncEngine({"a:1": "sha256:a"})) == 1
+
+
+def test_concurrent_pulls_of_one_image_are_coalesced():
+    async def test(engine, client):
+        await asyncio.gather(*(client.pull("python:3.12-slim") for _ in range(5)))
+        assert engine.pulls == ["python:3.12-slim"]
+        await client.pull("python:3.12-slim")  # a later pull is a new one
+        info = await client.ensure_image("python:3.12-slim")
+        return engine.pulls, info["Id"]
+
+    pulls, image_id = _run(test)
+    assert pulls == ["python:3.12-slim"] * 2
+    assert image_id == "sha256:pulled-python:3.12-slim"
+
+
+def test_a_failed_pull_fails_every_waiter():
+    engine = AsyncEngine()
+    engine.pull_error = "manifest unknown"
+
+    async def test(engine, client):
+        results = await asyncio.gather(
+            *(client.pull("nope:1") for _ in range(3)), return_exceptions=True
+        )
+        return engine.pulls, results
+
+    pulls, results = _run(test, engine)
+    assert pulls == ["nope:1"]
+    assert all(isinstance(r, ImagePullError) and "manifest unknown" in str(r) for r in results)
@@ -0,0 +1,93 @@
+"""Tests for :func:`execute_async` against a scripted Unix-socket Engine API."""
+
+from __future__ import annotations
+
+import asyncio
+import socket
+import threading
+import time
+
+import pytest
+
+from safebox.config.constants import STDERR, STDOUT
+from safebox.core import images
+from safebox.core.async_docker import AsyncDockerClient
+from safebox.core.async_executor import execute_async
+from safebox.core.images import ImageCache, ImageRecord
+from tests.unit.async_engine import AsyncEngine, frame
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="needs Unix sockets")
+
+IMAGE = "python:3.12-slim"
+
+
+class OffLoopCache(ImageCache):
+    """An image cache that fails if it is touched from the event loop's thread.
+
+    Tests read and seed the same file through a plain :class:`ImageCache`.
+    """
+
+    def _load(self):
+        assert threading.current_thread() is not threading.main_thread()
+        return super()._load()
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch) -> ImageCache:
+    cache = OffLoopCache(tmp_path / "images.json")
+    monkeypatch.setattr(images, "_default_cache", cache)
+    return cache
+
+
+@pytest.fixture
+def script(tmp_path):
+    path = tmp_path / "job.py"
+    path.write_text("print('hi')\n")
+    return path
+
+
+def _execute(engine: AsyncEngine, script, **kwargs):
+    async def main():
+        async with engine:
+            async with AsyncDockerClient(engine.url, api_version="1.44") as client:
+                return await execute_async(script, client=client, **kwargs)
+
+    return asyncio.run(main())
+
+
+def test_output_is_captured_and_the_container_removed(cache, script):
+    engine = AsyncEngine({IMAGE: "sha256:py"})
+    data = frame(STDOUT, b"hi\n") + frame(STDERR, b"oops\n")
+    engine.log_chunks = [data[:5], data[5:13], data[13:]]
+    engine.exit_code = 3
+    result = _execute(engine, script)
+    assert (result.exit_code, result.timed_out) == (3, False)
+    assert (result.stdout, result.stderr) == ("hi\n", "oops\n")
+    assert result.image_id == "sha256:py" and engine.removed == ["c1"]
+    assert ImageCache(cache.path).get(IMAGE).image_id == "sha256:py"
+
+
+def test_missing_image_is_pulled_first(cache, script):
+    engine = AsyncEngine()
+    result = _execute(engine, script)
+    assert engine.pulls == [IMAGE]
+    assert result.image_id == f"sha256:pulled-{IMAGE}"
+
+
+def test_timeout_kills_the_container(cache, script):
+    engine = AsyncEngine({IMAGE: "sha256:py"})
+    engine.log_chunks = [frame(STDOUT, b"working\n")]
+    engine.hang_logs = True
+    result = _execute(engine, script, timeout=0.2)
+    assert (result.exit_code, result.timed_out) == (124, True)
+    assert result.output == "working\n"
+    assert engine.killed == ["SIGKILL"] and engine.removed == ["c1"]
+
+
+def test_stale_image_id_is_resolved_again(cache, script):
+    ImageCache(cache.path).put(ImageRecord(IMAGE, "sha256:old", resolved_at=time.time()))
+    engine = AsyncEngine({IMAGE: "sha256:new"})
+    result = _execute(engine, script)
+    assert [body["Image"] for body in engine.created] == ["sha256:old", "sha256:new"]
+    assert result.image_id == "sha256:new" and result.exit_code == 0
+    assert ImageCache(cache.path).get(IMAGE).image_id == "sha256:new"
@@ -0,0 +1,105 @@
+"""Tests for batch manifests and script expansion."""
+
+from __future__ import annotations
+
+import pytest
+
+from safebox.core.batch import (
+    BatchJob,
+    ManifestError,
+    default_concurrency,
+    expand_scripts,
+    load_manifest,
+)
+
+
+@pytest.fixture
+def scripts(tmp_path):
+    (tmp_path / "jobs").mkdir()
+    for name in ("a.py", "b.py", "c.js"):
+        (tmp_path / "jobs" / name).write_text("print(1)\n")
+    return tmp_path
+
+
+def _manifest(directory, text: str):
+    path = directory / "batch.yaml"
+    path.write_text(text)
+    return path
+
+
+def test_expand_scripts_dedupes_and_sorts(scripts):
+    paths = expand_scripts([str(scripts / "jobs" / "*.py"), str(scripts / "jobs" / "a.py")])
+    assert [p.name for p in paths] == ["a.py", "b.py"]
+
+
+def test_expand_scripts_skips_missing(scripts):
+    assert expand_scripts([str(scripts / "nope.py")]) == []
+
+
+def test_manifest_defaults_and_overrides(scripts):
+    path = _manifest(
+        scripts,
+        """
+defaults:
+  timeout: 30
+jobs:
+  - jobs/*.py
+  - script: jobs/c.js
+    memory: 1G
+    cpus: 2
+    priority: 5
+    args: "--fast"
+    env: {MODE: ci, N: 3}
+""",
+    )
+    jobs = load_manifest(path, memory="256m")
+    assert [job.name for job in jobs] == ["a.py", "b.py", "c.js"]
+    assert all(job.timeout == 30 for job in jobs)
+    assert jobs[0].memory == "256m"
+    heavy = jobs[2]
+    assert (heavy.memory, heavy.cpus, heavy.priority) == ("1g", 2.0, 5)
+    assert heavy.extra_args == "--fast"
+    assert heavy.environment == {"MODE": "ci", "N": "3"}
+
+
+def test_manifest_plain_list(scripts):
+    path = _manifest(scripts, "- jobs/a.py\n- jobs/c.js\n")
+    assert [job.name for job in load_manifest(path)] == ["a.py", "c.js"]
+
+
+@pytest.mark.parametrize(
+    "entry, message",
+    [
+        ("{script: jobs/a.py, cpus: abc}", "a.py"),
+        ("{script: jobs/a.py, cpus: 99}", "CPU"),
+        ("{script: jobs/a.py, env: [1]}", "'env' must be a mapping"),
+        ("{script: jobs/a.py, memory: lots}", "memory"),
+        ("{script: jobs/a.py, timeout: 0}", "timeout"),
+        ("{script: jobs/a.py, pids_limit: 0}", "PIDs"),
+        ("{script: jobs/a.py, priority: high}", "a.py"),
+        ("{cpus: 1}", "without 'script'"),
+        ("jobs/missing.py", "no script matches"),
+        ("[1, 2]", "path or mapping"),
+    ],
+)
+def test_manifest_rejects_bad_entries(scripts, entry, message):
+    path = _manifest(scripts, f"jobs:\n  - {entry}\n")
+    with pytest.raises(ManifestError, match=message):
+        load_manifest(path)
+
+
+def test_manifest_rejects_bad_defaults(scripts):
+    path = _manifest(scripts, "defaults: [1]\njobs: [jobs/a.py]\n")
+    with pytest.raises(ManifestError, match="'defaults' must be a mapping"):
+        load_manifest(path)
+
+
+def test_manifest_unreadable(tmp_path):
+    with pytest.raises(ManifestError, match="Cannot read manifest"):
+        load_manifest(tmp_path / "absent.yaml")
+
+
+def test_default_concurrency_is_capped_by_jobs(tmp_path):
+    jobs = [BatchJob(script_path=tmp_path / "a.py", cpus=0.1, memory="4m")] * 3
+    assert default_concurrency(jobs) == 3
+    assert default_concurrency([]) == 1
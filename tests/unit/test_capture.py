@@ -0,0 +1,157 @@
+"""Tests for bounded output capture, spilling and truncation."""
+
+from __future__ import annotations
+
+import errno
+import gzip
+import os
+import time
+
+import pytest
+
+from safebox.config.constants import MAX_SPILL_FILES, STDERR, STDOUT
+from safebox.core import capture as capture_module
+from safebox.core.capture import OutputCapture, RunCapture
+
+
+def test_small_output_stays_in_memory(tmp_path):
+    out = OutputCapture(max_memory=100, spill_dir=tmp_path)
+    out.write("hello ")
+    out.write("world")
+    assert out.value == "hello world"
+    assert out.complete and out.spill_path is None
+    assert out.total_bytes == 11
+
+
+def test_overflow_keeps_head_and_tail_and_spills_everything(tmp_path):
+    out = OutputCapture(max_memory=10, spill_dir=tmp_path, name="job")
+    for i in range(10):
+        out.write(f"{i}" * 3)
+    out.close()
+    assert out.value.startswith("00011")
+    assert out.value.endswith("88999")
+    assert "20 characters omitted" in out.value
+    assert not out.complete
+    with gzip.open(out.spill_path, "rt") as handle:
+        assert handle.read() == "".join(f"{i}" * 3 for i in range(10))
+
+
+def test_overflow_without_spill_dir(tmp_path):
+    out = OutputCapture(max_memory=4, spill_dir=None)
+    out.write("abcdefgh")
+    assert out.spill_path is None
+    assert out.value == "ab\n… [4 characters omitted] …\ngh"
+
+
+def test_max_output_truncates_on_a_character_boundary():
+    out = OutputCapture(max_output=5, spill_dir=None)
+    assert out.write("héllo") == "héll"  # é is two bytes
+    assert out.truncated and out.total_bytes == 5
+    assert out.write("more") == ""
+
+
+def test_binary_capture():
+    out = OutputCapture(max_memory=4, spill_dir=None, binary=True)
+    out.write(b"\x00\x01\x02\x03\x04\x05")
+    assert out.value == b"\x00\x01\n\xe2\x80\xa6 [2 bytes omitted] \xe2\x80\xa6\n\x04\x05"
+
+
+def test_run_capture_splits_streams_and_decodes_split_characters():
+    run = RunCapture(spill_dir=None)
+    snowman = "☃".encode()
+    run.feed(STDOUT, b"a" + snowman[:1])
+    run.feed(STDERR, b"oops")
+    run.feed(STDOUT, snowman[1:] + b"b")
+    assert run.finish() == []
+    assert run.stdout.value == "a☃b"
+    assert run.stderr.value == "oops"
+    assert run.combined.value == "aoops☃b"
+
+
+def test_run_capture_flushes_an_incomplete_character():
+    run = RunCapture(spill_dir=None)
+    run.feed(STDOUT, "☃".encode()[:2])
+    assert run.finish() == [(STDOUT, "�")]
+
+
+def _spills(directory, count, age):
+    paths = []
+    stamp = time.time() - age
+    for i in range(count):
+        path = directory / f"old-{i:03}.log.gz"
+        path.write_bytes(b"")
+        os.utime(path, (stamp + i, stamp + i))
+        paths.append(path)
+    return paths
+
+
+def test_prune_keeps_the_newest_files(tmp_path):
+    paths = _spills(tmp_path, MAX_SPILL_FILES + 5, age=7200)
+    capture_module._prune_spills(tmp_path)
+    remaining = sorted(tmp_path.glob("*.log.gz"))
+    assert len(remaining) == MAX_SPILL_FILES - 1
+    assert remaining[0] == paths[6]
+
+
+def test_prune_spares_recent_files(tmp_path):
+    _spills(tmp_path, MAX_SPILL_FILES + 5, age=10)
+    capture_module._prune_spills(tmp_path)
+    assert len(list(tmp_path.glob("*.log.gz"))) == MAX_SPILL_FILES + 5
+
+
+def test_prune_spares_files_open_in_this_process(tmp_path):
+    paths = _spills(tmp_path, MAX_SPILL_FILES + 5, age=7200)
+    capture_module._open_spills.add(paths[0])
+    try:
+        capture_module._prune_spills(tmp_path)
+    finally:
+        capture_module._open_spills.discard(paths[0])
+    assert paths[0].exists() and not paths[1].exists()
+
+
+def test_open_spill_is_registered_until_closed(tmp_path):
+    out = OutputCapture(max_memory=2, spill_dir=tmp_path)
+    out.write("abcdef")
+    assert out.spill_path in capture_module._open_spills
+    out.close()
+    assert out.spill_path not in capture_module._open_spills
+
+
+class FullDisk:
+    """A spill file that fails with ENOSPC once *room* bytes have been written."""
+
+    def __init__(self, path, room: int) -> None:
+        self._file = open(path, "wb")
+        self.room = room
+        self.closed = False
+
+    def write(self, data: bytes) -> int:
+        if len(data) > self.room:
+            raise OSError(errno.ENOSPC, "No space left on device")
+        self.room -= len(data)
+        return self._file.write(data)
+
+    def close(self) -> None:
+        self.closed = True
+        self._file.close()
+
+
+@pytest.mark.parametrize("room", [0, 4])  # fails while starting the spill / later on
+def test_spill_write_errors_drop_the_spill_not_the_run(tmp_path, monkeypatch, room):
+    opened = []
+
+    def open_spill(path, mode, compresslevel):
+        opened.append(FullDisk(path, room))
+        return opened[-1]
+
+    monkeypatch.setattr(capture_module.gzip, "open", open_spill)
+    out = OutputCapture(max_memory=4, spill_dir=tmp_path)
+    out.write("abcdef")
+    out.write("ghijkl")
+    out.write("mnopqr")
+    [spill] = opened
+    assert spill.closed and out.spill_path is None
+    assert list(tmp_path.glob("*.log.gz")) == []
+    assert not capture_module._open_spills
+    assert out.value == "ab\n… [14 characters omitted] …\nqr"
+    assert not out.complete and out.total_bytes == 18
@@ -0,0 +1,134 @@
+"""Tests for compile cache volumes and prebuilt Go binaries."""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+
+import pytest
+
+from safebox.core import compile_cache
+from safebox.core.compile_cache import (
+    binary_command,
+    cache_environment,
+    cache_mounts,
+    go_binary_key,
+    prepare_go_binary,
+    volume_name,
+)
+from safebox.core.container import ContainerConfig
+
+
+def _config(tmp_path, language: str = "python", **kwargs) -> ContainerConfig:
+    script = tmp_path / ("main.go" if language == "go" else "job.py")
+    script.write_text("package main\n" if language == "go" else "print(1)\n")
+    return ContainerConfig(
+        image=f"{language}:latest",
+        language=language,
+        script_path=script,
+        image_ref="sha256:" + "ab" * 32,
+        **kwargs,
+    )
+
+
+def test_volume_names_are_namespaced_by_image(tmp_path):
+    config = _config(tmp_path)
+    assert volume_name("cache", config) == "safebox-cache-python-abababababab"
+    config.image_ref = "python:3.12-slim"  # not an ID: hashed instead
+    name = volume_name("cache", config)
+    assert name.startswith("safebox-cache-python-") and ":" not in name
+
+
+def test_bytecode_cache_only_when_enabled(tmp_path):
+    config = _config(tmp_path)
+    assert cache_mounts(config) == {} and cache_environment(config) == {}
+    config.compile_cache = True
+    assert cache_mounts(config) == {
+        "safebox-cache-python-abababababab": {"bind": "/safebox-cache/python", "mode": "rw"}
+    }
+    assert cache_environment(config) == {"PYTHONPYCACHEPREFIX": "/safebox-cache/python"}
+
+
+def test_go_binary_volume_is_read_only(tmp_path):
+    config = _config(tmp_path, "go", compile_cache=True, binary="/safebox-bin/x")
+    assert cache_mounts(config) == {
+        "safebox-bin-go-abababababab": {"bind": "/safebox-bin", "mode": "ro"}
+    }
+    assert cache_environment(config) == {}
+
+
+def test_go_binary_key_tracks_source_and_toolchain(tmp_path):
+    config = _config(tmp_path, "go")
+    key = go_binary_key(config)
+    config.image_ref = "sha256:" + "cd" * 32
+    assert go_binary_key(config) != key
+    config.image_ref = "sha256:" + "ab" * 32
+    config.script_path.write_text("package main\n\nfunc main() {}\n")
+    assert go_binary_key(config) != key
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="needs a POSIX shell")
+@pytest.mark.parametrize("present", [True, False])
+def test_binary_command_falls_back_when_the_binary_is_gone(tmp_path, present):
+    binary = tmp_path / "prog"
+    if present:
+        binary.write_text("#!/bin/sh\necho binary \"$@\"\n")
+        binary.chmod(0o755)
+    config = _config(tmp_path, "go", binary=str(binary))
+    command = binary_command(config, "echo fallback")
+    result = subprocess.run(command + " --flag", shell=True, capture_output=True, text=True)
+    assert result.stdout == ("binary --flag\n" if present else "fallback --flag\n")
+
+
+class FakeContainer:
+    def __init__(self, status: int) -> None:
+        self.status = status
+        self.removed = False
+
+    def wait(self, timeout=None):
+        return {"StatusCode": self.status}
+
+    def remove(self, force=False):
+        self.removed = True
+
+
+class FakeClient:
+    def __init__(self, status: int = 0) -> None:
+        self.status = status
+        self.builds: list[dict] = []
+        self.volumes = self
+        self.containers = self
+
+    def create(self, name, labels):
+        pass
+
+    def run(self, **kwargs):
+        self.builds.append(kwargs)
+        self.container = FakeContainer(self.status)
+        return self.container
+
+
+@pytest.fixture
+def builds_file(tmp_path, monkeypatch):
+    path = tmp_path / "go-builds.json"
+    monkeypatch.setattr(compile_cache, "GO_BUILDS_FILE", path)
+    monkeypatch.setattr(compile_cache, "_volumes", set())
+    return path
+
+
+def test_go_binary_is_built_once_offline(tmp_path, builds_file):
+    config = _config(tmp_path, "go")
+    client = FakeClient()
+    path = prepare_go_binary(config, client)
+    assert path == f"/safebox-bin/{go_binary_key(config)}"
+    assert prepare_go_binary(config, client) == path
+    [build] = client.builds
+    assert build["network_disabled"] is True
+    assert build["environment"]["CGO_ENABLED"] == "0"
+    assert client.container.removed
+
+
+def test_failed_go_build_falls_back_to_go_run(tmp_path, builds_file):
+    config = _config(tmp_path, "go")
+    assert prepare_go_binary(config, FakeClient(status=1)) == ""
+    assert not builds_file.exists()
@@ -0,0 +1,124 @@
+"""Tests for container kwargs and their translation into Engine API bodies."""
+
+from __future__ import annotations
+
+import io
+import tarfile
+
+import pytest
+
+from safebox.config.constants import POOL_KEEPALIVE_COMMAND, POOL_LABEL
+from safebox.core.container import (
+    ContainerConfig,
+    build_command,
+    build_container_kwargs,
+    build_create_body,
+    build_pool_container_kwargs,
+    upload_script,
+)
+
+
+@pytest.fixture
+def config(tmp_path):
+    script = tmp_path / "job.py"
+    script.write_text("print(1)\n")
+    return ContainerConfig(
+        image="python:3.12-slim",
+        language="python",
+        script_path=script,
+        image_ref="sha256:cafe",
+        memory="128m",
+        cpus=0.5,
+        pids_limit=32,
+        extra_args="--name 'two words'",
+    )
+
+
+def test_command_runs_the_script_with_its_arguments(config):
+    assert build_command(config) == "python /sandbox/job.py --name 'two words'"
+
+
+def test_kwargs_mount_the_script_and_apply_limits(config):
+    kwargs = build_container_kwargs(config)
+    assert kwargs["image"] == "sha256:cafe"
+    assert kwargs["volumes"] == {
+        str(config.script_path.resolve()): {"bind": "/sandbox/job.py", "mode": "ro"}
+    }
+    assert (kwargs["mem_limit"], kwargs["nano_cpus"], kwargs["pids_limit"]) == (
+        "128m",
+        500_000_000,
+        32,
+    )
+    assert kwargs["labels"]["safebox.image"] == "python:3.12-slim"
+    assert not {"environment", "init", "cpuset_cpus"} & set(kwargs)
+
+
+def test_kwargs_optional_settings(config):
+    config.environment = {"MODE": "ci"}
+    config.kill_grace = 2.0
+    config.cpuset_cpus, config.cpuset_mems = "0-1", "0"
+    config.upload_script = True
+    kwargs = build_container_kwargs(config)
+    assert kwargs["environment"] == {"MODE": "ci"}
+    assert kwargs["init"] is True
+    assert (kwargs["cpuset_cpus"], kwargs["cpuset_mems"]) == ("0-1", "0")
+    assert kwargs["volumes"] == {}  # the script is uploaded instead
+
+
+def test_pool_kwargs_keep_the_container_alive_without_the_script(config):
+    config.environment = {"MODE": "ci"}
+    config.cpuset_cpus = "3"
+    kwargs = build_pool_container_kwargs(config, "key")
+    assert kwargs["command"] == POOL_KEEPALIVE_COMMAND
+    assert kwargs["labels"][POOL_LABEL] == "key"
+    assert kwargs["init"] is True
+    assert not {"volumes", "environment", "cpuset_cpus"} & set(kwargs)
+
+
+def test_create_body(config):
+    config.environment = {"MODE": "ci"}
+    config.kill_grace = 1.0
+    config.cpuset_cpus = "2-3"
+    body = build_create_body(build_container_kwargs(config))
+    assert body["Image"] == "sha256:cafe"
+    assert body["Cmd"] == ["python", "/sandbox/job.py", "--name", "two words"]
+    assert body["WorkingDir"] == "/sandbox"
+    assert body["Env"] == ["MODE=ci"]
+    assert body["Labels"]["safebox.script"] == "job.py"
+    assert body["HostConfig"] == {
+        "Memory": 128 << 20,
+        "NanoCpus": 500_000_000,
+        "PidsLimit": 32,
+        "Binds": [f"{config.script_path.resolve()}:/sandbox/job.py:ro"],
+        "Init": True,
+        "CpusetCpus": "2-3",
+    }
+
+
+def test_create_body_for_a_pool_container(config):
+    body = build_create_body(build_pool_container_kwargs(config, "key"))
+    assert body["Cmd"] == POOL_KEEPALIVE_COMMAND
+    assert body["Env"] == [] and body["HostConfig"]["Binds"] == []
+
+
+def test_create_body_refuses_kwargs_it_cannot_translate(config):
+    kwargs = {**build_container_kwargs(config), "network_mode": "none", "privileged": True}
+    with pytest.raises(ValueError, match="network_mode, privileged"):
+        build_create_body(kwargs)
+
+
+def test_upload_script_creates_the_sandbox_directory(config):
+    uploads = []
+
+    class API:
+        def put_archive(self, container_id, path, data):
+            uploads.append((container_id, path, data))
+
+    upload_script(API(), "abc", config)
+    [(container_id, path, data)] = uploads
+    assert (container_id, path) == ("abc", "/")
+    with tarfile.open(fileobj=io.BytesIO(data)) as tar:
+        directory, script = tar.getmembers()
+        assert directory.isdir() and directory.name == "sandbox"
+        assert script.name == "sandbox/job.py" and script.mode == 0o444
+        assert tar.extractfile(script).read() == b"print(1)\n"
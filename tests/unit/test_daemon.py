@@ -0,0 +1,149 @@
+"""Tests for the ``safeboxd`` protocol over a real Unix socket, with a stubbed executor."""
+
+from __future__ import annotations
+
+import os
+import shutil
+import socket
+import stat
+import tempfile
+import threading
+from pathlib import Path
+
+import pytest
+
+from safebox import __version__
+from safebox.core.result import ExecutionResult
+from safebox.core.scheduler import Resources, Scheduler
+from safebox.daemon import server
+from safebox.daemon.client import (
+    DaemonJobError,
+    DaemonUnavailableError,
+    request,
+    run_via_daemon,
+)
+from safebox.output.plain import Reporter
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="needs Unix sockets")
+
+
+class FakePool:
+    def stats(self) -> dict:
+        return {"idle": 0}
+
+
+class Recorder(Reporter):
+    def __init__(self) -> None:
+        self.output_text = ""
+
+    def output(self, text, stream=1):
+        self.output_text += text
+
+
+@pytest.fixture
+def daemon(monkeypatch):
+    calls: list[dict] = []
+
+    def execute(script_path, *, reporter, **kwargs):
+        calls.append({"script": script_path, **kwargs})
+        reporter.output("hello\n")
+        result = ExecutionResult(exit_code=0, duration=0.1, language="python")
+        reporter.result(result)
+        return result
+
+    monkeypatch.setattr(server, "execute", execute)
+    directory = Path(tempfile.mkdtemp(prefix="sbx"))  # short: socket paths are limited
+    path = directory / "d.sock"
+    daemon = server.SafeboxDaemon(path, FakePool(), Scheduler(Resources(1, 1, 1)))
+    thread = threading.Thread(target=daemon.serve_forever, args=(0.01,), daemon=True)
+    thread.start()
+    yield path, calls
+    daemon.shutdown()
+    daemon.server_close()
+    shutil.rmtree(directory, ignore_errors=True)
+
+
+@pytest.fixture
+def job(tmp_path) -> dict:
+    script = tmp_path / "job.py"
+    script.write_text("print('hello')\n")
+    return {"script": str(script), "memory": "256m", "cpus": 1, "timeout": 30, "pids_limit": 64}
+
+
+def test_ping_and_status(daemon):
+    path, _ = daemon
+    assert request({"op": "ping"}, path)["version"] == __version__
+    status = request({"op": "status"}, path)
+    assert status["active_jobs"] == 0 and status["pool"] == {"idle": 0}
+    assert status["placement"] is None and status["endpoints"] is None
+
+
+def test_unknown_op_and_malformed_request(daemon):
+    path, _ = daemon
+    assert "Unknown op" in request({"op": "dance"}, path)["message"]
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(str(path))
+        sock.sendall(b"{not json\n")
+        assert b"Malformed request" in sock.makefile("rb").readline()
+
+
+def test_run_replays_events_into_the_reporter(daemon, job):
+    path, calls = daemon
+    reporter = Recorder()
+    result = run_via_daemon({**job, "tenant": "ci", "stats": True}, reporter, path)
+    assert result.exit_code == 0 and result.stdout == "hello\n"
+    assert reporter.output_text == "hello\n"
+    [call] = calls
+    assert (call["memory"], call["tenant"], call["stats"]) == ("256m", "ci", True)
+
+
+def test_stats_are_off_unless_requested(daemon, job):
+    path, calls = daemon
+    run_via_daemon(job, Reporter(), path)
+    assert calls[0]["stats"] is False
+
+
+@pytest.mark.parametrize(
+    "change, message",
+    [
+        ({"memory": "lots"}, "memory"),
+        ({"cpus": 99}, "CPU"),
+        ({"script": "relative.py"}, "Script not found"),
+        ({"timeout": None}, "Invalid request"),
+    ],
+)
+def test_invalid_jobs_are_refused(daemon, job, change, message):
+    path, calls = daemon
+    with pytest.raises(DaemonJobError, match=message):
+        run_via_daemon({**job, **change}, Reporter(), path)
+    assert calls == []
+
+
+def test_version_mismatch_falls_back_to_in_process(daemon, job, monkeypatch):
+    path, _ = daemon
+    monkeypatch.setattr("safebox.daemon.client.__version__", "0.0.0")
+    with pytest.raises(DaemonUnavailableError, match="client is 0.0.0"):
+        run_via_daemon(job, Reporter(), path)
+
+
+def test_socket_is_private_as_soon_as_it_is_bound():
+    class Probe(server.SafeboxDaemon):
+        def server_bind(self):
+            super().server_bind()
+            self.mode = stat.S_IMODE(os.stat(self.server_address).st_mode)
+
+    directory = Path(tempfile.mkdtemp(prefix="sbx"))
+    umask = os.umask(0o022)
+    try:
+        daemon = Probe(directory / "d.sock", FakePool(), Scheduler(Resources(1, 1, 1)))
+        daemon.server_close()
+        assert daemon.mode == 0o600
+        assert os.umask(0o022) == 0o022  # restored after the bind
+    finally:
+        os.umask(umask)
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def test_missing_socket_is_unavailable(tmp_path):
+    with pytest.raises(DaemonUnavailableError):
+        request({"op": "ping"}, tmp_path / "absent.sock")
@@ -0,0 +1,106 @@
+"""Tests for finding a script's dependencies and keying their images."""
+
+from __future__ import annotations
+
+import tarfile
+
+import pytest
+
+from safebox.core.deps import (
+    DependencyError,
+    DependencySpec,
+    _build_context,
+    dependency_tag,
+    find_dependencies,
+)
+
+PEP723 = """\
+# /// script
+# requires-python = ">=3.11"
+# dependencies = [
+#   "requests<3",
+#   "rich",
+# ]
+# ///
+import requests
+"""
+
+
+def _script(directory, text: str = "print(1)\n", name: str = "job.py"):
+    path = directory / name
+    path.write_text(text)
+    return path
+
+
+def test_pep723_block_wins_over_requirements_txt(tmp_path):
+    (tmp_path / "requirements.txt").write_text("numpy\n")
+    spec = find_dependencies(_script(tmp_path, PEP723), "python")
+    assert spec.files == {"requirements.txt": b"requests<3\nrich\n"}
+    assert spec.source == "job.py (PEP 723)"
+
+
+def test_empty_pep723_dependencies_mean_none(tmp_path):
+    text = "# /// script\n# dependencies = []\n# ///\n"
+    (tmp_path / "requirements.txt").write_text("numpy\n")
+    assert find_dependencies(_script(tmp_path, text), "python") is None
+
+
+@pytest.mark.parametrize(
+    "text, message",
+    [
+        ("# /// script\n# dependencies = [\n# ///\n", "invalid PEP 723"),
+        ("# /// script\n# dependencies = 'rich'\n# ///\n", "list of strings"),
+        ("# /// script\n# dependencies = []\n# ///\n\n" * 2, "multiple"),
+    ],
+)
+def test_bad_pep723_metadata(tmp_path, text, message):
+    with pytest.raises(DependencyError, match=message):
+        find_dependencies(_script(tmp_path, text), "python")
+
+
+def test_requirements_txt_next_to_the_script(tmp_path):
+    (tmp_path / "requirements.txt").write_text("numpy\n")
+    spec = find_dependencies(_script(tmp_path), "python")
+    assert spec.files == {"requirements.txt": b"numpy\n"}
+
+
+def test_node_package_json_with_lock(tmp_path):
+    (tmp_path / "package.json").write_text('{"dependencies": {"left-pad": "1"}}')
+    (tmp_path / "package-lock.json").write_text("{}")
+    spec = find_dependencies(_script(tmp_path, name="job.js"), "node")
+    assert sorted(spec.files) == ["package-lock.json", "package.json"]
+
+
+def test_explicit_requirements_and_no_manifest(tmp_path):
+    explicit = tmp_path / "deps.txt"
+    explicit.write_text("rich\n")
+    script = _script(tmp_path)
+    assert find_dependencies(script, "python", explicit).source == str(explicit)
+    assert find_dependencies(script, "python") is None
+    assert find_dependencies(script, "ruby") is None
+    with pytest.raises(DependencyError, match="Cannot read"):
+        find_dependencies(script, "python", tmp_path / "missing.txt")
+
+
+def test_tag_depends_on_the_dependency_set_and_base_image():
+    spec = DependencySpec("python", {"requirements.txt": b"rich\n"}, "a")
+    same = DependencySpec("python", {"requirements.txt": b"rich\n"}, "b")
+    other = DependencySpec("python", {"requirements.txt": b"numpy\n"})
+    tag = dependency_tag(spec, "sha256:base")
+    assert tag == dependency_tag(same, "sha256:base")
+    assert tag != dependency_tag(other, "sha256:base")
+    assert tag != dependency_tag(spec, "sha256:newer")
+    assert tag.split(":")[0].endswith("/python")
+
+
+def test_build_context_installs_from_the_manifest():
+    spec = DependencySpec("node", {"package.json": b"{}", "package-lock.json": b"{}"})
+    with tarfile.open(fileobj=_build_context(spec, "sha256:base")) as tar:
+        assert sorted(tar.getnames()) == ["Dockerfile", "package-lock.json", "package.json"]
+        dockerfile = tar.extractfile("Dockerfile").read().decode()
+    assert dockerfile.startswith("FROM sha256:base\n")
+    assert "npm ci" in dockerfile
+
+    spec = DependencySpec("python", {"requirements.txt": b"rich\n"})
+    with tarfile.open(fileobj=_build_context(spec, "img")) as tar:
+        assert "pip install" in tar.extractfile("Dockerfile").read().decode()
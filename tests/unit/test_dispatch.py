@@ -0,0 +1,174 @@
+"""Tests for spreading runs over several Docker endpoints."""
+
+from __future__ import annotations
+
+import pytest
+from requests.exceptions import ConnectionError as RequestsConnectionError
+
+from safebox.config.constants import DISPATCH_IMAGE_MISS_COST
+from safebox.core.dispatch import (
+    Dispatcher,
+    Endpoint,
+    EndpointsUnavailableError,
+    parse_endpoint,
+)
+from safebox.core.docker_client import get_client
+from safebox.core.images import ImageCache, get_image_cache, resolve_image
+
+
+class FakeImages:
+    """``client.images`` of a daemon holding *tags* (tag → image ID)."""
+
+    def __init__(self, tags: dict[str, str]) -> None:
+        self.tags = tags
+        self.lookups: list[str] = []
+
+    def get(self, name: str):
+        self.lookups.append(name)
+        return type("Image", (), {"id": self.tags[name], "attrs": {}})()
+
+
+class FakeClient:
+    def __init__(self, tags: dict[str, str] | None = None) -> None:
+        self.images = FakeImages(tags or {})
+
+
+class FakeEndpoint(Endpoint):
+    """An endpoint whose ping answers from :attr:`up` instead of the network."""
+
+    def __init__(
+        self, url: str, weight: float = 1.0, up: bool = True, tags: dict[str, str] | None = None
+    ) -> None:
+        super().__init__(url, weight)
+        self.up = up
+        self._client = FakeClient(tags)
+
+    def ping(self) -> Exception | None:
+        return None if self.up else RequestsConnectionError("refused")
+
+
+def _dispatcher(*endpoints: Endpoint) -> Dispatcher:
+    dispatcher = Dispatcher(endpoints)
+    dispatcher.check()
+    return dispatcher
+
+
+@pytest.mark.parametrize(
+    "spec, expected",
+    [
+        ("unix:///var/run/docker.sock", ("unix:///var/run/docker.sock", 1.0)),
+        ("tcp://big:2375=2.5", ("tcp://big:2375", 2.5)),
+        ("ssh://user@host?opt=x", ("ssh://user@host?opt=x", 1.0)),
+    ],
+)
+def test_parse_endpoint(spec, expected):
+    assert parse_endpoint(spec) == expected
+
+
+def test_parse_endpoint_rejects_non_positive_weight():
+    with pytest.raises(ValueError, match="positive"):
+        parse_endpoint("tcp://host:2375=0")
+
+
+def test_remote_endpoints():
+    assert not Endpoint("unix:///var/run/docker.sock").remote
+    assert Endpoint("tcp://host:2375").remote
+
+
+def test_runs_are_spread_by_weight():
+    small, big = FakeEndpoint("tcp://small"), FakeEndpoint("tcp://big", weight=2)
+    dispatcher = _dispatcher(small, big)
+    chosen = [dispatcher._acquire("") for _ in range(6)]
+    assert chosen.count(big) == 4 and chosen.count(small) == 2
+    assert (big.active, big.runs) == (4, 4)
+
+
+def test_missing_image_counts_as_extra_load():
+    warm, cold = FakeEndpoint("tcp://warm"), FakeEndpoint("tcp://cold")
+    warm.images.add("python:3.12-slim")
+    dispatcher = _dispatcher(cold, warm)
+    chosen = [dispatcher._acquire("python:3.12-slim") for _ in range(DISPATCH_IMAGE_MISS_COST + 1)]
+    assert chosen[:DISPATCH_IMAGE_MISS_COST] == [warm] * DISPATCH_IMAGE_MISS_COST
+    assert chosen[-1] is cold
+
+
+def test_unhealthy_and_excluded_endpoints_are_skipped():
+    down, first, second = (
+        FakeEndpoint("tcp://down", up=False),
+        FakeEndpoint("tcp://a"),
+        FakeEndpoint("tcp://b"),
+    )
+    dispatcher = _dispatcher(down, first, second)
+    assert not down.healthy and down.error == "refused"
+    assert dispatcher._acquire("", exclude={id(first)}) is second
+
+
+def test_no_healthy_endpoint_rechecks_then_raises():
+    endpoint = FakeEndpoint("tcp://a", up=False)
+    dispatcher = _dispatcher(endpoint)
+    with pytest.raises(EndpointsUnavailableError, match="tcp://a: refused"):
+        dispatcher._acquire("")
+    endpoint.up = True
+    assert dispatcher._acquire("") is endpoint  # back since the last check
+
+
+def test_check_counts_failures_once_per_outage():
+    endpoint = FakeEndpoint("tcp://a")
+    dispatcher = _dispatcher(endpoint)
+    endpoint.up = False
+    dispatcher.check()
+    dispatcher.check()
+    assert endpoint.failures == 1
+    endpoint.up = True
+    dispatcher.check()
+    assert endpoint.healthy and endpoint.error == ""
+
+
+def test_lease_binds_the_client_and_learns_the_image():
+    endpoint = FakeEndpoint("tcp://a")
+    dispatcher = _dispatcher(endpoint)
+    with dispatcher.lease("node:20-slim") as lease:
+        assert get_client() is endpoint.client
+        assert endpoint.active == 1
+    assert lease.endpoint is endpoint and endpoint.active == 0
+    assert "node:20-slim" in endpoint.images
+
+
+def test_lease_marks_an_unreachable_endpoint_down():
+    endpoint = FakeEndpoint("tcp://a")
+    dispatcher = _dispatcher(endpoint)
+    with pytest.raises(RequestsConnectionError):
+        with dispatcher.lease():
+            raise RequestsConnectionError("connection reset")
+    assert not endpoint.healthy and endpoint.active == 0
+
+
+def test_failover_moves_to_another_endpoint():
+    first, second = FakeEndpoint("tcp://a"), FakeEndpoint("tcp://b")
+    dispatcher = _dispatcher(first, second)
+    with dispatcher.lease() as lease:
+        assert lease.endpoint is first
+        assert lease.failover(RequestsConnectionError("gone")) is second
+        assert get_client() is second.client
+        with pytest.raises(EndpointsUnavailableError):
+            lease.failover(RequestsConnectionError("gone too"))
+    assert (first.active, second.active) == (0, 0)
+
+
+def test_each_endpoint_resolves_tags_against_its_own_daemon(tmp_path):
+    first = FakeEndpoint("tcp://a", tags={"python:3.12-slim": "sha256:aaa"})
+    second = FakeEndpoint("tcp://b", tags={"python:3.12-slim": "sha256:bbb"})
+    first.image_cache = ImageCache(tmp_path / "a.json")
+    second.image_cache = ImageCache(tmp_path / "b.json")
+    dispatcher = _dispatcher(first, second)
+    for _ in range(2):  # alternate between the endpoints
+        with dispatcher.lease() as outer:
+            assert outer.endpoint is first
+            assert resolve_image("python:3.12-slim") == "sha256:aaa"
+            with dispatcher.lease() as inner:
+                assert inner.endpoint is second
+                assert resolve_image("python:3.12-slim") == "sha256:bbb"
+            assert get_image_cache() is first.image_cache
+    # One lookup per endpoint: neither evicted the other's entry.
+    assert first.client.images.lookups == second.client.images.lookups == ["python:3.12-slim"]
+    assert get_image_cache() not in (first.image_cache, second.image_cache)
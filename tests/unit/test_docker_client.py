@@ -0,0 +1,48 @@
+"""Tests for the shared Docker client and its connection pool."""
+
+from __future__ import annotations
+
+import docker
+
+from safebox.core.docker_client import (
+    _SharedPoolAdapter,
+    _share_socket_pool,
+    get_client,
+    use_client,
+)
+
+
+def _unix_client(tmp_path) -> docker.DockerClient:
+    # A fixed API version keeps docker-py from asking the (absent) daemon.
+    return docker.DockerClient(
+        base_url=f"unix://{tmp_path / 'docker.sock'}", version="1.44", max_pool_size=8
+    )
+
+
+def test_unix_socket_urls_share_one_pool(tmp_path):
+    client = _unix_client(tmp_path)
+    _share_socket_pool(client)
+    adapter = client.api._custom_adapter
+    assert isinstance(adapter, _SharedPoolAdapter)
+    assert client.api.get_adapter("http+docker://localhost/v1.44/info") is adapter
+    first = adapter.get_connection("http+docker://localhost/v1.44/containers/a/logs")
+    second = adapter.get_connection("http+docker://localhost/v1.44/containers/b/wait")
+    assert first is second
+    assert adapter.max_pool_size == 8
+
+
+def test_tcp_clients_are_left_alone():
+    client = docker.DockerClient(base_url="tcp://127.0.0.1:1", version="1.44")
+    _share_socket_pool(client)
+    assert not isinstance(getattr(client.api, "_custom_adapter", None), _SharedPoolAdapter)
+
+
+def test_use_client_binds_for_the_block_only(monkeypatch):
+    default, bound = object(), object()
+    monkeypatch.setattr("safebox.core.docker_client._client", default)
+    with use_client(bound):
+        assert get_client() is bound
+        with use_client(default):
+            assert get_client() is default
+        assert get_client() is bound
+    assert get_client() is default
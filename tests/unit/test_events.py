@@ -0,0 +1,117 @@
+"""Tests for the shared Docker events stream and the exits it records."""
+
+from __future__ import annotations
+
+import queue
+import threading
+
+import pytest
+
+from safebox.core import events as events_module
+from safebox.core.events import ContainerEvent, EventStream
+
+_CLOSED = object()
+
+
+class FakeStream:
+    """An events connection fed from the test; iteration ends on :meth:`close`."""
+
+    def __init__(self) -> None:
+        self.messages: queue.SimpleQueue = queue.SimpleQueue()
+
+    def __iter__(self):
+        while (message := self.messages.get()) is not _CLOSED:
+            yield message
+
+    def close(self) -> None:
+        self.messages.put(_CLOSED)
+
+
+class FakeClient:
+    api = None
+
+
+@pytest.fixture
+def stream(monkeypatch):
+    connections: list[FakeStream] = []
+    opened = threading.Semaphore(0)
+
+    def follow_events(api, filters, since=None):
+        assert filters["label"] == ["safebox=true"]
+        connection = FakeStream()
+        connections.append(connection)
+        opened.release()
+        return connection
+
+    monkeypatch.setattr(events_module, "follow_events", follow_events)
+    monkeypatch.setattr(events_module, "RECONNECT_DELAY", 0.01)
+    events = EventStream(FakeClient())
+    events.subscribe(lambda event: None)
+    assert opened.acquire(timeout=5) and events.connected.wait(5)
+    yield events, connections, opened
+    events.close()
+
+
+def _message(action: str, container_id: str, **attributes: str) -> dict:
+    return {
+        "Action": action,
+        "Actor": {"ID": container_id, "Attributes": attributes},
+        "timeNano": 1_700_000_000_500_000_000,
+    }
+
+
+def test_event_from_message():
+    event = ContainerEvent.from_message(_message("exec_die", "c1", execID="e1", exitCode="3"))
+    assert (event.action, event.container_id, event.time) == ("exec_die", "c1", 1_700_000_000.5)
+    assert (event.exit_code, event.exit_key) == (3, "e1")
+    legacy = ContainerEvent.from_message({"status": "die", "id": "c2", "time": 5})
+    assert (legacy.action, legacy.exit_key, legacy.exit_code) == ("die", "c2", None)
+
+
+def test_wait_exit_returns_the_code_and_oom_verdict(stream):
+    events, connections, _ = stream
+    threading.Timer(
+        0.02,
+        lambda: [
+            connections[0].messages.put(_message("oom", "c1")),
+            connections[0].messages.put(_message("die", "c1", exitCode="137")),
+        ],
+    ).start()
+    status = events.wait_exit("c1", 5)
+    assert (status.exit_code, status.oom_killed) == (137, True)
+    assert events.exit_status("c1") is status
+
+
+def test_exit_seen_before_the_wait_is_remembered(stream):
+    events, connections, _ = stream
+    seen = threading.Event()
+    events.subscribe(lambda event: seen.set())
+    connections[0].messages.put(_message("die", "c1", exitCode="0"))
+    assert seen.wait(5)
+    assert events.wait_exit("c1", 0).exit_code == 0
+
+
+def test_wait_exit_times_out(stream):
+    events, _, _ = stream
+    assert events.wait_exit("never", 0.01) is None
+
+
+def test_listeners_survive_a_failing_listener(stream):
+    events, connections, _ = stream
+    got = queue.SimpleQueue()
+    events.subscribe(lambda event: 1 / 0)
+    unsubscribe = events.subscribe(got.put)
+    connections[0].messages.put(_message("die", "c1", exitCode="1"))
+    assert got.get(timeout=5).container_id == "c1"
+    unsubscribe()
+    assert events.wait_exit("c1", 0).exit_code == 1
+
+
+def test_dropped_connection_wakes_waiters_and_reconnects(stream):
+    events, connections, opened = stream
+    threading.Timer(0.02, connections[0].close).start()
+    assert events.wait_exit("c1", 5) is None  # woken by the drop, not the timeout
+    assert opened.acquire(timeout=5)
+    assert events.connected.wait(5)
+    connections[1].messages.put(_message("die", "c1", exitCode="2"))
+    assert events.wait_exit("c1", 5).exit_code == 2
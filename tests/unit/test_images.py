@@ -0,0 +1,90 @@
+"""Tests for the on-disk image resolution cache."""
+
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from safebox.core import images
+from safebox.core.images import ImageCache, ImageRecord, resolve_image
+
+
+def _record(tag: str, image_id: str = "sha256:cafe", age: float = 0.0) -> ImageRecord:
+    return ImageRecord(tag, image_id, ["repo@sha256:d1"], resolved_at=time.time() - age)
+
+
+def test_put_get_and_persist(tmp_path):
+    path = tmp_path / "images.json"
+    ImageCache(path).put(_record("python:3.12-slim"))
+    record = ImageCache(path).get("python:3.12-slim")
+    assert record.image_id == "sha256:cafe"
+    assert record.digest == "repo@sha256:d1"
+
+
+def test_stale_records_are_missing_but_listed(tmp_path):
+    cache = ImageCache(tmp_path / "images.json", ttl=60)
+    cache.put(_record("old", age=120))
+    assert cache.get("old") is None
+    assert [record.tag for record in cache.records()] == ["old"]
+
+
+def test_invalidate_one_or_all(tmp_path):
+    cache = ImageCache(tmp_path / "images.json")
+    for tag in ("a", "b", "c"):
+        cache.put(_record(tag))
+    cache.invalidate("b")
+    assert [record.tag for record in cache.records()] == ["a", "c"]
+    cache.invalidate()
+    assert cache.records() == []
+
+
+def test_changes_by_another_process_are_picked_up(tmp_path):
+    path = tmp_path / "images.json"
+    ours, theirs = ImageCache(path), ImageCache(path)
+    assert ours.get("a") is None
+    theirs.put(_record("a"))
+    assert ours.get("a") is not None
+
+
+def test_corrupt_cache_file_is_ignored(tmp_path):
+    path = tmp_path / "images.json"
+    path.write_text("{not json")
+    cache = ImageCache(path)
+    assert cache.get("a") is None
+    cache.put(_record("a"))
+    assert ImageCache(path).get("a") is not None
+
+
+class FakeImage:
+    def __init__(self, image_id: str) -> None:
+        self.id = image_id
+        self.attrs = {"RepoDigests": ["repo@sha256:d2"]}
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    cache = ImageCache(tmp_path / "images.json")
+    monkeypatch.setattr(images, "_default_cache", cache)
+    return cache
+
+
+def test_resolve_uses_a_fresh_record_without_docker(cache, monkeypatch):
+    cache.put(_record("python:3.12-slim"))
+    monkeypatch.setattr(images, "ensure_image", lambda image, pull=False: pytest.fail("looked up"))
+    assert resolve_image("python:3.12-slim") == "sha256:cafe"
+
+
+def test_resolve_looks_up_and_records(cache, monkeypatch):
+    calls = []
+
+    def ensure_image(image, pull=False):
+        calls.append((image, pull))
+        return FakeImage("sha256:beef")
+
+    monkeypatch.setattr(images, "ensure_image", ensure_image)
+    cache.put(_record("python:3.12-slim"))
+    assert resolve_image("python:3.12-slim", refresh=True) == "sha256:beef"
+    assert resolve_image("node:20-slim", pull=True) == "sha256:beef"
+    assert calls == [("python:3.12-slim", False), ("node:20-slim", True)]
+    assert cache.get("node:20-slim").digest == "repo@sha256:d2"
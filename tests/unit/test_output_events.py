@@ -0,0 +1,131 @@
+"""Tests for JSON-lines and raw output and for replaying run events."""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+
+from safebox.config.constants import STDERR, STDOUT
+from safebox.core.capture import RunCapture
+from safebox.core.result import ExecutionResult
+from safebox.core.telemetry import ResourceUsage
+from safebox.output.events import (
+    EventReporter,
+    JsonLinesReporter,
+    JsonLinesWriter,
+    replay,
+)
+from safebox.output.plain import RawReporter, Reporter
+
+
+class Recorder(Reporter):
+    def __init__(self) -> None:
+        self.calls: list[tuple] = []
+
+    def detection(self, language, image, script_name):
+        self.calls.append(("detection", language, image, script_name))
+
+    def output(self, text, stream=STDOUT):
+        self.calls.append(("output", text, stream))
+
+    def timeout(self, seconds):
+        self.calls.append(("timeout", seconds))
+
+    def result(self, result):
+        self.calls.append(("result", result))
+
+
+def _read_lines(fd: int) -> list[dict]:
+    with os.fdopen(fd, "rb") as handle:
+        return [json.loads(line) for line in handle.read().splitlines()]
+
+
+def test_writer_emits_one_line_per_event():
+    read_fd, write_fd = os.pipe()
+    writer = JsonLinesWriter(write_fd)
+    writer({"event": "output", "data": "héllo\n"})
+    writer({"event": "result", "path": os.path})  # not JSON: written with str()
+    os.close(write_fd)
+    first, second = _read_lines(read_fd)
+    assert first == {"event": "output", "data": "héllo\n"}
+    assert second["path"].startswith("<module")
+
+
+def test_concurrent_events_never_interleave():
+    read_fd, write_fd = os.pipe()
+    writer = JsonLinesWriter(write_fd)
+    lines: list[dict] = []
+    reader = threading.Thread(target=lambda: lines.extend(_read_lines(read_fd)))
+    reader.start()
+
+    def emit(n: int) -> None:
+        for i in range(50):
+            writer({"event": "output", "data": f"{n}" * 5000, "i": i})
+
+    threads = [threading.Thread(target=emit, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    os.close(write_fd)
+    reader.join()
+    assert len(lines) == 200
+    assert all(set(line["data"]) <= set("0123") for line in lines)
+
+
+def test_reporter_adds_fields_to_every_event():
+    read_fd, write_fd = os.pipe()
+    reporter = JsonLinesReporter(write_fd, job="a.py")
+    reporter.output("x", STDERR)
+    reporter.error("failed")
+    os.close(write_fd)
+    output, error = _read_lines(read_fd)
+    assert output["job"] == "a.py" and output["stream"] == STDERR
+    assert error == {"job": "a.py", "event": "error", "message": "failed"}
+
+
+def test_events_replay_into_another_reporter():
+    events: list[dict] = []
+    source = EventReporter(events.append)
+    source.detection("python", "python:3.12-slim", "job.py")
+    source.output("out\n", STDOUT)
+    source.output("err\n", STDERR)
+    source.timeout(5)
+    source.result(
+        ExecutionResult(
+            exit_code=124,
+            duration=5.1,
+            timed_out=True,
+            language="python",
+            image="python:3.12-slim",
+            usage=ResourceUsage(samples=3, memory_peak=1024),
+        )
+    )
+    events = [json.loads(json.dumps(event)) for event in events]  # as if sent over a socket
+
+    target, capture = Recorder(), RunCapture(spill_dir=None)
+    results = [replay(event, target, capture) for event in events]
+    assert results[:-1] == [None] * 4
+    result = results[-1]
+    assert (result.exit_code, result.timed_out) == (124, True)
+    assert (result.stdout, result.stderr, result.output) == ("out\n", "err\n", "out\nerr\n")
+    assert result.usage.memory_peak == 1024
+    assert [call[0] for call in target.calls] == [
+        "detection",
+        "output",
+        "output",
+        "timeout",
+        "result",
+    ]
+    assert target.calls[2] == ("output", "err\n", STDERR)
+
+
+def test_raw_reporter_writes_streams_to_their_descriptors(capfd):
+    reporter = RawReporter()
+    reporter.output("to stdout\n", STDOUT)
+    reporter.output("to stderr\n", STDERR)
+    reporter.timeout(3)
+    out, err = capfd.readouterr()
+    assert out == "to stdout\n"
+    assert err == "to stderr\nsafebox: timed out after 3s\n"
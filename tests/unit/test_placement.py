@@ -0,0 +1,108 @@
+"""Tests for CPU lists, topology detection and the NUMA-aware core allocator."""
+
+from __future__ import annotations
+
+import pytest
+
+from safebox.core import placement
+from safebox.core.placement import (
+    CpuAllocator,
+    Placement,
+    Topology,
+    format_cpulist,
+    parse_cpulist,
+)
+
+
+@pytest.mark.parametrize(
+    "text, cpus",
+    [
+        ("0-3,8,10-11\n", [0, 1, 2, 3, 8, 10, 11]),
+        ("5", [5]),
+        ("", []),
+        ("0,,2", [0, 2]),
+    ],
+)
+def test_parse_cpulist(text, cpus):
+    assert parse_cpulist(text) == cpus
+
+
+def test_parse_cpulist_rejects_garbage():
+    with pytest.raises(ValueError):
+        parse_cpulist("0-x")
+
+
+@pytest.mark.parametrize(
+    "cpus, text",
+    [([3, 0, 1, 2, 8, 10, 11], "0-3,8,10-11"), ([4], "4"), ([], ""), ([1, 3], "1,3")],
+)
+def test_format_cpulist(cpus, text):
+    assert format_cpulist(cpus) == text
+    assert parse_cpulist(text) == sorted(cpus)
+
+
+def _two_nodes() -> Topology:
+    return Topology({0: (0, 1, 2, 3), 1: (4, 5, 6, 7)})
+
+
+def test_single_node_hosts_do_not_bind_memory():
+    allocator = CpuAllocator(Topology.flat(4))
+    got = allocator.allocate(2)
+    assert got == Placement((0, 1))
+    assert (got.cpuset_cpus, got.cpuset_mems) == ("0-1", "")
+
+
+def test_runs_pack_into_the_fullest_node_that_fits():
+    allocator = CpuAllocator(_two_nodes())
+    first = allocator.allocate(3)
+    assert first.cpus == (0, 1, 2) and first.cpuset_mems == "0"
+    assert allocator.allocate(1).cpus == (3,)  # fills node 0 rather than splitting node 1
+    assert allocator.allocate(4).cpuset_cpus == "4-7"
+
+
+def test_runs_span_nodes_only_when_no_node_has_room():
+    allocator = CpuAllocator(_two_nodes())
+    allocator.allocate(3)
+    allocator.allocate(2)  # node 0: 1 free, node 1: 2 free
+    spanning = allocator.allocate(3)
+    assert spanning.cpuset_cpus == "3,6-7" and spanning.cpuset_mems == "0-1"
+
+
+def test_too_few_free_cores_leaves_the_run_unpinned():
+    allocator = CpuAllocator(Topology.flat(2))
+    allocator.allocate(2)
+    assert allocator.allocate(1) is None
+    assert allocator.stats()["unpinned"] == 1
+
+
+def test_place_rounds_up_and_releases():
+    allocator = CpuAllocator(_two_nodes())
+    with allocator.place(1.5) as held:
+        assert len(held.cpus) == 2
+        assert allocator.stats()["nodes"]["0"]["free"] == 2
+    with allocator.place(0.1) as held:
+        assert len(held.cpus) == 1
+    stats = allocator.stats()
+    assert stats["pinned"] == 2
+    assert {node["free"] for node in stats["nodes"].values()} == {4}
+
+
+def test_detect_reads_sysfs_limited_to_usable_cpus(tmp_path, monkeypatch):
+    for node, cpulist in ((0, "0-3"), (1, "4-7")):
+        (tmp_path / f"node{node}").mkdir()
+        (tmp_path / f"node{node}" / "cpulist").write_text(cpulist + "\n")
+    (tmp_path / "node2").mkdir()  # no cpulist: skipped
+    monkeypatch.setattr(placement, "NODE_DIR", tmp_path)
+    monkeypatch.setattr(placement.os, "sched_getaffinity", lambda pid: {1, 2, 5}, raising=False)
+    assert Topology.detect().nodes == {0: (1, 2), 1: (5,)}
+
+
+def test_detect_falls_back_to_a_flat_daemon_topology(tmp_path, monkeypatch):
+    class Client:
+        def info(self):
+            return {"NCPU": 6}
+
+    monkeypatch.setattr(placement, "NODE_DIR", tmp_path)
+    monkeypatch.setattr(placement.os, "sched_getaffinity", lambda pid: {0, 1}, raising=False)
+    assert Topology.detect().nodes == {0: (0, 1)}
+    assert Topology.detect(Client()) == Topology.flat(6)
@@ -0,0 +1,110 @@
+"""Tests for the warm container pool's sizing and key retirement."""
+
+from __future__ import annotations
+
+import itertools
+import time
+from pathlib import Path
+
+import pytest
+
+from safebox.core.container import ContainerConfig
+from safebox.core.pool import ContainerPool, PoolExhaustedError, PoolSettings
+
+
+class FakeContainer:
+    _ids = itertools.count()
+
+    def __init__(self, kwargs: dict) -> None:
+        self.id = f"c{next(self._ids)}"
+        self.kwargs = kwargs
+        self.status = "running"
+        self.removed = False
+
+    def reload(self) -> None:
+        pass
+
+    def remove(self, force: bool = False) -> None:
+        self.removed = True
+        self.status = "removed"
+
+
+class FakeContainers:
+    def __init__(self) -> None:
+        self.started: list[FakeContainer] = []
+
+    def run(self, **kwargs) -> FakeContainer:
+        container = FakeContainer(kwargs)
+        self.started.append(container)
+        return container
+
+
+class FakeClient:
+    def __init__(self) -> None:
+        self.containers = FakeContainers()
+
+
+def _config(image: str = "python:3.12-slim", memory: str = "256m") -> ContainerConfig:
+    return ContainerConfig(
+        image=image, language="python", script_path=Path("job.py"), memory=memory
+    )
+
+
+def _live(client: FakeClient) -> list[FakeContainer]:
+    return [c for c in client.containers.started if not c.removed]
+
+
+@pytest.fixture
+def client() -> FakeClient:
+    return FakeClient()
+
+
+def test_acquire_starts_container_and_release_destroys_it(client):
+    pool = ContainerPool(PoolSettings(min_size=0, max_size=2), client=client)
+    container = pool.acquire(_config())
+    assert container.kwargs["command"] == ["tail", "-f", "/dev/null"]
+    pool.release(container)
+    pool.close()
+    assert container.removed
+
+
+def test_acquire_blocks_at_max_size(client):
+    pool = ContainerPool(PoolSettings(min_size=0, max_size=1, acquire_timeout=0.05), client=client)
+    pool.acquire(_config())
+    with pytest.raises(PoolExhaustedError):
+        pool.acquire(_config())
+    pool.close()
+
+
+def test_unused_key_is_retired(client):
+    pool = ContainerPool(PoolSettings(min_size=1, idle_timeout=0.01), client=client)
+    pool.release(pool.acquire(_config(memory="512m")))
+    pool._background.shutdown(wait=True)  # let the top-up finish
+    assert len(_live(client)) == 1
+
+    time.sleep(0.02)
+    pool.maintain()
+    assert _live(client) == []
+    assert pool.stats() == {}
+    pool.close()
+
+
+def test_warmed_key_is_kept(client):
+    pool = ContainerPool(PoolSettings(min_size=1, idle_timeout=0.01), client=client)
+    pool.warm(_config())
+    time.sleep(0.02)
+    pool.maintain()
+    assert len(_live(client)) == 1
+    assert pool.stats()["python:3.12-slim"]["idle"] == 1
+    pool.close()
+    assert _live(client) == []
+
+
+def test_key_in_use_is_not_retired(client):
+    pool = ContainerPool(PoolSettings(min_size=0, idle_timeout=0.01), client=client)
+    container = pool.acquire(_config())
+    time.sleep(0.02)
+    pool.maintain()
+    assert not container.removed
+    assert pool.stats()["python:3.12-slim"]["busy"] == 1
+    pool.close()
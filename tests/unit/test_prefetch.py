@@ -0,0 +1,108 @@
+"""Tests for parallel image prefetch against a fake Docker client."""
+
+from __future__ import annotations
+
+import threading
+
+import pytest
+from docker.errors import APIError, ImageNotFound
+
+from safebox.core import images
+from safebox.core.docker_client import use_client
+from safebox.core.images import ImageCache, default_images, prefetch_images
+
+
+class FakeImage:
+    def __init__(self, image_id: str, digests: list[str]) -> None:
+        self.id = image_id
+        self.attrs = {"RepoDigests": digests}
+
+
+class FakeImages:
+    def __init__(self, client: FakeClient) -> None:
+        self._client = client
+
+    def get(self, name: str) -> FakeImage:
+        if name not in self._client.local:
+            raise ImageNotFound(name)
+        return self._client.local[name]
+
+    def get_registry_data(self, name: str):
+        if self._client.offline:
+            raise APIError("registry unreachable")
+        return type("RegistryData", (), {"id": self._client.remote[name]})()
+
+
+class FakeAPI:
+    def __init__(self, client: FakeClient) -> None:
+        self._client = client
+
+    def pull(self, name, stream=True, decode=True):
+        with self._client.lock:
+            self._client.pulls.append(name)
+        if name == "broken:1":
+            yield {"error": "manifest unknown"}
+            return
+        progress = {"current": 5, "total": 10}
+        yield {"id": "layer1", "status": "Downloading", "progressDetail": progress}
+        yield {"status": "Digest: sha256:new"}
+        self._client.local[name] = FakeImage(f"sha256:{name}-new", [f"{name}@sha256:new"])
+
+
+class FakeClient:
+    def __init__(self) -> None:
+        self.local: dict[str, FakeImage] = {}
+        self.remote: dict[str, str] = {}
+        self.offline = False
+        self.pulls: list[str] = []
+        self.lock = threading.Lock()
+        self.images = FakeImages(self)
+        self.api = FakeAPI(self)
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    """A fake bound with ``use_client``, which the worker threads must use too."""
+    monkeypatch.setattr(images, "_default_cache", ImageCache(tmp_path / "images.json"))
+    client = FakeClient()
+    with use_client(client):
+        yield client
+
+
+def test_default_images_are_distinct_and_sorted():
+    defaults = default_images()
+    assert defaults == sorted(set(defaults)) and defaults
+
+
+def test_present_images_are_skipped_and_missing_ones_pulled(client):
+    client.local["a:1"] = FakeImage("sha256:a", ["a:1@sha256:da"])
+    client.remote["a:1"] = "sha256:da"
+    layers = []
+    results = prefetch_images(["a:1", "b:1", "a:1"], on_layer=lambda *event: layers.append(event))
+    assert [(r.image, r.status) for r in results] == [("a:1", "present"), ("b:1", "pulled")]
+    assert client.pulls == ["b:1"]
+    assert layers == [("b:1", "layer1", "Downloading", 5, 10)]
+    assert images.get_image_cache().get("a:1").image_id == "sha256:a"
+    assert images.get_image_cache().get("b:1").image_id == "sha256:b:1-new"
+
+
+def test_stale_digest_is_pulled_again(client):
+    client.local["a:1"] = FakeImage("sha256:a", ["a:1@sha256:old"])
+    client.remote["a:1"] = "sha256:new"
+    [result] = prefetch_images(["a:1"])
+    assert result.status == "pulled" and client.pulls == ["a:1"]
+
+
+def test_offline_registry_and_local_builds_count_as_current(client):
+    client.local["a:1"] = FakeImage("sha256:a", ["a:1@sha256:old"])
+    client.local["mine:dev"] = FakeImage("sha256:m", [])
+    client.offline = True
+    results = prefetch_images(["a:1", "mine:dev"])
+    assert [r.status for r in results] == ["present", "present"]
+
+
+def test_force_pulls_and_failures_are_reported(client):
+    client.local["a:1"] = FakeImage("sha256:a", [])
+    results = prefetch_images(["a:1", "broken:1"], force=True, concurrency=1)
+    assert [r.status for r in results] == ["pulled", "failed"]
+    assert results[1].error == "manifest unknown"
@@ -0,0 +1,127 @@
+"""Tests for result cache keys, storage and hit/miss counting."""
+
+from __future__ import annotations
+
+import json
+from dataclasses import replace
+
+import pytest
+
+from safebox.core import result_cache
+from safebox.core.container import ContainerConfig
+from safebox.core.result_cache import CachedRun, ResultCache, cache_key
+
+
+@pytest.fixture
+def config(tmp_path):
+    script = tmp_path / "job.py"
+    script.write_text("print(1)\n")
+    return ContainerConfig(
+        image="python:3.12-slim",
+        language="python",
+        script_path=script,
+        image_ref="sha256:cafe",
+        environment={"B": "2", "A": "1"},
+    )
+
+
+def test_key_is_stable_and_ignores_the_script_location(config, tmp_path):
+    moved = tmp_path / "elsewhere"
+    moved.mkdir()
+    copy = moved / "job.py"
+    copy.write_text(config.script_path.read_text())
+    reordered = replace(config, script_path=copy, environment={"A": "1", "B": "2"})
+    assert cache_key(config) == cache_key(reordered)
+
+
+@pytest.mark.parametrize(
+    "change",
+    [
+        {"image_ref": "sha256:beef"},
+        {"memory": "1g"},
+        {"cpus": 2.0},
+        {"timeout": 5},
+        {"pids_limit": 8},
+        {"extra_args": "--fast"},
+        {"environment": {"A": "1"}},
+        {"script_name": "other.py"},
+    ],
+)
+def test_key_covers_what_shapes_the_run(config, change):
+    assert cache_key(config) != cache_key(replace(config, **change))
+
+
+def test_key_covers_script_contents_and_capture_settings(config):
+    key = cache_key(config)
+    assert key != cache_key(config, max_output=1024)
+    assert key != cache_key(config, raw=True)
+    config.script_path.write_text("print(2)\n")
+    assert key != cache_key(config)
+
+
+def _run(key: str, **kwargs) -> CachedRun:
+    defaults = dict(
+        script="/tmp/job.py",
+        exit_code=0,
+        duration=0.5,
+        language="python",
+        image="python:3.12-slim",
+        image_id="sha256:cafe",
+    )
+    return CachedRun(key=key, **{**defaults, **kwargs})
+
+
+def test_put_and_get_round_trip(tmp_path):
+    cache = ResultCache(tmp_path)
+    cache.put(_run("a", frames=[(1, "out\n"), (2, "err\n")]))
+    cache.put(_run("b", binary=True, frames=[(1, b"\x00\xff")]))
+    assert cache.get("a").frames == [(1, "out\n"), (2, "err\n")]
+    assert cache.get("b").frames == [(1, b"\x00\xff")]
+    assert cache.get("missing") is None
+
+
+def test_lookups_do_not_write_stats_until_flushed(tmp_path):
+    cache = ResultCache(tmp_path)
+    cache.put(_run("a"))
+    stats_file = tmp_path / "stats.json"
+    for _ in range(3):
+        cache.get("a")
+    cache.get("missing")
+    assert not stats_file.exists()
+    assert (cache.stats().hits, cache.stats().misses) == (3, 1)
+
+    cache.flush_stats()
+    assert json.loads(stats_file.read_text()) == {"hits": 3, "misses": 1}
+    cache.get("a")
+    cache.put(_run("b"))  # storing flushes too
+    assert json.loads(stats_file.read_text()) == {"hits": 4, "misses": 1}
+
+
+def test_counts_from_other_processes_are_added(tmp_path):
+    (tmp_path / "stats.json").write_text(json.dumps({"hits": 10, "misses": 5}))
+    cache = ResultCache(tmp_path)
+    cache.get("missing")
+    cache.flush_stats()
+    assert json.loads((tmp_path / "stats.json").read_text()) == {"hits": 10, "misses": 6}
+
+
+def test_lookups_flush_after_the_interval(tmp_path, monkeypatch):
+    monkeypatch.setattr(result_cache, "RESULT_CACHE_STATS_FLUSH", 0.0)
+    cache = ResultCache(tmp_path)
+    cache.get("missing")
+    assert json.loads((tmp_path / "stats.json").read_text()) == {"misses": 1}
+
+
+def test_reset_stats_drops_pending_counts(tmp_path):
+    cache = ResultCache(tmp_path)
+    cache.get("missing")
+    cache.reset_stats()
+    cache.flush_stats()
+    assert cache.stats().misses == 0
+
+
+def test_eviction_keeps_the_cache_under_its_limit(tmp_path):
+    cache = ResultCache(tmp_path, max_bytes=1)
+    cache.put(_run("a"))
+    assert cache.get("a") is None
+    assert cache.stats().entries == 0
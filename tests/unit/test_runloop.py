@@ -0,0 +1,145 @@
+"""Tests for the deadline-aware run loop."""
+
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from safebox.config.constants import STDERR, STDOUT
+from safebox.core import runloop
+from safebox.core.runloop import run_loop
+from safebox.core.timeout import ExecutionTimeoutError
+
+
+class Process:
+    """Output frames that block, once written, until the process is killed."""
+
+    def __init__(self, frames=(), block: bool = False) -> None:
+        self.frames = list(frames)
+        self.block = block
+        self.dead = threading.Event()
+        self.kills = 0
+
+    def __iter__(self):
+        yield from self.frames
+        if self.block:
+            self.dead.wait(5)
+
+    def kill(self) -> None:
+        self.kills += 1
+        self.dead.set()
+
+
+def test_output_then_exit_code():
+    process = Process([(STDOUT, b"a"), (STDERR, b"b")])
+    seen, remaining = [], []
+
+    def exit_status(left: float) -> int:
+        remaining.append(left)
+        return 3
+
+    outcome = run_loop(
+        process, timeout=10, on_chunk=seen.append, kill=process.kill, exit_status=exit_status
+    )
+    assert seen == [(STDOUT, b"a"), (STDERR, b"b")]
+    assert (outcome.exit_code, outcome.timed_out) == (3, False)
+    assert 9 < remaining[0] <= 10
+    assert process.kills == 0
+
+
+def test_unknown_exit_code_counts_as_failure():
+    process = Process()
+    outcome = run_loop(
+        process,
+        timeout=10,
+        on_chunk=lambda chunk: None,
+        kill=process.kill,
+        exit_status=lambda left: None,
+    )
+    assert outcome.exit_code == 1
+
+
+def test_deadline_kills_and_reports_timeout():
+    process = Process([(STDOUT, b"started")], block=True)
+    timeouts = []
+    outcome = run_loop(
+        process,
+        timeout=0.05,
+        on_chunk=lambda chunk: None,
+        kill=process.kill,
+        exit_status=lambda left: pytest.fail("exit status read after a timeout"),
+        on_timeout=lambda: timeouts.append(True),
+    )
+    assert (outcome.exit_code, outcome.timed_out) == (124, True)
+    assert outcome.duration >= 0.05
+    assert timeouts == [True] and process.kills == 1
+
+
+def test_stream_that_outlives_the_kill_is_abandoned(monkeypatch):
+    monkeypatch.setattr(runloop, "KILL_DRAIN_TIMEOUT", 0.05)
+    process = Process(block=True)
+    cancelled = []
+    start = time.monotonic()
+    outcome = run_loop(
+        process,
+        timeout=0.02,
+        on_chunk=lambda chunk: None,
+        kill=lambda: None,  # the process ignores it
+        exit_status=lambda left: 0,
+        cancel=lambda: cancelled.append(True),
+    )
+    assert outcome.timed_out and cancelled == [True]
+    assert time.monotonic() - start < 1
+    process.dead.set()
+
+
+def test_deadline_enforced_elsewhere_counts_as_timeout():
+    process = Process()
+    outcome = run_loop(
+        process,
+        timeout=10,
+        on_chunk=lambda chunk: None,
+        kill=process.kill,
+        exit_status=lambda left: 137,
+        expired=lambda: True,
+    )
+    assert (outcome.exit_code, outcome.timed_out) == (124, True)
+
+
+def test_still_running_at_the_deadline_is_a_timeout():
+    process = Process()
+
+    def exit_status(left: float) -> int:
+        raise ExecutionTimeoutError("still running")
+
+    outcome = run_loop(
+        process, timeout=10, on_chunk=lambda chunk: None, kill=process.kill, exit_status=exit_status
+    )
+    assert outcome.timed_out and process.kills == 1
+
+
+def test_failing_consumer_kills_the_process():
+    process = Process([(STDOUT, b"boom")], block=True)
+
+    def on_chunk(chunk):
+        raise RuntimeError("consumer failed")
+
+    with pytest.raises(RuntimeError, match="consumer failed"):
+        run_loop(process, timeout=10, on_chunk=on_chunk, kill=process.kill, exit_status=int)
+    assert process.kills == 1
+
+
+def test_start_time_counts_towards_the_deadline():
+    process = Process(block=True)
+    outcome = run_loop(
+        process,
+        timeout=1,
+        on_chunk=lambda chunk: None,
+        kill=process.kill,
+        exit_status=lambda left: 0,
+        start_time=time.monotonic() - 1,
+    )
+    assert outcome.timed_out and outcome.duration >= 1
+    assert process.kills == 1
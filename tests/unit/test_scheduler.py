@@ -0,0 +1,149 @@
+"""Tests for admission control: budget, ordering, fair share and timeouts."""
+
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from safebox.core.scheduler import AdmissionTimeoutError, Resources, Scheduler
+
+ONE = Resources(memory=100, nano_cpus=100, pids=10)
+"""A run that takes the whole budget of :func:`_scheduler`."""
+
+
+def _scheduler() -> Scheduler:
+    return Scheduler(ONE)
+
+
+def _wait_for(predicate, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out waiting"
+        time.sleep(0.001)
+
+
+def _queue_in_order(scheduler: Scheduler, runs: list[tuple[str, dict]]) -> list[str]:
+    """Queue *runs* one by one behind a blocker, release it, return the admission order."""
+    order: list[str] = []
+    lock = threading.Lock()
+
+    def run(name: str, kwargs: dict) -> None:
+        with scheduler.admit(kwargs.pop("resources", ONE), **kwargs):
+            with lock:
+                order.append(name)
+
+    threads = []
+    with scheduler.admit(ONE, tenant="blocker"):
+        for queued, (name, kwargs) in enumerate(runs, start=1):
+            thread = threading.Thread(target=run, args=(name, dict(kwargs)))
+            thread.start()
+            threads.append(thread)
+            _wait_for(lambda: len(scheduler._queue) == queued)
+    for thread in threads:
+        thread.join(5)
+    return order
+
+
+def test_resources_arithmetic_and_fit():
+    small = Resources(10, 10, 1)
+    assert small + small == Resources(20, 20, 2)
+    assert (small + small) - small == small
+    assert small.fits(ONE) and not Resources(101, 0, 0).fits(ONE)
+
+
+def test_runs_within_budget_are_admitted_together():
+    scheduler = Scheduler(Resources(300, 300, 30))
+    with scheduler.admit(ONE) as first, scheduler.admit(ONE) as second:
+        assert first >= 0 and second >= 0
+        assert scheduler.stats()["running"] == 2
+    assert scheduler.stats()["committed"] == Resources().to_dict()
+
+
+def test_higher_priority_first_then_arrival_order():
+    order = _queue_in_order(
+        _scheduler(),
+        [("low", {}), ("high", {"priority": 5}), ("low2", {}), ("mid", {"priority": 1})],
+    )
+    assert order == ["high", "mid", "low", "low2"]
+
+
+def test_tenant_served_longest_ago_goes_first():
+    order = _queue_in_order(
+        _scheduler(),
+        [("a1", {"tenant": "a"}), ("a2", {"tenant": "a"}), ("b1", {"tenant": "b"})],
+    )
+    assert order == ["a1", "b1", "a2"]
+
+
+def test_large_run_is_not_overtaken_by_small_ones():
+    scheduler = Scheduler(Resources(200, 200, 20))
+    half = Resources(100, 100, 10)
+    order: list[str] = []
+    finish_big = threading.Event()
+
+    def big() -> None:
+        with scheduler.admit(half + half):
+            order.append("big")
+            finish_big.wait(5)
+
+    def small() -> None:
+        with scheduler.admit(half):
+            order.append("small")
+
+    threads = [threading.Thread(target=big), threading.Thread(target=small)]
+    with scheduler.admit(half, tenant="holder"):
+        for queued, thread in enumerate(threads, start=1):
+            thread.start()
+            _wait_for(lambda: len(scheduler._queue) == queued)
+        time.sleep(0.05)
+        assert order == []  # the small run would fit, but the big one is next in line
+    _wait_for(lambda: order == ["big"])
+    finish_big.set()
+    for thread in threads:
+        thread.join(5)
+    assert order == ["big", "small"]
+
+
+def test_run_larger_than_the_budget_is_admitted_alone():
+    scheduler = _scheduler()
+    with scheduler.admit(Resources(1000, 1000, 100)):
+        assert scheduler.stats()["running"] == 1
+
+
+def test_admission_timeout():
+    scheduler = _scheduler()
+    with scheduler.admit(ONE):
+        with pytest.raises(AdmissionTimeoutError, match="0 other run"):
+            with scheduler.admit(ONE, timeout=0.05):
+                pass
+        assert scheduler.stats()["queued"] == 0
+
+
+def test_fair_share_history_is_dropped_when_a_tenant_goes_idle():
+    scheduler = _scheduler()
+    for tenant in ("a", "b", "c"):
+        with scheduler.admit(ONE, tenant=tenant):
+            assert tenant in scheduler._served
+    assert scheduler._served == {}
+
+
+def test_timed_out_tenant_is_forgotten():
+    scheduler = _scheduler()
+    with scheduler.admit(ONE, tenant="holder"):
+        with pytest.raises(AdmissionTimeoutError):
+            with scheduler.admit(ONE, tenant="late", timeout=0.01):
+                pass
+        assert "late" not in scheduler._served
+        assert set(scheduler._served) == {"holder"}
+    assert scheduler._served == {}
+
+
+def test_stats_report_tenants_and_waits():
+    scheduler = _scheduler()
+    _queue_in_order(scheduler, [("a1", {"tenant": "a"})])
+    stats = scheduler.stats()
+    assert stats["admitted"] == 2 and stats["max_queued"] == 1
+    assert stats["tenants"] == {}
+    assert stats["wait"]["max"] >= stats["wait"]["p50"] >= 0
@@ -0,0 +1,191 @@
+"""Tests for :class:`Sandbox` sessions against an in-memory fake daemon."""
+
+from __future__ import annotations
+
+import io
+import itertools
+import tarfile
+import threading
+
+import pytest
+from docker.errors import APIError
+
+from safebox.core import session
+from safebox.core.docker_client import use_client
+from safebox.core.events import ExitStatus, use_events
+from safebox.core.session import Sandbox, SessionClosedError
+
+
+class FakeEvents:
+    closed = False
+
+    def __init__(self) -> None:
+        self.exits: dict[str, ExitStatus] = {}
+
+    def wait_exit(self, key, timeout):
+        return None
+
+    def exit_status(self, key):
+        return self.exits.get(key)
+
+    def subscribe(self, listener):
+        return lambda: None
+
+
+class FakeContainer:
+    _ids = itertools.count()
+
+    def __init__(self, kwargs: dict) -> None:
+        self.id = f"session{next(self._ids)}"
+        self.kwargs = kwargs
+        self.files: dict[str, str] = {}
+        self.running = True
+        self.removed = False
+        self.killed = threading.Event()
+
+    def put_archive(self, path: str, data: bytes) -> bool:
+        with tarfile.open(fileobj=io.BytesIO(data)) as tar:
+            for member in tar.getmembers():
+                self.files[f"{path}/{member.name}"] = tar.extractfile(member).read().decode()
+        return True
+
+    def kill(self, signal=None) -> None:
+        self.running = False
+        self.killed.set()
+
+    def remove(self, force: bool = False) -> None:
+        self.running = False
+        self.removed = True
+
+
+class FakeAPI:
+    """Each exec prints its command, environment and files, then exits 3.
+
+    A command containing ``sleep`` blocks until the container is killed.
+    """
+
+    def __init__(self, client: FakeClient) -> None:
+        self._client = client
+        self.execs: dict[str, tuple] = {}
+
+    def exec_create(self, container_id, command, workdir=None, environment=None):
+        container = self._client.by_id[container_id]
+        if not container.running:
+            raise APIError(f"Container {container_id} is not running")
+        exec_id = f"exec{len(self.execs)}"
+        self.execs[exec_id] = (container, command, environment or {})
+        return {"Id": exec_id}
+
+    def exec_start(self, exec_id, stream=True, demux=True):
+        container, command, environment = self.execs[exec_id]
+        if "sleep" in str(command):
+            container.killed.wait(5)
+            return
+        yield f"{command}|{sorted(environment.items())}|{sorted(container.files)}\n".encode(), None
+        yield None, b"warning\n"
+
+    def exec_inspect(self, exec_id):
+        return {"Running": False, "ExitCode": 3}
+
+
+class FakeContainers:
+    def __init__(self, client: FakeClient) -> None:
+        self._client = client
+
+    def run(self, **kwargs) -> FakeContainer:
+        container = FakeContainer(kwargs)
+        self._client.by_id[container.id] = container
+        self._client.started.append(container)
+        return container
+
+
+class FakeClient:
+    def __init__(self) -> None:
+        self.by_id: dict[str, FakeContainer] = {}
+        self.started: list[FakeContainer] = []
+        self.api = FakeAPI(self)
+        self.containers = FakeContainers(self)
+
+
+@pytest.fixture
+def fake(monkeypatch):
+    monkeypatch.setattr(session, "resolve_image", lambda image, pull=False: "sha256:cafe")
+    client, events = FakeClient(), FakeEvents()
+    with use_client(client), use_events(events):
+        yield client, events
+
+
+def test_calls_share_one_container(fake):
+    client, _ = fake
+    with Sandbox("python", environment={"A": "1"}) as box:
+        first = box.run_code("print(1)", environment={"B": "2"})
+        second = box.run_command("ls -l")
+    assert len(client.started) == 1
+    assert (box.runs, box.starts) == (2, 1)
+
+    assert first.exit_code == 3
+    assert first.stdout.startswith("python /sandbox/snippet-1.py|[('A', '1'), ('B', '2')]")
+    assert first.stderr == "warning\n"
+    assert first.image_id == "sha256:cafe"
+    assert second.stdout.startswith("['sh', '-c', 'ls -l']|[('A', '1')]")
+    assert "/sandbox/snippet-1.py" in second.stdout  # files persist between calls
+    assert client.started[0].removed
+
+
+def test_container_is_labelled_and_kept_alive(fake):
+    client, _ = fake
+    with Sandbox("python", memory="128m"):
+        kwargs = client.started[0].kwargs
+    assert kwargs["labels"]["safebox.session"] == "true"
+    assert kwargs["command"] == ["tail", "-f", "/dev/null"]
+    assert kwargs["mem_limit"] == "128m"
+    assert "volumes" not in kwargs
+
+
+def test_run_copies_a_local_script(fake, tmp_path):
+    client, _ = fake
+    script = tmp_path / "check.py"
+    script.write_text("print('ok')\n")
+    with Sandbox("python") as box:
+        result = box.run(script, extra_args="--quick")
+    assert result.stdout.startswith("python /sandbox/check.py --quick|")
+    assert client.started[0].files["/sandbox/check.py"] == "print('ok')\n"
+
+
+def test_timeout_replaces_the_container(fake):
+    client, _ = fake
+    with Sandbox("python") as box:
+        result = box.run_command(["sleep", "5"], timeout=0.2)
+        assert result.timed_out and result.exit_code == 124
+        assert client.started[0].removed
+        assert box.run_command("true").exit_code == 3
+    assert box.starts == 2
+
+
+def test_container_that_died_unseen_is_replaced(fake):
+    client, _ = fake
+    with Sandbox("python") as box:
+        client.started[0].running = False
+        assert box.run_command("true").exit_code == 3
+    assert box.starts == 2
+
+
+def test_container_seen_dying_is_replaced(fake):
+    client, events = fake
+    with Sandbox("python") as box:
+        events.exits[client.started[0].id] = ExitStatus(exit_code=137)
+        box.run_command("true")
+    assert box.starts == 2
+    assert client.started[0].removed
+
+
+def test_closed_session_refuses_calls(fake):
+    box = Sandbox("python").start()
+    box.close()
+    with pytest.raises(SessionClosedError):
+        box.run_code("print(1)")
+
+
+def test_unknown_language_needs_an_image():
+    with pytest.raises(session.ExecutionError):
+        Sandbox("cobol")
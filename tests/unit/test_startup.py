@@ -0,0 +1,52 @@
+"""Tests that light CLI entry points never import Docker, Requests, Rich or YAML."""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[2]
+
+PROBE = """
+import sys
+sys.argv = ["safebox", *{argv!r}]
+try:
+    {code}
+except SystemExit:
+    pass
+print(",".join(sorted({{name.split(".")[0] for name in sys.modules}})))
+"""
+
+
+def _loaded(code: str, argv: list[str] | None = None) -> set[str]:
+    path = os.pathsep.join([str(ROOT), os.environ.get("PYTHONPATH", "")])
+    proc = subprocess.run(
+        [sys.executable, "-c", PROBE.format(code=code, argv=argv or [])],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={**os.environ, "PYTHONPATH": path},
+        cwd=ROOT,
+    )
+    return set(proc.stdout.strip().splitlines()[-1].split(","))
+
+
+@pytest.mark.parametrize(
+    "code, argv, forbidden",
+    [
+        ("import safebox.cli.app", None, {"docker", "requests", "rich", "yaml"}),
+        (
+            "from safebox.cli.app import app; app()",
+            ["--version"],
+            {"docker", "requests", "rich", "yaml"},
+        ),
+        # --help renders through Rich (Typer's rich markup mode).
+        ("from safebox.cli.app import app; app()", ["--help"], {"docker", "requests", "yaml"}),
+    ],
+)
+def test_light_entry_points(code, argv, forbidden):
+    assert not _loaded(code, argv) & forbidden
@@ -0,0 +1,111 @@
+"""Tests for demultiplexing Docker output streams into frames."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+import requests
+from docker.errors import NotFound
+
+from safebox.config.constants import STDERR, STDOUT
+from safebox.core.streams import demux_frames, exec_frames, follow_logs, follow_stats
+
+
+def _frame(stream: int, payload: bytes) -> bytes:
+    return bytes([stream, 0, 0, 0]) + len(payload).to_bytes(4, "big") + payload
+
+
+def test_whole_frames():
+    data = _frame(STDOUT, b"out\n") + _frame(STDERR, b"err\n") + _frame(STDOUT, b"")
+    assert list(demux_frames([data])) == [(STDOUT, b"out\n"), (STDERR, b"err\n"), (STDOUT, b"")]
+
+
+@pytest.mark.parametrize("size", [1, 3, 7, 9, 64])
+def test_frames_split_across_reads(size):
+    data = b"".join(_frame(STDOUT if i % 2 else STDERR, f"line {i}\n".encode()) for i in range(20))
+    chunks = [data[i : i + size] for i in range(0, len(data), size)]
+    frames = list(demux_frames(chunks))
+    assert frames == list(demux_frames([data]))
+    assert len(frames) == 20 and frames[3] == (STDOUT, b"line 3\n")
+
+
+def test_large_frame_with_header_bytes_in_payload():
+    payload = _frame(STDERR, b"not a header") * 1000
+    assert list(demux_frames([_frame(STDOUT, payload)])) == [(STDOUT, payload)]
+
+
+def test_truncated_trailing_frame_is_dropped():
+    data = _frame(STDOUT, b"complete") + _frame(STDERR, b"cut short")[:-3]
+    assert list(demux_frames([data])) == [(STDOUT, b"complete")]
+
+
+class FakeResponse:
+    def __init__(self, body: bytes, status: int = 200) -> None:
+        self._body = body
+        self.status_code = status
+        self.closed = False
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            response = requests.Response()
+            response.status_code = self.status_code
+            raise requests.HTTPError(response=response)
+
+    def iter_content(self, chunk_size=None):
+        yield from (self._body[i : i + 5] for i in range(0, len(self._body), 5))
+
+    def iter_lines(self):
+        yield from self._body.splitlines()
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class FakeAPI:
+    base_url = "http+docker://localhost"
+    api_version = "1.44"
+
+    def __init__(self, response: FakeResponse) -> None:
+        self.response = response
+        self.requests: list[tuple[str, dict]] = []
+
+    def get(self, url, params=None, stream=False, timeout=None):
+        self.requests.append((url, params))
+        return self.response
+
+    def exec_start(self, exec_id, stream=True, demux=True):
+        yield b"out", None
+        yield None, b"err"
+        yield b"both", b"at once"
+
+
+def test_follow_logs_reads_raw_frames():
+    api = FakeAPI(FakeResponse(_frame(STDOUT, b"hello ") + _frame(STDERR, b"world")))
+    assert list(follow_logs(api, "abc")) == [(STDOUT, b"hello "), (STDERR, b"world")]
+    url, params = api.requests[0]
+    assert url.endswith("/v1.44/containers/abc/logs")
+    assert params == {"stdout": 1, "stderr": 1, "follow": 1}
+
+
+def test_follow_logs_raises_docker_errors():
+    api = FakeAPI(FakeResponse(b"", status=404))
+    with pytest.raises(NotFound):
+        follow_logs(api, "gone")
+    assert api.response.closed
+
+
+def test_follow_stats_decodes_samples():
+    samples = [{"pids_stats": {"current": 1}}, {"pids_stats": {"current": 2}}]
+    body = b"\n".join(json.dumps(sample).encode() for sample in samples) + b"\n\n"
+    assert list(follow_stats(FakeAPI(FakeResponse(body)), "abc")) == samples
+
+
+def test_exec_frames_splits_demuxed_pairs():
+    frames = list(exec_frames(FakeAPI(FakeResponse(b"")), "exec1"))
+    assert frames == [
+        (STDOUT, b"out"),
+        (STDERR, b"err"),
+        (STDOUT, b"both"),
+        (STDERR, b"at once"),
+    ]
@@ -0,0 +1,87 @@
+"""Tests for folding container stats samples into :class:`ResourceUsage`."""
+
+from __future__ import annotations
+
+import threading
+
+from safebox.core.telemetry import ResourceUsage, StatsSampler
+
+
+class FakeStream:
+    def __init__(self, samples: list[dict]) -> None:
+        self._samples = samples
+        self.drained = threading.Event()
+        self.closed = False
+
+    def __iter__(self):
+        yield from self._samples
+        self.drained.set()
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def _sample(memory: int, cache: int, cpu_ns: int, pids: int) -> dict:
+    return {
+        "memory_stats": {"usage": memory, "limit": 1000, "stats": {"inactive_file": cache}},
+        "cpu_stats": {
+            "cpu_usage": {"total_usage": cpu_ns},
+            "throttling_data": {"throttled_periods": 2, "throttled_time": 500_000_000},
+        },
+        "blkio_stats": {
+            "io_service_bytes_recursive": [
+                {"op": "Read", "value": 10},
+                {"op": "Write", "value": 20},
+                {"op": "Read", "value": 5},
+            ]
+        },
+        "networks": {"eth0": {"rx_bytes": 7, "tx_bytes": 3}},
+        "pids_stats": {"current": pids},
+    }
+
+
+def test_samples_are_folded_into_usage():
+    stream = FakeStream(
+        [
+            _sample(600, 100, 1_000_000_000, 4),
+            _sample(900, 50, 3_000_000_000, 2),
+            {"memory_stats": {}},  # the container has stopped
+        ]
+    )
+    sampler = StatsSampler(lambda: stream).start()
+    assert stream.drained.wait(5)
+    usage = sampler.stop(duration=2.0)
+
+    assert stream.closed
+    assert usage.samples == 2
+    assert (usage.memory_peak, usage.memory_avg, usage.memory_limit) == (850, 675, 1000)
+    assert usage.memory_ratio == 0.85
+    assert (usage.cpu_time, usage.cpu_avg) == (3.0, 1.5)
+    assert (usage.throttled_periods, usage.throttled_time) == (2, 0.5)
+    assert (usage.block_read, usage.block_write) == (15, 20)
+    assert (usage.net_rx, usage.net_tx) == (7, 3)
+    assert usage.pids_peak == 4
+
+
+def test_stop_does_not_wait_for_the_stream():
+    opened = threading.Event()
+    release = threading.Event()
+
+    def open_stream():
+        opened.set()
+        release.wait(5)
+        return FakeStream([_sample(600, 0, 0, 1)])
+
+    sampler = StatsSampler(open_stream).start()
+    assert opened.wait(5)
+    usage = sampler.stop(duration=1.0)
+    release.set()
+    assert usage.samples == 0
+
+
+def test_failing_stream_yields_empty_usage():
+    def open_stream():
+        raise ConnectionError("stats endpoint unavailable")
+
+    usage = StatsSampler(open_stream).start().stop(duration=1.0)
+    assert usage == ResourceUsage()
@@ -0,0 +1,63 @@
+"""Tests for phase spans, their per-phase summary and the Chrome trace export."""
+
+from __future__ import annotations
+
+import json
+import threading
+
+from safebox.core import tracing as tracing_module
+from safebox.core.tracing import Tracer, record, span, tracing
+
+
+def test_spans_are_no_ops_without_a_tracer():
+    assert span("x") is span("y")
+    record("x", 0.0, 1.0)
+    with tracing(None) as tracer:
+        assert tracer is None and tracing_module._tracer is None
+
+
+def test_spans_and_records_are_collected_while_tracing():
+    with tracing(Tracer()) as tracer:
+        with span("run", script="a.py"):
+            pass
+        record("dispatch", 1.0, 1.5, endpoint="tcp://a")
+    with span("after"):
+        pass
+    assert [s.name for s in tracer.spans] == ["run", "dispatch"]
+    assert tracer.spans[0].attrs == {"script": "a.py"}
+    assert tracer.total("dispatch") == 0.5
+
+
+def test_phases_sum_calls_and_record_nesting():
+    tracer = Tracer()
+    tracer.add("execute", 0.0, 10.0)
+    tracer.add("create", 1.0, 2.0)
+    tracer.add("start", 2.0, 3.0)
+    tracer.add("create", 4.0, 6.0)
+    tracer.add("wait", 6.0, 9.0)
+    phases = {p.name: p for p in tracer.phases()}
+    assert list(phases) == ["execute", "create", "start", "wait"]
+    assert (phases["create"].calls, phases["create"].total) == (2, 3.0)
+    assert phases["execute"].depth == 0 and phases["wait"].depth == 1
+
+
+def test_spans_on_other_threads_do_not_nest():
+    tracer = Tracer()
+    tracer.add("outer", 0.0, 10.0)
+    worker = threading.Thread(target=lambda: tracer.add("worker", 1.0, 2.0))
+    worker.start()
+    worker.join()
+    assert {p.name: p.depth for p in tracer.phases()} == {"outer": 0, "worker": 0}
+
+
+def test_chrome_trace_export(tmp_path):
+    tracer = Tracer()
+    tracer.add("run", tracer.origin + 0.001, tracer.origin + 0.003, script="a.py")
+    path = tmp_path / "traces" / "run.json"
+    tracer.write(path)
+    trace = json.loads(path.read_text())
+    complete, metadata = trace["traceEvents"]
+    assert complete["ph"] == "X" and complete["name"] == "run"
+    assert (complete["ts"], complete["dur"]) == (1000.0, 2000.0)
+    assert complete["args"] == {"script": "a.py"}
+    assert metadata["ph"] == "M" and metadata["args"]["name"] == "MainThread"
@@ -0,0 +1,111 @@
+"""Tests for the deadline watchdog's signal order and retirement."""
+
+from __future__ import annotations
+
+import itertools
+import threading
+import time
+
+from safebox.core.events import ContainerEvent
+from safebox.core.watchdog import Watchdog
+
+
+class FakeContainer:
+    _ids = itertools.count()
+
+    def __init__(self, log: list) -> None:
+        self.id = f"c{next(self._ids)}"
+        self._log = log
+        self.killed = threading.Event()
+
+    def kill(self, signal: str = "SIGKILL") -> None:
+        self._log.append((self.id, signal, time.monotonic()))
+        if signal == "SIGKILL":
+            self.killed.set()
+
+
+class FakeEvents:
+    closed = False
+
+    def __init__(self) -> None:
+        self.listeners = []
+
+    def subscribe(self, listener):
+        self.listeners.append(listener)
+        return lambda: self.listeners.remove(listener)
+
+
+def _watchdog() -> tuple[Watchdog, FakeEvents]:
+    events = FakeEvents()
+    return Watchdog(lambda: events), events
+
+
+def test_sigterm_then_sigkill_after_the_grace_period():
+    log: list = []
+    watchdog, _ = _watchdog()
+    container = FakeContainer(log)
+    start = time.monotonic()
+    deadline = watchdog.watch(container, 0.05, grace=0.1, start=start)
+    assert container.killed.wait(5)
+
+    assert [signal for _, signal, _ in log] == ["SIGTERM", "SIGKILL"]
+    (_, _, term_at), (_, _, kill_at) = log
+    assert term_at - start >= 0.05
+    assert kill_at - term_at >= 0.1
+    assert deadline.terminated and deadline.killed and deadline.done
+    assert watchdog.pending == 0
+
+
+def test_zero_grace_kills_at_once():
+    log: list = []
+    watchdog, _ = _watchdog()
+    container = FakeContainer(log)
+    deadline = watchdog.watch(container, 0.01)
+    assert container.killed.wait(5)
+    assert [signal for _, signal, _ in log] == ["SIGKILL"]
+    assert deadline.killed and not deadline.terminated
+
+
+def test_cancelled_deadline_sends_nothing():
+    log: list = []
+    watchdog, _ = _watchdog()
+    deadline = watchdog.watch(FakeContainer(log), 0.05)
+    deadline.cancel()
+    deadline.cancel()
+    time.sleep(0.1)
+    assert log == [] and watchdog.pending == 0
+
+
+def test_die_event_retires_the_deadline():
+    log: list = []
+    watchdog, events = _watchdog()
+    container = FakeContainer(log)
+    deadline = watchdog.watch(container, 0.05)
+    for listener in events.listeners:
+        listener(ContainerEvent("die", container.id, time.time()))
+    time.sleep(0.1)
+    assert log == [] and deadline.done
+
+
+def test_expire_stops_the_container_now():
+    log: list = []
+    watchdog, _ = _watchdog()
+    container = FakeContainer(log)
+    deadline = watchdog.watch(container, 60, grace=0.05)
+    deadline.expire()
+    assert container.killed.wait(5)
+    assert [signal for _, signal, _ in log] == ["SIGTERM", "SIGKILL"]
+    deadline.expire()  # already expired: a no-op
+    assert deadline.expired
+
+
+def test_earlier_deadline_wakes_the_thread():
+    log: list = []
+    watchdog, _ = _watchdog()
+    late, early = FakeContainer(log), FakeContainer(log)
+    watchdog.watch(late, 60)
+    time.sleep(0.01)  # the thread is now asleep until the late deadline
+    watchdog.watch(early, 0.02)
+    assert early.killed.wait(5)
+    assert [container_id for container_id, _, _ in log] == [early.id]
+    assert watchdog.pending == 1